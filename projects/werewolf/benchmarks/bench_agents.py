@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# ==================== 离线 Agent 基准 ====================
+"""
+对比 RandomAgent、HeuristicAgent、PolicyAgent 与 ISMCTSAgent 的单次决策延迟和阵营胜率
+
+每种组合（好人 / 狼人各自使用的 Agent）跑若干局完整对局，
+统计 decide_action + speak 的平均耗时和狼人胜率。
+
+用法:
+    python benchmarks/bench_agents.py
+    python benchmarks/bench_agents.py --preset 12p --games 500
+    python benchmarks/bench_agents.py --agents heuristic ismcts --iterations 1000
+    python benchmarks/bench_agents.py --agents heuristic policy --policy policy.npz
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.core.enums import Faction
+from werewolf.agents.random_agent import RandomAgent
+from werewolf.agents.heuristic_agent import HeuristicAgent
+from werewolf.agents.ismcts_agent import ISMCTSAgent
+from werewolf.runner import AgentPool, GameRunner
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+AGENTS = {"random": RandomAgent, "heuristic": HeuristicAgent, "ismcts": ISMCTSAgent, "policy": None}
+
+
+class Timed:
+    """包装 Agent，累计决策耗时"""
+
+    def __init__(self, agent, stats):
+        self._agent = agent
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._agent, name)
+
+    async def decide_action(self):
+        start = time.perf_counter()
+        action = await self._agent.decide_action()
+        self._stats[0] += time.perf_counter() - start
+        self._stats[1] += 1
+        return action
+
+    async def speak(self):
+        start = time.perf_counter()
+        speech = await self._agent.speak()
+        self._stats[0] += time.perf_counter() - start
+        self._stats[1] += 1
+        return speech
+
+
+async def run(config, good: str, wolf: str, games: int, iterations: int, policy=None):
+    """返回 (狼人胜率, 平均决策耗时 µs)"""
+    stats = [0.0, 0]
+    wolf_wins = 0
+
+    def faction_of(pid, game):
+        return game.get_player(pid).role.faction
+
+    def factory(pid, game):
+        kind = wolf if faction_of(pid, game) == Faction.WEREWOLF else good
+        kwargs = {"iterations": iterations} if kind == "ismcts" else {}
+        seed = game.seed * 100 + pid
+        if kind == "policy":
+            from werewolf.agents.policy_agent import PolicyAgent
+            return Timed(PolicyAgent(pid, game, policy, seed=seed), stats)
+        return Timed(AGENTS[kind](pid, game, seed=seed, **kwargs), stats)
+
+    # 按 (座位, 阵营) 复用 Agent，对局之间只 rebind 不重新创建
+    pool = AgentPool(
+        factory,
+        key=lambda pid, game: (pid, faction_of(pid, game)),
+        seed=lambda pid, game: game.seed * 100 + pid,
+    )
+    for seed in range(games):
+        result = await GameRunner(config, pool, seed=seed, verbose=False).run()
+        wolf_wins += result.winner == Faction.WEREWOLF
+    return wolf_wins / games, stats[0] / max(stats[1], 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线 Agent 基准")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                        help="只测试指定预设（默认全部）")
+    parser.add_argument("--games", type=int, default=200, help="每种组合的对局数")
+    parser.add_argument("--agents", nargs="+", choices=sorted(AGENTS), default=["heuristic", "random"],
+                        help="参与对比的 Agent（policy 需要 numpy，ismcts 较慢，需显式指定）")
+    parser.add_argument("--iterations", type=int, default=500,
+                        help="ISMCTSAgent 每次决策的迭代次数")
+    parser.add_argument("--policy", type=str, default=None,
+                        help="PolicyAgent 的 .npz 权重（默认零权重，即均匀随机）")
+    args = parser.parse_args()
+
+    policy = None
+    if "policy" in args.agents:
+        from werewolf.agents.policy_agent import LinearPolicy
+        policy = LinearPolicy.load(args.policy) if args.policy else LinearPolicy()
+
+    presets = [args.preset] if args.preset else ["6p", "9p", "12p"]
+    print(f"{'preset':<8}{'good':<11}{'wolf':<11}{'wolf win':>10}{'µs/decision':>14}")
+    for name in presets:
+        for good in args.agents:
+            for wolf in args.agents:
+                rate, latency = asyncio.run(
+                    run(PRESETS[name], good, wolf, args.games, args.iterations, policy)
+                )
+                print(f"{name:<8}{good:<11}{wolf:<11}{rate:>10.3f}{latency:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
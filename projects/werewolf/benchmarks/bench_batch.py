@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# ==================== BatchSimulator 吞吐基准 ====================
+"""
+BatchSimulator（NumPy 锁步批量）与 FastGame 的每秒对局数及胜率对比
+
+用法:
+    python benchmarks/bench_batch.py
+    python benchmarks/bench_batch.py --preset 12p --games 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.core.enums import Faction
+from werewolf.sim import FastGame, RandomPolicy
+from werewolf.sim.batch import BatchSimulator
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+
+
+def bench_fast_game(config, games: int):
+    """FastGame + RandomPolicy，返回 (games/s, 狼人胜率)"""
+    game = FastGame(config)
+    wolf_wins = 0
+    start = time.perf_counter()
+    for seed in range(games):
+        game.reset(seed)
+        wolf_wins += game.run(RandomPolicy(seed)).winner == Faction.WEREWOLF
+    return games / (time.perf_counter() - start), wolf_wins / games
+
+
+def bench_batch(config, games: int, chunk_size: int):
+    """BatchSimulator，返回 (games/s, 狼人胜率)"""
+    sim = BatchSimulator(config, seed=0, chunk_size=chunk_size)
+    start = time.perf_counter()
+    result = sim.run(games)
+    elapsed = time.perf_counter() - start
+    return games / elapsed, result.summary()["win_rates"]["werewolf"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BatchSimulator 吞吐基准")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                        help="只测试指定预设（默认全部）")
+    parser.add_argument("--games", type=int, default=500_000, help="BatchSimulator 对局数")
+    parser.add_argument("--baseline-games", type=int, default=5000, help="FastGame 对局数")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="每批对局数")
+    args = parser.parse_args()
+
+    presets = [args.preset] if args.preset else ["6p", "9p", "12p"]
+    print(f"{'preset':<8}{'FastGame (g/s)':>16}{'Batch (g/s)':>14}{'speedup':>10}"
+          f"{'wolf% fast':>12}{'wolf% batch':>13}")
+    for name in presets:
+        config = PRESETS[name]
+        fast, fast_rate = bench_fast_game(config, args.baseline_games)
+        batch, batch_rate = bench_batch(config, args.games, args.chunk_size)
+        print(f"{name:<8}{fast:>16.0f}{batch:>14.0f}{batch / fast:>9.1f}x"
+              f"{fast_rate:>12.2%}{batch_rate:>13.2%}")
+
+
+if __name__ == "__main__":
+    main()
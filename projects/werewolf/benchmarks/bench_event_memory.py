@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# ==================== 事件内存基准 ====================
+"""
+用 tracemalloc 对比保留大量对局历史时的内存占用：
+旧版 GameEvent（普通 dataclass + datetime + 字符串类型 + dict 负载）
+与当前的紧凑 GameEvent（__slots__ + 整数类型 + 单调时间戳 + 按对局驻留的负载）
+
+用法:
+    python benchmarks/bench_event_memory.py
+    python benchmarks/bench_event_memory.py --preset 12p --games 5000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.core.enums import GamePhase
+from werewolf.core.events import GameEvent
+from werewolf.sim import FastGame, RandomPolicy
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+
+
+@dataclass
+class LegacyGameEvent:
+    """旧版事件定义（对照组）"""
+    event_type: str
+    round_num: int
+    phase: GamePhase
+    data: dict = field(default_factory=dict)
+    visible_to: Optional[List[int]] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+def collect_specs(config, games: int) -> list:
+    """生成事件参数（每局一组），与引擎构造事件时的输入一致"""
+    game = FastGame(config, record_events=True)
+    specs = []
+    for seed in range(games):
+        game.reset(seed)
+        history = game.run(RandomPolicy(seed)).history
+        specs.append([
+            (e.event_type, e.round_num, e.phase, e.data,
+             list(e.visible_to) if e.visible_to is not None else None)
+            for e in history
+        ])
+    return specs
+
+
+def measure(build, specs) -> int:
+    """返回保留全部历史所需的字节数"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    histories = [
+        [build(t, r, p, dict(d), list(v) if v is not None else None) for t, r, p, d, v in spec]
+        for spec in specs
+    ]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del histories
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="事件内存基准")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                        help="只测试指定预设（默认全部）")
+    parser.add_argument("--games", type=int, default=2000, help="保留的对局数")
+    args = parser.parse_args()
+
+    presets = [args.preset] if args.preset else ["6p", "9p", "12p"]
+    print(f"{'preset':<8}{'events':>10}{'legacy (MB)':>14}{'compact (MB)':>15}"
+          f"{'B/event':>16}{'saving':>9}")
+    for name in presets:
+        specs = collect_specs(PRESETS[name], args.games)
+        events = sum(len(spec) for spec in specs)
+        legacy = measure(LegacyGameEvent, specs)
+        compact = measure(GameEvent, specs)
+        print(f"{name:<8}{events:>10}{legacy / 2**20:>14.1f}{compact / 2**20:>15.1f}"
+              f"{legacy / events:>8.0f} -> {compact / events:<5.0f}{1 - compact / legacy:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
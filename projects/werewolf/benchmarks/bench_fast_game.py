@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# ==================== FastGame 吞吐基准 ====================
+"""
+对比 Game + RandomAgent 与 FastGame + RandomPolicy 的每秒对局数
+
+用法:
+    python benchmarks/bench_fast_game.py
+    python benchmarks/bench_fast_game.py --preset 12p --games 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.agents.random_agent import RandomAgent
+from werewolf.runner.game_runner import GameRunner
+from werewolf.sim import FastGame, RandomPolicy
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+
+
+async def bench_game(config, games: int) -> float:
+    """Game + RandomAgent，返回 games/s"""
+    start = time.perf_counter()
+    for seed in range(games):
+        runner = GameRunner(
+            config=config,
+            agent_factory=lambda pid, game, s=seed: RandomAgent(pid, game, seed=s + pid),
+            seed=seed,
+            verbose=False,
+        )
+        await runner.run()
+    return games / (time.perf_counter() - start)
+
+
+def bench_fast_game(config, games: int) -> float:
+    """FastGame + RandomPolicy，返回 games/s"""
+    game = FastGame(config)
+    start = time.perf_counter()
+    for seed in range(games):
+        game.reset(seed)
+        game.run(RandomPolicy(seed))
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FastGame 吞吐基准")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                        help="只测试指定预设（默认全部）")
+    parser.add_argument("--games", type=int, default=5000, help="FastGame 对局数")
+    parser.add_argument("--baseline-games", type=int, default=500, help="Game 对局数")
+    args = parser.parse_args()
+
+    presets = [args.preset] if args.preset else ["6p", "9p", "12p"]
+    print(f"{'preset':<8}{'Game (g/s)':>14}{'FastGame (g/s)':>18}{'speedup':>10}")
+    for name in presets:
+        config = PRESETS[name]
+        baseline = asyncio.run(bench_game(config, args.baseline_games))
+        fast = bench_fast_game(config, args.games)
+        print(f"{name:<8}{baseline:>14.0f}{fast:>18.0f}{fast / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
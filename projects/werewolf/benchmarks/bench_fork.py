@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# ==================== Game.fork 基准 ====================
+"""
+对比 Game.fork() 与 copy.deepcopy(game) 的每秒复制次数
+
+对局先用 RandomAgent 推进到指定回合的夜间（含未结算的行动），再计时复制。
+
+用法:
+    python benchmarks/bench_fork.py
+    python benchmarks/bench_fork.py --preset 12p --round 4 --forks 20000
+"""
+
+import argparse
+import asyncio
+import copy
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.core.enums import GamePhase
+from werewolf.core.game import Game
+from werewolf.agents.random_agent import RandomAgent
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+
+
+async def build_game(config, round_num: int, seed: int = 0) -> Game:
+    """推进到第 round_num 晚，并让部分夜间角色提交行动"""
+    game = Game(config, seed=seed)
+    await game.setup([f"P{i}" for i in range(config.player_count)])
+    agents = {p.id: RandomAgent(p.id, game, seed=seed + p.id) for p in game.players}
+    await game.start()
+
+    while game.phase != GamePhase.GAME_OVER:
+        actors = game.get_active_players()
+        if game.phase == GamePhase.NIGHT and game.round >= round_num:
+            for pid in actors[: len(actors) // 2]:
+                await game.submit_action(pid, await agents[pid].decide_action())
+            break
+        for pid in actors:
+            await game.submit_action(pid, await agents[pid].decide_action())
+        await game.advance_phase()
+    return game
+
+
+def bench(func, game: Game, count: int) -> float:
+    """返回每秒复制次数"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func(game)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Game.fork 基准")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=None,
+                        help="只测试指定预设（默认全部）")
+    parser.add_argument("--round", type=int, default=3, help="复制时所在回合")
+    parser.add_argument("--forks", type=int, default=10000, help="fork 次数")
+    parser.add_argument("--deepcopies", type=int, default=500, help="deepcopy 次数")
+    args = parser.parse_args()
+
+    presets = [args.preset] if args.preset else ["6p", "9p", "12p"]
+    print(f"{'preset':<8}{'events':>8}{'deepcopy (/s)':>15}{'fork (/s)':>12}{'speedup':>10}")
+    for name in presets:
+        game = asyncio.run(build_game(PRESETS[name], args.round))
+        deep = bench(copy.deepcopy, game, args.deepcopies)
+        fork = bench(Game.fork, game, args.forks)
+        print(f"{name:<8}{len(game.history):>8}{deep:>15.0f}{fork:>12.0f}{fork / deep:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
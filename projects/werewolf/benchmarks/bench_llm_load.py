@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# ==================== LLM 对局压测 ====================
+"""
+用本地模拟 LLM 服务压测 LLMAgent 对局（不调用付费 API）
+
+在进程内启动 werewolf.llm.mock_server（httpx ASGITransport，无需端口），
+用 OpenAIClient 并发跑若干局 LLMAgent 对局，统计对局耗时分位数、
+模拟服务的请求 / 429 / 5xx 数和后备策略次数。
+需要 fastapi、httpx 和 openai: pip install werewolf[web,llm]
+
+用法:
+    python benchmarks/bench_llm_load.py
+    python benchmarks/bench_llm_load.py --games 20 --latency-ms 200 --sigma 0.8 --deadline 1.5
+    python benchmarks/bench_llm_load.py --error-rate 0.05 --rate-limit-rate 0.05 --max-concurrency 16
+    python benchmarks/bench_llm_load.py --max-concurrency 16 --client-concurrency 64  # 客户端自适应限流
+    python benchmarks/bench_llm_load.py --error-rate 0.05 --sigma 1.2 --retries 4 --hedge  # 重试与对冲请求
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.agents.llm_agent import LLMAgent
+from werewolf.llm.openai_client import OpenAIClient
+from werewolf.llm.limiter import AdaptiveConcurrency, LLMLimiter, RateLimitedLLMClient
+from werewolf.llm.retry import HedgePolicy, ResilientLLMClient, RetryPolicy
+from werewolf.llm.mock_server import MockConfig, create_app
+from werewolf.runner import GameRunner
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+
+
+async def run(args):
+    app = create_app(MockConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.sigma,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        max_concurrency=args.max_concurrency,
+        retry_after=args.retry_after,
+        seed=0,
+    ))
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock")
+    # 关闭 SDK 自带的重试（重试由 --retries 控制）
+    client = OpenAIClient("mock", api_key="x", base_url="http://mock/v1", http_client=http, max_retries=0)
+    limiter = None
+    if args.rpm or args.tpm or args.client_concurrency:
+        limiter = LLMLimiter("mock", args.rpm, args.tpm, AdaptiveConcurrency(
+            initial=min(8, args.client_concurrency or 64), maximum=args.client_concurrency or 64,
+        ))
+        client = RateLimitedLLMClient(client, limiter)
+    resilient = None
+    if args.retries or args.hedge:
+        client = resilient = ResilientLLMClient(
+            client, RetryPolicy(max_attempts=args.retries or 1),
+            hedge=HedgePolicy() if args.hedge else None, seed=0,
+        )
+    config = PRESETS[args.preset]
+
+    agents = []
+
+    def factory(pid, game):
+        agent = LLMAgent(pid, game, client, max_turns=2, deadline=args.deadline)
+        agents.append(agent)
+        return agent
+
+    async def one(seed):
+        start = time.perf_counter()
+        await GameRunner(config, factory, seed=seed, verbose=False).run()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    durations = sorted(await asyncio.gather(*(one(seed) for seed in range(args.games))))
+    elapsed = time.perf_counter() - start
+    await http.aclose()
+
+    fallbacks = {}
+    for agent in agents:
+        for reason, count in agent.fallback_counts.items():
+            fallbacks[reason] = fallbacks.get(reason, 0) + count
+    stats = app.state.stats
+    print(f"games={args.games} elapsed={elapsed:.2f}s "
+          f"p50={durations[len(durations) // 2]:.2f}s max={durations[-1]:.2f}s")
+    print(f"requests={stats.requests} ok={stats.ok} 429={stats.rate_limited} 5xx={stats.errors} "
+          f"peak_in_flight={stats.peak_in_flight} "
+          f"server p50={stats.percentile(0.5) * 1000:.1f}ms p99={stats.percentile(0.99) * 1000:.1f}ms")
+    print(f"fallbacks={fallbacks}")
+    if limiter is not None:
+        print(f"limiter={limiter.state()}")
+    if resilient is not None:
+        print(f"resilience={resilient.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 对局压测（本地模拟服务）")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="9p")
+    parser.add_argument("--games", type=int, default=8, help="并发对局数")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="模拟延迟中位数（毫秒）")
+    parser.add_argument("--sigma", type=float, default=0.5, help="对数正态延迟的 sigma")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="返回 429 的概率")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 5xx 的概率")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="429 响应的 retry-after 秒数")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="模拟服务的并发上限")
+    parser.add_argument("--rpm", type=float, default=None, help="客户端限流：每分钟请求数")
+    parser.add_argument("--tpm", type=float, default=None, help="客户端限流：每分钟 token 数")
+    parser.add_argument("--client-concurrency", type=int, default=None, help="客户端自适应并发上限")
+    parser.add_argument("--retries", type=int, default=None, help="分类重试的最多尝试次数")
+    parser.add_argument("--hedge", action="store_true", help="超过 p95 延迟时发出对冲请求")
+    parser.add_argument("--deadline", type=float, default=None, help="LLMAgent 单次决策时间上限（秒）")
+    # 注入的故障会产生大量告警日志，只统计不输出
+    logging.getLogger("werewolf").setLevel(logging.ERROR)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,9 +19,12 @@ import logging
 import os
 
 from werewolf.config.presets import PRESET_6P, PRESET_9P
+from werewolf.core.enums import Faction
 from werewolf.runner.game_runner import GameRunner
 from werewolf.agents.random_agent import RandomAgent
+from werewolf.agents.heuristic_agent import HeuristicAgent
 from werewolf.agents.llm_agent import LLMAgent
+from werewolf.agents.wolf_pack import WolfPack
 
 # 配置日志
 logging.basicConfig(
@@ -59,12 +62,14 @@ async def run_llm_battle(
         return None
 
     config = PRESET_6P
+    pack = WolfPack()  # 狼人夜间由一次 LLM 对话共同决定击杀目标
 
     def agent_factory(player_id, game):
         return LLMAgent(
             player_id, game, llm_client,
             name=f"AI_{player_id}",
-            temperature=0.7
+            temperature=0.7,
+            pack=pack,
         )
 
     runner = GameRunner(
@@ -98,6 +103,26 @@ async def run_random_battle(seed: int = 42):
     return result
 
 
+async def run_heuristic_battle(seed: int = 42):
+    """运行规则 Agent 对战（不调用模型）"""
+    print("\n使用规则 Agent 进行对战\n")
+
+    config = PRESET_6P
+
+    def agent_factory(player_id, game):
+        return HeuristicAgent(player_id, game, seed=seed + player_id)
+
+    runner = GameRunner(
+        config=config,
+        agent_factory=agent_factory,
+        seed=seed,
+        verbose=True
+    )
+
+    result = await runner.run()
+    return result
+
+
 async def run_mixed_battle(seed: int = 42):
     """混合对战：部分 LLM，部分随机"""
     print("\n混合对战: 狼人使用 LLM，村民使用随机\n")
@@ -119,14 +144,16 @@ async def run_mixed_battle(seed: int = 42):
         return await run_random_battle(seed)
 
     config = PRESET_6P
+    pack = WolfPack()
 
     def agent_factory(player_id, game):
         player = game.get_player(player_id)
-        # 狼人使用 LLM
-        if player.role.name == "狼人":
+        # 狼人使用 LLM（联合决策击杀目标）
+        if player.role.faction == Faction.WEREWOLF:
             return LLMAgent(
                 player_id, game, llm_client,
-                name=f"LLM_Wolf_{player_id}"
+                name=f"LLM_Wolf_{player_id}",
+                pack=pack,
             )
         else:
             return RandomAgent(player_id, game, seed=seed + player_id)
@@ -146,9 +173,9 @@ def main():
     parser = argparse.ArgumentParser(description="AI 狼人杀对战")
     parser.add_argument(
         "--mode",
-        choices=["llm", "random", "mixed"],
+        choices=["llm", "random", "heuristic", "mixed"],
         default="random",
-        help="对战模式: llm(纯LLM), random(纯随机), mixed(混合)"
+        help="对战模式: llm(纯LLM), random(纯随机), heuristic(规则Agent), mixed(混合)"
     )
     parser.add_argument(
         "--provider",
@@ -165,6 +192,8 @@ def main():
         asyncio.run(run_llm_battle(args.provider, args.model, args.seed))
     elif args.mode == "random":
         asyncio.run(run_random_battle(args.seed))
+    elif args.mode == "heuristic":
+        asyncio.run(run_heuristic_battle(args.seed))
     elif args.mode == "mixed":
         asyncio.run(run_mixed_battle(args.seed))
 
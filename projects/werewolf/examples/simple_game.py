@@ -12,7 +12,7 @@
 
 import asyncio
 from werewolf.core.game import Game
-from werewolf.core.enums import GamePhase, Faction, ActionType
+from werewolf.core.enums import GamePhase, Faction, ActionType, RoleType
 from werewolf.core.events import Action
 from werewolf.config.presets import PRESET_6P, GameConfig
 
@@ -65,7 +65,7 @@ async def simple_game_demo():
         print(f"  {wolf.name}（狼人）选择击杀 {target.name}: {result.message}")
 
     # 预言家查验
-    seers = [p for p in game.players if p.role.name == "预言家"]
+    seers = game.get_players_by_role(RoleType.SEER)
     if seers:
         seer = seers[0]
         # 查验第一个狼人
@@ -76,7 +76,7 @@ async def simple_game_demo():
         print(f"  {seer.name}（预言家）查验 {check_target.name}: {'狼人' if is_wolf else '好人'}")
 
     # 女巫行动（跳过）
-    witches = [p for p in game.players if p.role.name == "女巫"]
+    witches = game.get_players_by_role(RoleType.WITCH)
     if witches:
         witch = witches[0]
         action = Action(ActionType.SKIP, actor_id=witch.id)
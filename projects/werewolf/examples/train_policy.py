@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# ==================== 线性策略训练示例 ====================
+"""
+自对弈训练 PolicyAgent 并保存权重
+
+需要安装 numpy: pip install werewolf[sim]
+
+使用方法:
+    python examples/train_policy.py --preset 9p --games 5000 --out policy_9p.npz
+    python benchmarks/bench_agents.py --preset 9p --agents heuristic policy --policy policy_9p.npz
+"""
+
+import argparse
+import asyncio
+
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.agents.policy_agent import FEATURE_NAMES, ROLES, LinearPolicy, train_self_play
+
+PRESETS = {"6p": PRESET_6P, "9p": PRESET_9P, "12p": PRESET_12P}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="线性策略自对弈训练")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="9p")
+    parser.add_argument("--games", type=int, default=2000, help="总对局数")
+    parser.add_argument("--batch", type=int, default=50, help="每次更新的对局数")
+    parser.add_argument("--lr", type=float, default=0.5, help="学习率")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--init", type=str, default=None, help="从已有权重继续训练")
+    parser.add_argument("--out", type=str, default="policy.npz", help="输出路径")
+    args = parser.parse_args()
+
+    policy = LinearPolicy.load(args.init) if args.init else None
+
+    def report(done: int, wolf_rate: float) -> None:
+        print(f"{done:>7} 局  本批狼人胜率 {wolf_rate:.3f}")
+
+    policy = asyncio.run(train_self_play(
+        PRESETS[args.preset], policy, games=args.games, batch_size=args.batch,
+        lr=args.lr, seed=args.seed, callback=report,
+    ))
+    policy.save(args.out)
+    print(f"\n权重已保存到 {args.out}\n")
+
+    # 各角色权重绝对值最大的特征
+    for i, role in enumerate(ROLES):
+        top = sorted(range(len(FEATURE_NAMES)), key=lambda j: -abs(policy.weights[i, j]))[:3]
+        print(f"{role.value:<10}" + "  ".join(
+            f"{FEATURE_NAMES[j]}={policy.weights[i, j]:+.2f}" for j in top
+        ))
+
+
+if __name__ == "__main__":
+    main()
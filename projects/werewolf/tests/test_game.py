@@ -3,8 +3,8 @@
 
 import pytest
 from werewolf.core.game import Game
-from werewolf.core.enums import GamePhase, Faction, ActionType
-from werewolf.core.events import Action
+from werewolf.core.enums import GamePhase, Faction, ActionType, RoleType, DeathReason
+from werewolf.core.events import Action, GameEvent
 from werewolf.config.presets import GameConfig, PRESET_6P
 
 
@@ -101,6 +101,31 @@ class TestGameFlow:
             assert result.success is True
             assert "is_werewolf" in result.data
 
+    @pytest.mark.asyncio
+    async def test_wolf_target_follows_majority(self, started_game):
+        """狼刀目标随击杀提交更新，女巫看到的是当前多数决"""
+        game = started_game
+        wolf_a, wolf_b = game.get_players_by_role(RoleType.WEREWOLF)
+        witch = game.get_players_by_role(RoleType.WITCH)[0]
+        villagers = [p for p in game.players
+                     if p.role.faction == Faction.VILLAGER and p is not witch]
+        view = game.get_player_view(witch.id)
+        assert view.wolf_target_tonight is None
+
+        await game.submit_action(wolf_a.id, Action(ActionType.KILL, wolf_a.id, villagers[0].id))
+        assert view.wolf_target_tonight == villagers[0].id
+        await game.submit_action(wolf_b.id, Action(ActionType.KILL, wolf_b.id, villagers[1].id))
+        assert game.get_wolf_target() == villagers[0].id  # 平票取先投者
+
+        moderator = game._moderator
+        assert len(moderator.get_actions_by_type(ActionType.KILL)) == 2
+        assert moderator.get_actions_by_actor(wolf_b.id)[0].target_id == villagers[1].id
+        assert game.get_player_view(wolf_a.id).wolf_target_tonight is None
+
+        await game.advance_phase()
+        assert game.get_wolf_target() is None
+        assert moderator.get_actions_by_type(ActionType.KILL) == ()
+
     @pytest.mark.asyncio
     async def test_phase_advance(self, started_game):
         """阶段推进"""
@@ -121,6 +146,32 @@ class TestGameFlow:
         result = await game.advance_phase()
         assert result.next_phase == GamePhase.DAY_VOTE
 
+    @pytest.mark.asyncio
+    async def test_villagers_vote_out_wolf(self, started_game):
+        """白天所有存活玩家都参与投票，多数票处决"""
+        game = started_game
+        await game.advance_phase()  # 全员未行动：平安夜
+        await game.advance_phase()
+        assert game.phase == GamePhase.DAY_VOTE
+        alive = [p.id for p in game.get_alive_players()]
+        assert game.get_active_players() == alive
+
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        villager = next(p for p in game.players if p.role.faction == Faction.VILLAGER)
+        for pid in alive:
+            target = villager.id if game.get_player(pid).role.faction == Faction.WEREWOLF else wolf.id
+            if pid == target:
+                action = Action(ActionType.SKIP, pid)
+            else:
+                action = Action(ActionType.VOTE, pid, target)
+            assert (await game.submit_action(pid, action)).success
+
+        result = await game.advance_phase()
+        assert result.deaths == [wolf.id]
+        assert not wolf.is_alive
+        assert result.next_phase == GamePhase.NIGHT
+        assert game.round == 2
+
 
 class TestPlayerView:
     """玩家视角测试"""
@@ -154,6 +205,70 @@ class TestPlayerView:
 
             assert view.teammates is None
 
+    @pytest.mark.asyncio
+    async def test_visible_history(self):
+        """可见事件索引与逐条过滤结果一致，since 只返回新事件"""
+        game = Game(PRESET_6P, seed=42)
+        await game.setup([f"P{i}" for i in range(6)])
+        await game.start()
+
+        visibility = [[], [0], None, [1, 2], [], [0, 0], None, [2]]
+        for i, visible_to in enumerate(visibility):
+            game.add_event(GameEvent(
+                event_type=GameEvent.PLAYER_ACTION, round_num=1,
+                phase=GamePhase.NIGHT, data={"i": i}, visible_to=visible_to,
+            ))
+
+        for pid in range(6):
+            expected = [
+                e for e in game.history
+                if e.visible_to is not None
+                and (len(e.visible_to) == 0 or pid in e.visible_to)
+            ]
+            assert game.get_player_view(pid).get_visible_history() == expected
+
+        cursor = game.event_cursor
+        game.add_event(GameEvent(
+            event_type=GameEvent.PLAYER_ACTION, round_num=1,
+            phase=GamePhase.NIGHT, visible_to=[0],
+        ))
+        assert game.get_visible_events(0, since=cursor) == game.history[cursor:]
+        assert game.get_visible_events(1, since=cursor) == []
+
+
+class TestPlayerIndexes:
+    """玩家索引测试"""
+
+    @pytest.fixture
+    async def game(self):
+        game = Game(PRESET_6P, seed=42)
+        await game.setup([f"P{i}" for i in range(6)])
+        return game
+
+    @pytest.mark.asyncio
+    async def test_alive_index_tracks_deaths(self, game):
+        wolf = game.get_players_by_faction(Faction.WEREWOLF)[0]
+        assert game.get_alive_count() == 6
+        assert game.get_alive_count(Faction.WEREWOLF) == 2
+
+        wolf.die(DeathReason.VOTE_OUT, 1)
+        wolf.die(DeathReason.VOTE_OUT, 1)  # 重复死亡不重复计数
+
+        assert game.get_alive_count() == 5
+        assert game.get_alive_count(Faction.WEREWOLF) == 1
+        assert game.get_alive_count(Faction.VILLAGER) == 4
+        assert wolf not in game.get_alive_players()
+        assert [p.id for p in game.get_alive_players()] == \
+            [p.id for p in game.players if p.is_alive]
+
+    @pytest.mark.asyncio
+    async def test_players_by_role(self, game):
+        witches = game.get_players_by_role(RoleType.WITCH)
+        assert len(witches) == 1
+        assert witches[0].role.name == "女巫"
+        assert game.get_players_by_role(RoleType.HUNTER) == []
+        assert len(game.get_players_by_role(RoleType.WEREWOLF)) == 2
+
 
 class TestWinCondition:
     """胜利条件测试"""
@@ -200,3 +315,994 @@ class TestWinCondition:
         villager_count = sum(1 for p in alive if p.role.faction == Faction.VILLAGER)
 
         assert wolf_count >= villager_count
+
+
+async def _play_phase(game, agents):
+    """按 GameRunner 的顺序执行一个阶段的行动并推进"""
+    if game.phase in (GamePhase.NIGHT, GamePhase.DAY_VOTE):
+        for player in game.get_alive_players():
+            if game.phase == GamePhase.NIGHT and not player.role.can_act_at_night:
+                continue
+            await game.submit_action(player.id, await agents[player.id].decide_action())
+    return await game.advance_phase()
+
+
+async def _mid_game():
+    """第二晚进行到一半的 9 人局（含未结算的狼刀）"""
+    from werewolf.config.presets import PRESET_9P
+    from werewolf.agents.random_agent import RandomAgent
+
+    game = Game(PRESET_9P, seed=11)
+    await game.setup([f"P{i}" for i in range(9)])
+    await game.start()
+    agents = {p.id: RandomAgent(p.id, game, seed=p.id) for p in game.players}
+    while game.round < 2:
+        await _play_phase(game, agents)
+    for wolf in game.get_players_by_role(RoleType.WEREWOLF):
+        if wolf.is_alive:
+            target = next(p for p in game.get_alive_players() if p.id != wolf.id)
+            await game.submit_action(wolf.id, Action(ActionType.KILL, wolf.id, target.id))
+    return game
+
+
+class TestFork:
+    """对局复制测试"""
+
+    @pytest.fixture
+    async def mid_game(self):
+        return await _mid_game()
+
+    @pytest.mark.asyncio
+    async def test_fork_plays_out_identically(self, mid_game):
+        from werewolf.agents.random_agent import RandomAgent
+
+        fork = mid_game.fork()
+        assert fork.get_wolf_target() == mid_game.get_wolf_target()
+        assert fork.rng.getstate() == mid_game.rng.getstate()
+
+        results = []
+        for game in (mid_game, fork):
+            agents = {p.id: RandomAgent(p.id, game, seed=100 + p.id) for p in game.players}
+            while game.phase != GamePhase.GAME_OVER:
+                await _play_phase(game, agents)
+            results.append((game.get_winner(), game.round,
+                            [(e.event_type, e.data) for e in game.history]))
+        assert results[0] == results[1]
+
+    @pytest.mark.asyncio
+    async def test_fork_is_independent(self, mid_game):
+        original_witch = mid_game.get_players_by_role(RoleType.WITCH)[0]
+        had_poison = original_witch.role.state.has_poison_potion
+        fork = mid_game.fork()
+        witch = fork.get_players_by_role(RoleType.WITCH)[0]
+        witch.role.state.has_poison_potion = not had_poison
+        victim = fork.get_alive_players()[0]
+        victim.die(DeathReason.VOTE_OUT, 2)
+        await fork.advance_phase()
+
+        assert original_witch.role.state.has_poison_potion == had_poison
+        assert mid_game.get_player(victim.id).is_alive
+        assert mid_game.phase == GamePhase.NIGHT
+        assert mid_game.get_wolf_target() is not None
+        assert len(fork.history) > len(mid_game.history)
+
+
+class TestReplay:
+    """行动日志回放测试"""
+
+    @staticmethod
+    def _project(history):
+        return [(e.event_type, e.round_num, e.phase, e.data, e.visible_to) for e in history]
+
+    @pytest.mark.asyncio
+    async def test_replay_matches_original(self):
+        from werewolf.config.presets import PRESET_12P
+        from werewolf.agents.random_agent import RandomAgent
+        from werewolf.core.action_log import ActionLog
+        from werewolf.runner import GameRunner, ReplayRunner
+
+        for seed in range(10):
+            original = await GameRunner(
+                config=PRESET_12P,
+                agent_factory=lambda pid, game: RandomAgent(pid, game, seed=seed + pid),
+                seed=seed,
+                verbose=False,
+            ).run()
+
+            log = ActionLog.from_json(original.action_log.to_json())
+            replayed = await ReplayRunner(PRESET_12P, log).run()
+
+            assert replayed.winner == original.winner
+            assert replayed.rounds == original.rounds
+            assert self._project(replayed.history) == self._project(original.history)
+
+    @pytest.mark.asyncio
+    async def test_replay_unseeded_game(self):
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.agents.random_agent import RandomAgent
+        from werewolf.core.action_log import ActionLog
+        from werewolf.runner import GameRunner, ReplayRunner
+
+        original = await GameRunner(
+            config=PRESET_9P,
+            agent_factory=lambda pid, game: RandomAgent(pid, game, seed=pid),
+            verbose=False,
+        ).run()
+        assert original.action_log.seed is None
+
+        log = ActionLog.from_json(original.action_log.to_json())
+        runner = ReplayRunner(PRESET_9P, log)
+        replayed = await runner.run()
+        assert [p.role.role_type.value for p in runner.game.players] == log.roles
+        assert replayed.winner == original.winner
+        assert self._project(replayed.history) == self._project(original.history)
+
+    @pytest.mark.asyncio
+    async def test_replay_partial_game(self):
+        from werewolf.core.action_log import ActionLog
+        from werewolf.runner import ReplayRunner
+
+        game = Game(PRESET_6P, seed=3)
+        await game.setup([f"P{i}" for i in range(6)])
+        await game.start()
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        target = game.get_players_by_role(RoleType.VILLAGER)[0]
+        await game.submit_action(wolf.id, Action(ActionType.KILL, wolf.id, target.id))
+        await game.advance_phase()
+
+        runner = ReplayRunner(PRESET_6P, ActionLog.from_game(game))
+        await runner.run()
+        assert runner.game.phase == GamePhase.DAY_DISCUSSION
+        assert not runner.game.get_player(target.id).is_alive
+
+    @pytest.mark.asyncio
+    async def test_config_mismatch(self):
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.core.action_log import ActionLog
+        from werewolf.runner import ReplayRunner
+
+        game = Game(PRESET_6P, seed=1)
+        await game.setup([f"P{i}" for i in range(6)])
+        with pytest.raises(ValueError):
+            ReplayRunner(PRESET_9P, ActionLog.from_game(game))
+
+
+class TestGameEvent:
+    """紧凑事件记录测试"""
+
+    def test_dict_shape_and_immutability(self):
+        from werewolf.core.enums import EventType
+
+        event = GameEvent(GameEvent.VOTE_RESULT, 2, GamePhase.DAY_VOTE,
+                          {"votes": {"0": 1}, "eliminated": 1}, visible_to=[])
+        assert event.kind == EventType.VOTE_RESULT
+        assert event.event_type == "vote_result"
+        assert event.data == {"votes": {"0": 1}, "eliminated": 1}
+        assert event.get("eliminated") == 1
+        assert event.visible_to == ()
+
+        event.data["eliminated"] = 5  # 返回的是副本
+        assert event.get("eliminated") == 1
+        with pytest.raises(AttributeError):
+            event.round_num = 3
+
+    def test_payloads_are_interned(self):
+        game, other = Game(PRESET_6P, seed=1), Game(PRESET_6P, seed=2)
+        a = GameEvent(GameEvent.PLAYER_ACTION, 1, GamePhase.NIGHT,
+                      {"player_id": 3, "action": "kill"}, visible_to=[3])
+        b = GameEvent(GameEvent.PLAYER_ACTION, 1, GamePhase.NIGHT,
+                      {"player_id": 3, "action": "kill"}, visible_to=[3])
+        c = GameEvent(GameEvent.PLAYER_ACTION, 1, GamePhase.NIGHT,
+                      {"player_id": 3, "action": "kill"}, visible_to=[3])
+        game.add_event(a)
+        game.add_event(b)
+        other.add_event(c)
+        assert a.payload is b.payload
+        assert a.visible_to is b.visible_to
+        # 驻留表属于对局，不跨对局保留负载
+        assert c.payload == a.payload and c.payload is not a.payload
+        # 结构不同的负载不会被混淆
+        d = GameEvent(GameEvent.GAME_END, 1, GamePhase.GAME_OVER, {"x": []})
+        e = GameEvent(GameEvent.GAME_END, 1, GamePhase.GAME_OVER, {"x": {}})
+        game.add_event(d)
+        game.add_event(e)
+        assert d.data == {"x": []} and e.data == {"x": {}}
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+
+        game = Game(PRESET_6P, seed=1)
+        for _ in range(2):
+            game.add_event(GameEvent(GameEvent.PLAYER_DEATH, 1, GamePhase.NIGHT,
+                                     {"player_id": 2, "reason": "wolf_kill"}))
+        event = game.history[0]
+        assert copy.deepcopy(event) is event
+        restored = pickle.loads(pickle.dumps(game.history))
+        assert restored == game.history
+        assert restored[0].payload is restored[1].payload
+
+    def test_timestamp_survives_other_process(self):
+        """其他进程序列化的事件恢复后仍是正确的墙上时间"""
+        import pickle
+        import subprocess
+        import sys
+        import time
+        from datetime import datetime, timedelta
+
+        code = (
+            "import pickle, sys\n"
+            "from werewolf.core.events import GameEvent\n"
+            "from werewolf.core.enums import GamePhase\n"
+            "event = GameEvent(GameEvent.GAME_START, 0, GamePhase.INIT)\n"
+            "sys.stdout.buffer.write(pickle.dumps(event))\n"
+        )
+        data = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, check=True
+        ).stdout
+        event = pickle.loads(data)
+        # 持久化的是 Unix 时间，不依赖本次开机的单调时钟起点
+        assert abs(event.ts_ns - time.time_ns()) < 30 * 10**9
+        assert abs(event.timestamp - datetime.now()) < timedelta(seconds=30)
+
+    def test_custom_event_type(self):
+        import pickle
+
+        game = Game(PRESET_6P, seed=1)
+        received = []
+        game.bus.subscribe(received.append, topics=["sheriff_elected"])
+        event = GameEvent("sheriff_elected", 1, GamePhase.DAY_DISCUSSION, {"player_id": 4})
+        game.add_event(event)
+        assert event.event_type == "sheriff_elected" and event.kind == "sheriff_elected"
+        assert received == [event]
+        assert pickle.loads(pickle.dumps(event)) == event
+
+
+class TestEventBus:
+    """事件总线测试"""
+
+    @pytest.mark.asyncio
+    async def test_sync_subscriber_with_topics(self):
+        from werewolf.core.enums import EventType
+        from werewolf.agents.random_agent import RandomAgent
+
+        game = Game(PRESET_6P, seed=5)
+        await game.setup([f"P{i}" for i in range(6)])
+        deaths, everything = [], []
+        game.bus.subscribe(deaths.append, topics=[EventType.PLAYER_DEATH])
+        sub = game.bus.subscribe(everything.append)
+
+        await game.start()
+        agents = {p.id: RandomAgent(p.id, game, seed=p.id) for p in game.players}
+        while game.phase != GamePhase.GAME_OVER:
+            await _play_phase(game, agents)
+
+        assert everything == game.history
+        assert deaths == [e for e in game.history if e.event_type == GameEvent.PLAYER_DEATH]
+
+        sub.close()
+        game.add_event(GameEvent(GameEvent.GAME_END, game.round, game.phase))
+        assert len(everything) == len(game.history) - 1
+
+    @pytest.mark.asyncio
+    async def test_async_handler_and_bounded_queue(self):
+        from werewolf.core.event_bus import EventBus
+
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            received.append(event.round_num)
+
+        bus.subscribe(handler)
+        queue = bus.subscribe(maxsize=2)
+        for i in range(5):
+            bus.publish(GameEvent(GameEvent.PHASE_CHANGE, i, GamePhase.NIGHT))
+
+        await bus.drain()
+        assert received == [0, 1, 2, 3, 4]
+        # 队列满时丢弃最旧的事件
+        assert queue.dropped == 3
+        assert (await queue.get()).round_num == 3
+        assert queue.get_nowait().round_num == 4
+        assert queue.get_nowait() is None
+        bus.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_subscriber_does_not_break_game(self):
+        game = Game(PRESET_6P, seed=1)
+        await game.setup([f"P{i}" for i in range(6)])
+
+        def boom(event):
+            raise RuntimeError("boom")
+
+        game.bus.subscribe(boom)
+        await game.start()
+        assert game.phase == GamePhase.NIGHT
+
+
+class TestPhaseScheduler:
+    """阶段表调度测试"""
+
+    async def _game(self, **rules):
+        from werewolf.config.presets import PRESET_9P
+        config = GameConfig(name="9p", roles=PRESET_9P.roles, rules={**PRESET_9P.rules, **rules})
+        game = Game(config, seed=3)
+        await game.setup([f"P{i}" for i in range(9)])
+        await game.start()
+        return game
+
+    async def _kill(self, game, target_id):
+        """所有狼人刀 target_id（None 表示空刀），其余夜间角色跳过"""
+        for pid in game.get_active_players():
+            player = game.get_player(pid)
+            if target_id is not None and player.role.role_type == RoleType.WEREWOLF:
+                action = Action(ActionType.KILL, actor_id=pid, target_id=target_id)
+            else:
+                action = Action(ActionType.SKIP, actor_id=pid)
+            assert (await game.submit_action(pid, action)).success
+        return await game.advance_phase()
+
+    def _idle_vote(self, game):
+        """把投票阶段替换为没有行动者的阶段"""
+        from werewolf.engine.moderator import Moderator
+        from werewolf.engine.scheduler import PhaseSpec
+        game._moderator.scheduler.register(
+            PhaseSpec(GamePhase.DAY_VOTE, Moderator._resolve_vote, actors=lambda m: [])
+        )
+
+    @pytest.mark.asyncio
+    async def test_vote_phase_not_idle(self):
+        game = await self._game()
+        await self._kill(game, None)
+        result = await game.advance_phase()
+
+        assert result.skipped == []
+        assert game.phase == GamePhase.DAY_VOTE
+        assert game.get_active_players() == [p.id for p in game.get_alive_players()]
+
+    @pytest.mark.asyncio
+    async def test_idle_phase_skipped(self):
+        game = await self._game()
+        self._idle_vote(game)
+        await self._kill(game, None)
+        result = await game.advance_phase()
+
+        assert result.skipped == [GamePhase.DAY_VOTE]
+        assert game.phase == GamePhase.NIGHT
+        assert game.round == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_phase_kept_when_disabled(self):
+        game = await self._game(skip_idle_phases=False)
+        self._idle_vote(game)
+        await self._kill(game, None)
+        result = await game.advance_phase()
+
+        assert result.skipped == []
+        assert game.phase == GamePhase.DAY_VOTE
+        assert game.get_active_players() == []
+
+    @pytest.mark.asyncio
+    async def test_hunter_shot_phase(self):
+        game = await self._game(hunter_shot_phase=True)
+        hunter = game.get_players_by_role(RoleType.HUNTER)[0]
+        victim = next(p for p in game.get_players_by_role(RoleType.VILLAGER))
+
+        result = await self._kill(game, hunter.id)
+        assert result.next_phase == GamePhase.HUNTER_SHOT
+        assert game.get_active_players() == [hunter.id]
+
+        shot = Action(ActionType.SHOOT, actor_id=hunter.id, target_id=victim.id)
+        assert (await game.submit_action(hunter.id, shot)).success
+        result = await game.advance_phase()
+
+        assert result.deaths == [victim.id]
+        assert victim.death_reason == DeathReason.HUNTER_SHOT
+        assert game.phase == GamePhase.DAY_DISCUSSION
+        assert game.round == 1
+        assert not game._moderator.is_hunter_pending()
+
+    @pytest.mark.asyncio
+    async def test_hunter_phase_not_entered_without_hunter_death(self):
+        game = await self._game(hunter_shot_phase=True)
+        villager = game.get_players_by_role(RoleType.VILLAGER)[0]
+
+        result = await self._kill(game, villager.id)
+        assert result.next_phase == GamePhase.DAY_DISCUSSION
+
+    def test_simulators_reject_custom_phase_rules(self):
+        from werewolf.sim import FastGame
+        config = GameConfig(name="hunter", roles=PRESET_6P.roles, rules={"hunter_shot_phase": True})
+        with pytest.raises(ValueError):
+            FastGame(config)
+
+
+class TestCheckpoint:
+    """对局检查点测试"""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_plays_out_identically(self):
+        from werewolf.core.checkpoint import Checkpoint
+        from werewolf.agents.random_agent import RandomAgent
+
+        game = await _mid_game()
+        agents = {p.id: RandomAgent(p.id, game, seed=100 + p.id) for p in game.players}
+        data = Checkpoint.capture(game, agents, note="mid").to_bytes()
+
+        checkpoint = Checkpoint.from_bytes(data)
+        restored = checkpoint.game
+        assert checkpoint.extra == {"note": "mid"}
+        assert restored.get_wolf_target() == game.get_wolf_target()
+        assert restored.rng.getstate() == game.rng.getstate()
+        assert not restored.bus.has_subscribers
+
+        restored_agents = {p.id: RandomAgent(p.id, restored, seed=0) for p in restored.players}
+        checkpoint.restore_agents(restored_agents)
+
+        results = []
+        for g, a in ((game, agents), (restored, restored_agents)):
+            while g.phase != GamePhase.GAME_OVER:
+                await _play_phase(g, a)
+            results.append((g.get_winner(), g.round, g.get_alive_count(),
+                            [(e.event_type, e.data) for e in g.history]))
+        assert results[0] == results[1]
+
+    def test_rejects_invalid_data(self):
+        from werewolf.core.checkpoint import Checkpoint, CheckpointError, _HEADER
+
+        with pytest.raises(CheckpointError):
+            Checkpoint.from_bytes(b"WW")
+        with pytest.raises(CheckpointError):
+            Checkpoint.from_bytes(b"XXXX" + bytes(_HEADER.size))
+
+        data = bytearray(Checkpoint(game=Game(PRESET_6P, seed=1)).to_bytes())
+        data[-1] ^= 0xFF
+        with pytest.raises(CheckpointError):
+            Checkpoint.from_bytes(bytes(data))
+
+    @pytest.mark.asyncio
+    async def test_runner_resume_matches_uninterrupted_run(self, tmp_path):
+        from werewolf.core.checkpoint import Checkpoint
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.agents.random_agent import RandomAgent
+        from werewolf.runner.game_runner import GameRunner
+
+        saved = []
+
+        class RecordingRunner(GameRunner):
+            def _save_checkpoint(self, game, agents, result):
+                super()._save_checkpoint(game, agents, result)
+                saved.append(Checkpoint.capture(
+                    game, agents, speeches=result.speeches, agent_logs=result.agent_logs,
+                ).to_bytes())
+
+        def factory(pid, game):
+            return RandomAgent(pid, game, seed=7 + pid)
+
+        path = str(tmp_path / "game.ckpt")
+        reference = await RecordingRunner(
+            PRESET_9P, factory, seed=7, verbose=False, checkpoint_path=path,
+        ).run()
+        assert len(saved) >= 3
+        assert Checkpoint.load(path).game.round == reference.rounds
+
+        checkpoint = Checkpoint.from_bytes(saved[len(saved) // 2])
+        resumed = await GameRunner(PRESET_9P, factory, verbose=False).resume(checkpoint)
+
+        assert resumed.winner == reference.winner
+        assert resumed.rounds == reference.rounds
+        assert [(e.event_type, e.data) for e in resumed.history] == \
+            [(e.event_type, e.data) for e in reference.history]
+        assert resumed.speeches == reference.speeches
+        assert resumed.agent_logs == reference.agent_logs
+
+    @pytest.mark.asyncio
+    async def test_web_service_resumes_checkpoint(self, tmp_path, monkeypatch):
+        import asyncio
+        from werewolf.core.checkpoint import Checkpoint
+        from werewolf.config.settings import get_settings
+        from web.backend.services.game_service import GameService
+
+        monkeypatch.setattr(get_settings().game, "checkpoint_dir", str(tmp_path))
+        game = await _mid_game()
+        Checkpoint.capture(
+            game, {}, game_id="g1", mode="ai_vs_ai", ai_provider="heuristic", speed=1000.0,
+        ).save(str(tmp_path / "g1.ckpt"))
+
+        service = GameService()
+        sessions = await service.resume_checkpoints()
+        assert [s.game_id for s in sessions] == ["g1"]
+        session = await service.get_session("g1")
+        assert session.game.round == 2 and session.status == "running"
+        subscription = session.subscription
+
+        await asyncio.wait_for(session.runner_task, timeout=30)
+        assert session.status == "finished"
+        assert session.game.get_winner() is not None
+        assert not (tmp_path / "g1.ckpt").exists()
+        # 对局结束后关闭事件订阅，转发任务不再持有会话
+        await asyncio.sleep(0)
+        assert session.subscription is None and subscription.closed and subscription._task.done()
+
+    @pytest.mark.asyncio
+    async def test_web_service_delete_closes_subscription(self, tmp_path, monkeypatch):
+        import asyncio
+        from werewolf.core.checkpoint import Checkpoint
+        from werewolf.config.settings import get_settings
+        from web.backend.services.game_service import GameService
+
+        monkeypatch.setattr(get_settings().game, "checkpoint_dir", str(tmp_path))
+        Checkpoint.capture(
+            await _mid_game(), {}, game_id="g2", mode="ai_vs_ai", ai_provider="heuristic", speed=0.1,
+        ).save(str(tmp_path / "g2.ckpt"))
+
+        service = GameService()
+        session, = await service.resume_checkpoints()
+        subscription = session.subscription
+        await asyncio.sleep(0)
+
+        assert await service.delete_game("g2")
+        assert await service.get_session("g2") is None
+        await asyncio.gather(session.runner_task, return_exceptions=True)
+        assert session.runner_task.done()
+        assert session.subscription is None and subscription.closed and subscription._task.done()
+        assert not await service.delete_game("g2")
+
+
+class TestLegalActions:
+    """合法行动掩码测试"""
+
+    @staticmethod
+    def _assert_matches_validation(game):
+        """掩码与角色默认推导（逐个调用 validate_action）一致"""
+        for player in game.players:
+            expected = player.role.derive_legal_actions(player, game)
+            assert game.get_legal_actions(player.id) == expected, player.role.name
+
+    @pytest.mark.asyncio
+    async def test_masks_match_validation(self):
+        from werewolf.config.presets import PRESET_9P, PRESET_12P
+        from werewolf.agents.random_agent import RandomAgent
+
+        for config in (PRESET_9P, PRESET_12P):
+            for seed in range(5):
+                game = Game(config, seed=seed)
+                await game.setup([f"P{i}" for i in range(config.player_count)])
+                await game.start()
+                agents = {p.id: RandomAgent(p.id, game, seed=seed * 100 + p.id)
+                          for p in game.players}
+                while game.phase != GamePhase.GAME_OVER:
+                    self._assert_matches_validation(game)
+                    for pid in game.get_active_players():
+                        await game.submit_action(pid, await agents[pid].decide_action())
+                        self._assert_matches_validation(game)
+                    await game.advance_phase()
+
+    @staticmethod
+    async def _night(config, seed=5):
+        game = Game(config, seed=seed)
+        await game.setup([f"P{i}" for i in range(config.player_count)])
+        await game.start()
+        return game
+
+    @pytest.mark.asyncio
+    async def test_submit_rejects_outside_mask(self):
+        from werewolf.config.presets import PRESET_12P
+        game = await self._night(PRESET_12P)
+        guard = game.get_players_by_role(RoleType.GUARD)[0]
+        villager = game.get_players_by_role(RoleType.VILLAGER)[0]
+        target = next(p for p in game.get_alive_players() if p.id != guard.id)
+        guard.role.last_protected_id = target.id
+        game.invalidate_legal_actions(guard.id)
+
+        assert not game.get_legal_actions(guard.id).allows(ActionType.PROTECT, target.id)
+        result = await game.submit_action(
+            guard.id, Action(ActionType.PROTECT, guard.id, target.id)
+        )
+        assert not result.success
+        assert "连续" in result.message
+
+        # 平民夜间没有合法行动
+        assert not game.get_legal_actions(villager.id)
+        result = await game.submit_action(villager.id, Action(ActionType.SKIP, villager.id))
+        assert not result.success
+
+    @pytest.mark.asyncio
+    async def test_day_vote_mask(self):
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.core.legal import ActionMask, UNTARGETED
+        game = await self._night(PRESET_9P)
+        victim = game.get_players_by_role(RoleType.VILLAGER)[0]
+        for wolf in game.get_players_by_role(RoleType.WEREWOLF):
+            await game.submit_action(wolf.id, Action(ActionType.KILL, wolf.id, victim.id))
+        await game.advance_phase()
+        await game.advance_phase()
+        assert game.phase == GamePhase.DAY_VOTE
+
+        for player in game.get_alive_players():
+            assert game.get_legal_actions(player.id) == ActionMask({
+                ActionType.VOTE: game.alive_mask & ~(1 << player.id),
+                ActionType.SKIP: UNTARGETED,
+            }), player.role.name
+        assert not game.get_legal_actions(victim.id)
+
+        villager = game.get_players_by_role(RoleType.VILLAGER)[1]
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        assert (await game.submit_action(villager.id, Action(ActionType.VOTE, villager.id, wolf.id))).success
+        result = await game.submit_action(wolf.id, Action(ActionType.VOTE, wolf.id, wolf.id))
+        assert not result.success and "自己" in result.message
+        result = await game.submit_action(wolf.id, Action(ActionType.KILL, wolf.id, villager.id))
+        assert not result.success
+        result = await game.submit_action(victim.id, Action(ActionType.VOTE, victim.id, wolf.id))
+        assert not result.success
+
+    @pytest.mark.asyncio
+    async def test_witch_save_follows_wolf_target(self):
+        from werewolf.config.presets import PRESET_9P
+
+        for kill_witch in (True, False):
+            game = await self._night(PRESET_9P)
+            witch = game.get_players_by_role(RoleType.WITCH)[0]
+            victim = witch if kill_witch else next(
+                p for p in game.get_players_by_faction(Faction.VILLAGER) if p.id != witch.id
+            )
+            assert not game.get_legal_actions(witch.id).allows(ActionType.SAVE)
+
+            for wolf in game.get_players_by_role(RoleType.WEREWOLF):
+                await game.submit_action(wolf.id, Action(ActionType.KILL, wolf.id, victim.id))
+
+            # 狼刀是女巫自己时不能自救
+            legal = game.get_player_view(witch.id).legal_actions
+            assert legal.allows(ActionType.SAVE) != kill_witch
+            if not kill_witch:
+                assert legal.action_types == [ActionType.SKIP, ActionType.SAVE, ActionType.POISON]
+
+    @pytest.mark.asyncio
+    async def test_mask_cached_per_phase(self):
+        game = await _mid_game()
+        seer = game.get_players_by_role(RoleType.SEER)[0]
+        mask = game.get_legal_actions(seer.id)
+        assert game.get_legal_actions(seer.id) is mask
+
+        victim = next(p for p in game.get_alive_players() if p.id != seer.id)
+        assert mask.allows(ActionType.CHECK, victim.id)
+        victim.die(DeathReason.VOTE_OUT, game.round)
+
+        assert not game.alive_mask & (1 << victim.id)
+        assert not game.get_legal_actions(seer.id).allows(ActionType.CHECK, victim.id)
+        assert not game.get_legal_actions(seer.id).allows(ActionType.CHECK, seer.id)
+
+
+class TestHeuristicAgent:
+    """规则 Agent 测试"""
+
+    @staticmethod
+    async def _game(config, seed=0):
+        from werewolf.agents.heuristic_agent import HeuristicAgent
+        game = Game(config, seed=seed)
+        await game.setup([f"P{i}" for i in range(config.player_count)])
+        await game.start()
+        agents = {p.id: HeuristicAgent(p.id, game, seed=seed + p.id) for p in game.players}
+        return game, agents
+
+    @pytest.mark.asyncio
+    async def test_full_games_submit_only_legal_actions(self):
+        from werewolf.config.presets import PRESET_9P, PRESET_12P
+        from werewolf.runner import GameRunner
+        from werewolf.agents.heuristic_agent import HeuristicAgent
+
+        class StrictRunner(GameRunner):
+            async def _run_actions(self, game, agents, result):
+                for pid in game.get_active_players():
+                    action = await agents[pid].decide_action()
+                    outcome = await game.submit_action(pid, action)
+                    assert outcome.success, (action, outcome.message)
+                    agents[pid].on_action_result(action, outcome)
+
+        for config in (PRESET_6P, PRESET_9P, PRESET_12P):
+            for seed in range(5):
+                result = await StrictRunner(
+                    config, lambda pid, game, s=seed: HeuristicAgent(pid, game, seed=s + pid),
+                    seed=seed, verbose=False,
+                ).run()
+                assert result.winner is not None
+
+    @pytest.mark.asyncio
+    async def test_wolves_agree_on_target(self):
+        from werewolf.config.presets import PRESET_12P
+        game, agents = await self._game(PRESET_12P, seed=4)
+        wolves = game.get_players_by_role(RoleType.WEREWOLF)
+        targets = {(await agents[w.id].decide_action()).target_id for w in wolves}
+
+        assert len(targets) == 1
+        target = targets.pop()
+        assert game.get_player(target).role.faction == Faction.VILLAGER
+
+    @pytest.mark.asyncio
+    async def test_seer_claim_shapes_suspicion(self):
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.runner.game_runner import GameRunner, GameResult
+
+        game, agents = await self._game(PRESET_9P, seed=2)
+        seer = game.get_players_by_role(RoleType.SEER)[0]
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        check = Action(ActionType.CHECK, seer.id, wolf.id)
+        agents[seer.id].on_action_result(check, await game.submit_action(seer.id, check))
+        for pid in game.get_active_players():
+            if pid != seer.id:
+                await game.submit_action(pid, Action(ActionType.SKIP, pid))
+        await game.advance_phase()
+
+        await GameRunner(PRESET_9P, None, verbose=False)._run_discussion(
+            game, agents, GameResult()
+        )
+        villager = next(p for p in game.get_players_by_faction(Faction.VILLAGER)
+                        if p.id != seer.id)
+        assert agents[villager.id].seer_claims[seer.id] == {wolf.id: True}
+        assert agents[villager.id]._score(wolf.id) > 0
+
+        # 状态随检查点保存与恢复
+        from werewolf.agents.heuristic_agent import HeuristicAgent
+        restored = HeuristicAgent(villager.id, game)
+        restored.load_state(agents[villager.id].get_state())
+        assert restored.get_state() == agents[villager.id].get_state()
+
+
+class TestBeliefTracker:
+    """身份推断测试"""
+
+    @staticmethod
+    async def _game(config, seed=0):
+        game = Game(config, seed=seed)
+        await game.setup([f"P{i}" for i in range(config.player_count)])
+        await game.start()
+        return game
+
+    @pytest.mark.asyncio
+    async def test_exact_marginals(self):
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.agents.belief import BeliefTracker
+
+        game = await self._game(PRESET_9P, seed=1)
+        seer = game.get_players_by_role(RoleType.SEER)[0]
+        tracker = BeliefTracker.from_view(game.get_player_view(seer.id))
+        assert tracker.exact
+        assert tracker.wolf_prob(seer.id) == 0
+        assert sum(tracker.wolf_probs().values()) == pytest.approx(3)
+
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        tracker.observe_faction(wolf.id, True)
+        assert tracker.wolf_prob(wolf.id) == pytest.approx(1)
+        assert tracker.most_likely_wolves()[0] == wolf.id
+        assert sum(tracker.wolf_probs().values()) == pytest.approx(3)
+
+    @pytest.mark.asyncio
+    async def test_wolf_view_knows_team(self):
+        from werewolf.config.presets import PRESET_12P
+        from werewolf.agents.belief import BeliefTracker
+
+        game = await self._game(PRESET_12P, seed=3)
+        wolves = {p.id for p in game.get_players_by_role(RoleType.WEREWOLF)}
+        tracker = BeliefTracker.from_view(game.get_player_view(min(wolves)))
+        assert tracker.exact
+        for pid, prob in tracker.wolf_probs().items():
+            assert prob == pytest.approx(1.0 if pid in wolves else 0.0)
+
+    @pytest.mark.asyncio
+    async def test_particles_for_large_presets(self):
+        import random
+        from werewolf.config.presets import PRESET_12P
+        from werewolf.agents.belief import BeliefTracker
+
+        game = await self._game(PRESET_12P, seed=3)
+        seer = game.get_players_by_role(RoleType.SEER)[0]
+        tracker = BeliefTracker.from_view(game.get_player_view(seer.id), seed=0)
+        assert not tracker.exact
+        assert tracker.size == tracker.n_particles
+
+        target = next(p.id for p in game.players if p.id != seer.id)
+        tracker.observe_faction(target, False)
+        rng = random.Random(0)
+        for _ in range(50):
+            assignment = tracker.sample(rng)
+            assert assignment[seer.id] == RoleType.SEER
+            assert assignment[target] != RoleType.WEREWOLF
+            assert sorted(r.value for r in assignment) == sorted(RoleType(r).value for r in PRESET_12P.roles)
+
+    def test_seer_claim_and_state_roundtrip(self):
+        from werewolf.agents.belief import BeliefTracker
+
+        roles = [RoleType.WEREWOLF, RoleType.WEREWOLF, RoleType.SEER,
+                 RoleType.VILLAGER, RoleType.VILLAGER, RoleType.VILLAGER]
+        tracker = BeliefTracker(roles, 5, RoleType.VILLAGER, seed=0)
+        before = tracker.wolf_prob(3)
+        tracker.observe_seer_claim(1, {3: True})
+        assert tracker.wolf_prob(3) > before
+        assert tracker.role_probs(1)[RoleType.SEER] > 1 / 5
+
+        # 重复公布同一结果不重复计入
+        probs = tracker.wolf_probs()
+        tracker.observe_seer_claim(1, {3: True})
+        assert tracker.wolf_probs() == probs
+
+        tracker.observe_death(4, at_night=True)
+        restored = BeliefTracker(roles, 5, RoleType.VILLAGER)
+        restored.load_state(tracker.get_state())
+        assert restored.wolf_probs() == pytest.approx(tracker.wolf_probs())
+
+
+class TestISMCTSAgent:
+    """搜索 Agent 测试"""
+
+    @pytest.mark.asyncio
+    async def test_full_games_submit_only_legal_actions(self):
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.runner import GameRunner
+        from werewolf.agents.ismcts_agent import ISMCTSAgent
+
+        class StrictRunner(GameRunner):
+            async def _run_actions(self, game, agents, result):
+                for pid in game.get_active_players():
+                    action = await agents[pid].decide_action()
+                    outcome = await game.submit_action(pid, action)
+                    assert outcome.success, (action, outcome.message)
+                    agents[pid].on_action_result(action, outcome)
+
+        for config in (PRESET_6P, PRESET_9P):
+            for seed in range(2):
+                result = await StrictRunner(
+                    config,
+                    lambda pid, game, s=seed: ISMCTSAgent(pid, game, seed=s + pid, iterations=50),
+                    seed=seed, verbose=False,
+                ).run()
+                assert result.winner is not None
+
+    @pytest.mark.asyncio
+    async def test_wolf_does_not_kill_teammate(self):
+        from werewolf.agents.ismcts_agent import ISMCTSAgent
+
+        game = Game(PRESET_6P, seed=0)
+        await game.setup([f"P{i}" for i in range(6)])
+        await game.start()
+        wolves = {p.id for p in game.get_players_by_role(RoleType.WEREWOLF)}
+        agent = ISMCTSAgent(min(wolves), game, seed=0, iterations=600)
+        action = await agent.decide_action()
+        assert action.action_type == ActionType.KILL
+        assert action.target_id not in wolves
+
+    @pytest.mark.asyncio
+    async def test_state_includes_beliefs(self):
+        from werewolf.agents.ismcts_agent import ISMCTSAgent
+
+        game = Game(PRESET_6P, seed=1)
+        await game.setup([f"P{i}" for i in range(6)])
+        await game.start()
+        seer = game.get_players_by_role(RoleType.SEER)[0]
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        agent = ISMCTSAgent(seer.id, game, seed=0, iterations=20)
+        check = Action(ActionType.CHECK, seer.id, wolf.id)
+        agent.on_action_result(check, await game.submit_action(seer.id, check))
+        assert agent.beliefs.wolf_prob(wolf.id) == pytest.approx(1)
+
+        restored = ISMCTSAgent(seer.id, game)
+        restored.load_state(agent.get_state())
+        assert restored.beliefs.wolf_prob(wolf.id) == pytest.approx(1)
+
+
+class TestPolicyAgent:
+    """线性策略 Agent 测试"""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        self.np = pytest.importorskip("numpy")
+        from werewolf.agents import policy_agent
+        self.mod = policy_agent
+
+    @pytest.mark.asyncio
+    async def test_features_and_legal_choice(self):
+        mod = self.mod
+        game = Game(PRESET_6P, seed=0)
+        await game.setup([f"P{i}" for i in range(6)])
+        await game.start()
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0]
+        agent = mod.PolicyAgent(wolf.id, game, seed=0, record=True)
+        view = agent.get_view()
+        moves = view.legal_actions.moves()
+        agent._sync(view)
+        features = agent.features(view, moves)
+        assert features.shape == (len(moves), mod.FEATURE_DIM)
+
+        action = await agent.decide_action()
+        assert view.legal_actions.allows(action.action_type, action.target_id)
+        assert len(agent.decisions) == 1
+
+    @pytest.mark.asyncio
+    async def test_training_learns_not_to_kill_teammates(self, tmp_path):
+        mod = self.mod
+        policy = await mod.train_self_play(PRESET_6P, games=300, batch_size=30, lr=1.0)
+        wolf = mod.ROLES.index(RoleType.WEREWOLF)
+        known_wolf = mod.FEATURE_NAMES.index("target_known_wolf")
+        assert policy.weights[wolf, known_wolf] < 0
+
+        path = tmp_path / "policy.npz"
+        policy.save(path)
+        loaded = mod.LinearPolicy.load(path)
+        assert self.np.array_equal(loaded.weights, policy.weights)
+
+    def test_load_rejects_mismatched_features(self, tmp_path):
+        np = self.np
+        path = tmp_path / "bad.npz"
+        np.savez(path, weights=np.zeros((6, 3)), feature_names=np.array(["a", "b", "c"]),
+                 roles=np.array([r.value for r in RoleType]))
+        with pytest.raises(ValueError):
+            self.mod.LinearPolicy.load(path)
+
+
+class TestAgentPool:
+    """Agent 复用测试"""
+
+    @staticmethod
+    def _project(history):
+        return [(e.event_type, e.round_num, e.phase, e.data) for e in history]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("agent", ["random", "heuristic"])
+    async def test_pooled_games_match_fresh_agents(self, agent):
+        from werewolf.config.presets import PRESET_12P
+        from werewolf.agents.random_agent import RandomAgent
+        from werewolf.agents.heuristic_agent import HeuristicAgent
+        from werewolf.runner import AgentPool, GameRunner
+
+        cls = {"random": RandomAgent, "heuristic": HeuristicAgent}[agent]
+        pool = AgentPool(lambda pid, game: cls(pid, game, seed=game.seed + pid))
+        for seed in range(6):
+            fresh = await GameRunner(
+                PRESET_12P, lambda pid, game, s=seed: cls(pid, game, seed=s + pid),
+                seed=seed, verbose=False,
+            ).run()
+            pooled = await GameRunner(PRESET_12P, pool, seed=seed, verbose=False).run()
+            assert pooled.winner == fresh.winner
+            assert pooled.speeches == fresh.speeches
+            assert self._project(pooled.history) == self._project(fresh.history)
+
+        assert pool.created == PRESET_12P.player_count
+        assert pool.reused == PRESET_12P.player_count * 5
+
+    @pytest.mark.asyncio
+    async def test_rebind_moves_subscription_to_new_game(self):
+        from werewolf.agents.heuristic_agent import HeuristicAgent
+
+        old = Game(PRESET_6P, seed=0)
+        await old.setup([f"P{i}" for i in range(6)])
+        agent = HeuristicAgent(2, old, seed=0)
+        agent.suspicion[3] = 1.0
+        assert old.bus.has_subscribers
+
+        new = Game(PRESET_6P, seed=1)
+        await new.setup([f"P{i}" for i in range(6)])
+        agent.rebind(new, 4, seed=5)
+        assert not old.bus.has_subscribers
+        assert new.bus.has_subscribers
+        assert (agent.player_id, agent.name, agent.suspicion) == (4, "HeuristicBot_4", {})
+
+    @pytest.mark.asyncio
+    async def test_pool_groups_by_key(self):
+        from werewolf.agents.random_agent import RandomAgent
+        from werewolf.runner import AgentPool
+
+        game = Game(PRESET_6P, seed=0)
+        await game.setup([f"P{i}" for i in range(6)])
+        pool = AgentPool(lambda pid, game: RandomAgent(pid, game),
+                         key=lambda pid, game: game.get_player(pid).role.faction)
+        first = {p.id: pool(p.id, game) for p in game.players}
+        factions = {id(a): game.get_player(pid).role.faction for pid, a in first.items()}
+        pool.release(first)
+
+        game = Game(PRESET_6P, seed=1)
+        await game.setup([f"P{i}" for i in range(6)])
+        second = {p.id: pool(p.id, game) for p in game.players}
+        assert pool.created == 6 and pool.reused == 6
+        for pid, agent in second.items():
+            assert agent.player_id == pid and agent.game is game
+            assert factions[id(agent)] == game.get_player(pid).role.faction
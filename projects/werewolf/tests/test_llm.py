@@ -2,7 +2,7 @@
 """测试 LLM 客户端和工具"""
 
 import pytest
-from werewolf.llm.base import Message, ToolCall, ToolDefinition, LLMResponse
+from werewolf.llm.base import BaseLLMClient, Message, ToolCall, ToolDefinition, LLMResponse
 from werewolf.llm.tools import WEREWOLF_TOOLS, get_tool_definitions
 
 
@@ -166,3 +166,713 @@ class TestWerewolfTools:
         assert "enum" in action_type_def
         assert "vote" in action_type_def["enum"]
         assert "kill" in action_type_def["enum"]
+
+
+class ScriptedLLM(BaseLLMClient):
+    """按脚本返回 submit_action 的假客户端（记录调用次数）"""
+
+    def __init__(self, decide):
+        super().__init__(model="scripted")
+        self.decide = decide
+        self.calls = 0
+        self.prompts = []
+
+    async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+        self.calls += 1
+        self.prompts.append(messages[-1].content)
+        action_type, target = self.decide(messages)
+        return LLMResponse(tool_calls=[ToolCall(
+            id=f"call_{self.calls}", name="submit_action",
+            arguments={"action_type": action_type, "target_id": target},
+        )], finish_reason="tool_calls")
+
+
+class TestWolfPack:
+    """狼队联合决策测试"""
+
+    @staticmethod
+    async def _night_game():
+        from werewolf.core.game import Game
+        from werewolf.config.presets import PRESET_9P
+        game = Game(PRESET_9P, seed=0)
+        await game.setup([f"P{i}" for i in range(9)])
+        await game.start()
+        return game
+
+    @pytest.mark.asyncio
+    async def test_single_call_for_the_pack(self):
+        from werewolf.agents import LLMAgent, WolfPack
+        from werewolf.core.enums import ActionType, RoleType, Faction
+
+        game = await self._night_game()
+        wolves = [p.id for p in game.get_players_by_role(RoleType.WEREWOLF)]
+        victim = game.get_players_by_faction(Faction.VILLAGER)[0].id
+        client = ScriptedLLM(lambda messages: ("kill", victim))
+        pack = WolfPack()
+        agents = [LLMAgent(pid, game, client, pack=pack) for pid in wolves]
+
+        actions = [await agent.decide_action() for agent in agents]
+        assert client.calls == 1
+        assert "狼队联合决策" in client.prompts[0]
+        assert [a.actor_id for a in actions] == wolves
+        assert {(a.action_type, a.target_id) for a in actions} == {(ActionType.KILL, victim)}
+        for pid, action in zip(wolves, actions):
+            assert (await game.submit_action(pid, action)).success
+        assert game.get_wolf_target() == victim
+
+    @pytest.mark.asyncio
+    async def test_without_pack_each_wolf_decides(self):
+        from werewolf.agents import LLMAgent
+        from werewolf.core.enums import RoleType, Faction
+
+        game = await self._night_game()
+        wolves = [p.id for p in game.get_players_by_role(RoleType.WEREWOLF)]
+        victim = game.get_players_by_faction(Faction.VILLAGER)[0].id
+        client = ScriptedLLM(lambda messages: ("kill", victim))
+        for pid in wolves:
+            await LLMAgent(pid, game, client).decide_action()
+        assert client.calls == len(wolves)
+
+    @pytest.mark.asyncio
+    async def test_invalid_pack_decision_falls_back(self):
+        from werewolf.agents import LLMAgent, WolfPack
+        from werewolf.core.enums import ActionType, RoleType, Faction
+
+        game = await self._night_game()
+        wolf = game.get_players_by_role(RoleType.WEREWOLF)[0].id
+        victim = game.get_players_by_faction(Faction.VILLAGER)[0].id
+        # 队长对话提交非击杀行动（不被接受），单独决策时击杀
+        client = ScriptedLLM(
+            lambda messages: ("check", victim) if "狼队联合决策" in messages[-1].content
+            else ("kill", victim)
+        )
+        agent = LLMAgent(wolf, game, client, pack=WolfPack(), max_turns=1)
+        action = await agent.decide_action()
+        assert (action.action_type, action.target_id) == (ActionType.KILL, victim)
+        assert client.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_pack_reused_across_games(self, monkeypatch):
+        import gc
+        import weakref
+        from werewolf.agents import LLMAgent, WolfPack, wolf_pack
+        from werewolf.core.enums import RoleType, Faction
+
+        # 模拟旧对局释放后 id() 被新对局复用
+        monkeypatch.setattr(wolf_pack, "id", lambda obj: 0, raising=False)
+        pack = WolfPack()
+        game = await self._night_game()
+        wolves = [p.id for p in game.get_players_by_role(RoleType.WEREWOLF)]
+        first, second = [p.id for p in game.get_players_by_faction(Faction.VILLAGER)[:2]]
+        await LLMAgent(wolves[0], game, ScriptedLLM(lambda m: ("kill", first)), pack=pack).decide_action()
+        old = weakref.ref(game)
+        del game
+        gc.collect()
+        assert old() is None  # 决策不持有已结束的对局
+
+        # 同样座次的新对局不会拿到旧的击杀决策
+        game = await self._night_game()
+        client = ScriptedLLM(lambda m: ("kill", second))
+        action = await LLMAgent(wolves[0], game, client, pack=pack).decide_action()
+        assert client.calls == 1 and action.target_id == second
+
+
+class SlowLLM(BaseLLMClient):
+    """一直不返回（或抛出异常）的假客户端，记录请求是否被取消"""
+
+    def __init__(self, error=None):
+        super().__init__(model="slow")
+        self.error = error
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+        import asyncio
+        if self.error is not None:
+            raise self.error
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+class TestDeadline:
+    """限时决策与后备策略测试"""
+
+    @pytest.mark.asyncio
+    async def test_pack_request_cancelled_when_all_wolves_time_out(self):
+        import asyncio
+        from werewolf.agents import LLMAgent, WolfPack
+        from werewolf.core.enums import RoleType
+
+        game = await TestWolfPack._night_game()
+        wolves = [p.id for p in game.get_players_by_role(RoleType.WEREWOLF)]
+        client = SlowLLM()
+        pack = WolfPack()
+        agents = [LLMAgent(pid, game, client, pack=pack, deadline=0.05) for pid in wolves]
+
+        actions = await asyncio.gather(*(agent.decide_action() for agent in agents))
+        await asyncio.sleep(0)
+        assert client.cancelled == 1  # 全部狼人放弃后队长的对话被取消
+        assert all(a.extra["fallback"] == "timeout" for a in actions)
+
+        # 下一名狼人重新发起对话；reset 取消进行中的对话
+        pending = asyncio.ensure_future(pack.decide(agents[0]))
+        await asyncio.sleep(0.01)
+        pack.reset()
+        await asyncio.sleep(0)
+        assert client.cancelled == 2
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_request_and_falls_back(self):
+        from werewolf.agents import LLMAgent
+        from werewolf.core.enums import RoleType
+
+        game = await TestWolfPack._night_game()
+        seer = game.get_players_by_role(RoleType.SEER)[0].id
+        client = SlowLLM()
+        agent = LLMAgent(seer, game, client, deadline=0.05)
+
+        action = await agent.decide_action()
+        assert client.cancelled == 1
+        assert agent.last_fallback == "timeout"
+        assert action.extra["fallback"] == "timeout"
+        assert agent.get_view().legal_actions.allows(action.action_type, action.target_id)
+        assert await agent.speak()
+        assert agent.fallback_counts == {"timeout": 2}
+
+    @pytest.mark.asyncio
+    async def test_error_falls_back_only_with_fallback(self):
+        from werewolf.agents import LLMAgent
+
+        game = await TestWolfPack._night_game()
+        client = SlowLLM(error=RuntimeError("503"))
+        agent = LLMAgent(0, game, client, deadline=1.0)
+        await agent.decide_action()
+        assert agent.last_fallback == "error"
+
+        with pytest.raises(RuntimeError):
+            await LLMAgent(0, game, client).decide_action()
+
+    @pytest.mark.asyncio
+    async def test_runner_records_fallbacks(self):
+        from werewolf.agents import LLMAgent
+        from werewolf.config.presets import PRESET_6P
+        from werewolf.runner import GameRunner
+
+        client = SlowLLM()
+        result = await GameRunner(
+            PRESET_6P, lambda pid, game: LLMAgent(pid, game, client, deadline=0.001),
+            seed=0, verbose=False,
+        ).run()
+        assert result.winner is not None
+        assert result.agent_logs
+        assert all(log["fallback"] == "timeout" for log in result.agent_logs)
+        assert any(log["action"] == "speak" for log in result.agent_logs)
+
+
+class TestResponseCache:
+    """LLM 响应缓存测试"""
+
+    @staticmethod
+    async def _play(client, seed=0):
+        from werewolf.agents import LLMAgent
+        from werewolf.config.presets import PRESET_6P
+        from werewolf.runner import GameRunner
+        return await GameRunner(
+            PRESET_6P, lambda pid, game: LLMAgent(pid, game, client, max_turns=1),
+            seed=seed, verbose=False,
+        ).run()
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay_offline(self, tmp_path):
+        import random
+        from werewolf.llm.cache import CachedLLMClient, CacheMissError
+
+        rng = random.Random(0)
+        # 随机目标（不合法时跳过），保证对局能结束且每次调用的回答不同
+        live = ScriptedLLM(lambda messages: ("kill", rng.randrange(6)))
+        path = tmp_path / "cassette.db"
+        recorded = await self._play(CachedLLMClient(live, path, mode="record"))
+        assert live.calls > 0
+
+        replay = CachedLLMClient(None, path, mode="replay", model="scripted")
+        replayed = await self._play(replay)
+        assert replayed.agent_logs == recorded.agent_logs
+        assert replay.stats()["misses"] == 0
+
+        with pytest.raises(CacheMissError):
+            await replay.chat([Message(role="user", content="不在录制中")])
+
+    @pytest.mark.asyncio
+    async def test_read_through_hits_and_repeats(self, tmp_path):
+        from werewolf.llm.cache import CachedLLMClient
+
+        live = ScriptedLLM(lambda messages: ("skip", None))
+        client = CachedLLMClient(live, tmp_path / "cache.db")
+        messages = [Message(role="user", content="hi")]
+        await client.chat(messages)
+        await client.chat(messages)      # 同一请求第二次出现是另一条记录
+        assert live.calls == 2
+
+        client.reset()
+        first = await client.chat(messages)
+        assert live.calls == 2 and first.tool_calls[0].id == "call_1"
+        await client.chat(messages, temperature=0.0)
+        assert live.calls == 3
+
+    def test_lru_eviction(self, tmp_path):
+        from werewolf.llm.cache import ResponseCache
+
+        cache = ResponseCache(tmp_path / "lru.db", max_entries=2)
+        for key in "abc":
+            cache.put(key, LLMResponse(content=key))
+            if key == "b":
+                assert cache.get("a").content == "a"   # 刷新 a
+        assert len(cache) == 2
+        assert cache.get("b") is None and cache.get("a") is not None
+
+        sized = ResponseCache(":memory:", max_bytes=300)
+        for key in "abcdef":
+            sized.put(key, LLMResponse(content=key * 50))
+        assert 0 < len(sized) < 6
+
+    def test_settings_share_cache_per_path(self, tmp_path):
+        from werewolf.config.settings import Settings
+        from werewolf.llm.cache import close_response_caches, get_response_cache
+
+        pytest.importorskip("openai")
+        settings = Settings()
+        settings.llm.openai.api_key = "k"
+        settings.llm.cache_path = str(tmp_path / "shared.db")
+        settings.llm.cache_max_entries = 2
+        settings.llm.cache_max_bytes = 4096
+        a = settings.get_llm_client("openai")
+        b = settings.get_llm_client("openai")
+        assert a is not b and a.cache is b.cache is get_response_cache(tmp_path / "shared.db")
+        assert (a.cache.max_entries, a.cache.max_bytes) == (2, 4096)
+        # 容量配置以首次创建为准
+        assert get_response_cache(tmp_path / "shared.db", max_entries=10).max_entries == 2
+
+        close_response_caches()
+        assert get_response_cache(settings.llm.cache_path) is not a.cache
+        close_response_caches()
+
+
+class TestMockServer:
+    """本地模拟 LLM 服务测试"""
+
+    @pytest.fixture(autouse=True)
+    def _deps(self):
+        pytest.importorskip("fastapi")
+        self.httpx = pytest.importorskip("httpx")
+        from werewolf.llm import mock_server
+        self.mod = mock_server
+
+    def _transport(self, **kwargs):
+        app = self.mod.create_app(self.mod.MockConfig(seed=0, **kwargs))
+        return app, self.httpx.AsyncClient(
+            transport=self.httpx.ASGITransport(app=app), base_url="http://mock",
+        )
+
+    def test_parse_legal_actions(self):
+        text = "...\n### 合法行动\n\n- kill: target_id 可选 1号 P1, 3号 P3\n- skip: 无需 target_id\n\n其他"
+        assert self.mod.parse_legal_actions(text) == [("kill", 1), ("kill", 3), ("skip", None)]
+
+    @pytest.mark.asyncio
+    async def test_full_game_through_openai_client(self):
+        pytest.importorskip("openai")
+        from werewolf.agents import LLMAgent
+        from werewolf.config.presets import PRESET_9P
+        from werewolf.llm import OpenAIClient
+        from werewolf.runner import GameRunner
+
+        app, http = self._transport()
+        client = OpenAIClient("mock", api_key="x", base_url="http://mock/v1", http_client=http)
+        result = await GameRunner(
+            PRESET_9P, lambda pid, game: LLMAgent(pid, game, client, max_turns=2),
+            seed=1, verbose=False,
+        ).run()
+        assert result.winner is not None
+        assert all(log["success"] for log in result.agent_logs)
+        assert app.state.stats.ok == app.state.stats.requests > 0
+        assert any(s["content"] in self.mod.MOCK_SPEECHES for s in result.speeches)
+
+    @pytest.mark.asyncio
+    async def test_fault_injection_and_usage(self):
+        app, http = self._transport(rate_limit_rate=0.3, error_rate=0.3)
+        body = {"model": "mock", "messages": [{"role": "user", "content": "你好"}],
+                "tools": [{"type": "function", "function": {"name": "speak", "parameters": {}}}]}
+        statuses = []
+        for _ in range(50):
+            response = await http.post("/v1/chat/completions", json=body)
+            statuses.append(response.status_code)
+            if response.status_code == 429:
+                assert "retry-after" in response.headers
+            elif response.status_code == 200:
+                data = response.json()
+                assert data["choices"][0]["message"]["tool_calls"][0]["function"]["name"] == "speak"
+                assert data["usage"]["prompt_tokens"] == 2
+        assert {200, 429} <= set(statuses) and any(s >= 500 for s in statuses)
+        stats = (await http.get("/stats")).json()
+        assert stats["requests"] == 50
+        assert stats["rate_limited"] + stats["errors"] + stats["ok"] == 50
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_scripted_policy(self):
+        import asyncio
+        app, http = self._transport(
+            latency_ms=50, max_concurrency=2,
+            policy=self.mod.scripted_policy([("submit_action", {"action_type": "skip"})]),
+        )
+        body = {"model": "mock", "max_tokens": 16,
+                "messages": [{"role": "user", "content": "hi"}],
+                "tools": [{"name": "submit_action", "input_schema": {}}]}
+        responses = await asyncio.gather(*(http.post("/v1/messages", json=body) for _ in range(5)))
+        codes = sorted(r.status_code for r in responses)
+        assert codes == [200, 200, 429, 429, 429]
+        ok = next(r for r in responses if r.status_code == 200).json()
+        assert ok["content"][0]["input"] == {"action_type": "skip"}
+        assert app.state.stats.peak_in_flight == 2
+
+
+class TestClientRegistry:
+    """共享客户端注册表测试"""
+
+    @pytest.fixture(autouse=True)
+    def _deps(self):
+        pytest.importorskip("openai")
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_per_endpoint_and_key(self):
+        from werewolf.llm.registry import ClientRegistry, PoolLimits
+
+        registry = ClientRegistry(PoolLimits(max_connections=7))
+        a = registry.get("openai", "gpt-4o-mini", "k1")
+        assert registry.get("openai", "gpt-4o-mini", "k1") is a
+        b = registry.get("openai", "gpt-4o", "k1")
+        c = registry.get("openai", "gpt-4o-mini", "k2")
+        d = registry.get("openai", "deepseek-chat", "k1", "https://api.deepseek.com")
+        assert b is not a and b.http_client is a.http_client
+        assert c.http_client is not a.http_client and d.http_client is not a.http_client
+        assert len(registry) == 3
+
+        pools = [a.http_client, c.http_client, d.http_client]
+        await registry.aclose()
+        assert all(pool.is_closed for pool in pools) and len(registry) == 0
+        assert registry.get("openai", "gpt-4o-mini", "k1") is not a
+        await registry.aclose()
+
+        with pytest.raises(ValueError):
+            registry.get("gemini", "x")
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failure_is_not_fatal(self):
+        from werewolf.llm.registry import ClientRegistry
+
+        registry = ClientRegistry()
+        registry.get("openai", "mock", "x", "http://127.0.0.1:9/v1")
+        assert await registry.prewarm(timeout=2.0) == 0
+        await registry.aclose()
+
+    def test_settings_use_shared_clients(self):
+        from werewolf.config.settings import Settings
+
+        settings = Settings()
+        settings.llm.openai.api_key = "k"
+        assert settings.get_llm_client("openai") is settings.get_llm_client("openai")
+        custom = settings.get_llm_client("custom")
+        assert custom.http_client is not settings.get_llm_client("openai").http_client
+
+
+class TestRateLimiter:
+    """限流器测试"""
+
+    def test_token_bucket_waits_and_refunds(self):
+        import asyncio
+        import time
+        from werewolf.llm.limiter import TokenBucket
+
+        bucket = TokenBucket(per_minute=600, capacity=2)  # 每秒 10 个
+
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire()
+
+        start = time.monotonic()
+        asyncio.run(take(4))
+        assert 0.15 <= time.monotonic() - start < 1.0
+        bucket.refund(5)
+        assert bucket.available == 2
+
+    def test_aimd_backs_off_and_recovers(self):
+        from werewolf.llm.limiter import AdaptiveConcurrency
+
+        cc = AdaptiveConcurrency(initial=8, maximum=10, latency_threshold=1.0)
+        cc.in_flight = 3
+        cc.release(0.1, throttled=True)
+        assert cc.limit == 4
+        cc.release(0.1, throttled=True)  # 冷却期内不重复减小
+        assert cc.limit == 4
+        cc._last_decrease = float("-inf")
+        cc.release(5.0)  # 延迟超过阈值同样视为过载
+        assert cc.limit == 2
+        cc.in_flight = 100
+        for _ in range(100):
+            cc.release(0.1)
+        assert cc.limit == 10
+
+    @pytest.mark.asyncio
+    async def test_client_respects_concurrency_and_counts_429(self):
+        import asyncio
+        from werewolf.llm.limiter import AdaptiveConcurrency, LLMLimiter, RateLimitedLLMClient
+
+        class RateLimitError(Exception):
+            status_code = 429
+
+        class DelayedLLM(BaseLLMClient):
+            def __init__(self):
+                super().__init__(model="delayed")
+                self.in_flight = self.peak = 0
+
+            async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(0.02)
+                self.in_flight -= 1
+                if messages[-1].content == "429":
+                    raise RateLimitError()
+                return LLMResponse(content="ok", usage={"prompt_tokens": 3, "completion_tokens": 2})
+
+        inner = DelayedLLM()
+        limiter = LLMLimiter("test", tpm=6000, concurrency=AdaptiveConcurrency(initial=2, maximum=2))
+        client = RateLimitedLLMClient(inner, limiter)
+        results = await asyncio.gather(
+            *(client.chat([Message(role="user", content="hi")], max_tokens=10) for _ in range(6))
+        )
+        assert all(r.content == "ok" for r in results) and inner.peak == 2
+        state = limiter.state()
+        assert state["requests"] == 6 and state["tokens"] == 30 and state["in_flight"] == 0
+        assert state["tokens_available"] > 6000 - 30  # 预扣的 max_tokens 已按实际用量退还
+
+        with pytest.raises(RateLimitError):
+            await client.chat([Message(role="user", content="429")])
+        assert limiter.state()["throttled"] == 1 and limiter.concurrency.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_woken_waiter_cancelled_passes_slot_on(self):
+        import asyncio
+        from werewolf.llm.limiter import AdaptiveConcurrency
+
+        cc = AdaptiveConcurrency(initial=1, maximum=1)
+        await cc.acquire()  # A
+        b = asyncio.ensure_future(cc.acquire())
+        c = asyncio.ensure_future(cc.acquire())
+        await asyncio.sleep(0)
+        assert cc.waiting == 2
+
+        cc.release(0.1)  # 唤醒 B
+        b.cancel()       # B 恢复运行前被取消
+        await asyncio.wait_for(c, timeout=1)
+        assert b.cancelled() and cc.in_flight == 1 and cc.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_not_counted(self):
+        import asyncio
+        from werewolf.llm.limiter import AdaptiveConcurrency, LLMLimiter, RateLimitedLLMClient
+
+        class SlowLLM(BaseLLMClient):
+            async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+                await asyncio.sleep(10)
+
+        limiter = LLMLimiter("test", concurrency=AdaptiveConcurrency(initial=2, maximum=8))
+        client = RateLimitedLLMClient(SlowLLM(model="slow"), limiter)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.chat([Message(role="user", content="hi")]), timeout=0.01)
+        state = limiter.state()
+        assert state["in_flight"] == 0 and state["requests"] == 0 and state["errors"] == 0
+        assert limiter.concurrency.limit == 2
+
+    def test_shared_limiter_and_settings(self):
+        from werewolf.config.settings import Settings
+        from werewolf.llm.limiter import RateLimitedLLMClient, get_limiter, limiter_states
+
+        pytest.importorskip("openai")
+        settings = Settings()
+        settings.llm.openai.api_key = "k"
+        assert not isinstance(settings.get_llm_client("openai"), RateLimitedLLMClient)
+        settings.llm.rate_limit_rpm = 100
+        a = settings.get_llm_client("openai")
+        b = settings.get_llm_client("openai")
+        assert isinstance(a, RateLimitedLLMClient) and a.limiter is b.limiter is get_limiter("openai")
+        assert any(s["name"] == "openai" for s in limiter_states())
+
+
+class TestResilientClient:
+    """重试与对冲请求测试"""
+
+    class APIError(Exception):
+        def __init__(self, status_code, retry_after=None):
+            super().__init__(f"HTTP {status_code}")
+            self.status_code = status_code
+            headers = {"retry-after": retry_after} if retry_after is not None else {}
+            self.response = type("Response", (), {"headers": headers})()
+
+    def _tools(self):
+        return get_tool_definitions("day_vote")
+
+    def test_classify_and_retry_after(self):
+        import asyncio
+        from werewolf.llm.retry import MalformedResponseError, classify_error, retry_after
+
+        assert classify_error(self.APIError(429)) == "rate_limit"
+        assert classify_error(self.APIError(503)) == "server_error"
+        assert classify_error(asyncio.TimeoutError()) == "timeout"
+        assert classify_error(type("APIConnectionError", (Exception,), {})()) == "timeout"
+        assert classify_error(MalformedResponseError()) == "malformed"
+        assert classify_error(self.APIError(400)) is None
+        assert retry_after(self.APIError(429, "1.5")) == 1.5
+        assert retry_after(self.APIError(429, "soon")) is None
+        assert retry_after(ValueError()) is None
+
+    @pytest.mark.asyncio
+    async def test_classified_retries(self):
+        import time
+        from werewolf.llm.retry import ResilientLLMClient, RetryPolicy
+
+        failures = [self.APIError(503), self.APIError(429, "0.05"), None]
+
+        class FlakyLLM(BaseLLMClient):
+            def __init__(self):
+                super().__init__(model="flaky")
+                self.calls = 0
+
+            async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+                self.calls += 1
+                if failures:
+                    error = failures.pop(0)
+                    if error is not None:
+                        raise error
+                    # 工具参数解析失败时 OpenAIClient 返回空参数
+                    return LLMResponse(tool_calls=[ToolCall(id="c", name="submit_action", arguments={})])
+                return LLMResponse(tool_calls=[ToolCall(
+                    id="c", name="submit_action", arguments={"action_type": "skip"},
+                )])
+
+        inner = FlakyLLM()
+        client = ResilientLLMClient(inner, RetryPolicy(max_attempts=4, base_delay=0.01), seed=0)
+        start = time.monotonic()
+        response = await client.chat([Message(role="user", content="hi")], tools=self._tools())
+        assert time.monotonic() - start >= 0.05  # 遵守 Retry-After
+        assert response.tool_calls[0].arguments == {"action_type": "skip"} and inner.calls == 4
+        assert client.stats()["retries"] == {"server_error": 1, "rate_limit": 1, "malformed": 1}
+
+        failures.extend([self.APIError(400)])
+        with pytest.raises(self.APIError):
+            await client.chat([Message(role="user", content="hi")])
+        assert inner.calls == 5 and client.stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_cuts_tail(self):
+        import asyncio
+        import time
+        from werewolf.llm.retry import HedgePolicy, ResilientLLMClient
+
+        class TailLLM(BaseLLMClient):
+            def __init__(self):
+                super().__init__(model="tail")
+                self.calls = 0
+                self.cancelled = 0
+
+            async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+                self.calls += 1
+                slow = messages[-1].content == "slow" and not self.cancelled and self.calls == 6
+                try:
+                    await asyncio.sleep(5 if slow else 0.01)
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    raise
+                return LLMResponse(content=str(self.calls))
+
+        inner = TailLLM()
+        client = ResilientLLMClient(inner, hedge=HedgePolicy(min_samples=5, budget=0.1))
+        for _ in range(5):
+            await client.chat([Message(role="user", content="fast")])
+        assert client.hedge_delay() is not None
+
+        start = time.monotonic()
+        await client.chat([Message(role="user", content="slow")])
+        assert time.monotonic() - start < 1.0
+        await asyncio.sleep(0)
+        assert client.stats()["hedges"] == client.stats()["hedge_wins"] == 1
+        assert inner.cancelled == 1
+        # 超出对冲预算后不再发出对冲请求
+        assert client.hedge_delay() is None
+
+    @pytest.mark.asyncio
+    async def test_shared_state_pools_latency_and_budget(self):
+        """每个 Agent 一个包装器时，样本和预算按共享状态合计"""
+        import asyncio
+        from werewolf.llm.retry import HedgePolicy, ResilienceState, ResilientLLMClient
+
+        class FastLLM(BaseLLMClient):
+            async def chat(self, messages, tools=None, temperature=0.7, max_tokens=1024):
+                await asyncio.sleep(0)
+                return LLMResponse(content="ok")
+
+        policy = HedgePolicy(min_samples=6, budget=0.1)
+        state = ResilienceState.create(policy.window)
+        clients = [ResilientLLMClient(FastLLM(model="m"), hedge=policy, state=state)
+                   for _ in range(3)]
+        for client in clients:
+            for _ in range(2):
+                await client.chat([Message(role="user", content="hi")])
+        # 单个包装器只有 2 个样本，合计 6 个即可对冲
+        assert all(client.hedge_delay() is not None for client in clients)
+        assert clients[0].stats()["requests"] == 6
+        # 预算按合计计算：任一包装器用掉后其他包装器也不再对冲
+        state.stats.hedges = 1
+        assert all(client.hedge_delay() is None for client in clients)
+
+    @pytest.mark.asyncio
+    async def test_game_survives_injected_faults(self):
+        pytest.importorskip("fastapi")
+        httpx = pytest.importorskip("httpx")
+        pytest.importorskip("openai")
+        from werewolf.agents import LLMAgent
+        from werewolf.config.presets import PRESET_6P
+        from werewolf.llm import OpenAIClient
+        from werewolf.llm.mock_server import MockConfig, create_app
+        from werewolf.llm.retry import ResilientLLMClient, RetryPolicy
+        from werewolf.runner import GameRunner
+
+        app = create_app(MockConfig(seed=0, rate_limit_rate=0.1, error_rate=0.1, retry_after=0))
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock")
+        inner = OpenAIClient("mock", api_key="x", base_url="http://mock/v1", http_client=http, max_retries=0)
+        client = ResilientLLMClient(inner, RetryPolicy(max_attempts=8, base_delay=0.001), seed=0)
+        result = await GameRunner(
+            PRESET_6P, lambda pid, game: LLMAgent(pid, game, client, max_turns=2),
+            seed=1, verbose=False,
+        ).run()
+        assert result.winner is not None
+        assert all(log["success"] for log in result.agent_logs)
+        stats = client.stats()
+        assert stats["failures"] == 0 and set(stats["retries"]) == {"rate_limit", "server_error"}
+
+    def test_settings_wrap_and_disable_sdk_retries(self):
+        from werewolf.config.settings import Settings
+        from werewolf.llm.retry import ResilientLLMClient
+
+        pytest.importorskip("openai")
+        settings = Settings()
+        settings.llm.openai.api_key = "k"
+        assert settings.get_llm_client("openai").max_retries is None
+        settings.llm.retry_max_attempts = 4
+        settings.llm.hedge = True
+        client = settings.get_llm_client("openai")
+        assert isinstance(client, ResilientLLMClient)
+        assert settings.get_llm_client("openai").state is client.state
+        assert client.policy.max_attempts == 4 and client.hedge is not None
+        assert client.client.max_retries == 0
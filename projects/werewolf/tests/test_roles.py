@@ -140,6 +140,9 @@ class TestWitch:
             def get_pending_actions(self):
                 return self._pending
 
+            def get_wolf_target(self):
+                return 1
+
         game = MockGame()
         action = Action(ActionType.SAVE, actor_id=0)
 
@@ -161,6 +164,8 @@ class TestWitch:
                 return None
             def get_pending_actions(self):
                 return []
+            def get_wolf_target(self):
+                return None
 
         game = MockGame()
         action = Action(ActionType.POISON, actor_id=0, target_id=1)
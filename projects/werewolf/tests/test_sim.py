@@ -0,0 +1,314 @@
+# ==================== 模拟引擎测试 ====================
+"""测试 FastGame 与 Game 的规则一致性"""
+
+import pytest
+from werewolf.core.enums import ActionType, DeathReason, Faction, GamePhase
+from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
+from werewolf.agents.random_agent import RandomAgent
+from werewolf.runner.game_runner import GameRunner
+from werewolf.engine.rules import majority_target, tally_votes, check_winner
+from werewolf.sim import FastGame, RandomPolicy, run_games
+from werewolf.sim.fast_game import VILLAGER, WEREWOLF, SEER, WITCH
+
+
+def _project(history):
+    """去掉时间戳后的事件序列"""
+    return [
+        (e.event_type, e.round_num, e.phase, e.data, e.visible_to)
+        for e in history
+    ]
+
+
+async def _run_reference(config, seed):
+    """Game + RandomAgent 参考对局"""
+    runner = GameRunner(
+        config=config,
+        agent_factory=lambda pid, game: RandomAgent(pid, game, seed=seed + pid),
+        seed=seed,
+        verbose=False,
+    )
+    return await runner.run()
+
+
+class TestRules:
+    """结算规则测试"""
+
+    def test_majority_target(self):
+        assert majority_target([]) is None
+        assert majority_target([None, None]) is None
+        assert majority_target([3, 3, 4]) == 3
+        # 平票取最先被投的目标
+        assert majority_target([4, 3, 3, 4]) == 4
+
+    def test_tally_votes(self):
+        counts, eliminated, is_tie = tally_votes([1, None, 1, 2])
+        assert counts == {1: 2, 2: 1}
+        assert eliminated == 1
+        assert is_tie is False
+
+        _, eliminated, is_tie = tally_votes([1, 2])
+        assert eliminated is None
+        assert is_tie is True
+
+        _, eliminated, is_tie = tally_votes([None, None])
+        assert eliminated is None
+        assert is_tie is False
+
+    def test_check_winner(self):
+        assert check_winner(0, 3) == Faction.VILLAGER
+        assert check_winner(2, 2) == Faction.WEREWOLF
+        assert check_winner(1, 3) is None
+
+
+class TestFastGameParity:
+    """FastGame 与 Game 在相同 seed 下的一致性"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("config", [PRESET_6P, PRESET_9P, PRESET_12P],
+                             ids=["6p", "9p", "12p"])
+    async def test_same_result_and_history(self, config):
+        """胜者、回合数和完整事件序列一致"""
+        for seed in range(40):
+            reference = await _run_reference(config, seed)
+
+            game = FastGame(config, seed=seed, record_events=True)
+            result = game.run(RandomPolicy(seed))
+
+            assert result.winner == reference.winner, f"seed={seed}"
+            assert result.rounds == reference.rounds, f"seed={seed}"
+            assert _project(result.history) == _project(reference.history), f"seed={seed}"
+
+    @pytest.mark.asyncio
+    async def test_same_role_assignment(self):
+        """与 Game 使用相同的洗牌方式"""
+        from werewolf.core.game import Game
+
+        game = Game(PRESET_9P, seed=7)
+        await game.setup([f"P{i}" for i in range(9)])
+        fast = FastGame(PRESET_9P, seed=7)
+
+        wolves = {p.id for p in game.players if p.role.faction == Faction.WEREWOLF}
+        assert wolves == {i for i in range(9) if fast.roles[i] == WEREWOLF}
+
+
+class TestFastGame:
+    """FastGame 行为测试"""
+
+    def test_no_events_by_default(self):
+        result = FastGame(PRESET_6P, seed=1).run(RandomPolicy(1))
+        assert result.winner is not None
+        assert result.history == []
+
+    def test_reset_reuses_instance(self):
+        game = FastGame(PRESET_6P)
+        game.reset(3)
+        first = game.run(RandomPolicy(3))
+        game.reset(3)
+        second = game.run(RandomPolicy(3))
+        assert (first.winner, first.rounds, first.deaths) == \
+            (second.winner, second.rounds, second.deaths)
+
+    def test_witch_cannot_self_save(self):
+        game = FastGame(PRESET_6P, seed=0)
+        game.start()
+        witch = game.roles.index(WITCH)
+        wolf = game.roles.index(WEREWOLF)
+
+        assert game.submit(wolf, ActionType.KILL, witch)
+        assert not game.submit(witch, ActionType.SAVE, witch)
+        game.advance_phase()
+
+        assert not game.is_alive(witch)
+        assert game.result.deaths == [(1, witch, DeathReason.WOLF_KILL)]
+        assert game.phase == GamePhase.DAY_DISCUSSION
+
+    def test_run_games(self):
+        results = run_games(PRESET_6P, range(20))
+        assert len(results) == 20
+        assert all(r.winner is not None for r in results)
+
+    def test_invalid_config(self):
+        from werewolf.config.presets import GameConfig
+        bad_config = GameConfig(name="bad", roles=["werewolf"] * 3 + ["villager"] * 3)
+        with pytest.raises(ValueError):
+            FastGame(bad_config)
+
+
+class TestBatchSimulator:
+    """NumPy 批量模拟器测试"""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        self.np = pytest.importorskip("numpy")
+        from werewolf.sim import batch
+        self.batch = batch
+
+    def test_majority_targets_match_rules(self):
+        np = self.np
+        rng = np.random.default_rng(0)
+        kills = rng.integers(-1, 6, size=(500, 4))
+        expected = [majority_target(t if t >= 0 else None for t in row) for row in kills.tolist()]
+        got = self.batch.majority_targets(kills, 6)
+        assert [None if t < 0 else t for t in got.tolist()] == expected
+
+    def test_tally_votes_match_rules(self):
+        np = self.np
+        rng = np.random.default_rng(1)
+        votes = rng.integers(-1, 9, size=(500, 9))
+        expected = [tally_votes(t if t >= 0 else None for t in row)[1] for row in votes.tolist()]
+        got = self.batch.tally_votes(votes, 9)
+        assert [None if t < 0 else t for t in got.tolist()] == expected
+
+    def test_deterministic(self):
+        sim_a = self.batch.BatchSimulator(PRESET_9P, seed=5, chunk_size=300)
+        sim_b = self.batch.BatchSimulator(PRESET_9P, seed=5, chunk_size=300)
+        a, b = sim_a.run(1000), sim_b.run(1000)
+        assert (a.winners == b.winners).all()
+        assert (a.rounds == b.rounds).all()
+
+    @pytest.mark.parametrize("config", [PRESET_6P, PRESET_12P], ids=["6p", "12p"])
+    def test_distribution_matches_fast_game(self, config):
+        """胜率与平均回合数与 FastGame 在统计上一致"""
+        games = 4000
+        fast = run_games(config, range(games))
+        fast_wolf = sum(r.winner == Faction.WEREWOLF for r in fast) / games
+        fast_rounds = sum(r.rounds for r in fast) / games
+
+        summary = self.batch.BatchSimulator(config, seed=0).run(50_000).summary()
+        assert summary["wins"]["villager"] + summary["wins"]["werewolf"] == 50_000
+        assert abs(summary["win_rates"]["werewolf"] - fast_wolf) < 0.015
+        assert abs(summary["avg_rounds"] - fast_rounds) < 0.15
+
+    def test_rejects_multiple_witches(self):
+        from werewolf.config.presets import GameConfig
+        config = GameConfig(name="two-witch",
+                            roles=["werewolf"] * 2 + ["witch"] * 2 + ["villager"] * 3)
+        with pytest.raises(ValueError):
+            self.batch.BatchSimulator(config)
+
+
+class TestExactSolver:
+    """精确求解器测试"""
+
+    def test_vote_out_probability(self):
+        """两人：对方投我且我弃权；三人：见 vote_out_probability 的推导"""
+        from werewolf.sim.exact import vote_out_probability
+        assert vote_out_probability(2) == pytest.approx(1 / 4)
+        assert vote_out_probability(3) == pytest.approx(3 / 16)
+        for n in range(2, 8):
+            assert 0 < n * vote_out_probability(n) < 1
+
+    def test_single_wolf_closed_form(self):
+        """1 狼 5 民、1 回合：只有白天投出狼人才能结束"""
+        from werewolf.config.presets import GameConfig
+        from werewolf.sim import ExactSolver
+        from werewolf.sim.exact import vote_out_probability as q
+        config = GameConfig(name="1w5v", roles=["werewolf"] + ["villager"] * 5)
+
+        result = ExactSolver(config, max_rounds=1).solve()
+        # 夜里 1/2 概率刀人（剩 5 人），否则 6 人进入投票
+        villager = (q(5) + q(6)) / 2
+        assert result.villager == pytest.approx(villager)
+        assert result.werewolf == 0
+        assert result.no_winner == pytest.approx(1 - villager)
+        assert result.expected_rounds == pytest.approx(villager + 2 * (1 - villager))
+
+    def test_matches_fast_game(self):
+        """与 FastGame 蒙特卡洛估计一致"""
+        from werewolf.sim import ExactSolver
+        exact = ExactSolver(PRESET_6P).solve()
+        assert exact.villager + exact.werewolf + exact.no_winner == pytest.approx(1)
+
+        games = 4000
+        # 策略种子与对局种子错开，避免座位 0 与洗牌共用随机数流
+        results = [
+            FastGame(PRESET_6P, seed=s).run(RandomPolicy(10_000 * (s + 1)))
+            for s in range(games)
+        ]
+        wolf = sum(r.winner == Faction.WEREWOLF for r in results) / games
+        rounds = sum(r.rounds for r in results) / games
+        assert abs(exact.werewolf - wolf) < 0.015
+        assert abs(exact.expected_rounds - rounds) < 0.15
+
+    def test_symmetric_assignments_share_states(self):
+        from werewolf.sim import ExactSolver
+        solver = ExactSolver(PRESET_6P)
+        a = solver.solve_assignment([WEREWOLF, WITCH, VILLAGER, VILLAGER, SEER, WEREWOLF])
+        states = len(solver._memo)
+        # 交换两名平民阵营无行动角色（平民 / 预言家）的座位不产生新状态
+        b = solver.solve_assignment([WEREWOLF, WITCH, SEER, VILLAGER, VILLAGER, WEREWOLF])
+        assert a == b
+        assert len(solver._memo) == states
+
+    def test_rejects_oversized_config(self):
+        """12 人局约 83 万种角色排列，超出默认上限时在构造时拒绝"""
+        from werewolf.config.presets import PRESET_12P
+        from werewolf.sim import ExactSolver
+        from werewolf.sim.exact import count_assignments
+        assert count_assignments(PRESET_6P.roles) == 180
+        with pytest.raises(ValueError, match="蒙特卡洛"):
+            ExactSolver(PRESET_12P)
+        with pytest.raises(ValueError):
+            ExactSolver(PRESET_6P, max_assignments=100)
+
+    @pytest.mark.asyncio
+    async def test_web_benchmark_rejects_unsupported_exact(self):
+        from web.backend.models.schemas import BenchmarkRequest
+        from web.backend.services.benchmark_service import BenchmarkService
+        service = BenchmarkService()
+        with pytest.raises(ValueError):
+            await service.start_benchmark(BenchmarkRequest(preset="12p", exact=True))
+        with pytest.raises(ValueError):
+            await service.start_benchmark(
+                BenchmarkRequest(providers=["heuristic"], exact=True)
+            )
+        assert not service.sessions
+
+        session = await service.start_benchmark(BenchmarkRequest(preset="6p", exact=True))
+        await session.task
+        assert session.status == "completed"
+        assert session.results["exact"]
+
+
+class TestISMCTS:
+    """信息集 MCTS 测试"""
+
+    ROLES = [WEREWOLF, WEREWOLF, SEER, WITCH, VILLAGER, VILLAGER]
+
+    def test_set_position_and_legal_moves(self):
+        from werewolf.sim.fast_game import POISON_POTION
+        game = FastGame(PRESET_6P)
+        alive = 0b111110  # 座位 0 已死亡
+        game.set_position(self.ROLES, alive, GamePhase.NIGHT, 2,
+                          potions=[0, 0, 0, POISON_POTION, 0, 0])
+        assert game.alive_ids == [1, 2, 3, 4, 5]
+        assert game.legal_moves(3) == [(ActionType.SKIP, None)] + [
+            (ActionType.POISON, t) for t in (1, 2, 4, 5)
+        ]
+
+        policy = RandomPolicy(0)
+        policy.bind(game)
+        result = game.play(policy)
+        assert result.winner is not None
+        assert not result.alive_mask & 1
+
+    def test_search_finds_winning_poison(self):
+        from werewolf.sim import SearchPosition, search, merge_stats, best_move
+        from werewolf.sim.fast_game import POISON_POTION
+        position = SearchPosition(
+            config=PRESET_6P, observer=3, alive=0b111110,
+            phase=GamePhase.NIGHT, round_num=2, potions=POISON_POTION,
+        )
+        game = FastGame(PRESET_6P)
+        game.set_position(self.ROLES, position.alive, position.phase, position.round_num)
+        moves = [m for m in game.legal_moves(3) if m[0] != ActionType.SAVE]
+
+        stats = search(position, [self.ROLES], moves, iterations=400, seed=0)
+        assert sum(v for v, _ in stats.values()) == 400
+        # 毒死最后一名狼人立即获胜
+        assert best_move(stats) == (ActionType.POISON, 1)
+        assert stats[ActionType.POISON, 1][1] == stats[ActionType.POISON, 1][0]
+
+        merged = merge_stats([stats, stats])
+        assert merged[ActionType.POISON, 1] == (2 * stats[ActionType.POISON, 1][0],
+                                                2 * stats[ActionType.POISON, 1][1])
@@ -12,7 +12,10 @@ router = APIRouter(prefix="/api/benchmark", tags=["benchmark"])
 @router.post("", response_model=BenchmarkResult)
 async def start_benchmark(request: BenchmarkRequest):
     """启动 Benchmark"""
-    session = await benchmark_service.start_benchmark(request)
+    try:
+        session = await benchmark_service.start_benchmark(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return benchmark_service.get_result(session)
 
 
@@ -75,6 +75,13 @@ async def update_config(update: ConfigUpdate):
     return {"message": "配置已更新", "config": settings.to_dict()}
 
 
+@router.get("/limiters")
+async def get_limiters():
+    """各提供商共享限流器的实时状态（并发上限、排队数、剩余配额、429 次数）"""
+    from werewolf.llm.limiter import limiter_states
+    return {"limiters": limiter_states()}
+
+
 @router.post("/reload")
 async def reload_config():
     """重新加载配置文件"""
@@ -38,6 +38,15 @@ async def get_game(game_id: str):
     return game_service.get_game_state(session)
 
 
+@router.delete("/{game_id}")
+async def delete_game(game_id: str):
+    """删除游戏"""
+    success = await game_service.delete_game(game_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return {"message": "Game deleted"}
+
+
 @router.post("/{game_id}/join")
 async def join_game(game_id: str, request: JoinGameRequest):
     """加入游戏"""
@@ -8,7 +8,7 @@ from typing import Dict, Set
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from ..models.schemas import GameState, GameEvent, WSMessage
-from ..services.game_service import game_service
+from ..services.game_service import game_service, publish_speech
 
 router = APIRouter()
 
@@ -172,18 +172,9 @@ async def handle_client_message(
         content = data.get("content", "")
 
         session = await game_service.get_session(game_id)
-        if session:
-            event = GameEvent(
-                round=session.game.round if session.game else 0,
-                phase="day_discussion",
-                event_type="speech",
-                description=f"Player_{player_id}: {content}",
-                details={"player_id": player_id, "content": content},
-            )
-            session.events.append(event)
-
-            # 广播发言
-            await manager._broadcast_event(game_id, event)
+        if session and session.game and player_id is not None:
+            # 经事件总线统一记录和广播
+            publish_speech(session.game, player_id, content)
 
     elif msg_type == "ping":
         await websocket.send_json({"type": "pong"})
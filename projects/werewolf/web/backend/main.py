@@ -6,9 +6,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+import logging
 from pathlib import Path
 
 from .api import games_router, benchmark_router, ws_router, config_router
+from .services.game_service import game_service
+from werewolf.config.settings import get_settings
+from werewolf.llm.registry import get_client_registry
+from werewolf.llm.cache import close_response_caches
+
+logger = logging.getLogger(__name__)
 
 # 访问密码
 ACCESS_PASSWORD = "caoji123"
@@ -88,6 +95,32 @@ app.include_router(ws_router)
 app.include_router(config_router)
 
 
+@app.on_event("startup")
+async def resume_games():
+    """恢复进程重启前未结束的对局（需配置 game.checkpoint_dir）"""
+    await game_service.resume_checkpoints()
+
+
+@app.on_event("startup")
+async def prewarm_llm_connections():
+    """为默认提供商建立共享客户端并预热连接（未配置密钥时跳过）"""
+    settings = get_settings()
+    provider_config = getattr(settings.llm, settings.llm.default_provider, None)
+    if provider_config and provider_config.api_key:
+        try:
+            settings.get_llm_client()
+            await get_client_registry().prewarm()
+        except Exception as e:
+            logger.warning(f"LLM connection prewarm failed: {e}")
+
+
+@app.on_event("shutdown")
+async def close_llm_connections():
+    """关闭共享的 LLM 连接池和响应缓存"""
+    await get_client_registry().aclose()
+    close_response_caches()
+
+
 @app.get("/")
 async def root():
     """健康检查"""
@@ -21,6 +21,7 @@ class PlayerType(str, Enum):
     """玩家类型"""
     HUMAN = "human"
     AI_RANDOM = "ai_random"
+    AI_HEURISTIC = "ai_heuristic"
     AI_LLM = "ai_llm"
 
 
@@ -31,7 +32,9 @@ class CreateGameRequest(BaseModel):
     preset: str = Field(default="6p", description="预设配置: 6p, 9p, 12p")
     mode: GameMode = Field(default=GameMode.AI_VS_AI)
     seed: Optional[int] = Field(default=None, description="随机种子")
-    ai_provider: Optional[str] = Field(default=None, description="LLM 提供商: openai, anthropic")
+    ai_provider: Optional[str] = Field(
+        default=None, description="AI 提供商: openai, anthropic, heuristic（规则 Agent，不调用模型）"
+    )
     ai_model: Optional[str] = Field(default=None, description="模型名称")
     speed: float = Field(default=1.0, ge=0.1, le=10.0, description="游戏速度倍率")
 
@@ -60,6 +63,8 @@ class BenchmarkRequest(BaseModel):
     providers: List[str] = Field(default=["random"])
     models: Optional[Dict[str, str]] = Field(default=None)
     seed: Optional[int] = Field(default=None)
+    # 全部为随机策略时直接求解精确胜率（代替蒙特卡洛估计）
+    exact: bool = Field(default=False)
 
 
 # ==================== 响应模型 ====================
@@ -96,6 +101,8 @@ class GameState(BaseModel):
     winner: Optional[str] = None
     current_speaker: Optional[int] = None
     pending_action: Optional[str] = None  # 当前等待的行动类型
+    # 查看者当前的合法行动：行动名 -> 可选目标ID（无需目标为 None）
+    legal_actions: Optional[Dict[str, Optional[List[int]]]] = None
 
 
 class GameListItem(BaseModel):
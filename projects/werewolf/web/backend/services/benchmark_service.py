@@ -16,7 +16,11 @@ from werewolf.core.game import Game
 from werewolf.core.enums import Faction
 from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P
 from werewolf.agents.random_agent import RandomAgent
+from werewolf.agents.heuristic_agent import HeuristicAgent
+from werewolf.agents.ismcts_agent import ISMCTSAgent
 from werewolf.runner.game_runner import GameRunner
+from werewolf.runner.pool import AgentPool
+from werewolf.sim.exact import ExactSolver
 
 from ..models.schemas import BenchmarkRequest, BenchmarkResult
 
@@ -27,6 +31,12 @@ PRESETS = {
     "12p": PRESET_12P,
 }
 
+# 不调用模型的 Agent（providers 中的名称 -> 类）
+OFFLINE_AGENTS = {
+    "heuristic": HeuristicAgent,
+    "ismcts": ISMCTSAgent,
+}
+
 
 @dataclass
 class BenchmarkSession:
@@ -55,7 +65,20 @@ class BenchmarkService:
         self.sessions: Dict[str, BenchmarkSession] = {}
 
     async def start_benchmark(self, request: BenchmarkRequest) -> BenchmarkSession:
-        """启动 Benchmark"""
+        """
+        启动 Benchmark
+
+        Raises:
+            ValueError: 请求精确解，但策略不全是随机或配置超出求解规模
+        """
+        solver = None
+        if request.exact:
+            if set(request.providers) != {"random"}:
+                raise ValueError("精确解只支持全部为 random 的 providers")
+            # 在启动后台任务前构造求解器：超出规模的配置（如 12p）直接拒绝，
+            # 不会占用一个无法取消的求解线程
+            solver = ExactSolver(PRESETS.get(request.preset, PRESET_6P))
+
         benchmark_id = str(uuid.uuid4())[:8]
 
         session = BenchmarkSession(
@@ -67,12 +90,14 @@ class BenchmarkService:
         self.sessions[benchmark_id] = session
 
         # 启动后台任务
-        session.task = asyncio.create_task(self._run_benchmark(session))
+        session.task = asyncio.create_task(self._run_benchmark(session, solver))
 
         return session
 
-    async def _run_benchmark(self, session: BenchmarkSession):
-        """运行 Benchmark"""
+    async def _run_benchmark(
+        self, session: BenchmarkSession, solver: Optional[ExactSolver] = None,
+    ):
+        """运行 Benchmark（给出 solver 时直接求精确解）"""
         request = session.request
         config = PRESETS.get(request.preset, PRESET_6P)
 
@@ -82,16 +107,30 @@ class BenchmarkService:
         game_durations = []
 
         try:
+            if solver is not None:
+                # 随机策略的精确解：在线程中求解，不阻塞事件循环
+                result = await asyncio.to_thread(solver.solve)
+                session.results = result.summary()
+                session.completed_games = session.total_games
+                session.status = "completed"
+                return
+
+            # 座位按 providers 轮流分配；"heuristic" 为规则 Agent，
+            # "ismcts" 为搜索 Agent，其余为随机 Agent
+            def agent_factory(player_id, game):
+                provider = request.providers[player_id % len(request.providers)]
+                agent_cls = OFFLINE_AGENTS.get(provider, RandomAgent)
+                return agent_cls(player_id, game, seed=game.seed + player_id)
+
+            # 同一座位的 Agent 跨对局复用（rebind 时按 seed + 座位重新播种）
+            pool = AgentPool(agent_factory)
+
             for i in range(request.num_games):
                 seed = (request.seed or 0) + i
 
-                # 创建游戏
-                def agent_factory(player_id, game):
-                    return RandomAgent(player_id, game, seed=seed + player_id)
-
                 runner = GameRunner(
                     config=config,
-                    agent_factory=agent_factory,
+                    agent_factory=pool,
                     seed=seed,
                     verbose=False,
                 )
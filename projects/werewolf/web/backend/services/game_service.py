@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 import asyncio
+import os
 import uuid
 import logging
 import traceback
@@ -14,11 +15,15 @@ import sys
 sys.path.insert(0, str(__file__).replace("\\", "/").rsplit("/web/", 1)[0])
 
 from werewolf.core.game import Game
-from werewolf.core.enums import GamePhase, Faction, ActionType
+from werewolf.core.enums import GamePhase, Faction, ActionType, EventType
+from werewolf.core.events import GameEvent as EngineEvent
+from werewolf.core.event_bus import Subscription
+from werewolf.core.checkpoint import Checkpoint, CheckpointError
 from werewolf.config.presets import PRESET_6P, PRESET_9P, PRESET_12P, GameConfig
 from werewolf.agents.base import BaseAgent
-from werewolf.agents.random_agent import RandomAgent
+from werewolf.agents.heuristic_agent import HeuristicAgent
 from werewolf.agents.llm_agent import LLMAgent
+from werewolf.agents.wolf_pack import WolfPack
 from werewolf.runner.game_runner import GameRunner, GameResult
 from werewolf.config.settings import get_settings
 
@@ -39,6 +44,61 @@ PRESETS = {
 }
 
 
+# 推送给前端的引擎事件类型
+WEB_EVENT_TOPICS = (
+    EventType.PHASE_CHANGE,
+    EventType.PLAYER_ACTION,
+    EventType.PLAYER_DEATH,
+    EventType.VOTE_RESULT,
+    EventType.PLAYER_SPEECH,
+)
+
+
+def publish_speech(game: Game, player_id: int, content: str) -> None:
+    """发布发言事件（发言不进入 history，只推送给订阅者）"""
+    game.bus.publish(EngineEvent(
+        EventType.PLAYER_SPEECH, game.round, game.phase,
+        {"player_id": player_id, "content": content}, visible_to=[],
+    ))
+
+
+def to_view_event(game: Game, event: EngineEvent) -> GameEvent:
+    """引擎事件 -> 前端事件"""
+    kind = event.kind
+    data = event.data
+    player = game.get_player(data.get("player_id", -1))
+    name = player.name if player else f"Player_{data.get('player_id')}"
+
+    if kind == EventType.PHASE_CHANGE:
+        description = f"进入 {data.get('to')} 阶段"
+        details = None
+    elif kind == EventType.PLAYER_ACTION:
+        description = f"{name} 执行了行动"
+        details = None  # 行动内容不公开
+    elif kind == EventType.PLAYER_DEATH:
+        description = f"{name} 死亡"
+        details = data
+    elif kind == EventType.VOTE_RESULT:
+        eliminated = data.get("eliminated")
+        description = "无人被处决" if eliminated is None else f"{eliminated}号玩家被投票处决"
+        details = data
+    elif kind == EventType.PLAYER_SPEECH:
+        description = f"{name}: {data.get('content', '')}"
+        details = data
+    else:
+        description = event.event_type
+        details = data
+
+    return GameEvent(
+        round=event.round_num,
+        phase=event.phase.value,
+        event_type="speech" if kind == EventType.PLAYER_SPEECH else event.event_type,
+        description=description,
+        details=details,
+        timestamp=event.timestamp,
+    )
+
+
 @dataclass
 class GameSession:
     """游戏会话"""
@@ -46,6 +106,7 @@ class GameSession:
     game: Optional[Game] = None
     config: Optional[GameConfig] = None
     mode: GameMode = GameMode.AI_VS_AI
+    ai_provider: Optional[str] = None  # "heuristic" 表示只使用规则 Agent
     status: str = "waiting"  # waiting, running, finished
     created_at: datetime = field(default_factory=datetime.now)
 
@@ -60,8 +121,12 @@ class GameSession:
     runner: Optional[GameRunner] = None
     runner_task: Optional[asyncio.Task] = None
 
-    # 事件历史
+    # 事件历史（由事件总线订阅填充）
     events: List[GameEvent] = field(default_factory=list)
+    subscription: Optional[Subscription] = None
+
+    # 从检查点恢复时待写回的 Agent 状态
+    agent_states: Dict[int, Dict[str, Any]] = field(default_factory=dict)
 
     # 回调
     on_state_change: Optional[Callable[[GameState], Any]] = None
@@ -85,6 +150,7 @@ class GameService:
             game_id=game_id,
             config=config,
             mode=request.mode,
+            ai_provider=request.ai_provider,
             speed=request.speed,
         )
 
@@ -92,12 +158,13 @@ class GameService:
         session.player_names = [f"Player_{i}" for i in range(config.player_count)]
 
         # 根据模式设置玩家类型
+        ai_type = PlayerType.AI_HEURISTIC if request.ai_provider == "heuristic" else PlayerType.AI_RANDOM
         for i in range(config.player_count):
             if request.mode == GameMode.AI_VS_AI:
-                session.player_types[i] = PlayerType.AI_RANDOM
+                session.player_types[i] = ai_type
             else:
                 # 第一个位置留给人类
-                session.player_types[i] = PlayerType.HUMAN if i == 0 else PlayerType.AI_RANDOM
+                session.player_types[i] = PlayerType.HUMAN if i == 0 else ai_type
 
         async with self._lock:
             self.sessions[game_id] = session
@@ -169,6 +236,8 @@ class GameService:
         await session.game.setup(session.player_names)
         print(f"[Game {game_id}] Game setup complete, players: {session.player_names}", flush=True)
 
+        self._subscribe_events(session)
+
         await session.game.start()
         print(f"[Game {game_id}] Game started, phase: {session.game.phase.value}, round: {session.game.round}", flush=True)
 
@@ -186,39 +255,147 @@ class GameService:
 
         return True
 
+    def _subscribe_events(self, session: GameSession) -> None:
+        """订阅引擎事件：统一转换、记录并推送给 WebSocket"""
+        session.subscription = session.game.bus.subscribe(
+            lambda event: self._forward_event(session, event),
+            topics=WEB_EVENT_TOPICS,
+            is_async=True,
+            maxsize=256,
+        )
+
+    @staticmethod
+    def _close_subscription(session: GameSession) -> None:
+        """关闭会话的事件订阅（结束转发任务，释放对会话的引用）"""
+        if session.subscription is not None:
+            session.subscription.close()
+            session.subscription = None
+
+    # ==================== 检查点 ====================
+
+    @staticmethod
+    def _checkpoint_path(game_id: str) -> Optional[str]:
+        """对局检查点路径（未配置 checkpoint_dir 时为 None）"""
+        checkpoint_dir = get_settings().game.checkpoint_dir
+        if not checkpoint_dir:
+            return None
+        return os.path.join(checkpoint_dir, f"{game_id}.ckpt")
+
+    def _save_checkpoint(self, session: GameSession, agents: Dict[int, BaseAgent]) -> None:
+        """在阶段边界写入检查点"""
+        path = self._checkpoint_path(session.game_id)
+        if path is None:
+            return
+        try:
+            Checkpoint.capture(
+                session.game, agents,
+                game_id=session.game_id,
+                mode=session.mode.value,
+                ai_provider=session.ai_provider,
+                speed=session.speed,
+                player_types={k: v.value for k, v in session.player_types.items()},
+            ).save(path)
+        except Exception as e:
+            logger.error(f"[Game {session.game_id}] Checkpoint write failed: {e}")
+
+    def _remove_checkpoint(self, game_id: str) -> None:
+        """对局结束后删除检查点"""
+        path = self._checkpoint_path(game_id)
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+    async def resume_from_checkpoint(self, path: str) -> GameSession:
+        """
+        从检查点恢复 AI 对局并继续运行
+
+        Raises:
+            CheckpointError: 检查点无效
+        """
+        checkpoint = Checkpoint.load(path)
+        game = checkpoint.game
+        extra = checkpoint.extra
+
+        session = GameSession(
+            game_id=extra.get("game_id") or str(uuid.uuid4())[:8],
+            game=game,
+            config=game.config,
+            mode=GameMode(extra.get("mode", GameMode.AI_VS_AI.value)),
+            ai_provider=extra.get("ai_provider"),
+            status="running",
+            speed=extra.get("speed", 1.0),
+            player_names=[p.name for p in game.players],
+            player_types={
+                int(k): PlayerType(v) for k, v in extra.get("player_types", {}).items()
+            },
+            agent_states=checkpoint.agent_states,
+        )
+        async with self._lock:
+            self.sessions[session.game_id] = session
+
+        self._subscribe_events(session)
+        session.runner_task = asyncio.create_task(self._run_ai_game(session))
+        logger.info(f"[Game {session.game_id}] Resumed from checkpoint at round {game.round}, phase {game.phase.value}")
+        return session
+
+    async def resume_checkpoints(self) -> List[GameSession]:
+        """恢复检查点目录中所有未结束的对局（服务启动时调用）"""
+        checkpoint_dir = get_settings().game.checkpoint_dir
+        if not checkpoint_dir or not os.path.isdir(checkpoint_dir):
+            return []
+
+        sessions = []
+        for name in sorted(os.listdir(checkpoint_dir)):
+            if not name.endswith(".ckpt"):
+                continue
+            try:
+                sessions.append(await self.resume_from_checkpoint(os.path.join(checkpoint_dir, name)))
+            except (OSError, CheckpointError) as e:
+                logger.error(f"Failed to resume checkpoint {name}: {e}")
+        return sessions
+
     async def _run_ai_game(self, session: GameSession):
         """运行 AI 对战"""
         print(f"[Game {session.game_id}] === AI GAME LOOP STARTED ===", flush=True)
         game = session.game
 
-        # 尝试获取 LLM 客户端
+        # 尝试获取 LLM 客户端（指定 heuristic 时只使用规则 Agent）
         llm_client = None
-        try:
-            settings = get_settings()
-            provider = settings.llm.default_provider
-            print(f"[Game {session.game_id}] Default LLM provider: {provider}", flush=True)
-
-            # 获取对应提供商的配置
-            provider_config = getattr(settings.llm, provider, None)
-            if provider_config and provider_config.api_key:
-                logger.info(f"[Game {session.game_id}] API key found for {provider}, creating LLM client...")
-                llm_client = settings.get_llm_client()
-                logger.info(f"[Game {session.game_id}] LLM client created successfully")
-            else:
-                logger.warning(f"[Game {session.game_id}] No API key for {provider}, using RandomAgent")
-        except Exception as e:
-            logger.error(f"[Game {session.game_id}] LLM client error: {e}")
-            logger.error(traceback.format_exc())
+        if session.ai_provider != "heuristic":
+            try:
+                settings = get_settings()
+                provider = settings.llm.default_provider
+                print(f"[Game {session.game_id}] Default LLM provider: {provider}", flush=True)
+
+                # 获取对应提供商的配置
+                provider_config = getattr(settings.llm, provider, None)
+                if provider_config and provider_config.api_key:
+                    logger.info(f"[Game {session.game_id}] API key found for {provider}, creating LLM client...")
+                    llm_client = settings.get_llm_client()
+                    logger.info(f"[Game {session.game_id}] LLM client created successfully")
+                else:
+                    logger.warning(f"[Game {session.game_id}] No API key for {provider}, using HeuristicAgent")
+            except Exception as e:
+                logger.error(f"[Game {session.game_id}] LLM client error: {e}")
+                logger.error(traceback.format_exc())
 
         # 创建 agents
         agents: Dict[int, BaseAgent] = {}
+        pack = WolfPack()  # 狼人夜间共享一次 LLM 对话
+        deadline = get_settings().game.decision_deadline  # 超时改用规则 Agent 的决策
         for i in range(session.config.player_count):
             if llm_client:
-                agents[i] = LLMAgent(i, game, llm_client, name=f"AI_{i}")
+                agents[i] = LLMAgent(i, game, llm_client, name=f"AI_{i}", pack=pack, deadline=deadline)
             else:
-                agents[i] = RandomAgent(i, game, seed=42 + i)
+                # 无需模型调用的规则 Agent 填充座位
+                agents[i] = HeuristicAgent(i, game, seed=42 + i)
+
+        if session.agent_states:
+            for pid, state in session.agent_states.items():
+                if pid in agents:
+                    agents[pid].load_state(state)
+            session.agent_states = {}
 
-        agent_type = "LLMAgent" if llm_client else "RandomAgent"
+        agent_type = "LLMAgent" if llm_client else "HeuristicAgent"
         logger.info(f"[Game {session.game_id}] Created {len(agents)} {agent_type} agents")
 
         try:
@@ -234,44 +411,28 @@ class GameService:
                 # 广播状态
                 await self._broadcast_state(session)
 
-                # 处理当前阶段
-                if game.phase == GamePhase.NIGHT:
-                    logger.info(f"[Game {session.game_id}] Processing NIGHT phase...")
-                    await self._process_night(session, agents)
-                elif game.phase == GamePhase.DAY_DISCUSSION:
-                    logger.info(f"[Game {session.game_id}] Processing DAY_DISCUSSION phase...")
+                # 处理当前阶段（行动阶段由阶段表给出行动者，空阶段在推进时自动跳过）
+                logger.info(f"[Game {session.game_id}] Processing {game.phase.value} phase...")
+                if game.phase == GamePhase.DAY_DISCUSSION:
                     await self._process_discussion(session, agents)
-                elif game.phase == GamePhase.DAY_VOTE:
-                    logger.info(f"[Game {session.game_id}] Processing DAY_VOTE phase...")
-                    await self._process_vote(session, agents)
                 else:
-                    logger.warning(f"[Game {session.game_id}] Unhandled phase: {game.phase.value}")
+                    await self._process_actions(session, agents)
 
                 # 推进阶段
                 logger.info(f"[Game {session.game_id}] Advancing phase...")
                 result = await game.advance_phase()
+                if result.skipped:
+                    logger.info(f"[Game {session.game_id}] Skipped idle phases: {[p.value for p in result.skipped]}")
                 logger.info(f"[Game {session.game_id}] Phase advanced to: {game.phase.value}")
-
-                # 记录事件
-                event = GameEvent(
-                    round=game.round,
-                    phase=game.phase.value,
-                    event_type="phase_change",
-                    description=f"进入 {game.phase.value} 阶段",
-                )
-                session.events.append(event)
-                if session.on_event:
-                    try:
-                        result = session.on_event(event)
-                        if asyncio.iscoroutine(result):
-                            await result
-                    except Exception as e:
-                        logger.error(f"[Game {session.game_id}] Event callback error: {e}")
+                if game.phase != GamePhase.GAME_OVER:
+                    self._save_checkpoint(session, agents)
 
                 # 控制速度
                 await asyncio.sleep(1.0 / session.speed)
 
             # 游戏结束
+            self._remove_checkpoint(session.game_id)
+            await game.bus.drain()
             logger.info(f"[Game {session.game_id}] Game finished! Winner: {game.get_winner()}")
             session.status = "finished"
             await self._broadcast_state(session)
@@ -282,33 +443,30 @@ class GameService:
             session.status = "error"
             logger.error(f"[Game {session.game_id}] Game error: {e}")
             logger.error(traceback.format_exc())
+        finally:
+            self._close_subscription(session)
 
-    async def _process_night(self, session: GameSession, agents: Dict[int, BaseAgent]):
-        """处理夜间阶段"""
+    async def _process_actions(self, session: GameSession, agents: Dict[int, BaseAgent]):
+        """处理行动阶段（夜间 / 投票 / 猎人开枪等）"""
         game = session.game
-        alive_players = game.get_alive_players()
-        logger.info(f"[Game {session.game_id}] Night: {len(alive_players)} alive players")
+        actors = game.get_active_players()
+        logger.info(f"[Game {session.game_id}] {game.phase.value}: {len(actors)} players acting")
 
-        for player in alive_players:
-            if player.id in agents:
-                logger.info(f"[Game {session.game_id}] Player {player.id} ({player.name}) deciding action...")
+        for player_id in actors:
+            if player_id in agents:
+                logger.info(f"[Game {session.game_id}] Player {player_id} deciding action...")
                 try:
-                    action = await agents[player.id].decide_action()
+                    action = await agents[player_id].decide_action()
                     if action:
-                        result = await game.submit_action(player.id, action)
-                        logger.info(f"[Game {session.game_id}] Player {player.id} action: {action.action_type.value}, result: {result.success}")
-
-                        event = GameEvent(
-                            round=game.round,
-                            phase="night",
-                            event_type="action",
-                            description=f"{player.name} 执行了夜间行动",
-                        )
-                        session.events.append(event)
+                        result = await game.submit_action(player_id, action)
+                        agents[player_id].on_action_result(action, result)
+                        logger.info(f"[Game {session.game_id}] Player {player_id} action: {action.action_type.value} -> {action.target_id}, result: {result.success}")
+                        if agents[player_id].last_fallback:
+                            logger.warning(f"[Game {session.game_id}] Player {player_id} action used fallback ({agents[player_id].last_fallback})")
                     else:
-                        logger.info(f"[Game {session.game_id}] Player {player.id} skipped action")
+                        logger.info(f"[Game {session.game_id}] Player {player_id} skipped action")
                 except Exception as e:
-                    logger.error(f"[Game {session.game_id}] Player {player.id} action error: {e}")
+                    logger.error(f"[Game {session.game_id}] Player {player_id} action error: {e}")
                     logger.error(traceback.format_exc())
 
     async def _process_discussion(self, session: GameSession, agents: Dict[int, BaseAgent]):
@@ -323,45 +481,27 @@ class GameService:
                     logger.info(f"[Game {session.game_id}] Player {player.id} speaking...")
                     speech = await agents[player.id].speak()
                     logger.info(f"[Game {session.game_id}] Player {player.id} said: {speech[:50]}...")
+                    if agents[player.id].last_fallback:
+                        logger.warning(f"[Game {session.game_id}] Player {player.id} speech used fallback ({agents[player.id].last_fallback})")
 
-                    event = GameEvent(
-                        round=game.round,
-                        phase="day_discussion",
-                        event_type="speech",
-                        description=f"{player.name}: {speech}",
-                        details={"player_id": player.id, "content": speech},
-                    )
-                    session.events.append(event)
-                    if session.on_event:
-                        try:
-                            result = session.on_event(event)
-                            if asyncio.iscoroutine(result):
-                                await result
-                        except Exception as e:
-                            logger.error(f"[Game {session.game_id}] Event callback error: {e}")
+                    publish_speech(game, player.id, speech)
 
                     await asyncio.sleep(0.5 / session.speed)
                 except Exception as e:
                     logger.error(f"[Game {session.game_id}] Player {player.id} speak error: {e}")
                     logger.error(traceback.format_exc())
 
-    async def _process_vote(self, session: GameSession, agents: Dict[int, BaseAgent]):
-        """处理投票阶段"""
-        game = session.game
-        alive_players = game.get_alive_players()
-        logger.info(f"[Game {session.game_id}] Vote: {len(alive_players)} players voting")
-
-        for player in alive_players:
-            if player.id in agents:
-                try:
-                    logger.info(f"[Game {session.game_id}] Player {player.id} voting...")
-                    action = await agents[player.id].decide_action()
-                    if action:
-                        result = await game.submit_action(player.id, action)
-                        logger.info(f"[Game {session.game_id}] Player {player.id} voted: {action.target_id}, result: {result.success}")
-                except Exception as e:
-                    logger.error(f"[Game {session.game_id}] Player {player.id} vote error: {e}")
-                    logger.error(traceback.format_exc())
+    async def _forward_event(self, session: GameSession, event: EngineEvent):
+        """把引擎事件转换为前端事件，记录到会话并推送"""
+        view_event = to_view_event(session.game, event)
+        session.events.append(view_event)
+        if session.on_event:
+            try:
+                result = session.on_event(view_event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"[Game {session.game_id}] Event callback error: {e}")
 
     async def _broadcast_state(self, session: GameSession):
         """广播游戏状态"""
@@ -412,9 +552,12 @@ class GameService:
             phase=game.phase.value,
             round=game.round,
             players=players,
-            alive_count=len(game.get_alive_players()),
+            alive_count=game.get_alive_count(),
             events=session.events[-20:],  # 最近20条事件
             winner=game.get_winner().value if game.phase == GamePhase.GAME_OVER else None,
+            legal_actions=(
+                game.get_legal_actions(viewer_id).to_dict() if viewer_id is not None else None
+            ),
         )
 
     async def pause_game(self, game_id: str) -> bool:
@@ -433,6 +576,17 @@ class GameService:
             return True
         return False
 
+    async def delete_game(self, game_id: str) -> bool:
+        """删除游戏（停止运行中的对局并关闭事件订阅）"""
+        async with self._lock:
+            session = self.sessions.pop(game_id, None)
+        if session is None:
+            return False
+        if session.runner_task is not None and not session.runner_task.done():
+            session.runner_task.cancel()
+        self._close_subscription(session)
+        return True
+
     async def set_speed(self, game_id: str, speed: float) -> bool:
         """设置游戏速度"""
         session = await self.get_session(game_id)
@@ -3,12 +3,22 @@
 
 from werewolf.agents.base import BaseAgent
 from werewolf.agents.random_agent import RandomAgent
+from werewolf.agents.heuristic_agent import HeuristicAgent
+from werewolf.agents.belief import BeliefTracker, NightDeath, SeerClaim
+from werewolf.agents.ismcts_agent import ISMCTSAgent
 from werewolf.agents.llm_agent import LLMAgent
+from werewolf.agents.wolf_pack import WolfPack
 from werewolf.agents.human_agent import HumanAgent
 
 __all__ = [
     "BaseAgent",
     "RandomAgent",
+    "HeuristicAgent",
+    "ISMCTSAgent",
+    "BeliefTracker",
+    "NightDeath",
+    "SeerClaim",
     "LLMAgent",
+    "WolfPack",
     "HumanAgent",
 ]
@@ -3,11 +3,11 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Any, Dict, Optional, List
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game, PlayerView
-    from werewolf.core.events import Action
+    from werewolf.core.events import Action, ActionResult
 
 
 class BaseAgent(ABC):
@@ -22,6 +22,12 @@ class BaseAgent(ABC):
         name: Agent 名称（用于日志）
     """
 
+    # 未指定名称时的默认名称前缀（名称为 "{前缀}_{player_id}"）
+    name_prefix = "Agent"
+
+    # 上一次决策 / 发言改用后备策略的原因（如 "timeout"），未使用时为 None
+    last_fallback: Optional[str] = None
+
     def __init__(self, player_id: int, game: Game, name: Optional[str] = None):
         """
         Args:
@@ -31,7 +37,24 @@ class BaseAgent(ABC):
         """
         self.player_id = player_id
         self.game = game
-        self.name = name or f"Agent_{player_id}"
+        self._custom_name = name
+        self.name = name or f"{self.name_prefix}_{player_id}"
+
+    def rebind(self, game: Game, player_id: int, seed: Optional[int] = None) -> None:
+        """
+        绑定到新对局的座位（AgentPool 跨对局复用 Agent）
+
+        清空上一局的对局状态，保留与对局无关的资源（LLM 客户端、
+        预计算的提示词片段等）。子类覆盖时应先调用 super().rebind()。
+
+        Args:
+            game: 新的游戏实例
+            player_id: 新的座位
+            seed: 新的随机种子（None 表示沿用当前随机数状态）
+        """
+        self.player_id = player_id
+        self.game = game
+        self.name = self._custom_name or f"{self.name_prefix}_{player_id}"
 
     @abstractmethod
     async def decide_action(self) -> Action:
@@ -53,6 +76,26 @@ class BaseAgent(ABC):
         """
         pass
 
+    def on_action_result(self, action: Action, result: ActionResult) -> None:
+        """
+        行动提交后由运行器回调（如预言家的查验结果在 result.data 中）
+
+        默认忽略；需要记录私有信息的 Agent 可以覆盖。
+        """
+        pass
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        导出需要随检查点保存的内部状态（需可 pickle）
+
+        无状态的 Agent 返回空字典；有对话记忆、随机数等状态的子类应覆盖。
+        """
+        return {}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """从检查点恢复 get_state() 导出的状态"""
+        pass
+
     def get_view(self) -> PlayerView:
         """
         获取玩家视角
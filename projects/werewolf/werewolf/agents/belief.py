@@ -0,0 +1,455 @@
+# ==================== 身份推断 ====================
+"""
+BeliefTracker：单个玩家视角下对全体角色分配的后验
+
+假设空间是与该玩家已知信息一致的所有角色分配（每个座位一个角色，
+角色数量与配置一致）。观测分两类：
+
+- 硬信息：自己的角色、狼队友、查验结果、公开的身份 —— 直接剔除矛盾的分配
+- 软信息：夜间死亡、预言家声明等 —— 按似然调整分配的权重
+
+小配置（默认不超过 DEFAULT_MAX_EXACT 种分配）精确枚举；
+更大的配置用带权粒子近似，有效样本数过低时重采样并做交换移动恢复多样性。
+每个观测只遍历一次假设集合，边缘概率按需计算并缓存。
+"""
+
+from __future__ import annotations
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterator, List, Mapping,
+    Optional, Sequence, Set, Tuple,
+)
+
+from werewolf.core.enums import GamePhase, RoleType
+
+if TYPE_CHECKING:
+    from werewolf.core.game import PlayerView
+
+# 角色分配：座位 -> 角色
+Assignment = Tuple[RoleType, ...]
+Likelihood = Callable[[Assignment], float]
+
+# 精确枚举的分配数上限（9 人局任意视角最多 3360 种）
+DEFAULT_MAX_EXACT = 20000
+# 粒子数
+DEFAULT_PARTICLES = 2000
+
+# 似然参数
+NIGHT_DEATH_WOLF = 0.2   # 夜间死亡者是狼人的相对似然（狼人很少自刀，只可能被毒）
+CLAIM_BY_SEER = 0.8      # 真预言家跳身份的概率
+CLAIM_BY_WOLF = 0.3      # 狼人悍跳的概率
+CLAIM_BY_OTHER = 0.02    # 其他好人冒充预言家的概率
+CLAIM_LIE = 1e-3         # 真预言家报错查验结果的概率
+
+_WOLF = RoleType.WEREWOLF
+
+
+# ==================== 软信息似然 ====================
+
+@dataclass(frozen=True)
+class NightDeath:
+    """夜间死亡：死者是狼人的似然较低"""
+    player_id: int
+    wolf_factor: float = NIGHT_DEATH_WOLF
+
+    def __call__(self, assignment: Assignment) -> float:
+        return self.wolf_factor if assignment[self.player_id] == _WOLF else 1.0
+
+
+@dataclass(frozen=True)
+class SeerClaim:
+    """
+    预言家声明
+
+    声称者是真预言家时查验结果应全部属实；是狼人时视为悍跳，结果不提供信息；
+    其他好人冒充的概率很低。同一声称者后续公布的新结果（first=False）
+    只计入结果是否属实，不重复计入跳身份本身。
+    """
+    claimer: int
+    results: Tuple[Tuple[int, bool], ...] = ()
+    first: bool = True
+
+    def __call__(self, assignment: Assignment) -> float:
+        role = assignment[self.claimer]
+        if role == RoleType.SEER:
+            lies = sum(1 for pid, is_wolf in self.results if (assignment[pid] == _WOLF) != is_wolf)
+            return (CLAIM_BY_SEER if self.first else 1.0) * CLAIM_LIE ** lies
+        if not self.first:
+            return 1.0
+        return CLAIM_BY_WOLF if role == _WOLF else CLAIM_BY_OTHER
+
+
+class BeliefTracker:
+    """
+    身份推断
+
+    Example:
+        beliefs = BeliefTracker.from_view(view)
+        beliefs.observe_faction(3, is_wolf=True)      # 自己的查验结果
+        beliefs.observe(SeerClaim(5, ((2, False),)))  # 5 号跳预言家，给 2 号金水
+        beliefs.wolf_prob(4)
+    """
+
+    def __init__(
+        self,
+        roles: Sequence[RoleType],
+        player_id: int,
+        own_role: RoleType,
+        teammates: Sequence[int] = (),
+        *,
+        max_exact: int = DEFAULT_MAX_EXACT,
+        particles: int = DEFAULT_PARTICLES,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            roles: 配置中的全部角色
+            player_id: 视角玩家
+            own_role: 视角玩家的角色
+            teammates: 狼队友（狼人视角）
+            max_exact: 分配数不超过此值时精确枚举
+            particles: 粒子数（近似模式）
+            seed: 随机种子（粒子采样）
+        """
+        self.roles: Tuple[RoleType, ...] = tuple(roles)
+        self.player_id = player_id
+        self.own_role = own_role
+        self.teammates: Tuple[int, ...] = tuple(teammates)
+        self.max_exact = max_exact
+        self.n_particles = particles
+        self.rng = random.Random(seed)
+        self._rng_start = self.rng.getstate()
+
+        # 已处理的观测（用于 get_state / load_state 重放）
+        self.observations: List[Tuple[Any, ...]] = []
+        self._dead: Set[int] = set()
+        self._claims: Dict[int, Dict[int, bool]] = {}
+        self._reset()
+
+    @classmethod
+    def from_view(cls, view: PlayerView, **kwargs: Any) -> BeliefTracker:
+        """从玩家视角创建（自己的角色与狼队友作为初始硬信息）"""
+        roles = [RoleType(r) for r in view.role_config]
+        teammates = [m["id"] for m in view.teammates or () if m["id"] != view.my_id]
+        tracker = cls(roles, view.my_id, view.my_role.role_type, teammates, **kwargs)
+        tracker.sync(view)
+        return tracker
+
+    def _reset(self) -> None:
+        """按初始硬信息建立假设集合"""
+        n = len(self.roles)
+        self._allowed: Dict[int, FrozenSet[RoleType]] = {self.player_id: frozenset({self.own_role})}
+        for mate in self.teammates:
+            self._allowed[mate] = frozenset({_WOLF})
+        if self.own_role == _WOLF:
+            # 狼人知道全部队友：其余座位都不是狼
+            non_wolf = frozenset(set(self.roles) - {_WOLF})
+            for pid in range(n):
+                if pid != self.player_id and pid not in self.teammates:
+                    self._allowed[pid] = non_wolf
+        self._soft: List[Likelihood] = []
+
+        total = _count_assignments(self.roles, self._allowed)
+        if total == 0:
+            raise ValueError("初始信息与角色配置矛盾")
+        self.exact = total <= self.max_exact
+        if self.exact:
+            self._hyps: List[Assignment] = list(_enumerate(self.roles, self._allowed))
+        else:
+            self._hyps = [self._sample_prior() for _ in range(self.n_particles)]
+        self._weights: List[float] = [1.0] * len(self._hyps)
+        self._marginals: Optional[List[Dict[RoleType, float]]] = None
+
+    # ==================== 观测 ====================
+
+    def observe_role(self, player_id: int, role: RoleType) -> None:
+        """硬信息：确知某玩家的角色"""
+        self.observations.append(("role", player_id, role))
+        self._constrain(player_id, frozenset({role}))
+
+    def observe_faction(self, player_id: int, is_wolf: bool) -> None:
+        """硬信息：确知某玩家是否为狼人（如自己的查验结果）"""
+        self.observations.append(("faction", player_id, is_wolf))
+        roles = {_WOLF} if is_wolf else set(self.roles) - {_WOLF}
+        self._constrain(player_id, frozenset(roles))
+
+    def observe(self, likelihood: Likelihood) -> None:
+        """
+        软信息：按似然调整权重
+
+        Args:
+            likelihood: 分配 -> 非负似然（需可 pickle 才能随检查点保存，
+                        如 NightDeath / SeerClaim）
+        """
+        self.observations.append(("soft", likelihood))
+        self._apply(likelihood)
+
+    def _apply(self, likelihood: Likelihood) -> None:
+        """乘上软信息似然"""
+        self._soft.append(likelihood)
+        weights = self._weights
+        for i, assignment in enumerate(self._hyps):
+            weights[i] *= likelihood(assignment)
+        self._marginals = None
+        if sum(weights) <= 0:
+            raise ValueError("观测与所有角色分配矛盾")
+        if not self.exact:
+            self._maybe_resample()
+
+    def observe_death(self, player_id: int, at_night: bool) -> None:
+        """玩家死亡（夜间死亡作为软信息：死者不太可能是狼人）"""
+        if player_id in self._dead:
+            return
+        self._dead.add(player_id)
+        self.observations.append(("death", player_id, at_night))
+        if at_night and player_id != self.player_id:
+            self._apply(NightDeath(player_id))
+
+    def observe_seer_claim(self, claimer: int, results: Mapping[int, bool]) -> None:
+        """
+        某玩家声称预言家并公布查验结果
+
+        同一声称者重复发言时只计入新公布的结果。
+        """
+        if claimer == self.player_id:
+            return
+        first = claimer not in self._claims
+        known = self._claims.setdefault(claimer, {})
+        new = tuple(sorted(
+            (pid, is_wolf) for pid, is_wolf in results.items()
+            if pid not in known and pid != claimer
+        ))
+        if not first and not new:
+            return
+        known.update(new)
+        self.observations.append(("claim", claimer, new))
+        self._apply(SeerClaim(claimer, new, first))
+
+    def sync(self, view: PlayerView) -> None:
+        """
+        从玩家视角增量同步公开信息（新的死亡）
+
+        白天阶段发现的死亡视为夜间死亡。
+        """
+        night = view.phase in (GamePhase.DAY_DISCUSSION, GamePhase.DAY_VOTE)
+        for p in view.alive_players:
+            if not p["is_alive"] and p["id"] not in self._dead:
+                self.observe_death(p["id"], night)
+
+    def _constrain(self, player_id: int, roles: FrozenSet[RoleType]) -> None:
+        """收紧座位的可选角色并剔除矛盾的分配"""
+        allowed = self._allowed.get(player_id, frozenset(self.roles)) & roles
+        if not allowed:
+            raise ValueError(f"观测与已知信息矛盾: 玩家 {player_id}")
+        self._allowed[player_id] = allowed
+
+        keep = [(h, w) for h, w in zip(self._hyps, self._weights) if h[player_id] in allowed]
+        if not self.exact and len(keep) < self.n_particles // 2:
+            # 粒子不足：从约束后的先验补充，权重为全部软信息的似然
+            keep.extend(
+                (h, self._soft_weight(h))
+                for h in (self._sample_prior() for _ in range(self.n_particles - len(keep)))
+            )
+        if not keep or sum(w for _, w in keep) <= 0:
+            raise ValueError("观测与所有角色分配矛盾")
+        self._hyps = [h for h, _ in keep]
+        self._weights = [w for _, w in keep]
+        self._marginals = None
+
+    # ==================== 查询 ====================
+
+    def role_probs(self, player_id: int) -> Dict[RoleType, float]:
+        """某玩家各角色的后验概率"""
+        return dict(self._get_marginals()[player_id])
+
+    def wolf_prob(self, player_id: int) -> float:
+        """某玩家是狼人的后验概率"""
+        return self._get_marginals()[player_id].get(_WOLF, 0.0)
+
+    def wolf_probs(self) -> Dict[int, float]:
+        """所有玩家是狼人的后验概率"""
+        return {pid: m.get(_WOLF, 0.0) for pid, m in enumerate(self._get_marginals())}
+
+    def most_likely_wolves(self, alive_only: bool = True) -> List[int]:
+        """按狼人概率降序排列的玩家（不含自己）"""
+        probs = self.wolf_probs()
+        candidates = [
+            pid for pid in probs
+            if pid != self.player_id and not (alive_only and pid in self._dead)
+        ]
+        return sorted(candidates, key=lambda pid: (-probs[pid], pid))
+
+    def sample(self, rng: Optional[random.Random] = None) -> Assignment:
+        """按后验抽取一个角色分配（用于搜索中的确定化）"""
+        rng = rng or self.rng
+        return rng.choices(self._hyps, weights=self._weights)[0]
+
+    @property
+    def size(self) -> int:
+        """假设（或粒子）数量"""
+        return len(self._hyps)
+
+    def summary(self, names: Optional[Mapping[int, str]] = None, top: int = 5) -> str:
+        """
+        推断摘要（供 LLM 提示词使用）
+
+        Args:
+            names: player_id -> 名称
+            top: 列出狼人概率最高的玩家数
+        """
+        probs = self.wolf_probs()
+        lines = ["### 身份推断（狼人概率）", ""]
+        for pid in self.most_likely_wolves()[:top]:
+            name = f" {names[pid]}" if names and pid in names else ""
+            lines.append(f"- {pid}号{name}: {probs[pid]:.0%}")
+        return "\n".join(lines)
+
+    # ==================== 状态 ====================
+
+    def get_state(self) -> Dict[str, Any]:
+        """导出观测记录（恢复时重放，需可 pickle）"""
+        return {"observations": list(self.observations), "rng": self._rng_start}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """从 get_state() 的结果恢复：重建假设集合并重放观测"""
+        if "rng" in state:
+            self._rng_start = state["rng"]
+        self.rng.setstate(self._rng_start)
+        self.observations = []
+        self._dead = set()
+        self._claims = {}
+        self._reset()
+        for entry in state.get("observations", ()):
+            kind = entry[0]
+            if kind == "role":
+                self.observe_role(entry[1], entry[2])
+            elif kind == "faction":
+                self.observe_faction(entry[1], entry[2])
+            elif kind == "death":
+                self.observe_death(entry[1], entry[2])
+            elif kind == "claim":
+                self.observe_seer_claim(entry[1], dict(entry[2]))
+            else:
+                self.observe(entry[1])
+
+    # ==================== 内部 ====================
+
+    def _get_marginals(self) -> List[Dict[RoleType, float]]:
+        if self._marginals is None:
+            n = len(self.roles)
+            acc: List[Dict[RoleType, float]] = [{} for _ in range(n)]
+            total = 0.0
+            for assignment, weight in zip(self._hyps, self._weights):
+                if not weight:
+                    continue
+                total += weight
+                for pid in range(n):
+                    seat = acc[pid]
+                    role = assignment[pid]
+                    seat[role] = seat.get(role, 0.0) + weight
+            for seat in acc:
+                for role in seat:
+                    seat[role] /= total
+            self._marginals = acc
+        return self._marginals
+
+    def _soft_weight(self, assignment: Assignment) -> float:
+        weight = 1.0
+        for likelihood in self._soft:
+            weight *= likelihood(assignment)
+        return weight
+
+    def _sample_prior(self) -> Assignment:
+        """从满足硬信息的均匀先验中抽样（固定座位直接填入，其余拒绝采样）"""
+        n = len(self.roles)
+        fixed = {pid: next(iter(r)) for pid, r in self._allowed.items() if len(r) == 1}
+        pool = list((Counter(self.roles) - Counter(fixed.values())).elements())
+        free = [pid for pid in range(n) if pid not in fixed]
+        assignment = [None] * n
+        for pid, role in fixed.items():
+            assignment[pid] = role
+        constraints = [(i, self._allowed[pid]) for i, pid in enumerate(free) if pid in self._allowed]
+        for _ in range(10000):
+            self.rng.shuffle(pool)
+            if all(pool[i] in options for i, options in constraints):
+                break
+        else:
+            raise ValueError("无法采样满足已知信息的角色分配")
+        for i, pid in enumerate(free):
+            assignment[pid] = pool[i]
+        return tuple(assignment)
+
+    def _maybe_resample(self) -> None:
+        """有效样本数低于一半时重采样，并用座位交换的 MH 移动恢复多样性"""
+        weights = self._weights
+        total = sum(weights)
+        ess = total * total / sum(w * w for w in weights)
+        if ess >= len(weights) / 2:
+            return
+
+        rng = self.rng
+        particles = rng.choices(self._hyps, weights=weights, k=self.n_particles)
+        free = [pid for pid in range(len(self.roles))
+                if len(self._allowed.get(pid, self.roles)) > 1]
+        if len(free) >= 2:
+            allowed = self._allowed
+            moved = []
+            for assignment in particles:
+                a, b = rng.sample(free, 2)
+                ra, rb = assignment[a], assignment[b]
+                if ra != rb and rb in allowed.get(a, (rb,)) and ra in allowed.get(b, (ra,)):
+                    proposal = list(assignment)
+                    proposal[a], proposal[b] = rb, ra
+                    proposal = tuple(proposal)
+                    current = self._soft_weight(assignment)
+                    new = self._soft_weight(proposal)
+                    if current <= 0 or rng.random() < new / current:
+                        assignment = proposal
+                moved.append(assignment)
+            particles = moved
+        self._hyps = particles
+        self._weights = [1.0] * len(particles)
+        self._marginals = None
+
+
+# ==================== 枚举 ====================
+
+def _count_assignments(
+    roles: Sequence[RoleType], allowed: Mapping[int, FrozenSet[RoleType]],
+) -> int:
+    """满足约束的分配数的上界（只扣除固定座位的多重排列数）"""
+    fixed = [next(iter(r)) for r in allowed.values() if len(r) == 1]
+    pool = Counter(roles) - Counter(fixed)
+    if sum(pool.values()) != len(roles) - len(fixed):
+        return 0
+    count = math.factorial(sum(pool.values()))
+    for c in pool.values():
+        count //= math.factorial(c)
+    return count
+
+
+def _enumerate(
+    roles: Sequence[RoleType], allowed: Mapping[int, FrozenSet[RoleType]],
+) -> Iterator[Assignment]:
+    """按座位顺序枚举满足约束的全部不同分配"""
+    n = len(roles)
+    counts = Counter(roles)
+    assignment: List[Optional[RoleType]] = [None] * n
+    order = sorted(counts, key=lambda r: r.value)
+
+    def fill(pid: int) -> Iterator[Assignment]:
+        if pid == n:
+            yield tuple(assignment)
+            return
+        options = allowed.get(pid)
+        for role in order:
+            if counts[role] and (options is None or role in options):
+                counts[role] -= 1
+                assignment[pid] = role
+                yield from fill(pid + 1)
+                counts[role] += 1
+
+    yield from fill(0)
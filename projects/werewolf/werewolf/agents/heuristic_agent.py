@@ -0,0 +1,387 @@
+# ==================== 规则 Agent ====================
+"""基于规则的启发式 Agent：不调用 LLM 的快速基线"""
+
+from __future__ import annotations
+import random
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from werewolf.agents.base import BaseAgent
+from werewolf.core.enums import ActionType, EventType, Faction, GamePhase, RoleType
+from werewolf.core.events import Action, ActionResult
+from werewolf.core.legal import iter_bits
+
+if TYPE_CHECKING:
+    from werewolf.core.game import Game, PlayerView
+    from werewolf.core.events import GameEvent
+    from werewolf.core.event_bus import Subscription
+    from werewolf.core.legal import ActionMask
+
+
+# 发言解析：身份声明 / 查验结果 / 怀疑对象
+_CLAIM_SEER = re.compile(r"我是预言家")
+_CHECK_RESULT = re.compile(r"(\d+)\s*号[^，。,.；;!！]{0,8}?(狼人|查杀|好人|金水)")
+_SUSPECT = re.compile(r"怀疑\s*(\d+)\s*号")
+
+# 嫌疑分权重
+CLAIM_WOLF_WEIGHT = 2.0      # 预言家报查杀
+CLAIM_GOOD_WEIGHT = -1.0     # 预言家报金水
+COUNTER_CLAIM_WEIGHT = 1.0   # 出现对跳时每个声称者
+SUSPECT_WEIGHT = 0.3         # 发言中被怀疑
+VOTE_TRUSTED_WEIGHT = 0.5    # 投票给可信玩家
+POISON_THRESHOLD = 2.0       # 女巫用毒的最低嫌疑分
+SHOOT_THRESHOLD = 0.5        # 猎人开枪的最低嫌疑分
+
+
+def _shared_order(target_id: int, round_num: int) -> int:
+    """同一回合内各狼人一致的打散顺序（狼刀按多数决，需要统一目标）"""
+    return (target_id * 2654435761 + round_num * 40503) & 0xFFFFFFFF
+
+
+class HeuristicAgent(BaseAgent):
+    """
+    规则 Agent
+
+    增量维护公开信息（预言家声明与查验、发言中的怀疑、投票、夜间死亡），
+    每个决策只做常数次字典查找和一次合法目标遍历，决策延迟为微秒级。
+    可用于：
+    - 比 RandomAgent 更有意义的基线
+    - Benchmark 和 Web 对局中无需模型调用的填充座位
+
+    公开信息的来源：
+    - 发言和投票结果：订阅 game.bus（只订阅这两类公开事件）
+    - 死亡：对比玩家视角中的存活状态
+    - 自己的查验结果：运行器调用 on_action_result
+    """
+
+    name_prefix = "HeuristicBot"
+
+    def __init__(
+        self,
+        player_id: int,
+        game: Game,
+        name: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            player_id: 玩家ID
+            game: 游戏实例
+            name: Agent 名称
+            seed: 随机种子（只用于平局打散和发言措辞）
+        """
+        super().__init__(player_id, game, name)
+        self.rng = random.Random(seed)
+        self._subscription: Optional[Subscription] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """清空对局信息并订阅当前对局的事件总线"""
+        # 嫌疑分：正数越大越像狼人
+        self.suspicion: Dict[int, float] = {}
+        # 确知的身份：player_id -> 是否狼人（狼队友 / 自己的查验）
+        self.known: Dict[int, bool] = {}
+        # 声称预言家的玩家 -> {目标: 是否报查杀}
+        self.seer_claims: Dict[int, Dict[int, bool]] = {}
+        # 发言中的怀疑：发言者 -> 被怀疑者集合
+        self.accusations: Dict[int, Set[int]] = {}
+        # 已知死亡的玩家 -> 是否为夜间死亡
+        self.dead: Dict[int, bool] = {}
+        self.claimed = False
+
+        if self._subscription is not None:
+            self._subscription.close()
+        self._subscription = self.game.bus.subscribe(
+            self._on_public_event,
+            topics=[EventType.PLAYER_SPEECH, EventType.VOTE_RESULT],
+            is_async=False,
+        )
+
+    def rebind(self, game: Game, player_id: int, seed: Optional[int] = None) -> None:
+        super().rebind(game, player_id, seed)
+        if seed is not None:
+            self.rng.seed(seed)
+        self._reset()
+
+    # ==================== 状态 ====================
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "rng": self.rng.getstate(),
+            "suspicion": dict(self.suspicion),
+            "known": dict(self.known),
+            "seer_claims": {pid: dict(r) for pid, r in self.seer_claims.items()},
+            "accusations": {pid: set(s) for pid, s in self.accusations.items()},
+            "dead": dict(self.dead),
+            "claimed": self.claimed,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        if "rng" in state:
+            self.rng.setstate(state["rng"])
+        self.suspicion = dict(state.get("suspicion", {}))
+        self.known = dict(state.get("known", {}))
+        self.seer_claims = {pid: dict(r) for pid, r in state.get("seer_claims", {}).items()}
+        self.accusations = {pid: set(s) for pid, s in state.get("accusations", {}).items()}
+        self.dead = dict(state.get("dead", {}))
+        self.claimed = state.get("claimed", False)
+
+    # ==================== 信息收集 ====================
+
+    def on_action_result(self, action: Action, result: ActionResult) -> None:
+        """记录自己的查验结果"""
+        if result.success and action.action_type == ActionType.CHECK:
+            self.known[action.target_id] = bool(result.data.get("is_werewolf"))
+
+    def _on_public_event(self, event: GameEvent) -> None:
+        """事件总线回调：发言和投票结果"""
+        if event.kind == EventType.PLAYER_SPEECH:
+            speaker = event.data.get("player_id")
+            if speaker is not None and speaker != self.player_id:
+                self._observe_speech(speaker, event.data.get("content", ""))
+        elif event.kind == EventType.VOTE_RESULT:
+            for voter, target in event.data.get("votes", {}).items():
+                if target is not None:
+                    self._observe_vote(int(voter), target)
+
+    def _observe_speech(self, speaker: int, content: str) -> None:
+        """解析发言中的身份声明、查验结果和怀疑"""
+        if _CLAIM_SEER.search(content):
+            if speaker not in self.seer_claims:
+                self.seer_claims[speaker] = {}
+                if self._is_self_seer():
+                    # 真预言家看到对跳者：对方必然是狼
+                    self._add(speaker, CLAIM_WOLF_WEIGHT * 2)
+                if len(self.seer_claims) > 1:
+                    for claimer in self.seer_claims:
+                        self._add(claimer, COUNTER_CLAIM_WEIGHT / 2)
+
+            credibility = 1.0 / len(self.seer_claims)
+            results = self.seer_claims[speaker]
+            for target_str, verdict in _CHECK_RESULT.findall(content):
+                target = int(target_str)
+                if target in results or target == speaker:
+                    continue
+                is_wolf = verdict in ("狼人", "查杀")
+                results[target] = is_wolf
+                weight = CLAIM_WOLF_WEIGHT if is_wolf else CLAIM_GOOD_WEIGHT
+                self._add(target, weight * credibility)
+
+        for target_str in _SUSPECT.findall(content):
+            target = int(target_str)
+            if target != speaker:
+                self.accusations.setdefault(speaker, set()).add(target)
+                self._add(target, SUSPECT_WEIGHT)
+
+    def _observe_vote(self, voter: int, target: int) -> None:
+        """投票给可信玩家（唯一的预言家、确知的好人）的人更可疑"""
+        if voter != self.player_id and self._trusted(target):
+            self._add(voter, VOTE_TRUSTED_WEIGHT)
+
+    def _sync(self, view: PlayerView) -> None:
+        """同步狼队友和新的死亡（增量）"""
+        if not self.known and view.teammates:
+            for mate in view.teammates:
+                self.known[mate["id"]] = True
+
+        night = view.phase == GamePhase.DAY_DISCUSSION
+        for p in view.alive_players:
+            pid = p["id"]
+            if not p["is_alive"] and pid not in self.dead:
+                self.dead[pid] = night
+                if night and pid in self.seer_claims:
+                    # 被刀的预言家声明更可信：查杀对象加重嫌疑
+                    for target, is_wolf in self.seer_claims[pid].items():
+                        if is_wolf:
+                            self._add(target, CLAIM_WOLF_WEIGHT / 2)
+
+    # ==================== 评估 ====================
+
+    def _add(self, player_id: int, delta: float) -> None:
+        self.suspicion[player_id] = self.suspicion.get(player_id, 0.0) + delta
+
+    def _is_self_seer(self) -> bool:
+        return self.get_player().role.role_type == RoleType.SEER
+
+    def _is_wolf(self) -> bool:
+        return self.get_player().role.faction == Faction.WEREWOLF
+
+    def _score(self, player_id: int) -> float:
+        """嫌疑分（确知身份优先）"""
+        known = self.known.get(player_id)
+        if known is not None:
+            return 100.0 if known else -100.0
+        return self.suspicion.get(player_id, 0.0)
+
+    def _trusted(self, player_id: int) -> bool:
+        """是否可信：确知好人，或唯一的预言家声明者"""
+        known = self.known.get(player_id)
+        if known is not None:
+            return not known
+        return len(self.seer_claims) == 1 and player_id in self.seer_claims
+
+    def _pick(self, mask: int, key, exclude: int = 0) -> Optional[int]:
+        """在目标位集中选 key 最大者（随机打散平局）"""
+        best, best_key = None, None
+        for target in iter_bits(mask & ~exclude):
+            k = (key(target), self.rng.random())
+            if best_key is None or k > best_key:
+                best, best_key = target, k
+        return best
+
+    def _team_mask(self) -> int:
+        """自己和已知狼队友的位集（狼人视角）"""
+        mask = 1 << self.player_id
+        for pid, is_wolf in self.known.items():
+            if is_wolf:
+                mask |= 1 << pid
+        return mask
+
+    # ==================== 决策 ====================
+
+    async def decide_action(self) -> Action:
+        """按角色规则选择合法行动"""
+        view = self.get_view()
+        self._sync(view)
+        legal = view.legal_actions
+        if not legal:
+            return Action(ActionType.SKIP, actor_id=self.player_id)
+
+        role_type = view.my_role.role_type
+        if legal.target_mask(ActionType.VOTE):
+            return self._vote(view, legal)
+        if role_type == RoleType.WEREWOLF:
+            return self._wolf_kill(view, legal)
+        if role_type == RoleType.SEER:
+            return self._act(ActionType.CHECK, self._pick(
+                legal.target_mask(ActionType.CHECK),
+                lambda t: self._score(t) if t not in self.known else -1000.0,
+            ))
+        if role_type == RoleType.WITCH:
+            return self._witch(view, legal)
+        if role_type == RoleType.GUARD:
+            return self._guard(view, legal)
+        if role_type == RoleType.HUNTER:
+            target = self._pick(legal.target_mask(ActionType.SHOOT), self._score)
+            if target is not None and self._score(target) >= SHOOT_THRESHOLD:
+                return self._act(ActionType.SHOOT, target)
+        return self._fallback(legal)
+
+    def _act(self, action_type: ActionType, target_id: Optional[int]) -> Action:
+        if target_id is None:
+            return Action(ActionType.SKIP, actor_id=self.player_id)
+        return Action(action_type, actor_id=self.player_id, target_id=target_id)
+
+    def _fallback(self, legal: ActionMask) -> Action:
+        """默认：能跳过就跳过，否则随机选一个合法目标"""
+        if legal.allows(ActionType.SKIP):
+            return Action(ActionType.SKIP, actor_id=self.player_id)
+        action_type = legal.action_types[0]
+        targets = legal.targets(action_type)
+        target = self.rng.choice(targets) if targets else None
+        return Action(action_type, actor_id=self.player_id, target_id=target)
+
+    def _threat(self, player_id: int) -> float:
+        """狼人视角的威胁度：声称预言家 > 指认过狼队友 > 其他"""
+        threat = 0.0
+        if player_id in self.seer_claims:
+            threat += 5.0
+        team = self._team_mask()
+        if any((team >> t) & 1 for t in self.accusations.get(player_id, ())):
+            threat += 2.0
+        return threat
+
+    def _wolf_kill(self, view: PlayerView, legal: ActionMask) -> Action:
+        """狼人：优先刀声称预言家和指认队友的人；各狼人按共享顺序统一目标"""
+        round_num = view.round
+        best, best_key = None, None
+        for target in iter_bits(legal.target_mask(ActionType.KILL) & ~self._team_mask()):
+            k = (self._threat(target), _shared_order(target, round_num))
+            if best_key is None or k > best_key:
+                best, best_key = target, k
+        return self._act(ActionType.KILL, best)
+
+    def _witch(self, view: PlayerView, legal: ActionMask) -> Action:
+        """女巫：首夜或可信玩家被刀时救人；有足够把握时毒嫌疑最高者"""
+        if legal.allows(ActionType.SAVE):
+            wolf_target = view.wolf_target_tonight
+            if view.round == 1 or self._trusted(wolf_target):
+                return Action(ActionType.SAVE, actor_id=self.player_id, target_id=wolf_target)
+
+        poison_mask = legal.target_mask(ActionType.POISON)
+        if poison_mask:
+            target = self._pick(poison_mask, self._score)
+            if target is not None and self._score(target) >= POISON_THRESHOLD:
+                return self._act(ActionType.POISON, target)
+        return Action(ActionType.SKIP, actor_id=self.player_id)
+
+    def _guard(self, view: PlayerView, legal: ActionMask) -> Action:
+        """守卫：守可信的预言家，否则守最不可疑的玩家"""
+        protect_mask = legal.target_mask(ActionType.PROTECT)
+        for pid in self.seer_claims:
+            if self._trusted(pid) and (protect_mask >> pid) & 1:
+                return self._act(ActionType.PROTECT, pid)
+        return self._act(ActionType.PROTECT, self._pick(protect_mask, lambda t: -self._score(t)))
+
+    def _vote(self, view: PlayerView, legal: ActionMask) -> Action:
+        """投票：好人投嫌疑最高者；狼人投威胁最大的非狼人"""
+        vote_mask = legal.target_mask(ActionType.VOTE)
+        if self._is_wolf():
+            target = self._pick(vote_mask, self._threat, exclude=self._team_mask())
+        else:
+            target = self._pick(vote_mask, self._score, exclude=1 << self.player_id)
+        return self._act(ActionType.VOTE, target)
+
+    # ==================== 发言 ====================
+
+    async def speak(self) -> str:
+        """按角色生成包含可解析声明的发言"""
+        view = self.get_view()
+        self._sync(view)
+
+        if self._is_self_seer():
+            checks = {pid: w for pid, w in self.known.items() if pid != self.player_id}
+            if checks and (self.claimed or any(checks.values()) or view.round > 1):
+                self.claimed = True
+                return "我是预言家。" + "，".join(
+                    f"查验 {pid}号 是{'狼人' if is_wolf else '好人'}"
+                    for pid, is_wolf in checks.items()
+                ) + "。"
+
+        if self._is_wolf():
+            speech = self._wolf_speech(view)
+            if speech:
+                return speech
+
+        suspect = self._top_suspect(view)
+        if suspect is not None:
+            return self.rng.choice(("我是好人。", "我是好人，请相信我。")) + f"我怀疑 {suspect}号。"
+        return "我是好人，暂时没有确切的线索。"
+
+    def _wolf_speech(self, view: PlayerView) -> Optional[str]:
+        """狼人：有预言家查杀狼队友时，编号最小的存活狼人对跳并反查杀对方"""
+        team = self._team_mask()
+        for claimer, results in self.seer_claims.items():
+            if (team >> claimer) & 1 or claimer in self.dead:
+                continue
+            if not any(is_wolf and (team >> t) & 1 for t, is_wolf in results.items()):
+                continue
+            alive_team = [p["id"] for p in view.alive_players
+                          if p["is_alive"] and (team >> p["id"]) & 1]
+            if self.claimed or (alive_team and alive_team[0] == self.player_id):
+                self.claimed = True
+                return f"我是预言家，查验 {claimer}号 是狼人，他是假预言家。"
+        return None
+
+    def _top_suspect(self, view: PlayerView) -> Optional[int]:
+        """发言中要怀疑的玩家（狼人避开队友）"""
+        exclude = self._team_mask() if self._is_wolf() else 1 << self.player_id
+        alive = 0
+        for p in view.alive_players:
+            if p["is_alive"]:
+                alive |= 1 << p["id"]
+        key = self._threat if self._is_wolf() else self._score
+        target = self._pick(alive, key, exclude=exclude)
+        if target is None or key(target) <= 0:
+            return None
+        return target
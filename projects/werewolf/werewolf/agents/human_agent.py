@@ -46,8 +46,9 @@ class HumanAgent(BaseAgent):
         print(format_action_prompt(view))
         print("=" * 50)
 
-        # 获取可用行动
-        available = view.available_actions
+        # 获取合法行动（已排除会被拒绝的组合）
+        legal = view.legal_actions
+        available = legal.action_types
         if not available:
             print("你没有可用行动，自动跳过")
             return Action(ActionType.SKIP, actor_id=self.player_id)
@@ -70,9 +71,10 @@ class HumanAgent(BaseAgent):
         # 获取目标（如果需要）
         target_id = None
         if action_type not in (ActionType.SKIP, ActionType.SAVE):
+            legal_targets = legal.target_mask(action_type)
             alive_players = [
                 p for p in view.alive_players
-                if p["is_alive"] and p["id"] != self.player_id
+                if (legal_targets >> p["id"]) & 1
             ]
 
             if alive_players:
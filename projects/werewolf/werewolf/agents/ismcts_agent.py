@@ -0,0 +1,197 @@
+# ==================== ISMCTS Agent ====================
+"""基于信息集蒙特卡洛树搜索的 Agent：不调用 LLM 的强基线"""
+
+from __future__ import annotations
+import asyncio
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from werewolf.agents.belief import BeliefTracker
+from werewolf.agents.heuristic_agent import HeuristicAgent
+from werewolf.core.enums import ActionType, GamePhase, RoleType
+from werewolf.core.events import Action, ActionResult
+from werewolf.sim.fast_game import POISON_POTION, ROLE_CODES, SAVE_POTION, check_phase_rules
+from werewolf.sim.ismcts import DEFAULT_EXPLORATION, SearchPosition, best_move, merge_stats, search
+
+if TYPE_CHECKING:
+    from werewolf.core.game import Game, PlayerView
+
+
+DEFAULT_ITERATIONS = 2000
+DEFAULT_SAMPLES = 256   # 每次决策从后验抽取的确定化样本数
+
+
+class ISMCTSAgent(HeuristicAgent):
+    """
+    ISMCTS Agent
+
+    夜间行动（以及有投票行动时的投票）用信息集 MCTS 选择：
+    按 BeliefTracker 的后验抽取与自己视角一致的角色分配，
+    在 FastGame 上用廉价的随机规则策略模拟到终局，按根节点访问次数决策。
+    发言和公开信息的解析沿用 HeuristicAgent（预言家声明会同步给推断器）。
+
+    预算为迭代次数和/或时间上限；传入进程池时按 workers 份做根并行，
+    决策期间不阻塞事件循环。
+    """
+
+    name_prefix = "ISMCTSBot"
+
+    def __init__(
+        self,
+        player_id: int,
+        game: Game,
+        name: Optional[str] = None,
+        seed: Optional[int] = None,
+        iterations: int = DEFAULT_ITERATIONS,
+        time_limit: Optional[float] = None,
+        samples: int = DEFAULT_SAMPLES,
+        exploration: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        workers: int = 1,
+    ):
+        """
+        Args:
+            player_id: 玩家ID
+            game: 游戏实例
+            name: Agent 名称
+            seed: 随机种子
+            iterations: 每次决策的迭代次数上限
+            time_limit: 每次决策的时间上限（秒），与 iterations 先到者为准
+            samples: 每次决策抽取的确定化样本数
+            exploration: UCB 探索系数（默认见 sim.ismcts.DEFAULT_EXPLORATION）
+            executor: 进程池（可选，用于根并行）
+            workers: 根并行的份数（仅在传入 executor 时生效）
+        """
+        super().__init__(player_id, game, name, seed)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.samples = samples
+        self.exploration = exploration
+        self.executor = executor
+        self.workers = max(1, workers)
+
+        self._beliefs: Optional[BeliefTracker] = None
+        self._belief_state: Optional[Dict[str, Any]] = None
+
+    # ==================== 状态 ====================
+
+    def rebind(self, game: Game, player_id: int, seed: Optional[int] = None) -> None:
+        super().rebind(game, player_id, seed)
+        self._beliefs = None
+        self._belief_state = None
+
+    def get_state(self) -> Dict[str, Any]:
+        state = super().get_state()
+        if self._beliefs is not None:
+            state["beliefs"] = self._beliefs.get_state()
+        elif self._belief_state is not None:
+            state["beliefs"] = self._belief_state
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        super().load_state(state)
+        self._beliefs = None
+        self._belief_state = state.get("beliefs")
+
+    # ==================== 信息收集 ====================
+
+    @property
+    def beliefs(self) -> BeliefTracker:
+        """身份推断器（同步死亡和预言家声明）"""
+        view = self.get_view()
+        if self._beliefs is None:
+            self._beliefs = BeliefTracker.from_view(view, seed=self.rng.getrandbits(32))
+            if self._belief_state is not None:
+                self._beliefs.load_state(self._belief_state)
+                self._belief_state = None
+        self._beliefs.sync(view)
+        for claimer, results in self.seer_claims.items():
+            self._beliefs.observe_seer_claim(claimer, results)
+        return self._beliefs
+
+    def on_action_result(self, action: Action, result: ActionResult) -> None:
+        """记录自己的查验结果"""
+        super().on_action_result(action, result)
+        if result.success and action.action_type == ActionType.CHECK and "is_werewolf" in result.data:
+            self.beliefs.observe_faction(action.target_id, bool(result.data["is_werewolf"]))
+
+    # ==================== 决策 ====================
+
+    async def decide_action(self) -> Action:
+        """合法行动多于一个且阶段受支持时搜索，否则按规则行动"""
+        view = self.get_view()
+        legal = view.legal_actions
+        moves = legal.moves()
+        if len(moves) < 2 or not self._searchable(view):
+            return await super().decide_action()
+
+        self._sync(view)
+        stats = await self._search(view, moves)
+        move = best_move(stats)
+        if move is None:
+            return await super().decide_action()
+
+        action_type, target = move
+        if action_type == ActionType.SAVE:
+            target = view.wolf_target_tonight
+        return Action(action_type, actor_id=self.player_id, target_id=target)
+
+    def _searchable(self, view: PlayerView) -> bool:
+        """FastGame 只支持默认阶段表；猎人开枪等死后行动交给规则"""
+        if view.phase not in (GamePhase.NIGHT, GamePhase.DAY_VOTE) or not self.is_alive():
+            return False
+        try:
+            check_phase_rules(self.game.config)
+        except ValueError:
+            return False
+        return True
+
+    async def _search(self, view: PlayerView, moves: List[Tuple[ActionType, Optional[int]]]):
+        """抽取确定化样本并运行搜索（可选进程池根并行）"""
+        tracker = self.beliefs
+        rng = self.rng
+        samples = [
+            [ROLE_CODES[role.value] for role in tracker.sample(rng)]
+            for _ in range(self.samples)
+        ]
+        position = self._position(view)
+        exploration = DEFAULT_EXPLORATION if self.exploration is None else self.exploration
+
+        if self.executor is None:
+            return search(position, samples, moves, self.iterations, self.time_limit,
+                          exploration, rng.getrandbits(32))
+
+        loop = asyncio.get_running_loop()
+        share = -(-self.iterations // self.workers)
+        futures = [
+            loop.run_in_executor(
+                self.executor, search, position, samples, moves, share,
+                self.time_limit, exploration, rng.getrandbits(32),
+            )
+            for _ in range(self.workers)
+        ]
+        return merge_stats(await asyncio.gather(*futures))
+
+    def _position(self, view: PlayerView):
+        """当前局面中自己可见的部分"""
+        role = view.my_role
+        position = SearchPosition(
+            config=self.game.config,
+            observer=self.player_id,
+            alive=self.game.alive_mask,
+            phase=view.phase,
+            round_num=view.round,
+            wolf_target=view.wolf_target_tonight,
+        )
+        if role.role_type == RoleType.WITCH:
+            position.potions = (
+                (SAVE_POTION if role.state.has_save_potion else 0)
+                | (POISON_POTION if role.state.has_poison_potion else 0)
+            )
+        elif role.role_type == RoleType.GUARD:
+            last = role.last_protected_id
+            position.guard_last = -1 if last is None else last
+        elif role.role_type == RoleType.HUNTER:
+            position.can_shoot = role.can_shoot
+        return position
+
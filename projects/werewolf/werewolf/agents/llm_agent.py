@@ -2,14 +2,17 @@
 """基于 LLM 的智能 Agent"""
 
 from __future__ import annotations
+import asyncio
 import json
 import logging
-from typing import TYPE_CHECKING, Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, List, Dict, Any, Tuple, TypeVar
 
 from werewolf.agents.base import BaseAgent
-from werewolf.core.enums import ActionType
-from werewolf.core.events import Action
-from werewolf.llm.base import BaseLLMClient, Message, ToolCall
+from werewolf.agents.belief import BeliefTracker
+from werewolf.agents.heuristic_agent import HeuristicAgent
+from werewolf.core.enums import ActionType, GamePhase
+from werewolf.core.events import Action, ActionResult
+from werewolf.llm.base import BaseLLMClient, Message, ToolCall, ToolDefinition
 from werewolf.llm.tools import get_tool_definitions
 from werewolf.prompts.system import build_system_prompt
 from werewolf.prompts.role_prompts import get_role_prompt
@@ -18,13 +21,20 @@ from werewolf.prompts.templates import (
     format_player_info,
     format_history,
     format_action_prompt,
+    format_legal_actions,
+    format_pack_prompt,
 )
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
+    from werewolf.agents.wolf_pack import WolfPack
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+DEFAULT_SPEECH = "我暂时没有什么想说的。"
+
 
 class LLMAgent(BaseAgent):
     """
@@ -32,6 +42,10 @@ class LLMAgent(BaseAgent):
 
     使用大语言模型进行决策的智能 Agent。
     支持 ReAct 模式：多轮思考 + 工具调用。
+
+    设置 deadline 后每次决策 / 发言限时：超时的 LLM 请求被取消，
+    改由后备策略（默认 HeuristicAgent，单次决策约十微秒）给出结果；
+    LLM 请求出错或达到最大轮次时同样使用后备策略。原因记录在 last_fallback 中。
     """
 
     def __init__(
@@ -43,6 +57,9 @@ class LLMAgent(BaseAgent):
         persona: Optional[str] = None,
         max_turns: int = 5,
         temperature: float = 0.7,
+        pack: Optional[WolfPack] = None,
+        deadline: Optional[float] = None,
+        fallback: Optional[BaseAgent] = None,
     ):
         """
         Args:
@@ -53,16 +70,78 @@ class LLMAgent(BaseAgent):
             persona: 个性化设定
             max_turns: 最大对话轮次
             temperature: LLM 温度参数
+            pack: 狼队联合决策（狼人夜间共享一次 LLM 对话决定击杀目标）
+            deadline: 每次决策 / 发言的时间上限（秒），None 表示不限时
+            fallback: 后备策略（同一座位的 Agent）；设置了 deadline 时默认为 HeuristicAgent
         """
         super().__init__(player_id, game, name)
         self.llm = llm_client
         self.persona = persona
         self.max_turns = max_turns
         self.temperature = temperature
-
+        self.pack = pack
+        self.deadline = deadline
+        if fallback is None and deadline is not None:
+            fallback = HeuristicAgent(player_id, game, seed=player_id)
+        self.fallback = fallback
+        # 使用后备策略的次数（按原因）
+        self.fallback_counts: Dict[str, int] = {}
+
+        # 系统提示词按角色缓存（与对局无关，rebind 后保留）
+        self._system_messages: Dict[str, Message] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        """清空对局相关的状态"""
         # 对话历史（可选保留跨阶段记忆）
         self.memory: List[Dict[str, Any]] = []
 
+        # 身份推断（首次决策时按视角创建，摘要附在行动请求中）
+        self._beliefs: Optional[BeliefTracker] = None
+        self._belief_state: Optional[Dict[str, Any]] = None
+
+    def rebind(self, game: Game, player_id: int, seed: Optional[int] = None) -> None:
+        super().rebind(game, player_id, seed)
+        if self.fallback is not None:
+            self.fallback.rebind(game, player_id, seed)
+        self._reset()
+
+    @property
+    def beliefs(self) -> BeliefTracker:
+        """身份推断器（增量同步公开的死亡信息）"""
+        view = self.get_view()
+        if self._beliefs is None:
+            self._beliefs = BeliefTracker.from_view(view, seed=self.player_id)
+            if self._belief_state is not None:
+                self._beliefs.load_state(self._belief_state)
+                self._belief_state = None
+        self._beliefs.sync(view)
+        return self._beliefs
+
+    def on_action_result(self, action: Action, result: ActionResult) -> None:
+        """记录自己的查验结果"""
+        if self.fallback is not None:
+            self.fallback.on_action_result(action, result)
+        if result.success and action.action_type == ActionType.CHECK and "is_werewolf" in result.data:
+            self.beliefs.observe_faction(action.target_id, bool(result.data["is_werewolf"]))
+
+    def get_state(self) -> Dict[str, Any]:
+        # 每次决策都按当前视角重建提示词，没有需要保存的对话记录
+        state: Dict[str, Any] = {}
+        if self._beliefs is not None:
+            state["beliefs"] = self._beliefs.get_state()
+        elif self._belief_state is not None:
+            state["beliefs"] = self._belief_state
+        if self.fallback is not None:
+            state["fallback"] = self.fallback.get_state()
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self._beliefs = None
+        self._belief_state = state.get("beliefs")
+        if self.fallback is not None and "fallback" in state:
+            self.fallback.load_state(state["fallback"])
+
     async def decide_action(self) -> Action:
         """
         使用 ReAct 模式决定行动
@@ -72,20 +151,56 @@ class LLMAgent(BaseAgent):
         2. LLM 思考 + 调用工具获取信息
         3. 执行工具，返回结果
         4. 重复直到 LLM 调用 submit_action
+
+        设置了 pack 的狼人在夜间改为取得狼队的联合决策。
         """
+        action = await self._bounded(self._decide_action(), self._fallback_action)
+        if action is not None:
+            return action
+
+        # 达到最大轮次且没有后备策略，默认跳过
+        logger.warning(f"[{self.name}] 达到最大轮次，默认跳过")
+        return Action(ActionType.SKIP, actor_id=self.player_id)
+
+    async def _decide_action(self) -> Optional[Action]:
+        """LLM 决策（达到最大轮次时返回 None）"""
         view = self.get_view()
-        phase = view.phase.value
 
-        # 构建消息
+        if (
+            self.pack is not None
+            and view.phase == GamePhase.NIGHT
+            and view.legal_actions.target_mask(ActionType.KILL)
+        ):
+            action = await self.pack.decide(self)
+            if action is not None:
+                logger.info(f"[{self.name}] 狼队决策: {action}")
+                return action
+
         messages = [
             self._build_system_message(),
             self._build_action_request_message(),
         ]
+        return await self._react(messages, get_tool_definitions(view.phase.value))
 
-        # 获取当前阶段可用工具
-        tools = get_tool_definitions(phase)
+    async def decide_pack_kill(self) -> Optional[Tuple[ActionType, Optional[int]]]:
+        """
+        作为狼队队长进行一次 ReAct 决策（由 WolfPack 调用）
+
+        Returns:
+            (KILL, 目标) 或 (SKIP, None)；未能给出决策时为 None
+        """
+        view = self.get_view()
+        messages = [
+            self._build_system_message(),
+            self._build_action_request_message(format_pack_prompt(view)),
+        ]
+        action = await self._react(messages, get_tool_definitions(view.phase.value))
+        if action is None or action.action_type not in (ActionType.KILL, ActionType.SKIP):
+            return None
+        return action.action_type, action.target_id
 
-        # ReAct 循环
+    async def _react(self, messages: List[Message], tools: List[ToolDefinition]) -> Optional[Action]:
+        """ReAct 循环：直到 LLM 提交合法行动或达到最大轮次（返回 None）"""
         for turn in range(self.max_turns):
             logger.debug(f"[{self.name}] Turn {turn + 1}/{self.max_turns}")
 
@@ -129,12 +244,15 @@ class LLMAgent(BaseAgent):
                     content="请使用 submit_action 工具提交你的决策。"
                 ))
 
-        # 超时，默认跳过
-        logger.warning(f"[{self.name}] 达到最大轮次，默认跳过")
-        return Action(ActionType.SKIP, actor_id=self.player_id)
+        return None
 
     async def speak(self) -> str:
         """白天发言"""
+        speech = await self._bounded(self._speak(), self._fallback_speech)
+        return speech if speech is not None else DEFAULT_SPEECH
+
+    async def _speak(self) -> Optional[str]:
+        """LLM 发言（达到最大轮次时返回 None）"""
         view = self.get_view()
 
         messages = [
@@ -188,28 +306,78 @@ class LLMAgent(BaseAgent):
                     content="请使用 speak 工具发表你的发言。"
                 ))
 
-        return "我暂时没有什么想说的。"
+        return None
 
-    def _build_system_message(self) -> Message:
-        """构建系统消息"""
-        view = self.get_view()
-        role_name = view.my_role.name
+    # ==================== 限时与后备策略 ====================
 
-        # 基础系统提示 + 角色策略
-        system_content = build_system_prompt(self.persona)
-        system_content += "\n\n" + get_role_prompt(role_name)
+    async def _bounded(
+        self, request: Awaitable[Optional[T]], fallback: Callable[[], Awaitable[T]]
+    ) -> Optional[T]:
+        """
+        在 deadline 内等待 LLM 结果，超时（取消请求）、出错或无结果时使用后备策略
 
-        return Message(role="system", content=system_content)
+        没有后备策略时行为与不限时相同：直接等待，异常向上抛出。
+        """
+        self.last_fallback = None
+        if self.fallback is None:
+            return await request
+
+        try:
+            result = await asyncio.wait_for(request, self.deadline)
+        except asyncio.TimeoutError:
+            reason = "timeout"
+        except Exception as e:
+            logger.warning(f"[{self.name}] LLM 请求失败: {e}")
+            reason = "error"
+        else:
+            if result is not None:
+                return result
+            reason = "max_turns"
 
-    def _build_action_request_message(self) -> Message:
-        """构建行动请求消息"""
+        logger.warning(f"[{self.name}] 使用后备策略 ({reason})")
+        self.last_fallback = reason
+        self.fallback_counts[reason] = self.fallback_counts.get(reason, 0) + 1
+        return await fallback()
+
+    async def _fallback_action(self) -> Action:
+        action = await self.fallback.decide_action()
+        action.extra["fallback"] = self.last_fallback
+        return action
+
+    async def _fallback_speech(self) -> str:
+        return await self.fallback.speak()
+
+    def _build_system_message(self) -> Message:
+        """构建系统消息（按角色缓存）"""
+        role_name = self.get_view().my_role.name
+        message = self._system_messages.get(role_name)
+        if message is None:
+            # 基础系统提示 + 角色策略
+            system_content = build_system_prompt(self.persona)
+            system_content += "\n\n" + get_role_prompt(role_name)
+            message = self._system_messages[role_name] = Message(role="system", content=system_content)
+        return message
+
+    def _build_action_request_message(self, extra: str = "") -> Message:
+        """
+        构建行动请求消息
+
+        Args:
+            extra: 附加在行动提示之后的内容（如狼队联合决策说明）
+        """
         view = self.get_view()
+        names = {p["id"]: p["name"] for p in view.alive_players}
+        prompt = format_action_prompt(view)
+        if extra:
+            prompt = f"{prompt}\n\n{extra}"
 
         content = f"""{format_game_state(view)}
 
 {format_player_info(view)}
 
-{format_action_prompt(view)}
+{self.beliefs.summary(names)}
+
+{prompt}
 
 请先使用工具了解情况，然后做出决策。"""
 
@@ -235,7 +403,11 @@ class LLMAgent(BaseAgent):
             return format_history(events, event_type)
 
         elif name == "submit_action":
-            return self._parse_action(args)
+            action = self._parse_action(args)
+            # 提交前查合法行动掩码，不合法时把原因返回给模型重新选择
+            if not view.legal_actions.allows(action.action_type, action.target_id):
+                return f"行动不合法: {action}\n{format_legal_actions(view)}"
+            return action
 
         elif name == "speak":
             return args.get("content", "")
@@ -247,6 +419,8 @@ class LLMAgent(BaseAgent):
         """解析 submit_action 参数为 Action 对象"""
         action_type_str = args.get("action_type", "skip")
         target_id = args.get("target_id")
+        if isinstance(target_id, str):
+            target_id = int(target_id) if target_id.strip().lstrip("-").isdigit() else None
 
         # 映射行动类型
         action_map = {
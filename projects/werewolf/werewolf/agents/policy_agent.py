@@ -0,0 +1,318 @@
+# ==================== 线性策略 Agent ====================
+"""
+可训练的线性 softmax 策略 Agent
+
+每个候选行动 (行动类型, 目标) 编码为定长特征向量，一次决策的全部候选
+组成 (K, D) 特征矩阵，与当前角色的权重向量做一次矩阵乘法得到 logits，
+softmax 后按概率抽样（或取最大）。权重通过 GameRunner 自对弈的批量
+REINFORCE 更新训练，以 .npz 保存（每个角色 D 个浮点数）。
+
+需要安装 numpy: pip install werewolf[sim]
+"""
+
+from __future__ import annotations
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - 依赖缺失时给出安装提示
+    raise ImportError("请安装 numpy: pip install werewolf[sim]") from e
+
+from werewolf.agents.heuristic_agent import HeuristicAgent
+from werewolf.core.enums import ActionType, Faction, RoleType
+from werewolf.core.events import Action
+
+if TYPE_CHECKING:
+    from werewolf.core.game import Game, PlayerView
+    from werewolf.config.presets import GameConfig
+
+
+# ==================== 特征 ====================
+
+ACTIONS: Tuple[ActionType, ...] = tuple(ActionType)
+ROLES: Tuple[RoleType, ...] = tuple(RoleType)
+_ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+_ROLE_INDEX = {role: i for i, role in enumerate(ROLES)}
+
+# 特征名（顺序即向量下标；保存权重时一并写入，加载时校验）
+FEATURE_NAMES: Tuple[str, ...] = (
+    ("bias",)
+    + tuple(f"action_{a.value}" for a in ACTIONS)
+    + (
+        "round",                  # 回合 / 10
+        "alive_ratio",            # 存活比例
+        "has_target",
+        "target_known_wolf",      # 确知是狼（狼队友 / 自己查杀）
+        "target_known_good",      # 确知是好人
+        "target_suspicion",       # tanh(嫌疑分 / 2)
+        "target_claims_seer",     # 目标声称预言家
+        "target_counter_claim",   # 存在对跳
+        "target_accusers",        # 怀疑目标的发言者比例
+        "target_accused_team",    # 目标怀疑过自己或狼队友
+        "target_trusted",         # 唯一的预言家声明者或确知好人
+        "target_wolf_tonight",    # 目标是今晚狼刀对象（女巫可见）
+    )
+)
+FEATURE_DIM = len(FEATURE_NAMES)
+_BASE = 1 + len(ACTIONS)
+
+# 一次决策的训练记录：(角色下标, 候选特征矩阵, 所选下标)
+Decision = Tuple[int, "np.ndarray", int]
+
+
+class LinearPolicy:
+    """
+    线性 softmax 策略
+
+    Attributes:
+        weights: (角色数, FEATURE_DIM) 权重矩阵，行对应 ROLES
+    """
+
+    def __init__(self, weights: Optional[np.ndarray] = None):
+        if weights is None:
+            weights = np.zeros((len(ROLES), FEATURE_DIM))
+        if weights.shape != (len(ROLES), FEATURE_DIM):
+            raise ValueError(f"权重形状应为 {(len(ROLES), FEATURE_DIM)}，实际为 {weights.shape}")
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def probs(self, role: int, features: np.ndarray, temperature: float = 1.0) -> np.ndarray:
+        """候选行动的概率（features: (K, D)）"""
+        logits = features @ self.weights[role]
+        if temperature != 1.0:
+            logits = logits / max(temperature, 1e-6)
+        logits = logits - logits.max()
+        exp = np.exp(logits)
+        return exp / exp.sum()
+
+    def update(
+        self,
+        decisions: Sequence[Decision],
+        rewards: Sequence[float],
+        lr: float,
+        baseline: Optional[Dict[int, float]] = None,
+    ) -> None:
+        """
+        批量 REINFORCE 更新
+
+        Args:
+            decisions: [(角色下标, 特征矩阵, 所选下标), ...]
+            rewards: 每个决策对应的对局收益
+            lr: 学习率
+            baseline: 角色下标 -> 基线收益（降低方差）
+        """
+        grad = np.zeros_like(self.weights)
+        counts = np.zeros(len(ROLES))
+        baseline = baseline or {}
+        for (role, features, chosen), reward in zip(decisions, rewards):
+            counts[role] += 1
+            advantage = reward - baseline.get(role, 0.0)
+            if advantage:
+                # d log softmax / dw = 所选特征 - 期望特征
+                p = self.probs(role, features)
+                grad[role] += advantage * (features[chosen] - p @ features)
+        self.weights += lr * grad / np.maximum(counts, 1)[:, None]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """保存为 .npz（含特征名和角色顺序，便于校验）"""
+        np.savez(
+            path,
+            weights=self.weights,
+            feature_names=np.array(FEATURE_NAMES),
+            roles=np.array([r.value for r in ROLES]),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> LinearPolicy:
+        """
+        从 .npz 加载
+
+        Raises:
+            ValueError: 文件的特征或角色定义与当前版本不一致
+        """
+        with np.load(path) as data:
+            if tuple(data["feature_names"]) != FEATURE_NAMES:
+                raise ValueError("权重文件的特征定义与当前版本不一致")
+            if tuple(data["roles"]) != tuple(r.value for r in ROLES):
+                raise ValueError("权重文件的角色定义与当前版本不一致")
+            return cls(data["weights"])
+
+
+class PolicyAgent(HeuristicAgent):
+    """
+    线性策略 Agent
+
+    公开信息的收集和发言沿用 HeuristicAgent，决策改为对候选行动特征
+    做一次矩阵乘法 + softmax。temperature 越低越接近贪心，可用来调节强度。
+    record=True 时记录每个决策供自对弈训练。
+    """
+
+    name_prefix = "PolicyBot"
+
+    def __init__(
+        self,
+        player_id: int,
+        game: Game,
+        policy: Optional[LinearPolicy] = None,
+        name: Optional[str] = None,
+        seed: Optional[int] = None,
+        temperature: float = 1.0,
+        greedy: bool = False,
+        record: bool = False,
+    ):
+        """
+        Args:
+            player_id: 玩家ID
+            game: 游戏实例
+            policy: 线性策略（默认零权重，即在合法行动中均匀随机）
+            name: Agent 名称
+            seed: 随机种子
+            temperature: softmax 温度
+            greedy: 是否总是选择概率最大的行动
+            record: 是否记录决策（训练用）
+        """
+        super().__init__(player_id, game, name, seed)
+        self.policy = policy or LinearPolicy()
+        self.temperature = temperature
+        self.greedy = greedy
+        self.record = record
+        self.decisions: List[Decision] = []
+
+    def rebind(self, game: Game, player_id: int, seed: Optional[int] = None) -> None:
+        super().rebind(game, player_id, seed)
+        self.decisions = []
+
+    async def decide_action(self) -> Action:
+        """按策略在合法行动中选择"""
+        view = self.get_view()
+        self._sync(view)
+        moves = view.legal_actions.moves()
+        if not moves:
+            return Action(ActionType.SKIP, actor_id=self.player_id)
+
+        if len(moves) == 1:
+            index = 0
+        else:
+            role = _ROLE_INDEX[view.my_role.role_type]
+            features = self.features(view, moves)
+            p = self.policy.probs(role, features, self.temperature)
+            if self.greedy:
+                index = int(p.argmax())
+            else:
+                cumulative = np.cumsum(p)
+                index = min(int(np.searchsorted(cumulative, self.rng.random() * cumulative[-1])),
+                            len(moves) - 1)
+            if self.record:
+                self.decisions.append((role, features, index))
+
+        action_type, target = moves[index]
+        if action_type == ActionType.SAVE:
+            target = view.wolf_target_tonight
+        return Action(action_type, actor_id=self.player_id, target_id=target)
+
+    def features(self, view: PlayerView, moves: Sequence[Tuple[ActionType, Optional[int]]]) -> np.ndarray:
+        """候选行动的特征矩阵 (K, FEATURE_DIM)"""
+        players = view.alive_players
+        alive = sum(p["is_alive"] for p in players)
+        wolf_target = view.wolf_target_tonight
+        speakers = max(len(self.accusations), 1)
+        team = self._team_mask() if self._is_wolf() else 1 << self.player_id
+        counter = len(self.seer_claims) > 1
+
+        out = np.zeros((len(moves), FEATURE_DIM))
+        out[:, 0] = 1.0
+        out[:, _BASE] = view.round / 10
+        out[:, _BASE + 1] = alive / len(players)
+        for i, (action_type, target) in enumerate(moves):
+            row = out[i]
+            row[1 + _ACTION_INDEX[action_type]] = 1.0
+            if action_type == ActionType.SAVE:
+                target = wolf_target
+            if target is None:
+                continue
+            known = self.known.get(target)
+            row[_BASE + 2] = 1.0
+            row[_BASE + 3] = known is True
+            row[_BASE + 4] = known is False
+            row[_BASE + 5] = math.tanh(self.suspicion.get(target, 0.0) / 2)
+            row[_BASE + 6] = target in self.seer_claims
+            row[_BASE + 7] = counter and target in self.seer_claims
+            row[_BASE + 8] = sum(target in s for s in self.accusations.values()) / speakers
+            row[_BASE + 9] = any((team >> t) & 1 for t in self.accusations.get(target, ()))
+            row[_BASE + 10] = self._trusted(target)
+            row[_BASE + 11] = target == wolf_target
+        return out
+
+
+# ==================== 自对弈训练 ====================
+
+async def train_self_play(
+    config: GameConfig,
+    policy: Optional[LinearPolicy] = None,
+    games: int = 1000,
+    batch_size: int = 32,
+    lr: float = 0.5,
+    seed: int = 0,
+    temperature: float = 1.0,
+    baseline_decay: float = 0.9,
+    callback: Optional[Callable[[int, float], None]] = None,
+) -> LinearPolicy:
+    """
+    自对弈训练：所有座位共享同一策略，每 batch_size 局做一次批量更新
+
+    收益为所在阵营是否获胜（无胜者 0.5），基线为各角色收益的指数滑动平均。
+
+    Args:
+        config: 游戏配置
+        policy: 初始策略（默认零权重）
+        games: 总对局数
+        batch_size: 每次更新使用的对局数
+        lr: 学习率
+        seed: 起始种子（第 i 局使用 seed + i）
+        temperature: 训练时的 softmax 温度
+        baseline_decay: 基线滑动平均的衰减系数
+        callback: 每批结束后调用 callback(已完成局数, 本批狼人胜率)
+
+    Returns:
+        训练后的策略
+    """
+    from werewolf.runner.game_runner import GameRunner
+
+    policy = policy or LinearPolicy()
+    baseline: Dict[int, float] = {}
+    done = 0
+    while done < games:
+        batch = min(batch_size, games - done)
+        decisions: List[Decision] = []
+        rewards: List[float] = []
+        wolf_wins = 0
+        for i in range(batch):
+            game_seed = seed + done + i
+            agents: List[PolicyAgent] = []
+
+            def factory(pid, game, game_seed=game_seed):
+                agent = PolicyAgent(pid, game, policy, seed=game_seed * 100 + pid,
+                                    temperature=temperature, record=True)
+                agents.append(agent)
+                return agent
+
+            result = await GameRunner(config, factory, seed=game_seed, verbose=False).run()
+            wolf_wins += result.winner == Faction.WEREWOLF
+            for agent in agents:
+                faction = agent.get_player().role.faction
+                reward = 0.5 if result.winner is None else float(result.winner == faction)
+                decisions.extend(agent.decisions)
+                rewards.extend([reward] * len(agent.decisions))
+
+        policy.update(decisions, rewards, lr, baseline)
+        totals: Dict[int, List[float]] = {}
+        for (role, _, _), reward in zip(decisions, rewards):
+            totals.setdefault(role, []).append(reward)
+        for role, values in totals.items():
+            mean = sum(values) / len(values)
+            baseline[role] = baseline_decay * baseline.get(role, mean) + (1 - baseline_decay) * mean
+        done += batch
+        if callback:
+            callback(done, wolf_wins / batch)
+    return policy
@@ -3,11 +3,13 @@
 
 from __future__ import annotations
 import random
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Any, Dict, Optional, List
 
 from werewolf.agents.base import BaseAgent
 from werewolf.core.enums import ActionType
 from werewolf.core.events import Action
+from werewolf.core.legal import TARGETED_ACTIONS
+from werewolf.core.phrases import RANDOM_PHRASES
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
@@ -23,6 +25,8 @@ class RandomAgent(BaseAgent):
     - 填充玩家
     """
 
+    name_prefix = "RandomBot"
+
     def __init__(
         self,
         player_id: int,
@@ -37,9 +41,22 @@ class RandomAgent(BaseAgent):
             name: Agent 名称
             seed: 随机种子
         """
-        super().__init__(player_id, game, name or f"RandomBot_{player_id}")
+        super().__init__(player_id, game, name)
         self.rng = random.Random(seed)
 
+    def rebind(self, game: Game, player_id: int, seed: Optional[int] = None) -> None:
+        super().rebind(game, player_id, seed)
+        if seed is not None:
+            # 与 random.Random(seed) 的随机数流相同，无需重新分配
+            self.rng.seed(seed)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"rng": self.rng.getstate()}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        if "rng" in state:
+            self.rng.setstate(state["rng"])
+
     async def decide_action(self) -> Action:
         """随机选择行动"""
         view = self.get_view()
@@ -53,8 +70,7 @@ class RandomAgent(BaseAgent):
 
         # 确定目标
         target_id = None
-        if action_type in (ActionType.KILL, ActionType.CHECK, ActionType.POISON,
-                           ActionType.PROTECT, ActionType.VOTE, ActionType.SHOOT):
+        if action_type in TARGETED_ACTIONS:
             # 需要选择目标
             alive_players = [
                 p["id"] for p in view.alive_players
@@ -78,14 +94,4 @@ class RandomAgent(BaseAgent):
 
     async def speak(self) -> str:
         """随机发言"""
-        phrases = [
-            "我没什么特别想说的。",
-            "我觉得大家都挺可疑的。",
-            "我是好人，请相信我。",
-            "让我再观察一下。",
-            "我同意上一位的发言。",
-            "我觉得应该投那个发言最少的人。",
-            "我暂时没有确切的线索。",
-            "请大家理性分析。",
-        ]
-        return self.rng.choice(phrases)
+        return self.rng.choice(RANDOM_PHRASES)
@@ -0,0 +1,85 @@
+# ==================== 狼队联合决策 ====================
+"""多个 LLM 狼人共享一次夜间击杀决策"""
+
+from __future__ import annotations
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from werewolf.core.events import Action
+
+if TYPE_CHECKING:
+    from werewolf.agents.llm_agent import LLMAgent
+
+
+class WolfPack:
+    """
+    狼队联合决策
+
+    每晚第一个行动的狼人（队长）发起一次 LLM 对话，以全队视角决定击杀目标；
+    其余狼人直接复用结果，提交同一目标。夜间狼人的 LLM 对话从 k 次
+    降为一次，也不会因分票而出现多数决失败。
+
+    同一个 WolfPack 可以交给一局中的所有 LLMAgent（非狼人不会使用），
+    也可以在多局之间复用（按对局和回合区分决策，只保留当前这一晚的决策）。
+
+    Example:
+        pack = WolfPack()
+        agents = {pid: LLMAgent(pid, game, client, pack=pack) for pid in ...}
+    """
+
+    def __init__(self):
+        # 当前这一晚：(对局的弱引用, 回合)。对局释放后弱引用失效，
+        # 不会像 id() 那样被新对局复用而取到旧的击杀决策
+        self._key: Optional[Tuple[weakref.ref, int]] = None
+        # 队长的决策 (行动, 目标)；未能给出决策时为 None
+        self._decision: Optional[asyncio.Future] = None
+        # 正在等待当前决策的狼人数：全部放弃（如限时决策超时）时取消队长的对话
+        self._waiting = 0
+
+    async def decide(self, agent: LLMAgent) -> Optional[Action]:
+        """
+        为狼人取得本晚的联合决策
+
+        Returns:
+            该狼人应提交的行动；队长未能给出决策或目标对该狼人不合法时为 None
+            （调用方回退到单独决策）
+        """
+        game = agent.game
+        if (
+            self._key is None or self._key[0]() is not game or self._key[1] != game.round
+            or self._decision.cancelled()
+        ):
+            # 新的一晚，或上一次对话因无人等待被取消：由当前狼人重新发起
+            self._cancel()
+            self._key = (weakref.ref(game), game.round)
+            self._decision = asyncio.ensure_future(agent.decide_pack_kill())
+            self._waiting = 0
+
+        task = self._decision
+        self._waiting += 1
+        try:
+            decision = await asyncio.shield(task)
+        finally:
+            if task is self._decision:
+                self._waiting -= 1
+                if self._waiting == 0 and not task.done():
+                    task.cancel()
+        if decision is None:
+            return None
+
+        action_type, target = decision
+        if not agent.get_view().legal_actions.allows(action_type, target):
+            return None
+        return Action(action_type, actor_id=agent.player_id, target_id=target)
+
+    def reset(self) -> None:
+        """清空已缓存的决策（取消进行中的队长对话）"""
+        self._cancel()
+        self._key = None
+        self._decision = None
+        self._waiting = 0
+
+    def _cancel(self) -> None:
+        if self._decision is not None and not self._decision.done():
+            self._decision.cancel()
@@ -2,6 +2,8 @@
 """预设游戏配置"""
 
 from __future__ import annotations
+import hashlib
+import json
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
@@ -59,6 +61,18 @@ class GameConfig:
 
         return True, ""
 
+    def fingerprint(self) -> str:
+        """
+        配置指纹（角色列表与规则的哈希，不含名称）
+
+        用于确认行动日志与回放时的配置一致。
+        """
+        payload = json.dumps(
+            {"roles": self.roles, "rules": self.rules},
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
     @classmethod
     def preset_6p(cls) -> GameConfig:
         """6人简化局"""
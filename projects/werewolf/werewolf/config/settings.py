@@ -27,6 +27,26 @@ class LLMConfig:
         model="deepseek-chat"
     ))
     custom: LLMProviderConfig = field(default_factory=LLMProviderConfig)
+    cache_path: Optional[str] = None  # 响应缓存的 SQLite 文件（None 表示不缓存）
+    cache_mode: str = "read_through"  # read_through / record / replay
+    cache_max_entries: Optional[int] = None  # 缓存最多保留的响应条数（None 表示不限）
+    cache_max_bytes: Optional[int] = None  # 缓存响应数据的总字节数上限（None 表示不限）
+    # 共享连接池（同一提供商地址和密钥的所有对局共用）
+    pool_max_connections: int = 100
+    pool_max_keepalive: int = 20
+    pool_keepalive_expiry: float = 30.0
+    # 按提供商共享的限流器（rpm / tpm 为 None 表示不限；max_concurrency 为自适应并发上限）
+    rate_limit_rpm: Optional[float] = None
+    rate_limit_tpm: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    latency_threshold: Optional[float] = None  # 延迟超过该值（秒）时降低并发
+    # 分类重试与对冲请求（retry_max_attempts 为 None 时使用 SDK 自带的重试）
+    retry_max_attempts: Optional[int] = None
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 8.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_budget: float = 0.1
 
 
 @dataclass
@@ -35,6 +55,8 @@ class GameConfig:
     default_preset: str = "6p"
     default_speed: float = 1.0
     max_rounds: int = 20
+    checkpoint_dir: Optional[str] = None  # 进行中对局的检查点目录（None 表示不写检查点）
+    decision_deadline: Optional[float] = None  # LLM 单次决策 / 发言的时间上限（秒），超时改用规则策略
 
 
 @dataclass
@@ -105,6 +127,46 @@ class Settings:
                     self.llm.deepseek = LLMProviderConfig(**llm['deepseek'])
                 if 'custom' in llm:
                     self.llm.custom = LLMProviderConfig(**llm['custom'])
+                if 'cache_path' in llm:
+                    self.llm.cache_path = llm['cache_path']
+                if 'cache_mode' in llm:
+                    self.llm.cache_mode = llm['cache_mode']
+                if 'cache_max_entries' in llm:
+                    self.llm.cache_max_entries = llm['cache_max_entries']
+                if 'cache_max_bytes' in llm:
+                    self.llm.cache_max_bytes = llm['cache_max_bytes']
+                if 'pool' in llm:
+                    pool = llm['pool']
+                    if 'max_connections' in pool:
+                        self.llm.pool_max_connections = pool['max_connections']
+                    if 'max_keepalive' in pool:
+                        self.llm.pool_max_keepalive = pool['max_keepalive']
+                    if 'keepalive_expiry' in pool:
+                        self.llm.pool_keepalive_expiry = pool['keepalive_expiry']
+                if 'rate_limit' in llm:
+                    limit = llm['rate_limit']
+                    if 'rpm' in limit:
+                        self.llm.rate_limit_rpm = limit['rpm']
+                    if 'tpm' in limit:
+                        self.llm.rate_limit_tpm = limit['tpm']
+                    if 'max_concurrency' in limit:
+                        self.llm.max_concurrency = limit['max_concurrency']
+                    if 'latency_threshold' in limit:
+                        self.llm.latency_threshold = limit['latency_threshold']
+                if 'retry' in llm:
+                    retry = llm['retry']
+                    if 'max_attempts' in retry:
+                        self.llm.retry_max_attempts = retry['max_attempts']
+                    if 'base_delay' in retry:
+                        self.llm.retry_base_delay = retry['base_delay']
+                    if 'max_delay' in retry:
+                        self.llm.retry_max_delay = retry['max_delay']
+                    if 'hedge' in retry:
+                        self.llm.hedge = bool(retry['hedge'])
+                    if 'hedge_quantile' in retry:
+                        self.llm.hedge_quantile = retry['hedge_quantile']
+                    if 'hedge_budget' in retry:
+                        self.llm.hedge_budget = retry['hedge_budget']
 
             # 游戏配置
             if 'game' in data:
@@ -115,6 +177,10 @@ class Settings:
                     self.game.default_speed = game['default_speed']
                 if 'max_rounds' in game:
                     self.game.max_rounds = game['max_rounds']
+                if 'checkpoint_dir' in game:
+                    self.game.checkpoint_dir = game['checkpoint_dir']
+                if 'decision_deadline' in game:
+                    self.game.decision_deadline = game['decision_deadline']
 
             # 服务器配置
             if 'server' in data:
@@ -157,46 +223,112 @@ class Settings:
         if os.getenv("LLM_PROVIDER"):
             self.llm.default_provider = os.getenv("LLM_PROVIDER")
 
+        # 响应缓存
+        if os.getenv("WEREWOLF_LLM_CACHE"):
+            self.llm.cache_path = os.getenv("WEREWOLF_LLM_CACHE")
+        if os.getenv("WEREWOLF_LLM_CACHE_MODE"):
+            self.llm.cache_mode = os.getenv("WEREWOLF_LLM_CACHE_MODE")
+        if os.getenv("WEREWOLF_LLM_CACHE_MAX_ENTRIES"):
+            self.llm.cache_max_entries = int(os.getenv("WEREWOLF_LLM_CACHE_MAX_ENTRIES"))
+        if os.getenv("WEREWOLF_LLM_CACHE_MAX_BYTES"):
+            self.llm.cache_max_bytes = int(os.getenv("WEREWOLF_LLM_CACHE_MAX_BYTES"))
+
+        # 限流
+        if os.getenv("WEREWOLF_LLM_RPM"):
+            self.llm.rate_limit_rpm = float(os.getenv("WEREWOLF_LLM_RPM"))
+        if os.getenv("WEREWOLF_LLM_TPM"):
+            self.llm.rate_limit_tpm = float(os.getenv("WEREWOLF_LLM_TPM"))
+        if os.getenv("WEREWOLF_LLM_MAX_CONCURRENCY"):
+            self.llm.max_concurrency = int(os.getenv("WEREWOLF_LLM_MAX_CONCURRENCY"))
+
+        # 重试与对冲请求
+        if os.getenv("WEREWOLF_LLM_RETRIES"):
+            self.llm.retry_max_attempts = int(os.getenv("WEREWOLF_LLM_RETRIES"))
+        if os.getenv("WEREWOLF_LLM_HEDGE"):
+            self.llm.hedge = os.getenv("WEREWOLF_LLM_HEDGE").lower() in ("1", "true", "yes")
+
+        # 检查点目录
+        if os.getenv("WEREWOLF_CHECKPOINT_DIR"):
+            self.game.checkpoint_dir = os.getenv("WEREWOLF_CHECKPOINT_DIR")
+
+        # LLM 决策时间上限
+        if os.getenv("WEREWOLF_DECISION_DEADLINE"):
+            self.game.decision_deadline = float(os.getenv("WEREWOLF_DECISION_DEADLINE"))
+
     def get_llm_client(self, provider: Optional[str] = None):
         """
         获取 LLM 客户端
 
+        配置了限流时经过该提供商的共享限流器（RateLimitedLLMClient），
+        配置了重试时外层再包装 ResilientLLMClient（每次重试 / 对冲都经过限流器，
+        延迟窗口和对冲预算按提供商共享），
+        配置了 cache_path 时最外层包装为 CachedLLMClient（缓存命中不占用配额）。
+
         Args:
             provider: 指定提供商，默认使用 default_provider
         """
         provider = provider or self.llm.default_provider
+        client = self._create_llm_client(provider)
+        if self.llm.rate_limit_rpm or self.llm.rate_limit_tpm or self.llm.max_concurrency:
+            from werewolf.llm.limiter import RateLimitedLLMClient, get_limiter
+            limiter = get_limiter(
+                provider,
+                rpm=self.llm.rate_limit_rpm,
+                tpm=self.llm.rate_limit_tpm,
+                max_concurrency=self.llm.max_concurrency or 64,
+                latency_threshold=self.llm.latency_threshold,
+            )
+            client = RateLimitedLLMClient(client, limiter)
+        if self.llm.retry_max_attempts:
+            from werewolf.llm.retry import (
+                HedgePolicy, ResilientLLMClient, RetryPolicy, get_resilience_state,
+            )
+            hedge = HedgePolicy(quantile=self.llm.hedge_quantile, budget=self.llm.hedge_budget)
+            client = ResilientLLMClient(
+                client,
+                RetryPolicy(
+                    max_attempts=self.llm.retry_max_attempts,
+                    base_delay=self.llm.retry_base_delay,
+                    max_delay=self.llm.retry_max_delay,
+                ),
+                hedge=hedge if self.llm.hedge else None,
+                # 同一提供商的所有包装器共用延迟窗口和对冲预算
+                state=get_resilience_state(provider, hedge.window),
+            )
+        if self.llm.cache_path:
+            from werewolf.llm.cache import CachedLLMClient, get_response_cache
+            cache = get_response_cache(
+                self.llm.cache_path,
+                max_entries=self.llm.cache_max_entries,
+                max_bytes=self.llm.cache_max_bytes,
+            )
+            client = CachedLLMClient(client, cache, mode=self.llm.cache_mode)
+        return client
+
+    def _create_llm_client(self, provider: str):
+        """从全局注册表取得提供商的共享客户端（同一 base_url 和密钥共用连接池）"""
+        from werewolf.llm.registry import get_client_registry, PoolLimits
 
+        # 由 ResilientLLMClient 负责重试时关闭 SDK 自带的重试，避免重试次数相乘
+        retries = 0 if self.llm.retry_max_attempts else None
+
+        registry = get_client_registry(PoolLimits(
+            max_connections=self.llm.pool_max_connections,
+            max_keepalive_connections=self.llm.pool_max_keepalive,
+            keepalive_expiry=self.llm.pool_keepalive_expiry,
+        ))
         if provider == "openai":
-            from werewolf.llm.openai_client import OpenAIClient
             cfg = self.llm.openai
-            return OpenAIClient(
-                model=cfg.model,
-                api_key=cfg.api_key,
-                base_url=cfg.base_url,
-            )
+            return registry.get("openai", cfg.model, cfg.api_key, cfg.base_url, retries)
         elif provider == "anthropic":
-            from werewolf.llm.anthropic_client import AnthropicClient
             cfg = self.llm.anthropic
-            return AnthropicClient(
-                model=cfg.model,
-                api_key=cfg.api_key,
-            )
+            return registry.get("anthropic", cfg.model, cfg.api_key, cfg.base_url, retries)
         elif provider == "deepseek":
-            from werewolf.llm.openai_client import OpenAIClient
             cfg = self.llm.deepseek
-            return OpenAIClient(
-                model=cfg.model,
-                api_key=cfg.api_key,
-                base_url=cfg.base_url or "https://api.deepseek.com",
-            )
+            return registry.get("openai", cfg.model, cfg.api_key, cfg.base_url or "https://api.deepseek.com", retries)
         elif provider == "custom":
-            from werewolf.llm.openai_client import OpenAIClient
             cfg = self.llm.custom
-            return OpenAIClient(
-                model=cfg.model,
-                api_key=cfg.api_key,
-                base_url=cfg.base_url,
-            )
+            return registry.get("openai", cfg.model, cfg.api_key, cfg.base_url, retries)
         else:
             raise ValueError(f"未知的 LLM 提供商: {provider}")
 
@@ -212,6 +344,20 @@ class Settings:
         return {
             "llm": {
                 "default_provider": self.llm.default_provider,
+                "cache_path": self.llm.cache_path,
+                "cache_mode": self.llm.cache_mode,
+                "cache_max_entries": self.llm.cache_max_entries,
+                "cache_max_bytes": self.llm.cache_max_bytes,
+                "rate_limit": {
+                    "rpm": self.llm.rate_limit_rpm,
+                    "tpm": self.llm.rate_limit_tpm,
+                    "max_concurrency": self.llm.max_concurrency,
+                    "latency_threshold": self.llm.latency_threshold,
+                },
+                "retry": {
+                    "max_attempts": self.llm.retry_max_attempts,
+                    "hedge": self.llm.hedge,
+                },
                 "openai": {
                     "api_key": mask_key(self.llm.openai.api_key),
                     "base_url": self.llm.openai.base_url,
@@ -236,6 +382,7 @@ class Settings:
                 "default_preset": self.game.default_preset,
                 "default_speed": self.game.default_speed,
                 "max_rounds": self.game.max_rounds,
+                "decision_deadline": self.game.decision_deadline,
             },
             "server": {
                 "host": self.server.host,
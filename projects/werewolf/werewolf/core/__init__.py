@@ -4,6 +4,10 @@
 from werewolf.core.enums import GamePhase, Faction, ActionType, DeathReason
 from werewolf.core.player import Player, NightState
 from werewolf.core.events import GameEvent, Action, ActionResult
+from werewolf.core.action_log import ActionLog, ActionRecord
+from werewolf.core.event_bus import EventBus, Subscription
+from werewolf.core.checkpoint import Checkpoint, CheckpointError
+from werewolf.core.legal import ActionMask
 
 __all__ = [
     "GamePhase",
@@ -15,4 +19,11 @@ __all__ = [
     "GameEvent",
     "Action",
     "ActionResult",
+    "ActionLog",
+    "ActionRecord",
+    "EventBus",
+    "Subscription",
+    "Checkpoint",
+    "CheckpointError",
+    "ActionMask",
 ]
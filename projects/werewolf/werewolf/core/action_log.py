@@ -0,0 +1,110 @@
+# ==================== 行动日志 ====================
+"""紧凑的行动日志：记录足以确定性复现一局游戏的全部输入"""
+
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
+
+from werewolf.core.enums import ActionType, GamePhase
+
+if TYPE_CHECKING:
+    from werewolf.core.game import Game
+
+
+class ActionRecord(NamedTuple):
+    """
+    一条成功提交的行动
+
+    Attributes:
+        round_num: 提交时的回合
+        phase: 提交时的阶段
+        actor_id: 行动者玩家ID
+        action_type: 行动类型
+        target_id: 目标玩家ID
+    """
+    round_num: int
+    phase: GamePhase
+    actor_id: int
+    action_type: ActionType
+    target_id: Optional[int] = None
+
+    def to_list(self) -> List[Any]:
+        """紧凑序列化：[回合, 阶段, 行动者, 行动, 目标]"""
+        return [self.round_num, self.phase.value, self.actor_id,
+                self.action_type.value, self.target_id]
+
+    @classmethod
+    def from_list(cls, data: List[Any]) -> ActionRecord:
+        round_num, phase, actor_id, action_type, target_id = data
+        return cls(round_num, GamePhase(phase), actor_id, ActionType(action_type), target_id)
+
+
+@dataclass
+class ActionLog:
+    """
+    行动日志
+
+    游戏引擎本身是确定性的：给定角色分配和按顺序提交的行动，就能重建
+    完整的对局状态与事件历史，无需重新调用 Agent。
+
+    Attributes:
+        seed: 随机种子（对局未指定时为 None，回放不依赖）
+        config_fingerprint: 配置指纹（GameConfig.fingerprint）
+        player_names: 玩家名称
+        roles: 各座位的角色类型（回放时按此分配）
+        actions: 按提交顺序排列的行动
+        final_round: 记录结束时的回合
+        final_phase: 记录结束时的阶段
+    """
+    seed: Optional[int]
+    config_fingerprint: str
+    player_names: List[str]
+    roles: List[str]
+    actions: List[ActionRecord] = field(default_factory=list)
+    final_round: int = 0
+    final_phase: GamePhase = GamePhase.INIT
+
+    @classmethod
+    def from_game(cls, game: Game) -> ActionLog:
+        """从对局中导出行动日志"""
+        return cls(
+            seed=game.seed,
+            config_fingerprint=game.config.fingerprint(),
+            player_names=[p.name for p in game.players],
+            roles=[p.role.role_type.value for p in game.players],
+            actions=list(game.action_log),
+            final_round=game.round,
+            final_phase=game.phase,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典"""
+        return {
+            "seed": self.seed,
+            "config_fingerprint": self.config_fingerprint,
+            "player_names": self.player_names,
+            "roles": self.roles,
+            "actions": [record.to_list() for record in self.actions],
+            "final_round": self.final_round,
+            "final_phase": self.final_phase.value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> ActionLog:
+        return cls(
+            seed=data.get("seed"),
+            config_fingerprint=data["config_fingerprint"],
+            player_names=list(data["player_names"]),
+            roles=list(data["roles"]),
+            actions=[ActionRecord.from_list(item) for item in data["actions"]],
+            final_round=data["final_round"],
+            final_phase=GamePhase(data["final_phase"]),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> ActionLog:
+        return cls.from_dict(json.loads(text))
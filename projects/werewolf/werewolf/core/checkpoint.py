@@ -0,0 +1,149 @@
+# ==================== 对局检查点 ====================
+"""
+进行中对局的二进制检查点
+
+检查点保存完整的 Game（玩家、角色状态、主持人待处理行动、随机数状态、
+事件历史）、各 Agent 的状态（如 LLM 对话记忆）以及运行器需要的附加信息，
+进程重启后可以从最近的阶段边界继续，而不必从头回放整局。
+
+二进制格式：
+
+    magic(4) | version(u16) | flags(u16) | crc32(u32) | payload
+
+payload 为 pickle（flags 含 FLAG_ZLIB 时经过 zlib 压缩）。
+检查点只应加载由本程序写出的文件（pickle 不能用于不可信数据）。
+"""
+
+from __future__ import annotations
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
+
+if TYPE_CHECKING:
+    from werewolf.core.game import Game
+    from werewolf.agents.base import BaseAgent
+
+CHECKPOINT_MAGIC = b"WWCK"
+CHECKPOINT_VERSION = 1
+
+FLAG_ZLIB = 1
+
+_HEADER = struct.Struct("<4sHHI")
+
+
+class CheckpointError(ValueError):
+    """检查点格式错误、版本不兼容或数据损坏"""
+
+
+@dataclass
+class Checkpoint:
+    """
+    对局检查点
+
+    Attributes:
+        game: 游戏实例（不含事件总线的订阅者）
+        agent_states: player_id -> Agent.get_state() 的结果
+        extra: 运行器附加信息（如已收集的发言、会话设置）
+    """
+    game: Game
+    agent_states: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def capture(
+        cls,
+        game: Game,
+        agents: Optional[Mapping[int, BaseAgent]] = None,
+        **extra: Any,
+    ) -> Checkpoint:
+        """
+        记录当前对局
+
+        Args:
+            game: 游戏实例
+            agents: player_id -> Agent
+            **extra: 附加信息（需可 pickle）
+        """
+        agent_states = {
+            pid: agent.get_state() for pid, agent in (agents or {}).items()
+        }
+        return cls(game=game, agent_states=agent_states, extra=extra)
+
+    def restore_agents(self, agents: Mapping[int, BaseAgent]) -> None:
+        """把保存的状态写回新创建的 Agent"""
+        for pid, state in self.agent_states.items():
+            agent = agents.get(pid)
+            if agent is not None and state:
+                agent.load_state(state)
+
+    # ==================== 序列化 ====================
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """
+        序列化为二进制检查点
+
+        Args:
+            compress: 是否用 zlib 压缩（事件历史较长时体积可缩小数倍）
+        """
+        payload = pickle.dumps(
+            (self.game, self.agent_states, self.extra),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload, 1)
+            flags |= FLAG_ZLIB
+        header = _HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, flags, zlib.crc32(payload))
+        return header + payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Checkpoint:
+        """
+        从二进制检查点恢复
+
+        Raises:
+            CheckpointError: 格式错误、版本不兼容或校验失败
+        """
+        if len(data) < _HEADER.size:
+            raise CheckpointError("检查点数据过短")
+        magic, version, flags, crc = _HEADER.unpack_from(data)
+        if magic != CHECKPOINT_MAGIC:
+            raise CheckpointError("不是对局检查点文件")
+        if version != CHECKPOINT_VERSION:
+            raise CheckpointError(
+                f"检查点版本不兼容: {version}（当前 {CHECKPOINT_VERSION}）"
+            )
+
+        payload = memoryview(data)[_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            raise CheckpointError("检查点校验失败（文件损坏或被截断）")
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+
+        game, agent_states, extra = pickle.loads(payload)
+        return cls(game=game, agent_states=agent_states, extra=extra)
+
+    def save(self, path: str, compress: bool = True) -> None:
+        """原子地写入文件（先写临时文件再替换，进程中断不会留下半个检查点）"""
+        data = self.to_bytes(compress)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Checkpoint:
+        """从文件读取检查点"""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
@@ -1,7 +1,8 @@
 # ==================== 枚举定义 ====================
 """游戏核心枚举类型"""
 
-from enum import Enum, auto
+from __future__ import annotations
+from enum import Enum, IntEnum, auto
 
 
 class GamePhase(Enum):
@@ -12,6 +13,7 @@ class GamePhase(Enum):
     DAY_DISCUSSION = "day_discussion"   # 白天讨论
     DAY_VOTE = "day_vote"               # 白天投票
     DAY_RESOLVE = "day_resolve"         # 投票结算
+    HUNTER_SHOT = "hunter_shot"         # 猎人开枪（规则 hunter_shot_phase 开启时）
     GAME_OVER = "game_over"             # 游戏结束
 
 
@@ -52,3 +54,31 @@ class RoleType(Enum):
     WITCH = "witch"             # 女巫
     HUNTER = "hunter"           # 猎人
     GUARD = "guard"             # 守卫
+
+
+class EventType(IntEnum):
+    """游戏事件类型（整数编码，label 为历史记录中使用的字符串名）"""
+    GAME_START = 0          # 游戏开始
+    PHASE_CHANGE = 1        # 阶段变更
+    PLAYER_ACTION = 2       # 玩家行动
+    PLAYER_DEATH = 3        # 玩家死亡
+    VOTE_RESULT = 4         # 投票结果
+    GAME_END = 5            # 游戏结束
+    PLAYER_SPEECH = 6       # 玩家发言
+
+    @property
+    def label(self) -> str:
+        """字符串名（如 player_death）"""
+        return _EVENT_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: str) -> EventType:
+        """根据字符串名获取事件类型"""
+        try:
+            return _EVENT_BY_LABEL[label]
+        except KeyError:
+            raise ValueError(f"未知事件类型: {label}") from None
+
+
+_EVENT_LABELS = {member: member.name.lower() for member in EventType}
+_EVENT_BY_LABEL = {label: member for member, label in _EVENT_LABELS.items()}
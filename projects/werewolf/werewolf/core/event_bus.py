@@ -0,0 +1,217 @@
+# ==================== 事件总线 ====================
+"""Game 的发布/订阅事件总线"""
+
+from __future__ import annotations
+import asyncio
+import inspect
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional, Union
+
+from werewolf.core.enums import EventType
+from werewolf.core.events import GameEvent, event_kind
+
+logger = logging.getLogger(__name__)
+
+Topic = Union[str, EventType]
+EventHandler = Callable[[GameEvent], Union[None, Awaitable[None]]]
+EventFilter = Callable[[GameEvent], bool]
+
+# 异步订阅者的默认队列容量
+DEFAULT_QUEUE_SIZE = 1024
+
+
+class Subscription:
+    """
+    订阅句柄
+
+    - 同步订阅：publish 时在调用方直接执行 handler
+    - 异步订阅：事件进入有界队列，由后台任务逐个交给协程 handler；
+      未提供 handler 时可通过 `await sub.get()` / `async for` 自行消费
+    - 队列满时丢弃最旧的事件（计入 dropped），发布方永不阻塞
+
+    Attributes:
+        topics: 订阅的事件类型（None 表示全部）
+        dropped: 因队列已满被丢弃的事件数
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        handler: Optional[EventHandler],
+        topics: Optional[frozenset],
+        predicate: Optional[EventFilter],
+        is_async: bool,
+        maxsize: int,
+    ):
+        self._bus = bus
+        self._handler = handler
+        self.topics = topics
+        self._predicate = predicate
+        self.is_async = is_async
+        self.dropped = 0
+        self.closed = False
+
+        self._queue: Optional[asyncio.Queue] = asyncio.Queue(maxsize) if is_async else None
+        self._task: Optional[asyncio.Task] = None
+        if is_async and handler is not None:
+            self._task = asyncio.get_running_loop().create_task(self._pump())
+
+    def matches(self, event: GameEvent) -> bool:
+        """事件是否符合订阅条件"""
+        if self.topics is not None and event.kind not in self.topics:
+            return False
+        return self._predicate is None or self._predicate(event)
+
+    def _deliver(self, event: GameEvent) -> None:
+        """投递事件（由 EventBus.publish 调用）"""
+        if not self.is_async:
+            try:
+                self._handler(event)
+            except Exception:
+                logger.exception("事件订阅者处理失败: %r", event)
+            return
+
+        queue = self._queue
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+            self.dropped += 1
+        queue.put_nowait(event)
+
+    async def _pump(self) -> None:
+        """后台任务：把队列中的事件依次交给异步 handler"""
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            try:
+                result = self._handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("事件订阅者处理失败: %r", event)
+            finally:
+                queue.task_done()
+
+    # ---------- 拉取式消费（无 handler 的异步订阅） ----------
+
+    async def get(self) -> GameEvent:
+        """等待并取出下一个事件"""
+        event = await self._queue.get()
+        self._queue.task_done()
+        return event
+
+    def get_nowait(self) -> Optional[GameEvent]:
+        """取出下一个事件，队列为空时返回 None"""
+        if self._queue.empty():
+            return None
+        event = self._queue.get_nowait()
+        self._queue.task_done()
+        return event
+
+    def pending(self) -> int:
+        """队列中尚未处理的事件数"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> GameEvent:
+        if self.closed and self._queue.empty():
+            raise StopAsyncIteration
+        return await self.get()
+
+    # ---------- 生命周期 ----------
+
+    async def drain(self) -> None:
+        """等待异步 handler 处理完已入队的事件"""
+        if self._task is not None:
+            await self._queue.join()
+
+    def close(self) -> None:
+        """取消订阅"""
+        if self.closed:
+            return
+        self.closed = True
+        self._bus._remove(self)
+        if self._task is not None:
+            self._task.cancel()
+
+
+class EventBus:
+    """
+    事件总线
+
+    Game.add_event 记录事件后发布到总线；运行器也可以直接发布不进入
+    history 的瞬时事件（如发言）。WebSocket 广播、日志和统计等消费者
+    订阅一次即可获得推送，无需各自复制事件或轮询状态。
+
+    Example:
+        game.bus.subscribe(print, topics=[EventType.PLAYER_DEATH])
+
+        async def broadcast(event): ...
+        game.bus.subscribe(broadcast, maxsize=256)   # 协程函数 -> 异步订阅
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+
+    def subscribe(
+        self,
+        handler: Optional[EventHandler] = None,
+        topics: Optional[Iterable[Topic]] = None,
+        predicate: Optional[EventFilter] = None,
+        *,
+        is_async: Optional[bool] = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+    ) -> Subscription:
+        """
+        订阅事件
+
+        Args:
+            handler: 事件处理函数；协程函数自动作为异步订阅
+            topics: 只接收这些事件类型（EventType 或字符串名），None 表示全部
+            predicate: 额外的过滤条件
+            is_async: 强制指定同步/异步；handler 为 None 时默认为异步（拉取式）
+            maxsize: 异步订阅的队列容量
+
+        Returns:
+            Subscription（调用 close() 取消订阅）
+        """
+        if is_async is None:
+            is_async = handler is None or inspect.iscoroutinefunction(handler)
+        if handler is None and not is_async:
+            raise ValueError("同步订阅必须提供 handler")
+        if maxsize <= 0:
+            raise ValueError("maxsize 必须为正数")
+
+        kinds = None
+        if topics is not None:
+            kinds = frozenset(event_kind(t) for t in topics)
+
+        subscription = Subscription(self, handler, kinds, predicate, is_async, maxsize)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def publish(self, event: GameEvent) -> None:
+        """发布事件（同步订阅者立即执行，异步订阅者入队）"""
+        for subscription in tuple(self._subscriptions):
+            if subscription.matches(event):
+                subscription._deliver(event)
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    async def drain(self) -> None:
+        """等待所有异步订阅者处理完已入队的事件"""
+        for subscription in tuple(self._subscriptions):
+            await subscription.drain()
+
+    def close(self) -> None:
+        """取消全部订阅"""
+        for subscription in tuple(self._subscriptions):
+            subscription.close()
+
+    def _remove(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
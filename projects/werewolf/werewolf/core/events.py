@@ -2,14 +2,16 @@
 """行动、事件和结果定义"""
 
 from __future__ import annotations
+import sys
+import time
 from dataclasses import dataclass, field
-from typing import Any, Optional, List
+from typing import Any, Dict, Iterable, Optional, List, Tuple, Union
 from datetime import datetime
 
-from werewolf.core.enums import ActionType, GamePhase, DeathReason, Faction
+from werewolf.core.enums import ActionType, GamePhase, DeathReason, Faction, EventType
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """
     玩家行动
@@ -30,7 +32,7 @@ class Action:
         return f"Action({self.action_type.value}, P{self.actor_id}{target})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionResult:
     """
     行动结果
@@ -53,36 +55,239 @@ class ActionResult:
         return cls(success=False, message=message)
 
 
-@dataclass
+# ---------- 事件负载驻留 ----------
+
+class _FrozenDict(tuple):
+    """冻结的字典负载：((key, value), ...)"""
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is _FrozenDict and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((_FrozenDict, tuple.__hash__(self)))
+
+
+class _FrozenList(tuple):
+    """冻结的列表负载"""
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(other) is _FrozenList and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((_FrozenList, tuple.__hash__(self)))
+
+
+# 驻留表容量上限（驻留表由对局持有，随对局释放）
+_INTERN_LIMIT = 1 << 16
+_INTERN_STR_MAX = 32  # 只驻留短字符串（键名、枚举值），长文本（发言）不驻留
+
+
+def _freeze(value: Any) -> Any:
+    """把 dict / list 递归转换为不可变结构，并驻留短字符串"""
+    if isinstance(value, dict):
+        return _FrozenDict(
+            (sys.intern(k) if type(k) is str else k, _freeze(v))
+            for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return _FrozenList(_freeze(v) for v in value)
+    if type(value) is str and len(value) <= _INTERN_STR_MAX:
+        return sys.intern(value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """_freeze 的逆操作，返回新的 dict / list"""
+    if type(value) is _FrozenDict:
+        return {k: _thaw(v) for k, v in value}
+    if type(value) is _FrozenList:
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _intern(value: Any, table: Dict[Any, Any]) -> Any:
+    """返回驻留表中与 value 相等的已有对象（不可哈希时原样返回）"""
+    try:
+        cached = table.get(value)
+    except TypeError:
+        return value
+    if cached is not None:
+        return cached
+    if len(table) < _INTERN_LIMIT:
+        table[value] = value
+    return value
+
+
+def event_kind(event_type: Union[str, EventType]) -> Union[EventType, str]:
+    """事件类型编码：内置类型为 EventType，自定义类型保留字符串名"""
+    if isinstance(event_type, EventType):
+        return event_type
+    try:
+        return EventType.from_label(event_type)
+    except ValueError:
+        return sys.intern(event_type)
+
+
+_EMPTY_PAYLOAD = _FrozenDict()
+_PUBLIC: Tuple[int, ...] = ()
+
+
 class GameEvent:
     """
     游戏事件（用于历史记录和回放）
 
+    不可变、带 __slots__ 的紧凑记录：事件类型为整数编码，时间戳为墙上时钟
+    整数（Unix 纳秒，跨进程 / 重启恢复的检查点仍然有效），负载与可见列表冻结；加入对局时按对局的驻留表驻留，
+    同一局中相同内容的事件共享同一份数据。
+    data / timestamp 在访问时才转换为 dict / datetime。
+
     Attributes:
-        event_type: 事件类型
+        event_type: 事件类型（字符串名，如 "player_death"）
+        kind: 事件类型（EventType；自定义类型为字符串名）
         round_num: 回合数
         phase: 发生阶段
-        timestamp: 时间戳
-        data: 事件数据
-        visible_to: 可见玩家ID列表（空列表=全体可见，None=仅系统）
+        timestamp: 时间戳（datetime）
+        data: 事件数据（每次访问返回新的 dict）
+        visible_to: 可见玩家ID元组（空元组=全体可见，None=仅系统）
     """
-    event_type: str
-    round_num: int
-    phase: GamePhase
-    data: dict = field(default_factory=dict)
-    visible_to: Optional[List[int]] = None
-    timestamp: datetime = field(default_factory=datetime.now)
+
+    __slots__ = ("kind", "round_num", "phase", "payload", "visible_to", "ts_ns")
 
     # 事件类型常量
-    GAME_START = "game_start"
-    PHASE_CHANGE = "phase_change"
-    PLAYER_ACTION = "player_action"
-    PLAYER_DEATH = "player_death"
-    VOTE_RESULT = "vote_result"
-    GAME_END = "game_end"
+    GAME_START = EventType.GAME_START.label
+    PHASE_CHANGE = EventType.PHASE_CHANGE.label
+    PLAYER_ACTION = EventType.PLAYER_ACTION.label
+    PLAYER_DEATH = EventType.PLAYER_DEATH.label
+    VOTE_RESULT = EventType.VOTE_RESULT.label
+    GAME_END = EventType.GAME_END.label
+    PLAYER_SPEECH = EventType.PLAYER_SPEECH.label
+
+    def __init__(
+        self,
+        event_type: Union[str, EventType],
+        round_num: int,
+        phase: GamePhase,
+        data: Optional[dict] = None,
+        visible_to: Optional[Iterable[int]] = None,
+        timestamp: Optional[int] = None,
+    ):
+        """
+        Args:
+            event_type: 事件类型（EventType 或字符串名，未知的字符串名作为自定义类型）
+            round_num: 回合数
+            phase: 发生阶段
+            data: 事件数据
+            visible_to: 可见玩家ID（空=全体可见，None=仅系统）
+            timestamp: Unix 纳秒时间戳（默认当前时间）
+        """
+        kind = event_kind(event_type)
+        payload = _freeze(data) if data else _EMPTY_PAYLOAD
+        if visible_to is not None:
+            visible_to = tuple(visible_to) if visible_to else _PUBLIC
+
+        setattr_ = object.__setattr__
+        setattr_(self, "kind", kind)
+        setattr_(self, "round_num", round_num)
+        setattr_(self, "phase", phase)
+        setattr_(self, "payload", payload)
+        setattr_(self, "visible_to", visible_to)
+        setattr_(self, "ts_ns", time.time_ns() if timestamp is None else timestamp)
+
+    @property
+    def event_type(self) -> str:
+        """事件类型字符串名"""
+        kind = self.kind
+        return kind.label if isinstance(kind, EventType) else kind
+
+    @property
+    def data(self) -> dict:
+        """事件数据（转换为 dict，修改不会影响事件本身）"""
+        return _thaw(self.payload)
+
+    @property
+    def timestamp(self) -> datetime:
+        """事件时间"""
+        return datetime.fromtimestamp(self.ts_ns / 1e9)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取单个数据字段（不构造完整 dict）"""
+        for k, v in self.payload:
+            if k == key:
+                return _thaw(v)
+        return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典（与旧版 dataclass 字段一致）"""
+        return {
+            "event_type": self.event_type,
+            "round_num": self.round_num,
+            "phase": self.phase,
+            "data": self.data,
+            "visible_to": list(self.visible_to) if self.visible_to is not None else None,
+            "timestamp": self.timestamp,
+        }
+
+    def intern_into(self, table: Dict[Any, Any]) -> None:
+        """把负载与可见列表换成驻留表中相等的已有对象（内容不变，由 Game.add_event 调用）"""
+        setattr_ = object.__setattr__
+        setattr_(self, "payload", _intern(self.payload, table))
+        if self.visible_to:
+            setattr_(self, "visible_to", _intern(self.visible_to, table))
+
+    def _key(self) -> tuple:
+        return (self.kind, self.round_num, self.phase, self.payload, self.visible_to, self.ts_ns)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("GameEvent 不可修改")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("GameEvent 不可修改")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not GameEvent:
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __copy__(self) -> GameEvent:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> GameEvent:
+        return self
+
+    def __reduce__(self):
+        return (_restore_event, (self.kind, self.round_num, self.phase,
+                                 self.payload, self.visible_to, self.ts_ns))
+
+    def __repr__(self) -> str:
+        return (f"GameEvent({self.event_type}, round={self.round_num}, "
+                f"phase={self.phase.value}, data={self.data}, visible_to={self.visible_to})")
+
+
+def _restore_event(kind, round_num, phase, payload, visible_to, ts_ns) -> GameEvent:
+    """反序列化（pickle）时重建事件（同一次序列化中共享的负载仍然共享）"""
+    event = object.__new__(GameEvent)
+    setattr_ = object.__setattr__
+    setattr_(event, "kind", EventType(kind) if isinstance(kind, int) else kind)
+    setattr_(event, "round_num", round_num)
+    setattr_(event, "phase", phase)
+    setattr_(event, "payload", payload)
+    setattr_(event, "visible_to", visible_to)
+    setattr_(event, "ts_ns", ts_ns)
+    return event
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseResult:
     """
     阶段结算结果
@@ -93,15 +298,17 @@ class PhaseResult:
         messages: 公开消息
         next_phase: 下一阶段
         winner: 胜利阵营（游戏结束时）
+        skipped: 因无人行动而被自动结算的阶段
     """
     phase: GamePhase
     deaths: List[int] = field(default_factory=list)
     messages: List[str] = field(default_factory=list)
     next_phase: Optional[GamePhase] = None
     winner: Optional[Faction] = None
+    skipped: List[GamePhase] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class NightResult:
     """
     夜间结算结果
@@ -117,7 +324,7 @@ class NightResult:
     messages: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class VoteResult:
     """
     投票结算结果
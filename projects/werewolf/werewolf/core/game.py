@@ -2,12 +2,17 @@
 """Game 类：游戏状态机和核心接口"""
 
 from __future__ import annotations
+import heapq
 import random
-from typing import List, Optional, Dict, Callable, Awaitable
+from bisect import bisect_left
+from typing import Any, List, Optional, Dict, Callable, Awaitable
 
-from werewolf.core.enums import GamePhase, Faction, ActionType
+from werewolf.core.enums import GamePhase, Faction, ActionType, RoleType
 from werewolf.core.player import Player
 from werewolf.core.events import GameEvent, Action, ActionResult, PhaseResult
+from werewolf.core.action_log import ActionRecord
+from werewolf.core.event_bus import EventBus
+from werewolf.core.legal import ActionMask, EMPTY_MASK
 from werewolf.config.presets import GameConfig
 from werewolf.roles import create_role, Role
 
@@ -28,6 +33,8 @@ class Game:
         phase: 当前阶段
         round: 当前回合
         history: 游戏事件历史
+        action_log: 成功提交的行动（用于确定性回放）
+        bus: 事件总线（add_event 记录的事件会发布到这里）
     """
 
     def __init__(self, config: GameConfig, seed: Optional[int] = None):
@@ -49,15 +56,31 @@ class Game:
         self.phase: GamePhase = GamePhase.INIT
         self.round: int = 0
         self.history: List[GameEvent] = []
+        self.action_log: List[ActionRecord] = []
+        self.bus = EventBus()
+
+        # 可见性索引：history 中的序号（全体可见 / 按玩家的私有事件）
+        self._public_seqs: List[int] = []
+        self._private_seqs: Dict[int, List[int]] = {}
+        # 事件负载驻留表：本局相同内容的负载只保留一份，随对局释放
+        self._interned: Dict[Any, Any] = {}
+
+        # 玩家索引（setup 时建立，玩家死亡时增量更新）
+        self._alive: Dict[int, Player] = {}
+        self._alive_counts: Dict[Faction, int] = {}
+        self._alive_mask: int = 0  # 存活玩家位集（按座位号）
+        self._by_faction: Dict[Faction, List[Player]] = {}
+        self._by_role: Dict[RoleType, List[Player]] = {}
 
         self._moderator: Optional["Moderator"] = None
 
-    async def setup(self, player_names: List[str]) -> None:
+    async def setup(self, player_names: List[str], roles: Optional[List[str]] = None) -> None:
         """
         初始化游戏，分配角色
 
         Args:
             player_names: 玩家名称列表（长度必须与配置人数一致）
+            roles: 各座位的角色类型（如回放时使用日志中的分配；默认随机分配）
         """
         if len(player_names) != self.config.player_count:
             raise ValueError(
@@ -65,15 +88,21 @@ class Game:
                 f"实际 {len(player_names)}"
             )
 
-        # 创建角色并随机分配
-        roles = [create_role(role_type) for role_type in self.config.roles]
-        self.rng.shuffle(roles)
+        if roles is None:
+            # 创建角色并随机分配
+            roles = [create_role(role_type) for role_type in self.config.roles]
+            self.rng.shuffle(roles)
+        else:
+            if sorted(roles) != sorted(self.config.roles):
+                raise ValueError(f"角色分配与配置不一致: {roles}")
+            roles = [create_role(role_type) for role_type in roles]
 
         # 创建玩家
         self.players = [
             Player(id=i, name=name, role=role)
             for i, (name, role) in enumerate(zip(player_names, roles))
         ]
+        self._build_indexes()
 
         # 初始化主持人
         from werewolf.engine.moderator import Moderator
@@ -98,7 +127,13 @@ class Game:
         """
         if self._moderator is None:
             return ActionResult.fail("游戏未初始化")
-        return await self._moderator.submit_action(player_id, action)
+        round_num, phase = self.round, self.phase
+        result = await self._moderator.submit_action(player_id, action)
+        if result.success:
+            self.action_log.append(ActionRecord(
+                round_num, phase, player_id, action.action_type, action.target_id
+            ))
+        return result
 
     async def advance_phase(self) -> PhaseResult:
         """
@@ -111,6 +146,58 @@ class Game:
             raise RuntimeError("游戏未初始化")
         return await self._moderator.advance_phase()
 
+    def fork(self) -> Game:
+        """
+        复制当前对局（用于前瞻搜索和假设分析）
+
+        玩家、角色状态、主持人待处理行动和随机数状态独立复制；
+        配置、已发生的事件对象和事件负载驻留表在两个对局间共享（事件只追加、不修改）。
+
+        Returns:
+            与当前状态一致、互不影响的新 Game
+        """
+        new = Game.__new__(Game)
+        new.config = self.config
+        new.seed = self.seed
+        new.rng = random.Random(0)
+        new.rng.setstate(self.rng.getstate())
+
+        new.players = [p.clone() for p in self.players]
+        new.phase = self.phase
+        new.round = self.round
+        new.history = self.history.copy()
+        new.action_log = self.action_log.copy()
+        new.bus = EventBus()  # 订阅者不随复制转移
+
+        new._public_seqs = self._public_seqs.copy()
+        new._private_seqs = {pid: seqs.copy() for pid, seqs in self._private_seqs.items()}
+        new._interned = self._interned
+
+        # 按座位号映射父对局的索引，避免重建
+        players = new.players
+        new._alive = {pid: players[pid] for pid in self._alive}
+        new._alive_counts = self._alive_counts.copy()
+        new._alive_mask = self._alive_mask
+        new._by_faction = {k: [players[p.id] for p in v] for k, v in self._by_faction.items()}
+        new._by_role = {k: [players[p.id] for p in v] for k, v in self._by_role.items()}
+        listener = new._on_player_death
+        for player in players:
+            player._death_listener = listener
+
+        new._moderator = self._moderator.fork(new) if self._moderator else None
+        return new
+
+    def __getstate__(self) -> dict:
+        """序列化状态（用于检查点；事件总线的订阅者不随之保存）"""
+        state = self.__dict__.copy()
+        del state["bus"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        state.setdefault("_interned", {})
+        self.__dict__.update(state)
+        self.bus = EventBus()
+
     # ==================== 查询接口 ====================
 
     def get_player(self, player_id: int) -> Optional[Player]:
@@ -120,35 +207,66 @@ class Game:
         return None
 
     def get_alive_players(self) -> List[Player]:
-        """获取所有存活玩家"""
-        return [p for p in self.players if p.is_alive]
+        """获取所有存活玩家（按座位顺序）"""
+        return list(self._alive.values())
+
+    def get_alive_count(self, faction: Optional[Faction] = None) -> int:
+        """
+        获取存活人数
+
+        Args:
+            faction: 指定阵营，None 表示所有玩家
+        """
+        if faction is None:
+            return len(self._alive)
+        return self._alive_counts.get(faction, 0)
+
+    @property
+    def alive_mask(self) -> int:
+        """存活玩家位集（第 i 位为 1 表示座位 i 存活）"""
+        return self._alive_mask
 
     def get_players_by_faction(self, faction: Faction) -> List[Player]:
         """获取指定阵营的玩家"""
-        return [p for p in self.players if p.role.faction == faction]
+        return list(self._by_faction.get(faction, ()))
 
-    def get_players_by_role(self, role_name: str) -> List[Player]:
+    def get_players_by_role(self, role_type: RoleType) -> List[Player]:
         """获取指定角色的玩家"""
-        return [p for p in self.players if p.role.name == role_name]
+        return list(self._by_role.get(role_type, ()))
 
     def get_active_players(self) -> List[int]:
         """
-        获取当前阶段需要行动的玩家ID列表
+        获取当前阶段需要行动的玩家ID列表（由阶段表决定，按行动顺序）
 
         Returns:
             玩家ID列表
         """
-        if self.phase == GamePhase.NIGHT:
-            # 夜间：所有存活且可以夜间行动的玩家
-            return [
-                p.id for p in self.get_alive_players()
-                if p.role.can_act_at_night
-            ]
-        elif self.phase == GamePhase.DAY_VOTE:
-            # 投票：所有存活玩家
-            return [p.id for p in self.get_alive_players()]
-        else:
-            return []
+        if self._moderator:
+            return self._moderator.get_active_players()
+        return []
+
+    def get_legal_actions(self, player_id: int) -> ActionMask:
+        """
+        获取玩家当前阶段的合法行动掩码（每阶段计算一次）
+
+        Returns:
+            ActionMask（未初始化或玩家不存在时为空）
+        """
+        if self._moderator:
+            return self._moderator.get_legal_actions(player_id)
+        return EMPTY_MASK
+
+    def invalidate_legal_actions(self, player_id: Optional[int] = None) -> None:
+        """
+        使缓存的合法行动掩码失效
+
+        引擎内的状态变化会自动失效；绕过引擎直接修改角色状态后需要调用。
+
+        Args:
+            player_id: 指定玩家，None 表示全部
+        """
+        if self._moderator:
+            self._moderator.invalidate_legal_actions(player_id)
 
     def get_pending_actions(self) -> List[Action]:
         """获取待处理的行动"""
@@ -156,18 +274,50 @@ class Game:
             return self._moderator.get_pending_actions()
         return []
 
+    def get_wolf_target(self) -> Optional[int]:
+        """获取今晚当前的狼刀目标（已提交击杀的多数决）"""
+        if self._moderator:
+            return self._moderator.get_wolf_target()
+        return None
+
     def get_winner(self) -> Optional[Faction]:
         """获取胜利阵营（游戏结束时）"""
         if self.phase != GamePhase.GAME_OVER:
             return None
 
-        alive = self.get_alive_players()
-        wolf_count = sum(1 for p in alive if p.role.faction == Faction.WEREWOLF)
-
-        if wolf_count == 0:
+        if self.get_alive_count(Faction.WEREWOLF) == 0:
             return Faction.VILLAGER
         return Faction.WEREWOLF
 
+    # ==================== 玩家索引 ====================
+
+    def _build_indexes(self) -> None:
+        """根据当前玩家列表建立索引，并注册死亡回调"""
+        self._alive = {}
+        self._alive_counts = {faction: 0 for faction in Faction}
+        self._alive_mask = 0
+        self._by_faction = {}
+        self._by_role = {}
+
+        for player in self.players:
+            role = player.role
+            self._by_faction.setdefault(role.faction, []).append(player)
+            if role.role_type is not None:
+                self._by_role.setdefault(role.role_type, []).append(player)
+            if player.is_alive:
+                self._alive[player.id] = player
+                self._alive_counts[role.faction] += 1
+                self._alive_mask |= 1 << player.id
+            player._death_listener = self._on_player_death
+
+    def _on_player_death(self, player: Player) -> None:
+        """玩家死亡时更新存活索引（缓存的合法行动掩码随之失效）"""
+        if self._alive.pop(player.id, None) is not None:
+            self._alive_counts[player.role.faction] -= 1
+            self._alive_mask &= ~(1 << player.id)
+            if self._moderator is not None:
+                self._moderator.invalidate_legal_actions()
+
     # ==================== 信息隔离 ====================
 
     def get_player_view(self, player_id: int) -> "PlayerView":
@@ -191,20 +341,49 @@ class Game:
     # ==================== 事件系统 ====================
 
     def add_event(self, event: GameEvent) -> None:
-        """添加游戏事件"""
+        """添加游戏事件（负载按本局驻留），更新可见性索引并发布到事件总线"""
+        event.intern_into(self._interned)
+        seq = len(self.history)
         self.history.append(event)
 
-    def get_visible_events(self, player_id: int) -> List[GameEvent]:
-        """获取玩家可见的事件"""
-        events = []
-        for event in self.history:
-            if event.visible_to is None:
-                continue  # 仅系统可见
+        if event.visible_to is not None:
             if len(event.visible_to) == 0:
-                events.append(event)  # 全体可见
-            elif player_id in event.visible_to:
-                events.append(event)  # 该玩家可见
-        return events
+                self._public_seqs.append(seq)  # 全体可见
+            else:
+                for player_id in set(event.visible_to):
+                    self._private_seqs.setdefault(player_id, []).append(seq)
+
+        if self.bus.has_subscribers:
+            self.bus.publish(event)
+
+    @property
+    def event_cursor(self) -> int:
+        """当前事件序号（下一个事件的序号），可作为 get_visible_events 的 since 参数"""
+        return len(self.history)
+
+    def get_visible_events(self, player_id: int, since: int = 0) -> List[GameEvent]:
+        """
+        获取玩家可见的事件（按发生顺序）
+
+        Args:
+            player_id: 玩家ID
+            since: 只返回序号 >= since 的事件（配合 event_cursor 增量获取）
+
+        Returns:
+            事件列表
+        """
+        public = self._public_seqs
+        private = self._private_seqs.get(player_id, ())
+        if since:
+            public = public[bisect_left(public, since):]
+            private = private[bisect_left(private, since):]
+
+        history = self.history
+        if not private:
+            return [history[seq] for seq in public]
+        if not public:
+            return [history[seq] for seq in private]
+        return [history[seq] for seq in heapq.merge(public, private)]
 
 
 class PlayerView:
@@ -243,6 +422,11 @@ class PlayerView:
         """当前回合"""
         return self._game.round
 
+    @property
+    def role_config(self) -> List[str]:
+        """本局的角色配置（公开信息，不含座位对应关系）"""
+        return list(self._game.config.roles)
+
     @property
     def alive_players(self) -> List[Dict]:
         """
@@ -279,6 +463,16 @@ class PlayerView:
             self._player, self._game
         )
 
+    @property
+    def legal_actions(self) -> ActionMask:
+        """
+        当前阶段的合法行动掩码
+
+        与 available_actions 不同，掩码已排除会被拒绝的组合
+        （如不能连续守护同一人、女巫不能自救）。
+        """
+        return self._game.get_legal_actions(self._player.id)
+
     @property
     def wolf_target_tonight(self) -> Optional[int]:
         """
@@ -287,14 +481,15 @@ class PlayerView:
         Returns:
             被杀玩家ID，或None
         """
-        if self._player.role.name != "女巫":
+        if self._player.role.role_type != RoleType.WITCH:
             return None
+        return self._game.get_wolf_target()
 
-        for action in self._game.get_pending_actions():
-            if action.action_type == ActionType.KILL:
-                return action.target_id
-        return None
+    def get_visible_history(self, since: int = 0) -> List[GameEvent]:
+        """
+        获取可见的历史事件
 
-    def get_visible_history(self) -> List[GameEvent]:
-        """获取可见的历史事件"""
-        return self._game.get_visible_events(self._player.id)
+        Args:
+            since: 只返回序号 >= since 的事件（见 Game.event_cursor）
+        """
+        return self._game.get_visible_events(self._player.id, since)
@@ -0,0 +1,123 @@
+# ==================== 合法行动掩码 ====================
+"""
+合法行动掩码
+
+每个玩家在每个阶段的合法 (行动类型, 目标) 组合编码为位集：
+action_bits 中每种行动类型占一位，每种需要目标的行动对应一个
+按座位号编码的目标位集。主持人每阶段为行动者计算一次，
+提交行动时的合法性校验变为常数时间查表。
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from werewolf.core.enums import ActionType
+
+# 行动类型 -> 位
+ACTION_BITS: Dict[ActionType, int] = {action: 1 << i for i, action in enumerate(ActionType)}
+
+# 需要指定目标的行动（其余行动的目标由规则隐含或为空）
+TARGETED_ACTIONS = frozenset({
+    ActionType.KILL,
+    ActionType.CHECK,
+    ActionType.POISON,
+    ActionType.PROTECT,
+    ActionType.SHOOT,
+    ActionType.VOTE,
+})
+
+# 无需目标的行动在目标位集中的取值
+UNTARGETED = -1
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """按升序遍历位集中的座位号"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ActionMask:
+    """
+    单个玩家的合法行动掩码（不可变）
+
+    Attributes:
+        action_bits: 合法行动类型位集（见 ACTION_BITS）
+    """
+
+    __slots__ = ("action_bits", "_targets")
+
+    def __init__(self, targets: Optional[Mapping[ActionType, int]] = None):
+        """
+        Args:
+            targets: 行动类型 -> 目标位集（无需目标的行动为 UNTARGETED），
+                     按角色给出的行动顺序排列；目标位集为 0 的行动视为不合法
+        """
+        self._targets: Dict[ActionType, int] = {
+            action_type: mask for action_type, mask in (targets or {}).items() if mask
+        }
+        bits = 0
+        for action_type in self._targets:
+            bits |= ACTION_BITS[action_type]
+        self.action_bits = bits
+
+    def allows(self, action_type: ActionType, target_id: Optional[int] = None) -> bool:
+        """行动是否合法（无需目标的行动忽略 target_id）"""
+        mask = self._targets.get(action_type)
+        if mask is None:
+            return False
+        if mask == UNTARGETED:
+            return True
+        return target_id is not None and target_id >= 0 and bool((mask >> target_id) & 1)
+
+    @property
+    def action_types(self) -> List[ActionType]:
+        """合法的行动类型（按角色给出的顺序）"""
+        return list(self._targets)
+
+    def target_mask(self, action_type: ActionType) -> int:
+        """指定行动的目标位集（不合法为 0，无需目标为 UNTARGETED）"""
+        return self._targets.get(action_type, 0)
+
+    def targets(self, action_type: ActionType) -> List[int]:
+        """指定行动的合法目标（升序）；无需目标的行动返回空列表"""
+        mask = self._targets.get(action_type, 0)
+        if mask == UNTARGETED:
+            return []
+        return list(iter_bits(mask))
+
+    def moves(self) -> List[Tuple[ActionType, Optional[int]]]:
+        """展开为 (行动, 目标) 列表（无需目标的行动目标为 None），供搜索和策略枚举"""
+        moves: List[Tuple[ActionType, Optional[int]]] = []
+        for action_type, mask in self._targets.items():
+            if mask == UNTARGETED:
+                moves.append((action_type, None))
+            else:
+                moves.extend((action_type, target) for target in iter_bits(mask))
+        return moves
+
+    def to_dict(self) -> Dict[str, Optional[List[int]]]:
+        """序列化（行动名 -> 合法目标列表，无需目标为 None），供前端和提示词使用"""
+        return {
+            action_type.value: None if mask == UNTARGETED else list(iter_bits(mask))
+            for action_type, mask in self._targets.items()
+        }
+
+    def __bool__(self) -> bool:
+        return bool(self._targets)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ActionMask):
+            return NotImplemented
+        return self._targets == other._targets
+
+    def __hash__(self) -> int:
+        return hash(tuple(self._targets.items()))
+
+    def __repr__(self) -> str:
+        return f"ActionMask({self.to_dict()})"
+
+
+# 没有任何合法行动
+EMPTY_MASK = ActionMask()
@@ -0,0 +1,14 @@
+# ==================== 随机发言语料 ====================
+"""RandomAgent 与 werewolf.sim 的随机策略共用的发言语料"""
+
+# 随机策略按相同方式消耗随机数（rng.choice），两者的随机数流保持同步
+RANDOM_PHRASES = (
+    "我没什么特别想说的。",
+    "我觉得大家都挺可疑的。",
+    "我是好人，请相信我。",
+    "让我再观察一下。",
+    "我同意上一位的发言。",
+    "我觉得应该投那个发言最少的人。",
+    "我暂时没有确切的线索。",
+    "请大家理性分析。",
+)
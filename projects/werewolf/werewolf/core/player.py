@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 from werewolf.core.enums import DeathReason
 
@@ -23,6 +23,13 @@ class NightState:
     saved: bool = False                 # 被女巫解药救了
     poisoned: bool = False              # 被女巫毒药毒了
 
+    def copy(self) -> NightState:
+        """复制夜间状态"""
+        return NightState(
+            self.killed_by_wolf, self.wolf_target_id,
+            self.protected, self.saved, self.poisoned,
+        )
+
     def reset(self) -> None:
         """重置夜间状态"""
         self.killed_by_wolf = False
@@ -53,12 +60,31 @@ class Player:
     death_reason: Optional[DeathReason] = None
     death_round: Optional[int] = None
     night_state: NightState = field(default_factory=NightState)
+    # 死亡回调（由 Game 注册，用于维护存活索引）
+    _death_listener: Optional[Callable[[Player], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def die(self, reason: DeathReason, round_num: int) -> None:
         """玩家死亡"""
+        was_alive = self.is_alive
         self.is_alive = False
         self.death_reason = reason
         self.death_round = round_num
+        if was_alive and self._death_listener is not None:
+            self._death_listener(self)
+
+    def clone(self) -> Player:
+        """复制玩家及其角色状态（用于 Game.fork，不复制死亡回调）"""
+        return Player(
+            id=self.id,
+            name=self.name,
+            role=self.role.clone() if self.role else None,
+            is_alive=self.is_alive,
+            death_reason=self.death_reason,
+            death_round=self.death_round,
+            night_state=self.night_state.copy(),
+        )
 
     def reset_night_state(self) -> None:
         """重置夜间状态（每晚开始时调用）"""
@@ -2,12 +2,16 @@
 """游戏主持人，负责驱动游戏流程"""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Optional, Callable, Awaitable
+import copy
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Callable, Awaitable
 
-from werewolf.core.enums import GamePhase, ActionType, DeathReason, Faction
+from werewolf.core.enums import GamePhase, ActionType, DeathReason, Faction, RoleType
 from werewolf.core.events import Action, ActionResult, PhaseResult, GameEvent
+from werewolf.core.legal import ActionMask, EMPTY_MASK
 from werewolf.engine.resolver import NightResolver
 from werewolf.engine.vote import VoteManager
+from werewolf.engine.rules import check_winner, majority_target
+from werewolf.engine.scheduler import PhaseInterrupt, PhaseScheduler, PhaseSpec
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
@@ -19,7 +23,7 @@ class Moderator:
     游戏主持人
 
     职责：
-    - 驱动游戏阶段转换
+    - 驱动游戏阶段转换（按 PhaseScheduler 的阶段表）
     - 收集和验证玩家行动
     - 调用结算器处理行动
     - 判定游戏胜负
@@ -31,7 +35,48 @@ class Moderator:
         self.night_resolver = NightResolver()
         self.vote_manager = VoteManager()
         self._pending_actions: List[Action] = []
+        # 待处理行动索引：按行动类型 / 行动者（提交时增量维护）
+        self._actions_by_type: Dict[ActionType, List[Action]] = {}
+        self._actions_by_actor: Dict[int, List[Action]] = {}
+        # 当前狼刀多数目标（新的 KILL 提交时失效）
+        self._wolf_target: Optional[int] = None
+        self._wolf_target_stale: bool = False
+        # 合法行动掩码缓存（进入新阶段时清空，行动者状态或存活集合变化时失效）
+        self._legal: Dict[int, ActionMask] = {}
+        self._legal_wolf_dependents: Set[int] = set()
         self._hunter_pending: bool = False  # 猎人是否需要开枪
+        self._hunter_id: Optional[int] = None
+        # 插入阶段结束后要回到的阶段
+        self._resume_phase: Optional[GamePhase] = None
+        self.scheduler = self._build_scheduler()
+
+    def _build_scheduler(self) -> PhaseScheduler:
+        """
+        构建阶段表
+
+        规则开关：
+        - skip_idle_phases（默认开启）：没有玩家需要行动的阶段立即结算
+        - hunter_shot_phase（默认关闭）：猎人死亡后插入 HUNTER_SHOT 阶段开枪
+        """
+        rules = self.game.config.rules
+        scheduler = PhaseScheduler(
+            specs=[
+                PhaseSpec(GamePhase.NIGHT, Moderator._resolve_night,
+                          actors=Moderator._night_actors),
+                PhaseSpec(GamePhase.DAY_DISCUSSION, Moderator._end_discussion),
+                PhaseSpec(GamePhase.DAY_VOTE, Moderator._resolve_vote,
+                          actors=Moderator._vote_actors),
+                PhaseSpec(GamePhase.HUNTER_SHOT, Moderator._resolve_hunter_shot,
+                          actors=Moderator._hunter_actors),
+                PhaseSpec(GamePhase.GAME_OVER, Moderator._game_over),
+            ],
+            skip_idle=rules.get("skip_idle_phases", True),
+        )
+        if rules.get("hunter_shot_phase", False):
+            scheduler.add_interrupt(
+                PhaseInterrupt(GamePhase.HUNTER_SHOT, Moderator._hunter_shot_due)
+            )
+        return scheduler
 
     async def start_game(self) -> None:
         """开始游戏"""
@@ -65,17 +110,20 @@ class Moderator:
         if player is None:
             return ActionResult.fail(f"玩家不存在: {player_id}")
 
-        # 验证行动
-        valid, msg = player.role.validate_action(action, player, self.game)
-        if not valid:
-            return ActionResult.fail(msg)
+        # 验证行动：查合法行动掩码；只有被拒绝时才调用角色校验获取错误信息
+        if not self.get_legal_actions(player_id).allows(action.action_type, action.target_id):
+            _, msg = player.role.validate_action(action, player, self.game)
+            return ActionResult.fail(
+                msg or f"当前阶段不能执行此行动: {action.action_type.value}"
+            )
 
-        # 执行行动（可能返回即时结果，如预言家查验）
+        # 执行行动（可能返回即时结果，如预言家查验）；行动者状态可能改变
         result = await player.role.execute_action(action, player, self.game)
+        self.invalidate_legal_actions(player_id)
 
         # 记录行动
         if result.success:
-            self._pending_actions.append(action)
+            self._add_pending(action)
             self.game.add_event(GameEvent(
                 event_type=GameEvent.PLAYER_ACTION,
                 round_num=self.game.round,
@@ -88,23 +136,73 @@ class Moderator:
 
     async def advance_phase(self) -> PhaseResult:
         """
-        推进到下一阶段
+        推进到下一阶段（没有行动者的阶段会被连续结算跳过）
 
         Returns:
             阶段结算结果
         """
-        current_phase = self.game.phase
-
-        if current_phase == GamePhase.NIGHT:
-            return await self._resolve_night()
-        elif current_phase == GamePhase.DAY_DISCUSSION:
-            return await self._end_discussion()
-        elif current_phase == GamePhase.DAY_VOTE:
-            return await self._resolve_vote()
-        elif current_phase == GamePhase.GAME_OVER:
-            return PhaseResult(phase=GamePhase.GAME_OVER)
+        return await self.scheduler.advance(self)
+
+    def get_active_players(self) -> List[int]:
+        """当前阶段需要行动的玩家ID列表（按行动顺序）"""
+        return self.scheduler.active_players(self)
+
+    def get_legal_actions(self, player_id: int) -> ActionMask:
+        """
+        获取玩家的合法行动掩码（本阶段首次访问时由角色计算并缓存）
+
+        Returns:
+            ActionMask（玩家不存在时为空）
+        """
+        mask = self._legal.get(player_id)
+        if mask is None:
+            player = self.game.get_player(player_id)
+            if player is None:
+                return EMPTY_MASK
+            mask = player.role.legal_actions(player, self.game)
+            self._legal[player_id] = mask
+            if player.role.legal_depends_on_wolf_target:
+                self._legal_wolf_dependents.add(player_id)
+        return mask
+
+    def invalidate_legal_actions(self, player_id: Optional[int] = None) -> None:
+        """
+        使缓存的合法行动掩码失效
+
+        Args:
+            player_id: 指定玩家，None 表示全部
+        """
+        if player_id is None:
+            self._legal.clear()
+            self._legal_wolf_dependents.clear()
         else:
-            raise RuntimeError(f"无法从此阶段推进: {current_phase}")
+            self._legal.pop(player_id, None)
+            self._legal_wolf_dependents.discard(player_id)
+
+    # ==================== 行动者 ====================
+
+    def _night_actors(self) -> List[int]:
+        """夜间：所有存活且可以夜间行动的玩家"""
+        return [p.id for p in self.game.get_alive_players() if p.role.can_act_at_night]
+
+    def _vote_actors(self) -> List[int]:
+        """投票：所有存活玩家（投票或弃权，由角色的合法行动给出）"""
+        return [p.id for p in self.game.get_alive_players() if self.get_legal_actions(p.id)]
+
+    def _hunter_actors(self) -> List[int]:
+        """猎人开枪：待开枪且仍保有开枪能力的猎人"""
+        if not self._hunter_pending or self._hunter_id is None:
+            return []
+        hunter = self.game.get_player(self._hunter_id)
+        if hunter is None or not getattr(hunter.role, "can_shoot", False):
+            return []
+        return [hunter.id]
+
+    def _hunter_shot_due(self) -> bool:
+        """是否需要插入猎人开枪阶段"""
+        return bool(self._hunter_actors())
+
+    # ==================== 阶段结算 ====================
 
     async def _resolve_night(self) -> PhaseResult:
         """结算夜间"""
@@ -112,7 +210,7 @@ class Moderator:
 
         # 调用夜间结算器
         night_result = await self.night_resolver.resolve(self.game, self._pending_actions)
-        self._pending_actions.clear()
+        self._clear_pending()
 
         # 处理死亡
         for player_id, death_reason in night_result.deaths:
@@ -133,34 +231,22 @@ class Moderator:
                     }
                 ))
 
-        # 检查猎人
+        # 检查猎人（开启 hunter_shot_phase 时在 HUNTER_SHOT 阶段开枪，
+        # 否则只做标记，由外部处理）
         if night_result.hunter_can_shoot:
             self._hunter_pending = True
-            # 实际游戏中这里需要等待猎人选择目标
-            # 简化处理：标记后由外部处理
-
-        # 检查胜负
-        winner = self._check_winner()
-        if winner:
-            result.winner = winner
-            result.next_phase = GamePhase.GAME_OVER
-            await self._transition_to(GamePhase.GAME_OVER)
-        else:
-            result.next_phase = GamePhase.DAY_DISCUSSION
-            await self._transition_to(GamePhase.DAY_DISCUSSION)
+            self._hunter_id = night_result.hunter_id
 
         # 重置所有玩家的夜间状态
         for player in self.game.players:
             player.reset_night_state()
 
+        self._finish(result, GamePhase.DAY_DISCUSSION)
         return result
 
     async def _end_discussion(self) -> PhaseResult:
         """结束讨论阶段，进入投票"""
-        result = PhaseResult(phase=GamePhase.DAY_DISCUSSION)
-        result.next_phase = GamePhase.DAY_VOTE
-        await self._transition_to(GamePhase.DAY_VOTE)
-        return result
+        return PhaseResult(phase=GamePhase.DAY_DISCUSSION, next_phase=GamePhase.DAY_VOTE)
 
     async def _resolve_vote(self) -> PhaseResult:
         """结算投票"""
@@ -169,7 +255,7 @@ class Moderator:
         # 筛选投票行动
         vote_actions = [a for a in self._pending_actions
                        if a.action_type in (ActionType.VOTE, ActionType.SKIP)]
-        self._pending_actions.clear()
+        self._clear_pending()
 
         # 调用投票管理器
         vote_result = await self.vote_manager.resolve(self.game, vote_actions)
@@ -194,29 +280,77 @@ class Moderator:
                 result.messages.append(f"{player.name} 被投票处决")
 
                 # 检查猎人
-                if player.role and player.role.name == "猎人":
+                if player.role and player.role.role_type == RoleType.HUNTER:
                     trigger = player.role.on_death(player, self.game)
                     if trigger == ActionType.SHOOT:
                         self._hunter_pending = True
+                        self._hunter_id = player.id
+
+        # 进入下一个夜晚（回合数在进入夜晚时递增）
+        self._finish(result, GamePhase.NIGHT)
+        return result
+
+    async def _resolve_hunter_shot(self) -> PhaseResult:
+        """结算猎人开枪，然后回到被插入的阶段"""
+        result = PhaseResult(phase=GamePhase.HUNTER_SHOT)
+
+        shots = self._actions_by_type.get(ActionType.SHOOT, ())
+        target_id = shots[-1].target_id if shots else None
+        self._clear_pending()
+
+        hunter = self.game.get_player(self._hunter_id) if self._hunter_id is not None else None
+        if hunter is not None:
+            # 开枪机会只有一次，放弃也视为用掉
+            hunter.role.can_shoot = False
+        self.clear_hunter_pending()
+
+        target = self.game.get_player(target_id) if target_id is not None else None
+        if target is not None and target.is_alive:
+            target.die(DeathReason.HUNTER_SHOT, self.game.round)
+            result.deaths.append(target.id)
+            result.messages.append(f"{target.name} 被猎人射杀")
+            self.game.add_event(GameEvent(
+                event_type=GameEvent.PLAYER_DEATH,
+                round_num=self.game.round,
+                phase=GamePhase.HUNTER_SHOT,
+                data={
+                    "player_id": target.id,
+                    "reason": DeathReason.HUNTER_SHOT.value
+                }
+            ))
+
+        self._finish(result, self.pop_resume_phase() or GamePhase.DAY_DISCUSSION)
+        return result
 
-        # 检查胜负
+    async def _game_over(self) -> PhaseResult:
+        """游戏已结束，停留在 GAME_OVER"""
+        return PhaseResult(phase=GamePhase.GAME_OVER)
+
+    def _finish(self, result: PhaseResult, next_phase: GamePhase) -> None:
+        """检查胜负并设置下一阶段"""
         winner = self._check_winner()
         if winner:
             result.winner = winner
             result.next_phase = GamePhase.GAME_OVER
-            await self._transition_to(GamePhase.GAME_OVER)
         else:
-            # 进入下一个夜晚
-            self.game.round += 1
-            result.next_phase = GamePhase.NIGHT
-            await self._transition_to(GamePhase.NIGHT)
+            result.next_phase = next_phase
 
-        return result
+    def pop_resume_phase(self) -> Optional[GamePhase]:
+        """取出插入阶段结束后要回到的阶段"""
+        phase, self._resume_phase = self._resume_phase, None
+        return phase
+
+    async def _enter_phase(self, phase: GamePhase) -> None:
+        """进入阶段（由 PhaseScheduler 调用；白天之后进入夜晚时回合数加一）"""
+        if phase == GamePhase.NIGHT and self.game.phase != GamePhase.INIT:
+            self.game.round += 1
+        await self._transition_to(phase)
 
     async def _transition_to(self, phase: GamePhase) -> None:
         """切换阶段"""
         old_phase = self.game.phase
         self.game.phase = phase
+        self.invalidate_legal_actions()
 
         self.game.add_event(GameEvent(
             event_type=GameEvent.PHASE_CHANGE,
@@ -232,24 +366,76 @@ class Moderator:
         Returns:
             胜利阵营，或None（游戏继续）
         """
-        alive_players = self.game.get_alive_players()
+        return check_winner(
+            self.game.get_alive_count(Faction.WEREWOLF),
+            self.game.get_alive_count(Faction.VILLAGER),
+        )
 
-        wolf_count = sum(1 for p in alive_players if p.role.faction == Faction.WEREWOLF)
-        villager_count = sum(1 for p in alive_players if p.role.faction == Faction.VILLAGER)
+    def get_pending_actions(self) -> List[Action]:
+        """获取待处理的行动（副本）"""
+        return self._pending_actions.copy()
 
-        # 狼人全灭 -> 村民胜
-        if wolf_count == 0:
-            return Faction.VILLAGER
+    def get_actions_by_type(self, action_type: ActionType) -> Sequence[Action]:
+        """获取指定类型的待处理行动（按提交顺序，只读）"""
+        return self._actions_by_type.get(action_type, ())
 
-        # 狼人 >= 村民 -> 狼人胜
-        if wolf_count >= villager_count:
-            return Faction.WEREWOLF
+    def get_actions_by_actor(self, actor_id: int) -> Sequence[Action]:
+        """获取指定玩家的待处理行动（按提交顺序，只读）"""
+        return self._actions_by_actor.get(actor_id, ())
 
-        return None
+    def get_wolf_target(self) -> Optional[int]:
+        """
+        获取当前狼刀目标（已提交击杀的多数决，与夜间结算规则一致）
 
-    def get_pending_actions(self) -> List[Action]:
-        """获取待处理的行动（用于女巫查看狼刀目标等）"""
-        return self._pending_actions.copy()
+        Returns:
+            被击杀玩家ID，或None（尚无狼刀）
+        """
+        if self._wolf_target_stale:
+            self._wolf_target = majority_target(
+                a.target_id for a in self._actions_by_type.get(ActionType.KILL, ())
+            )
+            self._wolf_target_stale = False
+        return self._wolf_target
+
+    def fork(self, game: Game) -> Moderator:
+        """
+        复制主持人状态到新的游戏实例（用于 Game.fork）
+
+        结算器无状态，直接共享；行动对象提交后不再修改，只复制容器。
+        """
+        new = copy.copy(self)
+        new.game = game
+        new._pending_actions = []
+        new._actions_by_type = {}
+        new._actions_by_actor = {}
+        for action in self._pending_actions:
+            new._add_pending(action)
+        new._wolf_target = self._wolf_target
+        new._wolf_target_stale = self._wolf_target_stale
+        # 掩码不可变，复制容器即可
+        new._legal = self._legal.copy()
+        new._legal_wolf_dependents = self._legal_wolf_dependents.copy()
+        return new
+
+    def _add_pending(self, action: Action) -> None:
+        """记录待处理行动并更新索引"""
+        self._pending_actions.append(action)
+        self._actions_by_type.setdefault(action.action_type, []).append(action)
+        self._actions_by_actor.setdefault(action.actor_id, []).append(action)
+        if action.action_type == ActionType.KILL:
+            self._wolf_target_stale = True
+            # 狼刀变化：依赖狼刀的掩码（女巫解药）失效
+            for pid in self._legal_wolf_dependents:
+                self._legal.pop(pid, None)
+            self._legal_wolf_dependents.clear()
+
+    def _clear_pending(self) -> None:
+        """清空待处理行动及索引"""
+        self._pending_actions.clear()
+        self._actions_by_type.clear()
+        self._actions_by_actor.clear()
+        self._wolf_target = None
+        self._wolf_target_stale = False
 
     def is_hunter_pending(self) -> bool:
         """检查是否有猎人需要开枪"""
@@ -258,3 +444,4 @@ class Moderator:
     def clear_hunter_pending(self) -> None:
         """清除猎人待开枪状态"""
         self._hunter_pending = False
+        self._hunter_id = None
@@ -3,10 +3,10 @@
 
 from __future__ import annotations
 from typing import TYPE_CHECKING, List, Dict, Optional
-from collections import Counter
 
-from werewolf.core.enums import ActionType, DeathReason, Faction
+from werewolf.core.enums import ActionType, DeathReason, Faction, RoleType
 from werewolf.core.events import Action, NightResult
+from werewolf.engine.rules import majority_target
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
@@ -113,7 +113,7 @@ class NightResolver:
         # 6. 检查猎人触发
         for player_id, death_reason in deaths:
             player = game.get_player(player_id)
-            if player and player.role and player.role.name == "猎人":
+            if player and player.role and player.role.role_type == RoleType.HUNTER:
                 # 被毒死不能开枪
                 if death_reason != DeathReason.WITCH_POISON:
                     result.hunter_can_shoot = True
@@ -157,27 +157,5 @@ class NightResolver:
         Returns:
             被击杀玩家的ID，或None（空刀）
         """
-        if not kill_actions:
-            return None
-
-        # 统计目标票数
-        targets = [a.target_id for a in kill_actions if a.target_id is not None]
-        if not targets:
-            return None
-
-        # 多数决
-        counter = Counter(targets)
-        most_common = counter.most_common()
-
-        if not most_common:
-            return None
-
-        # 检查是否平票
-        top_count = most_common[0][1]
-        tied_targets = [t for t, c in most_common if c == top_count]
-
-        if len(tied_targets) == 1:
-            return tied_targets[0]
-
-        # 平票时取第一个（可改为随机或空刀）
-        return tied_targets[0]
+        # 平票时取最先被投的目标（可改为随机或空刀）
+        return majority_target(a.target_id for a in kill_actions)
@@ -0,0 +1,97 @@
+# ==================== 结算规则 ====================
+"""
+纯函数形式的结算规则
+
+NightResolver / VoteManager / Moderator 与快速模拟引擎（werewolf.sim）
+共用这里的实现，保证两套引擎的规则完全一致。
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, Optional, Tuple
+
+from werewolf.core.enums import Faction
+
+
+def majority_target(targets: Iterable[Optional[int]]) -> Optional[int]:
+    """
+    狼刀多数决
+
+    统计每个目标的票数，取票数最多者；平票时取最先被投的目标
+    （与 Counter.most_common 的稳定排序一致）。
+
+    Args:
+        targets: 按提交顺序排列的击杀目标（None 表示空刀）
+
+    Returns:
+        被击杀玩家的ID，或None（空刀）
+    """
+    counts: Dict[int, int] = {}
+    for target in targets:
+        if target is not None:
+            counts[target] = counts.get(target, 0) + 1
+
+    best: Optional[int] = None
+    best_count = 0
+    for target, count in counts.items():
+        if count > best_count:
+            best, best_count = target, count
+    return best
+
+
+def tally_votes(
+    targets: Iterable[Optional[int]],
+    tie_policy: str = "no_elimination",
+) -> Tuple[Dict[int, int], Optional[int], bool]:
+    """
+    统计投票
+
+    Args:
+        targets: 按提交顺序排列的投票目标（None 表示弃权）
+        tie_policy: 平票处理策略，见 VoteManager
+
+    Returns:
+        (得票统计, 被处决玩家ID, 是否平票)
+    """
+    counts: Dict[int, int] = {}
+    for target in targets:
+        if target is not None:
+            counts[target] = counts.get(target, 0) + 1
+
+    if not counts:
+        # 所有人都弃权
+        return counts, None, False
+
+    top_count = max(counts.values())
+    tied = [player_id for player_id, count in counts.items() if count == top_count]
+
+    if len(tied) == 1:
+        return counts, tied[0], False
+
+    # 平票
+    if tie_policy == "random":
+        # 实际实现时应使用游戏的随机数生成器
+        return counts, tied[0], True
+    # "no_elimination" 不处决，"revote" 需外部处理
+    return counts, None, True
+
+
+def check_winner(wolf_count: int, villager_count: int) -> Optional[Faction]:
+    """
+    检查胜负条件
+
+    Args:
+        wolf_count: 存活狼人数量
+        villager_count: 存活村民阵营数量
+
+    Returns:
+        胜利阵营，或None（游戏继续）
+    """
+    # 狼人全灭 -> 村民胜
+    if wolf_count == 0:
+        return Faction.VILLAGER
+
+    # 狼人 >= 村民 -> 狼人胜
+    if wolf_count >= villager_count:
+        return Faction.WEREWOLF
+
+    return None
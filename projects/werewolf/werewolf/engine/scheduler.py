@@ -0,0 +1,163 @@
+# ==================== 阶段调度 ====================
+"""
+表驱动的阶段调度
+
+每个阶段由一条 PhaseSpec 描述：谁需要行动、如何结算、是否有事可做。
+Moderator.advance_phase 只负责查表：
+
+1. 结算当前阶段，得到下一阶段
+2. 检查插入阶段（如猎人开枪），命中时先进入插入阶段，结算后回到原定阶段
+3. 进入下一阶段；若该阶段没有任何需要行动的玩家，立即结算并继续推进
+
+新增阶段（猎人开枪、警长竞选等）只需注册 PhaseSpec / PhaseInterrupt，
+运行器通过 game.get_active_players() 通用地驱动所有行动阶段。
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from werewolf.core.enums import GamePhase
+from werewolf.core.events import PhaseResult
+
+if TYPE_CHECKING:
+    from werewolf.engine.moderator import Moderator
+
+PhaseResolver = Callable[["Moderator"], Awaitable[PhaseResult]]
+ActorSelector = Callable[["Moderator"], List[int]]
+WorkPredicate = Callable[["Moderator"], bool]
+
+
+@dataclass(frozen=True)
+class PhaseSpec:
+    """
+    阶段定义
+
+    Attributes:
+        phase: 阶段
+        resolve: 结算函数，返回的 PhaseResult.next_phase 为下一阶段
+                 （None 表示停留在当前阶段）；阶段切换由调度器完成
+        actors: 需要提交行动的玩家（按行动顺序）；None 表示非行动阶段（如讨论）
+        has_work: 是否有事可做；默认为 actors 非空，非行动阶段始终有事可做
+    """
+    phase: GamePhase
+    resolve: PhaseResolver
+    actors: Optional[ActorSelector] = None
+    has_work: Optional[WorkPredicate] = None
+
+    def is_idle(self, moderator: Moderator) -> bool:
+        """阶段是否为空（可以跳过等待直接结算）"""
+        if self.has_work is not None:
+            return not self.has_work(moderator)
+        if self.actors is not None:
+            return not self.actors(moderator)
+        return False
+
+
+@dataclass(frozen=True)
+class PhaseInterrupt:
+    """
+    插入阶段
+
+    某阶段结算后若 when(moderator) 为真，先进入 phase，
+    phase 结算时通过 moderator.pop_resume_phase() 回到原定的下一阶段。
+    游戏结束时不会触发插入阶段。
+    """
+    phase: GamePhase
+    when: WorkPredicate
+
+
+class PhaseScheduler:
+    """
+    阶段调度器
+
+    Example:
+        scheduler.register(PhaseSpec(GamePhase.SHERIFF, resolve_sheriff, actors=candidates))
+        scheduler.add_interrupt(PhaseInterrupt(GamePhase.SHERIFF, lambda m: m.game.round == 1))
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[PhaseSpec] = (),
+        interrupts: Iterable[PhaseInterrupt] = (),
+        skip_idle: bool = True,
+    ):
+        """
+        Args:
+            specs: 阶段定义
+            interrupts: 插入阶段（按优先级排列）
+            skip_idle: 是否自动结算没有行动者的阶段
+        """
+        self._specs: Dict[GamePhase, PhaseSpec] = {}
+        self._interrupts: List[PhaseInterrupt] = []
+        self.skip_idle = skip_idle
+        for spec in specs:
+            self.register(spec)
+        for interrupt in interrupts:
+            self.add_interrupt(interrupt)
+
+    def register(self, spec: PhaseSpec) -> None:
+        """注册（或替换）阶段定义"""
+        self._specs[spec.phase] = spec
+
+    def add_interrupt(self, interrupt: PhaseInterrupt) -> None:
+        """注册插入阶段"""
+        if interrupt.phase not in self._specs:
+            raise ValueError(f"插入阶段未注册: {interrupt.phase}")
+        self._interrupts.append(interrupt)
+
+    def get(self, phase: GamePhase) -> Optional[PhaseSpec]:
+        """获取阶段定义"""
+        return self._specs.get(phase)
+
+    def active_players(self, moderator: Moderator) -> List[int]:
+        """当前阶段需要行动的玩家ID列表"""
+        spec = self._specs.get(moderator.game.phase)
+        if spec is None or spec.actors is None:
+            return []
+        return spec.actors(moderator)
+
+    async def advance(self, moderator: Moderator) -> PhaseResult:
+        """
+        结算当前阶段并推进，连续跳过空阶段
+
+        Returns:
+            当前阶段的结算结果；被跳过阶段的死亡、消息和胜负合并进来，
+            next_phase 为最终停留的阶段，skipped 记录被自动结算的阶段
+        """
+        game = moderator.game
+        spec = self._specs.get(game.phase)
+        if spec is None:
+            raise RuntimeError(f"无法从此阶段推进: {game.phase}")
+
+        result = await spec.resolve(moderator)
+        next_phase = self._route(moderator, result)
+
+        while next_phase is not None:
+            await moderator._enter_phase(next_phase)
+            result.next_phase = next_phase
+
+            spec = self._specs.get(next_phase)
+            if not self.skip_idle or spec is None or not spec.is_idle(moderator):
+                break
+
+            skipped = await spec.resolve(moderator)
+            result.skipped.append(next_phase)
+            result.deaths.extend(skipped.deaths)
+            result.messages.extend(skipped.messages)
+            if skipped.winner is not None:
+                result.winner = skipped.winner
+            next_phase = self._route(moderator, skipped)
+
+        return result
+
+    def _route(self, moderator: Moderator, result: PhaseResult) -> Optional[GamePhase]:
+        """确定下一阶段（处理插入阶段）"""
+        next_phase = result.next_phase
+        if next_phase is None or next_phase == GamePhase.GAME_OVER:
+            return next_phase
+        for interrupt in self._interrupts:
+            if interrupt.phase != result.phase and interrupt.when(moderator):
+                moderator._resume_phase = next_phase
+                return interrupt.phase
+        return next_phase
@@ -3,10 +3,10 @@
 
 from __future__ import annotations
 from typing import TYPE_CHECKING, List, Dict, Optional
-from collections import Counter
 
 from werewolf.core.enums import ActionType
 from werewolf.core.events import Action, VoteResult
+from werewolf.engine.rules import tally_votes
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
@@ -59,34 +59,10 @@ class VoteManager:
         result.votes = votes
 
         # 统计得票（排除弃权）
-        valid_votes = [t for t in votes.values() if t is not None]
-        vote_counts = Counter(valid_votes)
-        result.vote_counts = dict(vote_counts)
-
-        if not vote_counts:
-            # 所有人都弃权
-            result.is_tie = False
-            result.eliminated_id = None
-            return result
-
-        # 找出最高票
-        most_common = vote_counts.most_common()
-        top_count = most_common[0][1]
-        tied_players = [player_id for player_id, count in most_common if count == top_count]
-
-        if len(tied_players) == 1:
-            # 无平票，处决最高票者
-            result.eliminated_id = tied_players[0]
-            result.is_tie = False
-        else:
-            # 平票
-            result.is_tie = True
-            if self.tie_policy == "no_elimination":
-                result.eliminated_id = None
-            elif self.tie_policy == "random":
-                # 实际实现时应使用游戏的随机数生成器
-                result.eliminated_id = tied_players[0]
-            # "revote" 策略需要外部处理
+        vote_counts, eliminated_id, is_tie = tally_votes(votes.values(), self.tie_policy)
+        result.vote_counts = vote_counts
+        result.eliminated_id = eliminated_id
+        result.is_tie = is_tie
 
         return result
 
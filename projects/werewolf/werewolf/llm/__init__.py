@@ -10,6 +10,11 @@ from werewolf.llm.base import (
 )
 from werewolf.llm.openai_client import OpenAIClient
 from werewolf.llm.anthropic_client import AnthropicClient
+from werewolf.llm.cache import (
+    CachedLLMClient, ResponseCache, CacheMissError, get_response_cache, close_response_caches,
+)
+from werewolf.llm.limiter import RateLimitedLLMClient, get_limiter, limiter_states
+from werewolf.llm.retry import ResilientLLMClient, RetryPolicy, HedgePolicy, get_resilience_state
 from werewolf.llm.tools import WEREWOLF_TOOLS, get_tool_definitions
 
 __all__ = [
@@ -22,6 +27,21 @@ __all__ = [
     # 客户端
     "OpenAIClient",
     "AnthropicClient",
+    # 缓存
+    "CachedLLMClient",
+    "ResponseCache",
+    "CacheMissError",
+    "get_response_cache",
+    "close_response_caches",
+    # 限流
+    "RateLimitedLLMClient",
+    "get_limiter",
+    "limiter_states",
+    # 重试
+    "ResilientLLMClient",
+    "RetryPolicy",
+    "HedgePolicy",
+    "get_resilience_state",
     # 工具
     "WEREWOLF_TOOLS",
     "get_tool_definitions",
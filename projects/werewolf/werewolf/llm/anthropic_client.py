@@ -2,7 +2,7 @@
 """Anthropic API 客户端实现"""
 
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from werewolf.llm.base import (
     BaseLLMClient,
@@ -24,13 +24,22 @@ class AnthropicClient(BaseLLMClient):
         self,
         model: str = "claude-sonnet-4-20250514",
         api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        http_client: Any = None,
+        max_retries: Optional[int] = None,
     ):
         """
         Args:
             model: 模型名称，如 "claude-sonnet-4-20250514", "claude-3-5-haiku-20241022"
             api_key: API 密钥，默认从 ANTHROPIC_API_KEY 环境变量读取
+            base_url: API 基础 URL（如本地模拟服务）
+            http_client: 自定义 httpx.AsyncClient（如连接到进程内的模拟服务）
+            max_retries: SDK 自带的重试次数（None 使用 SDK 默认值；外层有 ResilientLLMClient 时设为 0）
         """
         super().__init__(model, api_key)
+        self.base_url = base_url
+        self.http_client = http_client
+        self.max_retries = max_retries
         self._client = None
 
     def _get_client(self):
@@ -46,6 +55,12 @@ class AnthropicClient(BaseLLMClient):
             kwargs = {}
             if self.api_key:
                 kwargs["api_key"] = self.api_key
+            if self.base_url:
+                kwargs["base_url"] = self.base_url
+            if self.http_client is not None:
+                kwargs["http_client"] = self.http_client
+            if self.max_retries is not None:
+                kwargs["max_retries"] = self.max_retries
 
             self._client = AsyncAnthropic(**kwargs)
 
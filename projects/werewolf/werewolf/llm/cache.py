@@ -0,0 +1,286 @@
+# ==================== LLM 响应缓存 ====================
+"""
+磁盘 LLM 响应缓存（SQLite）
+
+CachedLLMClient 包装任意 BaseLLMClient，以 (模型, 消息, 工具, 温度, max_tokens)
+的规范化 JSON 的 SHA-256 为键把响应存入 SQLite 文件，按最近使用时间淘汰。
+同一个请求在一次运行中第 n 次出现时对应第 n 条记录（温度 > 0 时
+相同提示的多次调用可以有不同回答），因此指定 seed 的对局重放时
+逐次得到与录制时完全相同的响应序列。
+
+模式：
+- read_through: 命中返回缓存，未命中调用模型并写入（默认）
+- record: 总是调用模型并覆盖写入（重新录制）
+- replay: 只读缓存，未命中抛出 CacheMissError（离线重放 / 测试用录制文件）
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from werewolf.llm.base import BaseLLMClient, LLMResponse, Message, ToolCall, ToolDefinition
+
+CACHE_MODES = ("read_through", "record", "replay")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+)
+"""
+
+
+class CacheMissError(LookupError):
+    """replay 模式下请求不在缓存中"""
+
+
+def request_key(
+    model: str,
+    messages: List[Message],
+    tools: Optional[List[ToolDefinition]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """请求的规范化哈希（与客户端实现无关，统一使用 OpenAI 格式）"""
+    payload = {
+        "model": model,
+        "messages": [m.to_openai_format() for m in messages],
+        "tools": [t.to_openai_format() for t in tools] if tools else None,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _dump_response(response: LLMResponse) -> str:
+    return json.dumps({
+        "content": response.content,
+        "tool_calls": [
+            {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+            for tc in response.tool_calls
+        ] if response.tool_calls else None,
+        "finish_reason": response.finish_reason,
+        "usage": response.usage,
+    }, ensure_ascii=False)
+
+
+def _load_response(value: str) -> LLMResponse:
+    data = json.loads(value)
+    tool_calls = data.get("tool_calls")
+    return LLMResponse(
+        content=data.get("content"),
+        tool_calls=[ToolCall(**tc) for tc in tool_calls] if tool_calls else None,
+        finish_reason=data.get("finish_reason", "stop"),
+        usage=data.get("usage"),
+    )
+
+
+class ResponseCache:
+    """
+    SQLite 响应存储（LRU 淘汰）
+
+    Attributes:
+        hits: 命中次数
+        misses: 未命中次数
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: SQLite 文件路径（":memory:" 表示内存数据库）
+            max_entries: 最多保留的响应条数（None 表示不限）
+            max_bytes: 响应数据的总字节数上限（None 表示不限）
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+        # 逻辑时钟：每次读写递增，最近使用顺序不受系统时钟精度影响
+        self._clock = self._conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM responses").fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """读取响应（命中时刷新最近使用时间）"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (self._tick(), key)
+                )
+        return _load_response(row[0])
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """写入响应（超出上限时淘汰最久未使用的记录）"""
+        value = _dump_response(response)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), self._tick()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+                stale = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        """删除所有记录"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CachedLLMClient(BaseLLMClient):
+    """
+    带磁盘缓存的 LLM 客户端
+
+    Example:
+        client = CachedLLMClient(OpenAIClient("gpt-4o-mini"), "llm_cache.db")
+        # 离线重放（不需要 API 密钥）
+        client = CachedLLMClient(None, "llm_cache.db", mode="replay", model="gpt-4o-mini")
+    """
+
+    def __init__(
+        self,
+        client: Optional[BaseLLMClient],
+        cache: Union[ResponseCache, str, Path],
+        mode: str = "read_through",
+        model: Optional[str] = None,
+    ):
+        """
+        Args:
+            client: 被包装的客户端（replay 模式下可以为 None）
+            cache: ResponseCache 或 SQLite 文件路径
+            mode: "read_through" | "record" | "replay"
+            model: 缓存键使用的模型名（默认取 client.model）
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"未知的缓存模式: {mode}（可选 {', '.join(CACHE_MODES)}）")
+        if client is None and mode != "replay":
+            raise ValueError(f"{mode} 模式需要被包装的客户端")
+        model = model or (client.model if client is not None else None)
+        if model is None:
+            raise ValueError("replay 模式未传入 client 时需要指定 model")
+
+        super().__init__(model, client.api_key if client is not None else None)
+        self.client = client
+        self.cache = cache if isinstance(cache, ResponseCache) else ResponseCache(cache)
+        self.mode = mode
+        # 请求键 -> 本次运行中已出现的次数
+        self._occurrences: Dict[str, int] = {}
+
+    async def chat(
+        self,
+        messages: List[Message],
+        tools: Optional[List[ToolDefinition]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> LLMResponse:
+        base = request_key(self.model, messages, tools, temperature, max_tokens)
+        n = self._occurrences.get(base, 0)
+        self._occurrences[base] = n + 1
+        key = f"{base}:{n}"
+
+        if self.mode != "record":
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+            if self.mode == "replay":
+                raise CacheMissError(f"缓存中没有该请求（{key[:16]}…）")
+
+        response = await self.client.chat(
+            messages=messages, tools=tools, temperature=temperature, max_tokens=max_tokens,
+        )
+        self.cache.put(key, response)
+        return response
+
+    def reset(self) -> None:
+        """重新开始计数（新的一局 / 一次运行从第一次出现开始对应）"""
+        self._occurrences.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计"""
+        return {"mode": self.mode, "entries": len(self.cache),
+                "hits": self.cache.hits, "misses": self.cache.misses}
+
+
+# ==================== 全局缓存 ====================
+
+_caches: Dict[str, ResponseCache] = {}
+
+
+def get_response_cache(
+    path: Union[str, Path],
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> ResponseCache:
+    """
+    获取进程内共享的响应缓存（容量配置只在首次创建时生效）
+
+    同一文件只打开一个 SQLite 连接，所有对局共用同一个 LRU 逻辑时钟。
+
+    Args:
+        path: SQLite 文件路径（":memory:" 为内存数据库）
+        max_entries: 最多保留的响应条数（None 表示不限）
+        max_bytes: 响应数据的总字节数上限（None 表示不限）
+    """
+    key = str(path) if str(path) == ":memory:" else str(Path(path).resolve())
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = ResponseCache(path, max_entries=max_entries, max_bytes=max_bytes)
+    return cache
+
+
+def close_response_caches() -> None:
+    """关闭所有共享的响应缓存（服务关闭时调用）"""
+    for cache in _caches.values():
+        cache.close()
+    _caches.clear()
@@ -0,0 +1,349 @@
+# ==================== LLM 限流 ====================
+"""
+按提供商共享的限流器
+
+RateLimitedLLMClient 包装 BaseLLMClient.chat，每次请求依次经过：
+
+1. 请求数令牌桶（RPM）
+2. token 令牌桶（TPM，按提示长度 + max_tokens 预估，响应后按实际用量退还）
+3. AIMD 自适应并发：遇到 429 或延迟超过阈值时并发上限乘性减小，
+   正常完成时加性增大（约每完成 limit 个请求 +1）
+
+限流器按名称在进程内共享（get_limiter），同一提供商的所有对局、
+基准 worker 共用同一组配额；limiter_states() 返回实时状态用于监控。
+"""
+
+from __future__ import annotations
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from werewolf.llm.base import BaseLLMClient, LLMResponse, Message, ToolDefinition
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略的 token 估计（中文约一字一 token，英文约四字符一 token）"""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    return max(1, (len(text) - ascii_chars) + ascii_chars // 4)
+
+
+def estimate_request_tokens(messages: List[Message], max_tokens: int) -> int:
+    """请求最多消耗的 token 数（提示估计 + max_tokens）"""
+    return sum(estimate_tokens(m.content or "") for m in messages) + max_tokens
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """是否为提供商的限流错误（HTTP 429）"""
+    return getattr(error, "status_code", None) == 429
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    Attributes:
+        rate: 每秒补充的令牌数
+        capacity: 桶容量（允许的突发量）
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: 每分钟的配额
+            capacity: 桶容量（默认一分钟的配额）
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute 必须大于 0")
+        self.rate = per_minute / 60
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    async def acquire(self, n: float = 1) -> None:
+        """取出 n 个令牌（不足时等待；超过容量的请求按容量计）"""
+        n = min(n, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            await asyncio.sleep((n - self.tokens) / self.rate)
+
+    def refund(self, n: float) -> None:
+        """退还多扣的令牌"""
+        if n > 0:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + n)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 自适应并发上限
+
+    Attributes:
+        limit: 当前并发上限（浮点，向下取整生效）
+        in_flight: 进行中的请求数
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 64,
+        decrease: float = 0.5,
+        latency_threshold: Optional[float] = None,
+        cooldown: float = 1.0,
+    ):
+        """
+        Args:
+            initial: 初始并发上限
+            minimum: 并发上限的下限
+            maximum: 并发上限的上限
+            decrease: 乘性减小系数
+            latency_threshold: 延迟超过该值（秒）视为过载（None 表示只看 429）
+            cooldown: 两次减小之间的最短间隔（秒），避免一批 429 把上限压到底
+        """
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_threshold = latency_threshold
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        # 不绑定事件循环：等待时才在当前循环上创建 future
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # 已被唤醒、但在恢复运行前被取消（如 wait_for 超时）：名额转交下一个等待者
+                if waiter.done() and not waiter.cancelled():
+                    self._waiters.remove(waiter)
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False) -> None:
+        """
+        归还并发名额并调整上限
+
+        Args:
+            latency: 请求耗时（秒）
+            throttled: 是否被提供商限流（429）
+        """
+        self.in_flight -= 1
+        overloaded = throttled or (
+            self.latency_threshold is not None and latency > self.latency_threshold
+        )
+        if overloaded:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(float(self.minimum), self.limit * self.decrease)
+                self._last_decrease = now
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+        self._wake()
+
+    def cancel(self) -> None:
+        """归还被取消请求的并发名额（耗时不代表提供商负载，不调整上限）"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        for waiter in list(self._waiters):
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+@dataclass
+class LimiterStats:
+    """限流器累计统计"""
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    tokens: int = 0
+
+
+class LLMLimiter:
+    """一个提供商的限流器（请求桶 + token 桶 + 自适应并发）"""
+
+    def __init__(
+        self,
+        name: str,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+    ):
+        """
+        Args:
+            name: 名称（通常为提供商名）
+            rpm: 每分钟请求数上限（None 表示不限）
+            tpm: 每分钟 token 数上限（None 表示不限）
+            concurrency: 自适应并发（默认 AdaptiveConcurrency()）
+        """
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.stats = LimiterStats()
+
+    async def acquire(self, tokens: int) -> None:
+        """等待配额（先令牌桶，后并发名额）"""
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(tokens)
+        await self.concurrency.acquire()
+
+    def release(self, latency: float, estimated: int, used: Optional[int], error: Optional[BaseException]) -> None:
+        """
+        归还配额
+
+        Args:
+            latency: 请求耗时（秒）
+            estimated: 预扣的 token 数
+            used: 实际用量（未知时为 None，不退还）
+            error: 请求异常（成功时为 None）；请求被取消时只归还并发名额，不计入统计
+        """
+        if isinstance(error, asyncio.CancelledError):
+            self.concurrency.cancel()
+            return
+        throttled = error is not None and is_rate_limited(error)
+        self.concurrency.release(latency, throttled)
+        self.stats.requests += 1
+        if throttled:
+            self.stats.throttled += 1
+        elif error is not None:
+            self.stats.errors += 1
+        if used is not None:
+            self.stats.tokens += used
+            if self.tokens is not None:
+                self.tokens.refund(estimated - used)
+
+    def state(self) -> Dict[str, Any]:
+        """实时状态（监控用）"""
+        return {
+            "name": self.name,
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "waiting": self.concurrency.waiting,
+            "requests_available": None if self.requests is None else int(self.requests.available),
+            "tokens_available": None if self.tokens is None else int(self.tokens.available),
+            "requests": self.stats.requests,
+            "throttled": self.stats.throttled,
+            "errors": self.stats.errors,
+            "tokens": self.stats.tokens,
+        }
+
+
+class RateLimitedLLMClient(BaseLLMClient):
+    """
+    经过限流器的 LLM 客户端
+
+    Example:
+        limiter = get_limiter("openai", rpm=500, tpm=200_000)
+        client = RateLimitedLLMClient(OpenAIClient("gpt-4o-mini"), limiter)
+    """
+
+    def __init__(self, client: BaseLLMClient, limiter: LLMLimiter):
+        """
+        Args:
+            client: 被包装的客户端
+            limiter: 限流器（可在多个客户端之间共享）
+        """
+        super().__init__(client.model, client.api_key)
+        self.client = client
+        self.limiter = limiter
+
+    async def chat(
+        self,
+        messages: List[Message],
+        tools: Optional[List[ToolDefinition]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> LLMResponse:
+        estimated = estimate_request_tokens(messages, max_tokens)
+        await self.limiter.acquire(estimated)
+        start = time.monotonic()
+        error: Optional[BaseException] = None
+        used: Optional[int] = None
+        try:
+            response = await self.client.chat(
+                messages=messages, tools=tools, temperature=temperature, max_tokens=max_tokens,
+            )
+            if response.usage:
+                used = response.usage.get("prompt_tokens", 0) + response.usage.get("completion_tokens", 0)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.limiter.release(time.monotonic() - start, estimated, used, error)
+
+
+# ==================== 全局限流器 ====================
+
+_limiters: Dict[str, LLMLimiter] = {}
+
+
+def get_limiter(
+    name: str,
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None,
+    max_concurrency: int = 64,
+    latency_threshold: Optional[float] = None,
+) -> LLMLimiter:
+    """
+    获取进程内共享的限流器（配置只在首次创建时生效）
+
+    Args:
+        name: 名称（通常为提供商名）
+        rpm: 每分钟请求数上限
+        tpm: 每分钟 token 数上限
+        max_concurrency: 自适应并发的上限
+        latency_threshold: 视为过载的延迟（秒）
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = _limiters[name] = LLMLimiter(
+            name, rpm, tpm,
+            AdaptiveConcurrency(
+                initial=min(8, max_concurrency),
+                maximum=max_concurrency,
+                latency_threshold=latency_threshold,
+            ),
+        )
+    return limiter
+
+
+def limiter_states() -> List[Dict[str, Any]]:
+    """所有共享限流器的实时状态"""
+    return [limiter.state() for limiter in _limiters.values()]
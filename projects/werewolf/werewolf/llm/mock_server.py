@@ -0,0 +1,384 @@
+# ==================== 本地模拟 LLM 服务 ====================
+"""
+OpenAI / Anthropic 兼容的本地模拟服务（压测与故障注入用）
+
+实现 OpenAIClient（通过 base_url）和 AnthropicClient 使用的两个接口：
+
+- POST /v1/chat/completions  （OpenAI Chat Completions）
+- POST /v1/messages          （Anthropic Messages）
+
+按策略返回 submit_action / speak 工具调用：默认策略从对话中的「合法行动」
+列表随机选择，也可以传入脚本。延迟服从对数正态分布，可按概率注入
+429（或超过并发上限时返回 429）和 5xx，并返回粗略的 token 用量。
+
+用法:
+    python -m werewolf.llm.mock_server --port 8901 --latency-ms 800 --error-rate 0.02
+    # OpenAIClient(model="mock", api_key="x", base_url="http://127.0.0.1:8901/v1")
+    # AnthropicClient(model="mock", api_key="x", base_url="http://127.0.0.1:8901")
+
+需要安装 fastapi（运行服务还需要 uvicorn）: pip install werewolf[web]
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+except ImportError as e:  # pragma: no cover - 依赖缺失时给出安装提示
+    raise ImportError("请安装 fastapi: pip install werewolf[web]") from e
+
+
+from werewolf.llm.limiter import estimate_tokens
+
+# 工具调用：(工具名, 参数)；None 表示只返回文本
+MockCall = Optional[Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class MockRequest:
+    """
+    策略看到的请求
+
+    Attributes:
+        api: "openai" | "anthropic"
+        model: 请求的模型名
+        text: 对话中全部文本按顺序拼接（含系统提示和工具结果）
+        tools: 可用的工具名
+    """
+    api: str
+    model: str
+    text: str
+    tools: List[str]
+
+
+# 策略：(请求, 随机数生成器) -> 工具调用
+MockPolicy = Callable[[MockRequest, random.Random], MockCall]
+
+_LEGAL_HEADER = "### 合法行动"
+_LEGAL_LINE = re.compile(r"^- (\w+): (?:target_id 可选 (.+)|无需 target_id)$")
+_TARGET = re.compile(r"(\d+)号")
+
+MOCK_SPEECHES = (
+    "我是好人，昨晚没有什么信息，先听听大家的发言。",
+    "我觉得发言偏少的人比较可疑，今天重点关注一下。",
+    "目前信息不多，我建议大家多分享自己的视角。",
+)
+
+
+def parse_legal_actions(text: str) -> List[Tuple[str, Optional[int]]]:
+    """从提示中最后一个「合法行动」列表解析出候选行动"""
+    start = text.rfind(_LEGAL_HEADER)
+    if start < 0:
+        return []
+    moves: List[Tuple[str, Optional[int]]] = []
+    for line in text[start + len(_LEGAL_HEADER):].lstrip("\n").splitlines():
+        match = _LEGAL_LINE.match(line.strip())
+        if match is None:
+            if moves:
+                break
+            continue
+        action, targets = match.groups()
+        if targets:
+            moves.extend((action, int(t)) for t in _TARGET.findall(targets))
+        else:
+            moves.append((action, None))
+    return moves
+
+
+def legal_random_policy(request: MockRequest, rng: random.Random) -> MockCall:
+    """默认策略：在合法行动中均匀随机（没有列表时跳过），发言取随机模板"""
+    if "submit_action" in request.tools:
+        moves = parse_legal_actions(request.text)
+        if not moves:
+            return "submit_action", {"action_type": "skip", "reason": "mock"}
+        action, target = rng.choice(moves)
+        args: Dict[str, Any] = {"action_type": action, "reason": "mock"}
+        if target is not None:
+            args["target_id"] = target
+        return "submit_action", args
+    if "speak" in request.tools:
+        return "speak", {"content": rng.choice(MOCK_SPEECHES)}
+    return None
+
+
+def scripted_policy(calls: Iterable[MockCall]) -> MockPolicy:
+    """脚本策略：按顺序循环返回给定的工具调用"""
+    cycle = itertools.cycle(list(calls))
+
+    def policy(request: MockRequest, rng: random.Random) -> MockCall:
+        return next(cycle)
+
+    return policy
+
+
+@dataclass
+class MockConfig:
+    """
+    模拟服务配置
+
+    Attributes:
+        latency_ms: 延迟中位数（毫秒）
+        latency_sigma: 对数正态分布的 sigma（0 表示固定延迟；1.0 时 p99 约为中位数的 10 倍）
+        rate_limit_rate: 按概率返回 429 的比例
+        error_rate: 按概率返回 5xx 的比例
+        max_concurrency: 同时处理的请求上限，超出时返回 429（None 表示不限）
+        retry_after: 429 响应的 retry-after 秒数
+        policy: 工具调用策略
+        seed: 随机种子
+    """
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    rate_limit_rate: float = 0.0
+    error_rate: float = 0.0
+    max_concurrency: Optional[int] = None
+    retry_after: float = 1.0
+    policy: MockPolicy = legal_random_policy
+    seed: Optional[int] = None
+
+
+@dataclass
+class MockStats:
+    """请求统计"""
+    requests: int = 0
+    ok: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    # 最近的请求耗时（秒）
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=100_000))
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ==================== 请求解析 ====================
+
+def _openai_request(body: Dict[str, Any]) -> MockRequest:
+    parts: List[str] = []
+    for msg in body.get("messages", []):
+        content = msg.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(b.get("text", "") for b in content if isinstance(b, dict))
+    tools = [t.get("function", {}).get("name", "") for t in body.get("tools") or []]
+    return MockRequest("openai", body.get("model", ""), "\n".join(parts), tools)
+
+
+def _anthropic_request(body: Dict[str, Any]) -> MockRequest:
+    parts: List[str] = []
+    system = body.get("system")
+    if isinstance(system, str):
+        parts.append(system)
+    elif isinstance(system, list):
+        parts.extend(b.get("text", "") for b in system)
+    for msg in body.get("messages", []):
+        content = msg.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+            continue
+        for block in content or []:
+            if block.get("type") == "text":
+                parts.append(block.get("text", ""))
+            elif block.get("type") == "tool_result":
+                result = block.get("content")
+                if isinstance(result, str):
+                    parts.append(result)
+                elif isinstance(result, list):
+                    parts.extend(b.get("text", "") for b in result)
+    tools = [t.get("name", "") for t in body.get("tools") or []]
+    return MockRequest("anthropic", body.get("model", ""), "\n".join(parts), tools)
+
+
+# ==================== 响应构造 ====================
+
+def _openai_response(request: MockRequest, call: MockCall, call_id: str) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"role": "assistant", "content": None}
+    if call is None:
+        message["content"] = "（模拟回复）"
+        completion = message["content"]
+        finish_reason = "stop"
+    else:
+        name, args = call
+        arguments = json.dumps(args, ensure_ascii=False)
+        message["tool_calls"] = [{
+            "id": call_id, "type": "function",
+            "function": {"name": name, "arguments": arguments},
+        }]
+        completion = arguments
+        finish_reason = "tool_calls"
+    prompt_tokens = estimate_tokens(request.text)
+    completion_tokens = estimate_tokens(completion)
+    return {
+        "id": f"chatcmpl-{call_id}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _anthropic_response(request: MockRequest, call: MockCall, call_id: str) -> Dict[str, Any]:
+    if call is None:
+        content = [{"type": "text", "text": "（模拟回复）"}]
+        completion = content[0]["text"]
+        stop_reason = "end_turn"
+    else:
+        name, args = call
+        content = [{"type": "tool_use", "id": f"toolu_{call_id}", "name": name, "input": args}]
+        completion = json.dumps(args, ensure_ascii=False)
+        stop_reason = "tool_use"
+    return {
+        "id": f"msg_{call_id}",
+        "type": "message",
+        "role": "assistant",
+        "model": request.model,
+        "content": content,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": estimate_tokens(request.text),
+            "output_tokens": estimate_tokens(completion),
+        },
+    }
+
+
+def _error(api: str, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    if api == "openai":
+        kind = "rate_limit_exceeded" if status == 429 else "server_error"
+        body: Dict[str, Any] = {"error": {"message": message, "type": kind, "code": kind}}
+    else:
+        kind = "rate_limit_error" if status == 429 else "api_error"
+        body = {"type": "error", "error": {"type": kind, "message": message}}
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+# ==================== 服务 ====================
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """
+    创建模拟服务（统计在 app.state.stats）
+
+    Args:
+        config: 服务配置（默认零延迟、无故障、合法行动随机策略）
+    """
+    config = config or MockConfig()
+    app = FastAPI(title="Werewolf Mock LLM")
+    stats = MockStats()
+    rng = random.Random(config.seed)
+    counter = itertools.count(1)
+    app.state.config = config
+    app.state.stats = stats
+
+    async def handle(raw: Request, api: str) -> JSONResponse:
+        body = await raw.json()
+        request = _openai_request(body) if api == "openai" else _anthropic_request(body)
+        stats.requests += 1
+
+        if config.max_concurrency is not None and stats.in_flight >= config.max_concurrency:
+            stats.rate_limited += 1
+            return _error(api, 429, "too many concurrent requests",
+                          {"retry-after": str(config.retry_after)})
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        start = time.perf_counter()
+        try:
+            if config.latency_ms > 0:
+                delay = config.latency_ms / 1000
+                if config.latency_sigma > 0:
+                    delay *= math.exp(rng.gauss(0.0, config.latency_sigma))
+                await asyncio.sleep(delay)
+
+            roll = rng.random()
+            if roll < config.rate_limit_rate:
+                stats.rate_limited += 1
+                return _error(api, 429, "rate limit exceeded",
+                              {"retry-after": str(config.retry_after)})
+            if roll < config.rate_limit_rate + config.error_rate:
+                stats.errors += 1
+                return _error(api, rng.choice((500, 502, 503)), "injected server error")
+
+            call = config.policy(request, rng)
+            call_id = f"mock{next(counter)}"
+            stats.ok += 1
+            if api == "openai":
+                return JSONResponse(_openai_response(request, call, call_id))
+            return JSONResponse(_anthropic_response(request, call, call_id))
+        finally:
+            stats.in_flight -= 1
+            stats.latencies.append(time.perf_counter() - start)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(raw: Request):
+        return await handle(raw, "openai")
+
+    @app.post("/v1/messages")
+    async def messages(raw: Request):
+        return await handle(raw, "anthropic")
+
+    @app.get("/stats")
+    async def get_stats():
+        return {
+            "requests": stats.requests,
+            "ok": stats.ok,
+            "rate_limited": stats.rate_limited,
+            "errors": stats.errors,
+            "peak_in_flight": stats.peak_in_flight,
+            "latency_p50": stats.percentile(0.5),
+            "latency_p99": stats.percentile(0.99),
+        }
+
+    return app
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI / Anthropic 兼容的本地模拟 LLM 服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="延迟中位数（毫秒）")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="对数正态延迟的 sigma")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="返回 429 的概率")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 5xx 的概率")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="并发上限（超出返回 429）")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise ImportError("请安装 uvicorn: pip install werewolf[web]") from e
+
+    app = create_app(MockConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+    ))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
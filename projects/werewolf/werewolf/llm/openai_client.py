@@ -4,7 +4,7 @@
 from __future__ import annotations
 import os
 import json
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from werewolf.llm.base import (
     BaseLLMClient,
@@ -27,15 +27,21 @@ class OpenAIClient(BaseLLMClient):
         model: str = "gpt-4o",
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        http_client: Any = None,
+        max_retries: Optional[int] = None,
     ):
         """
         Args:
             model: 模型名称，如 "gpt-4o", "gpt-4o-mini"
             api_key: API 密钥，默认从 OPENAI_API_KEY 环境变量读取
             base_url: API 基础 URL，用于兼容其他 OpenAI 格式 API
+            http_client: 自定义 httpx.AsyncClient（如连接到进程内的模拟服务）
+            max_retries: SDK 自带的重试次数（None 使用 SDK 默认值；外层有 ResilientLLMClient 时设为 0）
         """
         super().__init__(model, api_key)
         self.base_url = base_url
+        self.http_client = http_client
+        self.max_retries = max_retries
         self._client = None
 
     def _get_client(self):
@@ -53,6 +59,10 @@ class OpenAIClient(BaseLLMClient):
                 kwargs["api_key"] = self.api_key
             if self.base_url:
                 kwargs["base_url"] = self.base_url
+            if self.http_client is not None:
+                kwargs["http_client"] = self.http_client
+            if self.max_retries is not None:
+                kwargs["max_retries"] = self.max_retries
 
             self._client = AsyncOpenAI(**kwargs)
 
@@ -0,0 +1,173 @@
+# ==================== LLM 客户端注册表 ====================
+"""
+进程级共享的 LLM 客户端
+
+每个 (接口类型, base_url, api_key) 共用一个带连接池的 HTTP 客户端（keep-alive），
+同一组合下不同模型的 OpenAIClient / AnthropicClient 实例也会被复用。
+Web 服务的每一局不再各自建立新的 TLS 连接；启动时可以预热连接，
+关闭时统一 aclose()。
+"""
+
+from __future__ import annotations
+import asyncio
+import importlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from werewolf.llm.base import BaseLLMClient
+
+logger = logging.getLogger(__name__)
+
+# 接口类型 -> 默认 base_url（用于预热）
+DEFAULT_BASE_URLS = {
+    "openai": "https://api.openai.com/v1",
+    "anthropic": "https://api.anthropic.com",
+}
+
+# (接口类型, base_url, api_key)
+PoolKey = Tuple[str, Optional[str], Optional[str]]
+
+
+@dataclass
+class PoolLimits:
+    """
+    连接池上限
+
+    Attributes:
+        max_connections: 每个池的最大连接数
+        max_keepalive_connections: 空闲时保留的连接数
+        keepalive_expiry: 空闲连接的保留时间（秒）
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+
+
+def _create_http_client(api: str, limits: PoolLimits) -> Any:
+    """创建 SDK 默认配置的 HTTP 客户端，只替换连接池上限"""
+    if api == "anthropic":
+        try:
+            from anthropic import DefaultAsyncHttpxClient
+        except ImportError:
+            raise ImportError("请安装 anthropic: pip install anthropic>=0.18")
+    else:
+        try:
+            from openai import DefaultAsyncHttpxClient
+        except ImportError:
+            raise ImportError("请安装 openai: pip install openai>=1.0")
+
+    # Limits 取自 SDK 实际使用的 httpx 模块
+    httpx = importlib.import_module(DefaultAsyncHttpxClient.__mro__[1].__module__.partition(".")[0])
+    return DefaultAsyncHttpxClient(limits=httpx.Limits(
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+    ))
+
+
+class ClientRegistry:
+    """
+    共享 LLM 客户端注册表
+
+    Example:
+        registry = get_client_registry()
+        client = registry.get("openai", "gpt-4o-mini", api_key=key)
+        await registry.prewarm()
+        ...
+        await registry.aclose()
+    """
+
+    def __init__(self, limits: Optional[PoolLimits] = None):
+        """
+        Args:
+            limits: 连接池上限（默认见 PoolLimits）
+        """
+        self.limits = limits or PoolLimits()
+        self._pools: Dict[PoolKey, Any] = {}
+        self._clients: Dict[Tuple[PoolKey, str, Optional[int]], BaseLLMClient] = {}
+
+    def get(
+        self,
+        api: str,
+        model: str,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_retries: Optional[int] = None,
+    ) -> BaseLLMClient:
+        """
+        取得共享客户端
+
+        Args:
+            api: "openai"（含 OpenAI 兼容接口）| "anthropic"
+            model: 模型名称
+            api_key: API 密钥
+            base_url: API 基础 URL
+            max_retries: SDK 自带的重试次数（None 使用 SDK 默认值）
+        """
+        if api not in DEFAULT_BASE_URLS:
+            raise ValueError(f"未知的接口类型: {api}")
+        key = (api, base_url, api_key)
+        client = self._clients.get((key, model, max_retries))
+        if client is not None:
+            return client
+
+        http_client = self._pools.get(key)
+        if http_client is None:
+            http_client = self._pools[key] = _create_http_client(api, self.limits)
+
+        if api == "anthropic":
+            from werewolf.llm.anthropic_client import AnthropicClient
+            client = AnthropicClient(model=model, api_key=api_key, base_url=base_url,
+                                     http_client=http_client, max_retries=max_retries)
+        else:
+            from werewolf.llm.openai_client import OpenAIClient
+            client = OpenAIClient(model=model, api_key=api_key, base_url=base_url,
+                                  http_client=http_client, max_retries=max_retries)
+        self._clients[(key, model, max_retries)] = client
+        return client
+
+    async def prewarm(self, timeout: float = 5.0) -> int:
+        """
+        预先建立各连接池的连接（TLS 握手），失败只记录日志
+
+        Returns:
+            成功建立连接的池数量
+        """
+        async def warm(key: PoolKey, http_client: Any) -> bool:
+            api, base_url, _ = key
+            url = base_url or DEFAULT_BASE_URLS[api]
+            try:
+                # 任意响应（包括 404）都说明连接已建立并留在池中
+                await asyncio.wait_for(http_client.head(url), timeout)
+                return True
+            except Exception as e:
+                logger.warning(f"预热 {url} 失败: {e}")
+                return False
+
+        results = await asyncio.gather(*(warm(k, c) for k, c in self._pools.items()))
+        return sum(results)
+
+    async def aclose(self) -> None:
+        """关闭所有连接池（之后 get() 会重新创建）"""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        self._clients.clear()
+        for http_client in pools:
+            await http_client.aclose()
+
+    def __len__(self) -> int:
+        """连接池数量"""
+        return len(self._pools)
+
+
+# 全局单例
+_registry: Optional[ClientRegistry] = None
+
+
+def get_client_registry(limits: Optional[PoolLimits] = None) -> ClientRegistry:
+    """获取全局客户端注册表（limits 只在首次创建时生效）"""
+    global _registry
+    if _registry is None:
+        _registry = ClientRegistry(limits)
+    return _registry
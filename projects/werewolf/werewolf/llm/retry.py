@@ -0,0 +1,291 @@
+# ==================== LLM 重试与对冲请求 ====================
+"""
+容错 LLM 客户端
+
+ResilientLLMClient 包装 BaseLLMClient.chat：
+
+- 分类重试：限流（429）、超时 / 连接错误、5xx、工具调用 JSON 不合法
+  （工具名未知或缺少必填参数；OpenAIClient 解析失败时参数为空字典）。
+  其他错误（如 400 / 401）直接抛出。重试间隔为带完全抖动的指数退避，
+  响应带 Retry-After 时至少等待该时长。
+- 对冲请求（可选）：请求耗时超过近期成功延迟的 p95 时再发一份相同请求，
+  取先完成的结果并取消另一份；对冲比例受 budget 限制，避免成倍消耗配额。
+
+延迟窗口和对冲预算按名称在进程内共享（get_resilience_state），同一提供商的
+各 Agent 的包装器共用同一组样本和统计，p95 与预算按提供商整体计算。
+
+与 RateLimitedLLMClient 组合时放在限流器外层，每次重试 / 对冲都经过限流器。
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, FrozenSet, List, Optional
+
+from werewolf.llm.base import BaseLLMClient, LLMResponse, Message, ToolDefinition
+from werewolf.llm.limiter import is_rate_limited
+
+logger = logging.getLogger(__name__)
+
+# 可重试的错误类别
+RETRYABLE = frozenset({"rate_limit", "timeout", "server_error", "malformed"})
+
+
+class MalformedResponseError(ValueError):
+    """工具调用不合法（未知工具或缺少必填参数）"""
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    错误类别
+
+    Returns:
+        "rate_limit" | "timeout" | "server_error" | "malformed"；不可重试的错误返回 None
+    """
+    if isinstance(error, MalformedResponseError):
+        return "malformed"
+    if is_rate_limited(error):
+        return "rate_limit"
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and status >= 500:
+        return "server_error"
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return "timeout"
+    # SDK 的 APITimeoutError / APIConnectionError 不继承内置异常
+    name = type(error).__name__
+    if name.endswith("TimeoutError") or name.endswith("ConnectionError"):
+        return "timeout"
+    return None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """错误响应的 Retry-After（秒），没有或无法解析时返回 None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def validate_tool_calls(response: LLMResponse, tools: Optional[List[ToolDefinition]]) -> None:
+    """检查工具调用是否对应已提供的工具且包含必填参数"""
+    if not tools or not response.tool_calls:
+        return
+    definitions = {tool.name: tool for tool in tools}
+    for tc in response.tool_calls:
+        tool = definitions.get(tc.name)
+        if tool is None:
+            raise MalformedResponseError(f"未知的工具: {tc.name}")
+        missing = [p for p in tool.parameters.get("required", []) if p not in tc.arguments]
+        if missing:
+            raise MalformedResponseError(f"工具 {tc.name} 缺少参数: {', '.join(missing)}")
+
+
+@dataclass
+class RetryPolicy:
+    """
+    重试策略
+
+    Attributes:
+        max_attempts: 最多尝试次数（含第一次）
+        base_delay: 退避基数（秒），第 n 次重试前最多等待 base_delay * 2**n
+        max_delay: 单次退避上限（秒，不限制 Retry-After）
+        retry_on: 可重试的错误类别
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    retry_on: FrozenSet[str] = RETRYABLE
+
+
+@dataclass
+class HedgePolicy:
+    """
+    对冲请求策略
+
+    Attributes:
+        quantile: 超过近期成功延迟的该分位数时发出对冲请求
+        min_samples: 延迟样本少于该数量时不对冲
+        budget: 对冲请求占请求总数的比例上限
+        window: 保留的延迟样本数
+    """
+    quantile: float = 0.95
+    min_samples: int = 20
+    budget: float = 0.1
+    window: int = 200
+
+
+@dataclass
+class ResilienceStats:
+    """累计统计"""
+    requests: int = 0
+    retries: Dict[str, int] = field(default_factory=dict)
+    hedges: int = 0
+    hedge_wins: int = 0
+    failures: int = 0
+
+
+@dataclass
+class ResilienceState:
+    """可在多个 ResilientLLMClient 之间共享的延迟样本与统计"""
+    latencies: Deque[float]
+    stats: ResilienceStats = field(default_factory=ResilienceStats)
+
+    @classmethod
+    def create(cls, window: int = 200) -> "ResilienceState":
+        """保留 window 个延迟样本的空状态"""
+        return cls(latencies=deque(maxlen=window))
+
+
+# ==================== 全局状态 ====================
+
+_states: Dict[str, ResilienceState] = {}
+
+
+def get_resilience_state(name: str, window: int = 200) -> ResilienceState:
+    """
+    获取进程内共享的重试 / 对冲状态（配置只在首次创建时生效）
+
+    Args:
+        name: 名称（通常为提供商名）
+        window: 保留的延迟样本数
+    """
+    state = _states.get(name)
+    if state is None:
+        state = _states[name] = ResilienceState.create(window)
+    return state
+
+
+def _consume(task: asyncio.Future) -> None:
+    """读取被放弃的请求的异常，避免 "exception was never retrieved" 警告"""
+    if not task.cancelled():
+        task.exception()
+
+
+class ResilientLLMClient(BaseLLMClient):
+    """
+    带分类重试和对冲请求的 LLM 客户端
+
+    Example:
+        client = ResilientLLMClient(OpenAIClient("gpt-4o-mini", max_retries=0), hedge=HedgePolicy(),
+                                    state=get_resilience_state("openai"))
+        client.stats()  # {"requests": 120, "retries": {"rate_limit": 3}, "hedges": 6, ...}
+    """
+
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        policy: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        seed: Optional[int] = None,
+        state: Optional[ResilienceState] = None,
+    ):
+        """
+        Args:
+            client: 被包装的客户端（建议关闭 SDK 自带的重试）
+            policy: 重试策略（默认见 RetryPolicy）
+            hedge: 对冲请求策略（None 表示不对冲）
+            seed: 退避抖动的随机种子
+            state: 共享的延迟样本与统计（默认为本实例独有）
+        """
+        super().__init__(client.model, client.api_key)
+        self.client = client
+        self.policy = policy or RetryPolicy()
+        self.hedge = hedge
+        self._rng = random.Random(seed)
+        self.state = state or ResilienceState.create(hedge.window if hedge else 1)
+        self._latencies = self.state.latencies
+        self._stats = self.state.stats
+
+    async def chat(
+        self,
+        messages: List[Message],
+        tools: Optional[List[ToolDefinition]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> LLMResponse:
+        self._stats.requests += 1
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(messages, tools, temperature, max_tokens)
+            except Exception as e:
+                kind = classify_error(e)
+                attempt += 1
+                if kind not in self.policy.retry_on or attempt >= self.policy.max_attempts:
+                    self._stats.failures += 1
+                    raise
+                delay = self.backoff(attempt, retry_after(e))
+                self._stats.retries[kind] = self._stats.retries.get(kind, 0) + 1
+                logger.debug(f"LLM 请求失败（{kind}），{delay:.2f}s 后第 {attempt} 次重试: {e}")
+                await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """第 attempt 次重试前的等待时间（完全抖动的指数退避，不短于 Retry-After）"""
+        cap = min(self.policy.max_delay, self.policy.base_delay * 2 ** (attempt - 1))
+        delay = self._rng.uniform(0, cap)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def hedge_delay(self) -> Optional[float]:
+        """发出对冲请求前的等待时间（样本不足或超出预算时返回 None）"""
+        if self.hedge is None or len(self._latencies) < self.hedge.min_samples:
+            return None
+        if self._stats.hedges >= self.hedge.budget * self._stats.requests:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge.quantile))]
+
+    async def _call(self, messages, tools, temperature, max_tokens) -> LLMResponse:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        response = await self.client.chat(
+            messages=messages, tools=tools, temperature=temperature, max_tokens=max_tokens,
+        )
+        validate_tool_calls(response, tools)
+        self._latencies.append(loop.time() - start)
+        return response
+
+    async def _attempt(self, messages, tools, temperature, max_tokens) -> LLMResponse:
+        """一次尝试（可能包含一个对冲请求）"""
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._call(messages, tools, temperature, max_tokens)
+
+        primary = asyncio.ensure_future(self._call(messages, tools, temperature, max_tokens))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and self.hedge_delay() is not None:
+                self._stats.hedges += 1
+                pending.add(asyncio.ensure_future(self._call(messages, tools, temperature, max_tokens)))
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.add_done_callback(_consume)
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """重试 / 对冲统计（共享 state 时为所有共享者的合计）"""
+        return {
+            "requests": self._stats.requests,
+            "retries": dict(self._stats.retries),
+            "hedges": self._stats.hedges,
+            "hedge_wins": self._stats.hedge_wins,
+            "failures": self._stats.failures,
+        }
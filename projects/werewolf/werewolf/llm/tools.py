@@ -119,7 +119,7 @@ def get_tool_definitions(phase: str = "all") -> List[ToolDefinition]:
     根据游戏阶段获取可用工具
 
     Args:
-        phase: 游戏阶段 ("night" | "day_discussion" | "day_vote" | "all")
+        phase: 游戏阶段 ("night" | "day_discussion" | "day_vote" | "hunter_shot" | "all")
 
     Returns:
         工具定义列表
@@ -128,7 +128,7 @@ def get_tool_definitions(phase: str = "all") -> List[ToolDefinition]:
         return NIGHT_TOOLS
     elif phase == "day_discussion":
         return DAY_DISCUSSION_TOOLS
-    elif phase == "day_vote":
+    elif phase in ("day_vote", "hunter_shot"):
         return DAY_VOTE_TOOLS
     else:
         return WEREWOLF_TOOLS
@@ -8,6 +8,8 @@ from werewolf.prompts.templates import (
     format_player_info,
     format_history,
     format_action_prompt,
+    format_legal_actions,
+    format_pack_prompt,
 )
 
 __all__ = [
@@ -22,4 +24,6 @@ __all__ = [
     "format_player_info",
     "format_history",
     "format_action_prompt",
+    "format_legal_actions",
+    "format_pack_prompt",
 ]
@@ -144,13 +144,65 @@ def format_action_prompt(view: PlayerView) -> str:
     phase = view.phase.value
 
     if phase == "night":
-        return _format_night_prompt(view)
+        prompt = _format_night_prompt(view)
     elif phase == "day_discussion":
         return _format_discussion_prompt(view)
     elif phase == "day_vote":
-        return _format_vote_prompt(view)
+        prompt = _format_vote_prompt(view)
     else:
-        return "当前阶段无需行动"
+        prompt = "当前阶段无需行动"
+
+    legal = format_legal_actions(view)
+    return f"{prompt}\n\n{legal}" if legal else prompt
+
+
+def format_legal_actions(view: PlayerView) -> str:
+    """
+    格式化当前的合法行动（来自合法行动掩码）
+
+    Returns:
+        合法行动列表字符串；没有合法行动时为空字符串
+    """
+    legal = view.legal_actions
+    if not legal:
+        return ""
+
+    names = {p["id"]: p["name"] for p in view.alive_players}
+    lines = ["### 合法行动", ""]
+    for action_type in legal.action_types:
+        targets = legal.targets(action_type)
+        if targets:
+            choices = ", ".join(f"{pid}号 {names.get(pid, '')}".rstrip() for pid in targets)
+            lines.append(f"- {action_type.value}: target_id 可选 {choices}")
+        else:
+            lines.append(f"- {action_type.value}: 无需 target_id")
+    return "\n".join(lines)
+
+
+def format_pack_prompt(view: PlayerView) -> str:
+    """
+    格式化狼队联合决策提示（由一名狼人代表全队决定今晚的击杀目标）
+
+    Returns:
+        提示字符串；非狼人视角为空字符串
+    """
+    teammates = view.teammates
+    if not teammates:
+        return ""
+
+    alive = {p["id"] for p in view.alive_players if p["is_alive"]}
+    lines = ["### 狼队联合决策", ""]
+    for mate in teammates:
+        status = "存活" if mate["id"] in alive else "死亡"
+        me = "（你）" if mate["id"] == view.my_id else ""
+        lines.append(f"- **{mate['id']}号** {mate['name']}{me}: {status}")
+    lines.append("")
+    lines.append(
+        "你代表整个狼队决定今晚的击杀目标，所有存活的狼人都会击杀你提交的目标，"
+        "不会出现分票。使用 `submit_action` 工具，设置 action_type 为 'kill' 并指定 target_id，"
+        "或 'skip' 表示全队空刀。"
+    )
+    return "\n".join(lines)
 
 
 def _format_night_prompt(view: PlayerView) -> str:
@@ -5,12 +5,13 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, List, Optional
 
-from werewolf.core.enums import Faction, ActionType
+from werewolf.core.enums import Faction, ActionType, GamePhase, RoleType
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
     from werewolf.core.player import Player
     from werewolf.core.events import Action, ActionResult
+    from werewolf.core.legal import ActionMask
 
 
 class Role(ABC):
@@ -21,20 +22,27 @@ class Role(ABC):
 
     Attributes:
         name: 角色名称（中文）
+        role_type: 角色类型
         faction: 所属阵营
         priority: 夜间行动优先级（数字越小越先行动）
         can_act_at_night: 是否可以在夜间行动
     """
 
     name: str = "未知角色"
+    role_type: Optional[RoleType] = None
     faction: Faction = Faction.VILLAGER
     priority: int = 100  # 默认最低优先级
     can_act_at_night: bool = False
+    # 合法行动是否依赖当晚狼刀（如女巫解药）；为真时新的击杀提交会使缓存的掩码失效
+    legal_depends_on_wolf_target: bool = False
 
     def get_available_actions(self, player: Player, game: Game) -> List[ActionType]:
         """
         获取当前可用的行动类型
 
+        白天投票阶段所有存活玩家都可以投票或弃权；子类覆盖时
+        在自己的行动阶段之外应回退到此实现。
+
         Args:
             player: 拥有此角色的玩家
             game: 游戏实例
@@ -42,6 +50,8 @@ class Role(ABC):
         Returns:
             可用行动类型列表
         """
+        if game is not None and game.phase == GamePhase.DAY_VOTE and player.is_alive:
+            return [ActionType.VOTE, ActionType.SKIP]
         return []
 
     def validate_action(self, action: Action, player: Player, game: Game) -> tuple[bool, str]:
@@ -60,6 +70,18 @@ class Role(ABC):
         if not player.is_alive:
             return False, "死亡玩家无法行动"
 
+        # 白天投票：投给除自己外的存活玩家，或弃权
+        if game.phase == GamePhase.DAY_VOTE:
+            if action.action_type not in (ActionType.VOTE, ActionType.SKIP):
+                return False, f"投票阶段只能投票或弃权: {action.action_type.value}"
+            if action.action_type == ActionType.VOTE:
+                if action.target_id is None:
+                    return False, "投票必须指定目标"
+                if action.target_id == player.id:
+                    return False, "不能投票给自己"
+        elif action.action_type == ActionType.VOTE:
+            return False, "只能在投票阶段投票"
+
         # 验证目标存在且存活（如果有目标）
         if action.target_id is not None:
             target = game.get_player(action.target_id)
@@ -70,6 +92,64 @@ class Role(ABC):
 
         return True, ""
 
+    def legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """
+        计算当前的合法行动掩码
+
+        白天投票阶段直接给出“投票给除自己外的存活玩家，或弃权”，
+        其余阶段按 derive_legal_actions 推导；常见角色覆盖为直接的位运算，
+        在自己的行动阶段之外回退到此实现。
+
+        Args:
+            player: 拥有此角色的玩家
+            game: 游戏实例
+
+        Returns:
+            ActionMask
+        """
+        from werewolf.core.legal import ActionMask, EMPTY_MASK, UNTARGETED
+
+        if game.phase == GamePhase.DAY_VOTE:
+            if not player.is_alive:
+                return EMPTY_MASK
+            return ActionMask({
+                ActionType.VOTE: game.alive_mask & ~(1 << player.id),
+                ActionType.SKIP: UNTARGETED,
+            })
+        return self.derive_legal_actions(player, game)
+
+    def derive_legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """
+        由 validate_action 推导合法行动掩码（参考实现）
+
+        对 get_available_actions 的每种行动逐个目标调用 validate_action，
+        结果与 validate_action 完全一致。无需目标的行动（跳过、解药）
+        只校验一次，提交时忽略其目标。
+
+        Args:
+            player: 拥有此角色的玩家
+            game: 游戏实例
+
+        Returns:
+            ActionMask
+        """
+        from werewolf.core.events import Action
+        from werewolf.core.legal import ActionMask, TARGETED_ACTIONS, UNTARGETED
+
+        targets = {}
+        for action_type in self.get_available_actions(player, game):
+            if action_type in TARGETED_ACTIONS:
+                bits = 0
+                for target in game.get_alive_players():
+                    action = Action(action_type, player.id, target.id)
+                    if self.validate_action(action, player, game)[0]:
+                        bits |= 1 << target.id
+                if bits:
+                    targets[action_type] = bits
+            elif self.validate_action(Action(action_type, player.id), player, game)[0]:
+                targets[action_type] = UNTARGETED
+        return ActionMask(targets)
+
     async def execute_action(
         self, action: Action, player: Player, game: Game
     ) -> ActionResult:
@@ -105,5 +185,15 @@ class Role(ABC):
         """
         return None
 
+    def clone(self) -> Role:
+        """
+        复制角色实例（用于 Game.fork）
+
+        默认浅复制实例属性；持有可变嵌套状态的角色需要覆盖此方法。
+        """
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.name}, {self.faction.value})"
@@ -5,12 +5,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, List, Optional
 
 from werewolf.roles.base import Role
-from werewolf.core.enums import Faction, ActionType, GamePhase
+from werewolf.core.enums import Faction, ActionType, GamePhase, RoleType
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
     from werewolf.core.player import Player
     from werewolf.core.events import Action, ActionResult
+    from werewolf.core.legal import ActionMask
 
 
 class Guard(Role):
@@ -28,6 +29,7 @@ class Guard(Role):
     """
 
     name = "守卫"
+    role_type = RoleType.GUARD
     faction = Faction.VILLAGER
     priority = 5  # 守卫最先行动（需要在狼刀之前确定保护）
     can_act_at_night = True
@@ -40,7 +42,18 @@ class Guard(Role):
         """守卫可以保护或跳过"""
         if game.phase == GamePhase.NIGHT and player.is_alive:
             return [ActionType.PROTECT, ActionType.SKIP]
-        return []
+        return super().get_available_actions(player, game)
+
+    def legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """守卫可以守护上一晚守护对象以外的存活玩家（包括自己）或跳过"""
+        from werewolf.core.legal import ActionMask, UNTARGETED
+
+        if game.phase != GamePhase.NIGHT or not player.is_alive:
+            return super().legal_actions(player, game)
+        targets = game.alive_mask
+        if self.last_protected_id is not None:
+            targets &= ~(1 << self.last_protected_id)
+        return ActionMask({ActionType.PROTECT: targets, ActionType.SKIP: UNTARGETED})
 
     def validate_action(
         self, action: Action, player: Player, game: Game
@@ -49,6 +62,8 @@ class Guard(Role):
         valid, msg = super().validate_action(action, player, game)
         if not valid:
             return valid, msg
+        if game.phase == GamePhase.DAY_VOTE:
+            return True, ""
 
         if action.action_type == ActionType.PROTECT:
             if action.target_id is None:
@@ -67,6 +82,8 @@ class Guard(Role):
         self, action: Action, player: Player, game: Game
     ) -> ActionResult:
         """执行守卫行动"""
+        if game.phase == GamePhase.DAY_VOTE:
+            return await super().execute_action(action, player, game)
         from werewolf.core.events import ActionResult
 
         if action.action_type == ActionType.SKIP:
@@ -5,12 +5,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, List, Optional
 
 from werewolf.roles.base import Role
-from werewolf.core.enums import Faction, ActionType, GamePhase, DeathReason
+from werewolf.core.enums import Faction, ActionType, GamePhase, DeathReason, RoleType
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
     from werewolf.core.player import Player
     from werewolf.core.events import Action, ActionResult
+    from werewolf.core.legal import ActionMask
 
 
 class Hunter(Role):
@@ -29,6 +30,7 @@ class Hunter(Role):
     """
 
     name = "猎人"
+    role_type = RoleType.HUNTER
     faction = Faction.VILLAGER
     priority = 100  # 无夜间主动行动
     can_act_at_night = False
@@ -45,12 +47,25 @@ class Hunter(Role):
         """
         if self.can_shoot and not player.is_alive:
             return [ActionType.SHOOT, ActionType.SKIP]
-        return []
+        return super().get_available_actions(player, game)
+
+    def legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """猎人死亡且保有开枪能力时，可以射杀除自己外的存活玩家或放弃"""
+        from werewolf.core.legal import ActionMask, UNTARGETED
+
+        if not self.can_shoot or player.is_alive:
+            return super().legal_actions(player, game)
+        return ActionMask({
+            ActionType.SHOOT: game.alive_mask & ~(1 << player.id),
+            ActionType.SKIP: UNTARGETED,
+        })
 
     def validate_action(
         self, action: Action, player: Player, game: Game
     ) -> tuple[bool, str]:
         """验证猎人行动"""
+        if game.phase == GamePhase.DAY_VOTE and player.is_alive:
+            return super().validate_action(action, player, game)
         if action.action_type == ActionType.SHOOT:
             if not self.can_shoot:
                 return False, "猎人无法开枪（可能被毒死）"
@@ -74,6 +89,8 @@ class Hunter(Role):
         self, action: Action, player: Player, game: Game
     ) -> ActionResult:
         """执行猎人开枪"""
+        if game.phase == GamePhase.DAY_VOTE and player.is_alive:
+            return await super().execute_action(action, player, game)
         from werewolf.core.events import ActionResult
 
         if action.action_type == ActionType.SKIP:
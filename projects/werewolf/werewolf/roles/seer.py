@@ -5,12 +5,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, List
 
 from werewolf.roles.base import Role
-from werewolf.core.enums import Faction, ActionType, GamePhase
+from werewolf.core.enums import Faction, ActionType, GamePhase, RoleType
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
     from werewolf.core.player import Player
     from werewolf.core.events import Action, ActionResult
+    from werewolf.core.legal import ActionMask
 
 
 class Seer(Role):
@@ -27,6 +28,7 @@ class Seer(Role):
     """
 
     name = "预言家"
+    role_type = RoleType.SEER
     faction = Faction.VILLAGER
     priority = 30  # 预言家在狼人之后行动
     can_act_at_night = True
@@ -35,7 +37,18 @@ class Seer(Role):
         """预言家可以查验或跳过"""
         if game.phase == GamePhase.NIGHT and player.is_alive:
             return [ActionType.CHECK, ActionType.SKIP]
-        return []
+        return super().get_available_actions(player, game)
+
+    def legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """预言家可以查验除自己外的存活玩家或跳过"""
+        from werewolf.core.legal import ActionMask, UNTARGETED
+
+        if game.phase != GamePhase.NIGHT or not player.is_alive:
+            return super().legal_actions(player, game)
+        return ActionMask({
+            ActionType.CHECK: game.alive_mask & ~(1 << player.id),
+            ActionType.SKIP: UNTARGETED,
+        })
 
     def validate_action(
         self, action: Action, player: Player, game: Game
@@ -44,6 +57,8 @@ class Seer(Role):
         valid, msg = super().validate_action(action, player, game)
         if not valid:
             return valid, msg
+        if game.phase == GamePhase.DAY_VOTE:
+            return True, ""
 
         if action.action_type not in (ActionType.CHECK, ActionType.SKIP):
             return False, f"预言家不能执行此行动: {action.action_type}"
@@ -65,6 +80,8 @@ class Seer(Role):
 
         查验结果立即返回（与其他夜间行动不同，预言家可以立即得知结果）
         """
+        if game.phase == GamePhase.DAY_VOTE:
+            return await super().execute_action(action, player, game)
         from werewolf.core.events import ActionResult
 
         if action.action_type == ActionType.SKIP:
@@ -2,7 +2,7 @@
 """平民角色：无特殊能力，依靠发言和投票参与游戏"""
 
 from werewolf.roles.base import Role
-from werewolf.core.enums import Faction
+from werewolf.core.enums import Faction, RoleType
 
 
 class Villager(Role):
@@ -16,6 +16,7 @@ class Villager(Role):
     """
 
     name = "平民"
+    role_type = RoleType.VILLAGER
     faction = Faction.VILLAGER
     priority = 100  # 无夜间行动
     can_act_at_night = False
@@ -5,12 +5,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, List
 
 from werewolf.roles.base import Role
-from werewolf.core.enums import Faction, ActionType, GamePhase
+from werewolf.core.enums import Faction, ActionType, GamePhase, RoleType
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
     from werewolf.core.player import Player
     from werewolf.core.events import Action, ActionResult
+    from werewolf.core.legal import ActionMask
 
 
 class Werewolf(Role):
@@ -27,6 +28,7 @@ class Werewolf(Role):
     """
 
     name = "狼人"
+    role_type = RoleType.WEREWOLF
     faction = Faction.WEREWOLF
     priority = 10  # 狼人较早行动（守卫之后）
     can_act_at_night = True
@@ -35,7 +37,15 @@ class Werewolf(Role):
         """狼人可以选择击杀或跳过"""
         if game.phase == GamePhase.NIGHT and player.is_alive:
             return [ActionType.KILL, ActionType.SKIP]
-        return []
+        return super().get_available_actions(player, game)
+
+    def legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """狼人可以击杀任意存活玩家（允许自刀）或空刀"""
+        from werewolf.core.legal import ActionMask, UNTARGETED
+
+        if game.phase != GamePhase.NIGHT or not player.is_alive:
+            return super().legal_actions(player, game)
+        return ActionMask({ActionType.KILL: game.alive_mask, ActionType.SKIP: UNTARGETED})
 
     def validate_action(
         self, action: Action, player: Player, game: Game
@@ -45,6 +55,8 @@ class Werewolf(Role):
         valid, msg = super().validate_action(action, player, game)
         if not valid:
             return valid, msg
+        if game.phase == GamePhase.DAY_VOTE:
+            return True, ""
 
         # 验证行动类型
         if action.action_type not in (ActionType.KILL, ActionType.SKIP):
@@ -66,6 +78,8 @@ class Werewolf(Role):
 
         注意：这里只是记录行动，实际击杀在 NightResolver 中结算
         """
+        if game.phase == GamePhase.DAY_VOTE:
+            return await super().execute_action(action, player, game)
         from werewolf.core.events import ActionResult
 
         if action.action_type == ActionType.SKIP:
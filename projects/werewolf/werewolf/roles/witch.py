@@ -2,16 +2,17 @@
 """女巫角色：拥有一瓶解药和一瓶毒药"""
 
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, List, Optional
 
 from werewolf.roles.base import Role
-from werewolf.core.enums import Faction, ActionType, GamePhase
+from werewolf.core.enums import Faction, ActionType, GamePhase, RoleType
 
 if TYPE_CHECKING:
     from werewolf.core.game import Game
     from werewolf.core.player import Player
     from werewolf.core.events import Action, ActionResult
+    from werewolf.core.legal import ActionMask
 
 
 @dataclass
@@ -37,9 +38,11 @@ class Witch(Role):
     """
 
     name = "女巫"
+    role_type = RoleType.WITCH
     faction = Faction.VILLAGER
     priority = 20  # 女巫在狼人之后、预言家之前（需要知道狼刀目标）
     can_act_at_night = True
+    legal_depends_on_wolf_target = True  # 解药取决于当晚狼刀
 
     def __init__(self):
         super().__init__()
@@ -48,7 +51,7 @@ class Witch(Role):
     def get_available_actions(self, player: Player, game: Game) -> List[ActionType]:
         """女巫可以使用解药、毒药或跳过"""
         if game.phase != GamePhase.NIGHT or not player.is_alive:
-            return []
+            return super().get_available_actions(player, game)
 
         actions = [ActionType.SKIP]
 
@@ -63,12 +66,23 @@ class Witch(Role):
         return actions
 
     def _get_wolf_target(self, game: Game) -> Optional[int]:
-        """获取今晚被狼杀的玩家ID"""
-        # 从待处理行动中查找狼刀目标
-        for action in game.get_pending_actions():
-            if action.action_type == ActionType.KILL and action.target_id is not None:
-                return action.target_id
-        return None
+        """获取今晚被狼杀的玩家ID（由主持人缓存的狼刀多数决）"""
+        return game.get_wolf_target()
+
+    def legal_actions(self, player: Player, game: Game) -> ActionMask:
+        """女巫：跳过；有解药且狼刀不是自己时可救人；有毒药时可毒除自己外的存活玩家"""
+        from werewolf.core.legal import ActionMask, UNTARGETED
+
+        if game.phase != GamePhase.NIGHT or not player.is_alive:
+            return super().legal_actions(player, game)
+        targets = {ActionType.SKIP: UNTARGETED}
+        if self.state.has_save_potion:
+            wolf_target = self._get_wolf_target(game)
+            if wolf_target is not None and wolf_target != player.id:
+                targets[ActionType.SAVE] = UNTARGETED
+        if self.state.has_poison_potion:
+            targets[ActionType.POISON] = game.alive_mask & ~(1 << player.id)
+        return ActionMask(targets)
 
     def validate_action(
         self, action: Action, player: Player, game: Game
@@ -77,6 +91,8 @@ class Witch(Role):
         valid, msg = super().validate_action(action, player, game)
         if not valid:
             return valid, msg
+        if game.phase == GamePhase.DAY_VOTE:
+            return True, ""
 
         if action.action_type == ActionType.SAVE:
             if not self.state.has_save_potion:
@@ -105,6 +121,8 @@ class Witch(Role):
         self, action: Action, player: Player, game: Game
     ) -> ActionResult:
         """执行女巫行动"""
+        if game.phase == GamePhase.DAY_VOTE:
+            return await super().execute_action(action, player, game)
         from werewolf.core.events import ActionResult
 
         if action.action_type == ActionType.SKIP:
@@ -131,6 +149,12 @@ class Witch(Role):
 
         return ActionResult.fail("未知行动")
 
+    def clone(self) -> Witch:
+        """复制女巫（药水状态独立）"""
+        new = super().clone()
+        new.state = replace(self.state)
+        return new
+
     def reset_potions(self) -> None:
         """重置药水状态（用于游戏重置）"""
         self.state = WitchState()
@@ -3,9 +3,13 @@
 
 from werewolf.runner.game_runner import GameRunner, GameResult
 from werewolf.runner.cli_runner import CLIRunner
+from werewolf.runner.replay import ReplayRunner
+from werewolf.runner.pool import AgentPool
 
 __all__ = [
     "GameRunner",
     "GameResult",
     "CLIRunner",
+    "ReplayRunner",
+    "AgentPool",
 ]
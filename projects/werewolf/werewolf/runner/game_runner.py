@@ -9,13 +9,22 @@ from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Any
 from werewolf.core.game import Game
 from werewolf.core.enums import GamePhase, Faction
 from werewolf.core.events import GameEvent
+from werewolf.core.action_log import ActionLog
+from werewolf.core.checkpoint import Checkpoint
 from werewolf.agents.base import BaseAgent
+from werewolf.runner.pool import AgentPool
 
 if TYPE_CHECKING:
     from werewolf.config.presets import GameConfig
 
 logger = logging.getLogger(__name__)
 
+# agent_logs 中的阶段名
+PHASE_LOG_NAMES = {
+    GamePhase.NIGHT: "night",
+    GamePhase.DAY_VOTE: "vote",
+}
+
 
 @dataclass
 class GameResult:
@@ -27,13 +36,15 @@ class GameResult:
         rounds: 总回合数
         history: 游戏事件历史
         speeches: 发言记录
-        agent_logs: Agent 决策日志
+        agent_logs: Agent 决策日志（改用后备策略的决策带 fallback 字段）
+        action_log: 行动日志（可用于 ReplayRunner 回放）
     """
     winner: Optional[Faction] = None
     rounds: int = 0
     history: List[GameEvent] = field(default_factory=list)
     speeches: List[Dict[str, Any]] = field(default_factory=list)
     agent_logs: List[Dict[str, Any]] = field(default_factory=list)
+    action_log: Optional[ActionLog] = None
 
 
 class GameRunner:
@@ -50,14 +61,17 @@ class GameRunner:
         player_names: Optional[List[str]] = None,
         seed: Optional[int] = None,
         verbose: bool = True,
+        checkpoint_path: Optional[str] = None,
     ):
         """
         Args:
             config: 游戏配置
-            agent_factory: Agent 工厂函数 (player_id, game) -> BaseAgent
+            agent_factory: Agent 工厂函数 (player_id, game) -> BaseAgent；
+                传入 AgentPool 时对局结束后自动归还 Agent
             player_names: 玩家名称列表
             seed: 随机种子
             verbose: 是否输出详细日志
+            checkpoint_path: 检查点文件路径（每个阶段边界覆盖写入，可用 resume 续跑）
         """
         self.config = config
         self.agent_factory = agent_factory
@@ -66,6 +80,7 @@ class GameRunner:
         ]
         self.seed = seed
         self.verbose = verbose
+        self.checkpoint_path = checkpoint_path
 
     async def run(self) -> GameResult:
         """运行完整游戏"""
@@ -75,30 +90,77 @@ class GameRunner:
         game = Game(self.config, seed=self.seed)
         await game.setup(self.player_names)
 
-        # 创建 Agents
-        agents: Dict[int, BaseAgent] = {}
-        for player in game.players:
-            agent = self.agent_factory(player.id, game)
-            agents[player.id] = agent
+        agents = self._create_agents(game)
+        try:
+            if self.verbose:
+                self._print_game_start(game)
 
-        if self.verbose:
-            self._print_game_start(game)
+            # 开始游戏
+            await game.start()
+            result.rounds = game.round
+            self._save_checkpoint(game, agents, result)
+
+            return await self._play(game, agents, result)
+        finally:
+            self._release_agents(agents)
 
-        # 开始游戏
-        await game.start()
-        result.rounds = game.round
+    async def resume(self, checkpoint: Checkpoint) -> GameResult:
+        """
+        从检查点继续运行
 
-        # 游戏主循环
+        Agent 由 agent_factory 重新创建后恢复检查点中保存的状态；
+        已收集的发言和决策日志会接续到结果中。
+        """
+        game = checkpoint.game
+        if game.config.fingerprint() != self.config.fingerprint():
+            raise ValueError("检查点的配置与运行器配置不一致")
+
+        agents = self._create_agents(game)
+        try:
+            checkpoint.restore_agents(agents)
+
+            result = GameResult(
+                winner=game.get_winner() if game.phase == GamePhase.GAME_OVER else None,
+                rounds=game.round,
+                speeches=list(checkpoint.extra.get("speeches", [])),
+                agent_logs=list(checkpoint.extra.get("agent_logs", [])),
+            )
+            return await self._play(game, agents, result)
+        finally:
+            self._release_agents(agents)
+
+    def _create_agents(self, game: Game) -> Dict[int, BaseAgent]:
+        """为每个座位创建 Agent"""
+        return {player.id: self.agent_factory(player.id, game) for player in game.players}
+
+    def _release_agents(self, agents: Dict[int, BaseAgent]) -> None:
+        """对局结束后把 Agent 归还给 AgentPool"""
+        if isinstance(self.agent_factory, AgentPool):
+            self.agent_factory.release(agents)
+
+    def _save_checkpoint(
+        self, game: Game, agents: Dict[int, BaseAgent], result: GameResult
+    ) -> None:
+        """在阶段边界写入检查点"""
+        if self.checkpoint_path is None:
+            return
+        Checkpoint.capture(
+            game, agents, speeches=result.speeches, agent_logs=result.agent_logs,
+        ).save(self.checkpoint_path)
+
+    async def _play(
+        self, game: Game, agents: Dict[int, BaseAgent], result: GameResult
+    ) -> GameResult:
+        """游戏主循环（从当前阶段运行到结束）"""
         while game.phase != GamePhase.GAME_OVER:
             if self.verbose:
                 self._print_phase(game)
 
-            if game.phase == GamePhase.NIGHT:
-                await self._run_night(game, agents, result)
-            elif game.phase == GamePhase.DAY_DISCUSSION:
+            if game.phase == GamePhase.DAY_DISCUSSION:
                 await self._run_discussion(game, agents, result)
-            elif game.phase == GamePhase.DAY_VOTE:
-                await self._run_vote(game, agents, result)
+            else:
+                # 夜间、投票及扩展阶段：由阶段表给出需要行动的玩家
+                await self._run_actions(game, agents, result)
 
             # 推进阶段
             phase_result = await game.advance_phase()
@@ -112,53 +174,65 @@ class GameRunner:
                 break
 
             result.rounds = game.round
+            self._save_checkpoint(game, agents, result)
 
         # 保存历史
         result.history = game.history
+        result.action_log = ActionLog.from_game(game)
 
         if self.verbose:
             self._print_game_end(result)
 
         return result
 
-    async def _run_night(
+    async def _run_actions(
         self,
         game: Game,
         agents: Dict[int, BaseAgent],
         result: GameResult
     ) -> None:
-        """运行夜间阶段"""
-        for player in game.get_alive_players():
-            if not player.role.can_act_at_night:
-                continue
-
-            agent = agents.get(player.id)
+        """运行行动阶段（夜间 / 投票 / 猎人开枪等）"""
+        phase = game.phase
+        for player_id in game.get_active_players():
+            agent = agents.get(player_id)
             if not agent:
                 continue
+            player = game.get_player(player_id)
 
             try:
                 action = await agent.decide_action()
-                action_result = await game.submit_action(player.id, action)
+                action_result = await game.submit_action(player_id, action)
+                agent.on_action_result(action, action_result)
 
-                result.agent_logs.append({
+                log = {
                     "round": game.round,
-                    "phase": "night",
-                    "player_id": player.id,
+                    "phase": PHASE_LOG_NAMES.get(phase, phase.value),
+                    "player_id": player_id,
                     "player_name": player.name,
                     "role": player.role.name,
                     "action": action.action_type.value,
                     "target": action.target_id,
                     "success": action_result.success,
-                })
+                }
+                if agent.last_fallback:
+                    log["fallback"] = agent.last_fallback
+                result.agent_logs.append(log)
 
                 if self.verbose:
-                    logger.info(
-                        f"  [{player.name}({player.role.name})] "
-                        f"{action.action_type.value} -> {action.target_id}"
-                    )
+                    if phase == GamePhase.DAY_VOTE:
+                        target_name = "弃权"
+                        if action.target_id is not None:
+                            target = game.get_player(action.target_id)
+                            target_name = target.name if target else str(action.target_id)
+                        print(f"  [{player.name}] 投票 -> {target_name}")
+                    else:
+                        logger.info(
+                            f"  [{player.name}({player.role.name})] "
+                            f"{action.action_type.value} -> {action.target_id}"
+                        )
 
             except Exception as e:
-                logger.error(f"Agent {player.id} 决策失败: {e}")
+                logger.error(f"Agent {player_id} 决策失败: {e}")
 
     async def _run_discussion(
         self,
@@ -181,6 +255,24 @@ class GameRunner:
                     "player_name": player.name,
                     "content": speech,
                 })
+                if agent.last_fallback:
+                    # 发言使用后备策略时同样记入决策日志
+                    result.agent_logs.append({
+                        "round": game.round,
+                        "phase": "discussion",
+                        "player_id": player.id,
+                        "player_name": player.name,
+                        "role": player.role.name,
+                        "action": "speak",
+                        "target": None,
+                        "success": True,
+                        "fallback": agent.last_fallback,
+                    })
+                if game.bus.has_subscribers:
+                    game.bus.publish(GameEvent(
+                        GameEvent.PLAYER_SPEECH, game.round, game.phase,
+                        {"player_id": player.id, "content": speech}, visible_to=[],
+                    ))
 
                 if self.verbose:
                     print(f"  [{player.name}]: {speech[:80]}{'...' if len(speech) > 80 else ''}")
@@ -188,41 +280,6 @@ class GameRunner:
             except Exception as e:
                 logger.error(f"Agent {player.id} 发言失败: {e}")
 
-    async def _run_vote(
-        self,
-        game: Game,
-        agents: Dict[int, BaseAgent],
-        result: GameResult
-    ) -> None:
-        """运行投票阶段"""
-        for player in game.get_alive_players():
-            agent = agents.get(player.id)
-            if not agent:
-                continue
-
-            try:
-                action = await agent.decide_action()
-                await game.submit_action(player.id, action)
-
-                result.agent_logs.append({
-                    "round": game.round,
-                    "phase": "vote",
-                    "player_id": player.id,
-                    "player_name": player.name,
-                    "action": action.action_type.value,
-                    "target": action.target_id,
-                })
-
-                if self.verbose:
-                    target_name = "弃权"
-                    if action.target_id is not None:
-                        target = game.get_player(action.target_id)
-                        target_name = target.name if target else str(action.target_id)
-                    print(f"  [{player.name}] 投票 -> {target_name}")
-
-            except Exception as e:
-                logger.error(f"Agent {player.id} 投票失败: {e}")
-
     def _print_game_start(self, game: Game) -> None:
         """打印游戏开始信息"""
         print("\n" + "=" * 60)
@@ -241,12 +298,15 @@ class GameRunner:
             GamePhase.NIGHT: "夜间",
             GamePhase.DAY_DISCUSSION: "白天讨论",
             GamePhase.DAY_VOTE: "白天投票",
+            GamePhase.HUNTER_SHOT: "猎人开枪",
         }
         phase_name = phase_names.get(game.phase, game.phase.value)
         print(f"\n--- 第 {game.round} 回合 {phase_name} ---")
 
     def _print_phase_result(self, game: Game, phase_result) -> None:
         """打印阶段结果"""
+        for phase in phase_result.skipped:
+            print(f"  (无人行动，跳过 {phase.value})")
         if phase_result.deaths:
             print(f"\n死亡玩家: {phase_result.deaths}")
         for msg in phase_result.messages:
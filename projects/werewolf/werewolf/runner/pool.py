@@ -0,0 +1,83 @@
+# ==================== Agent 池 ====================
+"""跨对局复用 Agent 实例"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, List, Optional
+
+if TYPE_CHECKING:
+    from werewolf.core.game import Game
+    from werewolf.agents.base import BaseAgent
+
+
+def seat_key(player_id: int, game: Game) -> Hashable:
+    """默认分组：按座位复用"""
+    return player_id
+
+
+def offset_seed(player_id: int, game: Game) -> Optional[int]:
+    """默认种子：对局种子 + 座位号（与常见的 agent_factory 写法一致）"""
+    return None if game.seed is None else game.seed + player_id
+
+
+class AgentPool:
+    """
+    Agent 池
+
+    第一次需要某一组（key）的 Agent 时调用 factory 创建，对局结束后归还；
+    之后的对局从空闲列表取出并调用 rebind() 绑定到新座位，
+    LLM 客户端、随机数生成器、缓存的提示词等资源随 Agent 一起复用。
+
+    可以直接作为 GameRunner 的 agent_factory 传入，运行器在对局结束时自动归还。
+    同一个池可以同时服务多局（每局取出各自的实例）。
+
+    Example:
+        pool = AgentPool(lambda pid, game: RandomAgent(pid, game, seed=game.seed + pid))
+        for seed in range(1000):
+            await GameRunner(config, pool, seed=seed, verbose=False).run()
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int, Game], BaseAgent],
+        key: Callable[[int, Game], Hashable] = seat_key,
+        seed: Callable[[int, Game], Optional[int]] = offset_seed,
+    ):
+        """
+        Args:
+            factory: Agent 工厂函数 (player_id, game) -> BaseAgent
+            key: 分组函数 (player_id, game) -> key；工厂按角色或阵营选择
+                 Agent 类型时，key 也应包含角色或阵营
+            seed: 复用时传给 rebind() 的随机种子 (player_id, game) -> seed
+        """
+        self.factory = factory
+        self.key = key
+        self.seed = seed
+        self._free: Dict[Hashable, List[BaseAgent]] = {}
+        self._keys: Dict[int, Hashable] = {}
+        self.created = 0
+        self.reused = 0
+
+    def __call__(self, player_id: int, game: Game) -> BaseAgent:
+        """取出（或创建）一个绑定到该座位的 Agent"""
+        key = self.key(player_id, game)
+        free = self._free.get(key)
+        if free:
+            agent = free.pop()
+            agent.rebind(game, player_id, self.seed(player_id, game))
+            self.reused += 1
+        else:
+            agent = self.factory(player_id, game)
+            self.created += 1
+        self._keys[id(agent)] = key
+        return agent
+
+    def release(self, agents: Dict[int, BaseAgent]) -> None:
+        """对局结束后归还 Agent"""
+        for agent in agents.values():
+            key = self._keys.pop(id(agent), None)
+            if key is not None:
+                self._free.setdefault(key, []).append(agent)
+
+    def clear(self) -> None:
+        """丢弃所有空闲的 Agent"""
+        self._free.clear()
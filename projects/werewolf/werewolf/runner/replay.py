@@ -0,0 +1,83 @@
+# ==================== 回放运行器 ====================
+"""根据行动日志确定性地重建对局（不调用任何 Agent）"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+
+from werewolf.core.game import Game
+from werewolf.core.enums import GamePhase
+from werewolf.core.events import Action
+from werewolf.core.action_log import ActionLog
+from werewolf.runner.game_runner import GameResult
+
+if TYPE_CHECKING:
+    from werewolf.config.presets import GameConfig
+
+
+class ReplayRunner:
+    """
+    回放运行器
+
+    按日志顺序重新提交行动，并在行动之间推进阶段，得到与原对局完全一致的
+    Game 状态和 history。用于复盘、回归检查和 Web 端回放 LLM 对局。
+
+    Example:
+        log = ActionLog.from_json(text)
+        result = await ReplayRunner(PRESET_9P, log).run()
+    """
+
+    def __init__(self, config: GameConfig, log: ActionLog):
+        """
+        Args:
+            config: 游戏配置（指纹必须与日志一致）
+            log: 行动日志
+        """
+        if config.fingerprint() != log.config_fingerprint:
+            raise ValueError(
+                f"配置指纹不匹配: 日志 {log.config_fingerprint}，"
+                f"当前 {config.fingerprint()}"
+            )
+        self.config = config
+        self.log = log
+        self.game: Optional[Game] = None
+
+    async def run(self) -> GameResult:
+        """
+        执行回放
+
+        Returns:
+            GameResult（winner / rounds / history 与原对局一致）
+        """
+        log = self.log
+        game = Game(self.config, seed=log.seed)
+        await game.setup(log.player_names, roles=log.roles)
+        self.game = game
+
+        if log.final_phase != GamePhase.INIT:
+            await game.start()
+
+        for record in log.actions:
+            await self._advance_to(game, record.round_num, record.phase)
+            action = Action(record.action_type, record.actor_id, record.target_id)
+            result = await game.submit_action(record.actor_id, action)
+            if not result.success:
+                raise RuntimeError(f"回放失败：行动 {record} 被拒绝（{result.message}）")
+
+        await self._advance_to(game, log.final_round, log.final_phase)
+
+        return GameResult(
+            winner=game.get_winner(),
+            rounds=game.round,
+            history=game.history,
+            action_log=ActionLog.from_game(game),
+        )
+
+    @staticmethod
+    async def _advance_to(game: Game, round_num: int, phase: GamePhase) -> None:
+        """推进阶段直到到达指定回合和阶段"""
+        while (game.round, game.phase) != (round_num, phase):
+            if game.phase == GamePhase.GAME_OVER or game.round > round_num:
+                raise RuntimeError(
+                    f"回放失败：无法到达第 {round_num} 回合 {phase.value} 阶段"
+                )
+            await game.advance_phase()
@@ -0,0 +1,20 @@
+# ==================== Simulation Module ====================
+"""高速模拟模块（平衡性测试、大规模对局统计）"""
+
+from werewolf.sim.fast_game import FastGame, FastGameResult, RandomPolicy, run_games
+from werewolf.sim.exact import ExactSolver, ExactResult
+from werewolf.sim.ismcts import SearchPosition, RolloutPolicy, search, merge_stats, best_move
+
+__all__ = [
+    "FastGame",
+    "FastGameResult",
+    "RandomPolicy",
+    "run_games",
+    "ExactSolver",
+    "ExactResult",
+    "SearchPosition",
+    "RolloutPolicy",
+    "search",
+    "merge_stats",
+    "best_move",
+]
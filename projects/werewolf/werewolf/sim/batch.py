@@ -0,0 +1,312 @@
+# ==================== 批量模拟器 ====================
+"""
+BatchSimulator：基于 NumPy 的锁步批量对局模拟
+
+N 局游戏的存活掩码、角色数组、药水与守卫状态都是 (N, P) / (N,) 数组，
+狼刀多数决和投票统计用向量化归约完成，随机策略整批采样。
+已结束的对局在每回合末被压缩出工作集，只有进行中的对局参与计算。
+
+随机策略的分布与 RandomAgent / RandomPolicy 一致（逐局随机数流不同），
+因此胜率等统计量可与 Game 直接对比。
+
+需要安装 numpy: pip install werewolf[sim]
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - 依赖缺失时给出安装提示
+    raise ImportError("请安装 numpy: pip install werewolf[sim]") from e
+
+from werewolf.config.presets import GameConfig
+from werewolf.sim.fast_game import (
+    ROLE_CODES, WEREWOLF, WITCH, GUARD, DEFAULT_MAX_ROUNDS, check_phase_rules,
+)
+
+# winners 数组中的阵营编码
+VILLAGER_WIN = 0
+WEREWOLF_WIN = 1
+NO_WINNER = -1
+
+# 默认分块大小：控制 (N, W, P) 中间数组的内存占用
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+# ==================== 向量化规则 ====================
+
+def majority_targets(kills: np.ndarray, player_count: int) -> np.ndarray:
+    """
+    批量狼刀多数决（与 engine.rules.majority_target 逐行一致）
+
+    Args:
+        kills: (N, W) 按提交顺序排列的击杀目标，-1 表示空刀
+        player_count: 玩家人数 P
+
+    Returns:
+        (N,) 被击杀座位，-1 表示空刀
+    """
+    n, w = kills.shape
+    onehot = kills[:, :, None] == np.arange(player_count)       # (N, W, P)
+    counts = onehot.sum(axis=1)                                  # (N, P)
+    first = onehot.argmax(axis=1)                                # 首次被投的位置
+    # 票数优先，平票时最先被投者优先
+    score = counts * (w + 1) - first
+    score[counts == 0] = -1
+    best = score.argmax(axis=1)
+    return np.where(counts.any(axis=1), best, -1)
+
+
+def tally_votes(votes: np.ndarray, player_count: int) -> np.ndarray:
+    """
+    批量投票统计（与 engine.rules.tally_votes 的 no_elimination 策略一致）
+
+    Args:
+        votes: (N, V) 投票目标，-1 表示弃权
+        player_count: 玩家人数 P
+
+    Returns:
+        (N,) 被处决座位，平票或全部弃权时为 -1
+    """
+    n = votes.shape[0]
+    valid = votes >= 0
+    rows = np.broadcast_to(np.arange(n)[:, None], votes.shape)
+    flat = (rows * player_count + votes)[valid]
+    counts = np.bincount(flat, minlength=n * player_count).reshape(n, player_count)
+    top = counts.max(axis=1)
+    unique_top = (counts == top[:, None]).sum(axis=1) == 1
+    return np.where((top > 0) & unique_top, counts.argmax(axis=1), -1)
+
+
+def _sample_others(
+    rng: np.random.Generator, alive: np.ndarray, seats: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    为每局的行动者在“除自己外的存活玩家”中均匀采样目标
+
+    Returns:
+        (目标座位, 是否存在可选目标)
+    """
+    n = alive.shape[0]
+    eligible = alive.copy()
+    eligible[np.arange(n), seats] = False
+    keys = np.where(eligible, rng.random(alive.shape), -1.0)
+    return keys.argmax(axis=1), eligible.any(axis=1)
+
+
+# ==================== 结果 ====================
+
+@dataclass
+class BatchResult:
+    """
+    批量模拟结果
+
+    Attributes:
+        winners: (N,) 胜利阵营编码（VILLAGER_WIN / WEREWOLF_WIN / NO_WINNER）
+        rounds: (N,) 每局回合数（与 GameResult.rounds 含义一致）
+    """
+    winners: np.ndarray
+    rounds: np.ndarray
+
+    @property
+    def num_games(self) -> int:
+        return int(self.winners.shape[0])
+
+    def summary(self) -> Dict[str, float]:
+        """汇总统计（字段与 BenchmarkService 结果一致）"""
+        total = max(self.num_games, 1)
+        wins = {
+            "villager": int((self.winners == VILLAGER_WIN).sum()),
+            "werewolf": int((self.winners == WEREWOLF_WIN).sum()),
+        }
+        return {
+            "win_rates": {faction: count / total for faction, count in wins.items()},
+            "wins": wins,
+            "avg_rounds": float(self.rounds.mean()) if self.num_games else 0.0,
+            "min_rounds": int(self.rounds.min()) if self.num_games else 0,
+            "max_rounds": int(self.rounds.max()) if self.num_games else 0,
+        }
+
+
+# ==================== 模拟器 ====================
+
+class BatchSimulator:
+    """
+    锁步批量模拟器
+
+    支持任意狼人数量，女巫和守卫每局至多一名（预言家查验不影响随机策略
+    下的局面；默认规则下猎人没有开枪阶段，二者不参与计算）。
+
+    Example:
+        sim = BatchSimulator(PRESET_12P, seed=0)
+        result = sim.run(1_000_000)
+        print(result.summary()["win_rates"])
+    """
+
+    def __init__(
+        self,
+        config: GameConfig,
+        seed: Optional[int] = None,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Args:
+            config: 游戏配置
+            seed: 随机种子
+            max_rounds: 回合上限，超过后以无胜者结束
+            chunk_size: 每批同时推进的对局数
+        """
+        valid, msg = config.validate()
+        if not valid:
+            raise ValueError(f"配置无效: {msg}")
+        check_phase_rules(config)
+        for role in ("witch", "guard"):
+            if config.roles.count(role) > 1:
+                raise ValueError(f"批量模拟器不支持多个 {role}")
+
+        self.config = config
+        self.player_count = config.player_count
+        self.wolf_count = config.werewolf_count
+        self.max_rounds = max_rounds
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self._role_codes = np.array([ROLE_CODES[r] for r in config.roles], dtype=np.int8)
+
+    def run(self, num_games: int) -> BatchResult:
+        """
+        运行 num_games 局随机策略对局
+
+        Returns:
+            BatchResult
+        """
+        winners = np.full(num_games, NO_WINNER, dtype=np.int8)
+        rounds = np.zeros(num_games, dtype=np.int16)
+
+        for start in range(0, num_games, self.chunk_size):
+            stop = min(start + self.chunk_size, num_games)
+            self._run_chunk(winners[start:stop], rounds[start:stop])
+
+        return BatchResult(winners=winners, rounds=rounds)
+
+    def _run_chunk(self, winners_out: np.ndarray, rounds_out: np.ndarray) -> None:
+        """锁步推进一批对局，结果写入输出切片"""
+        rng = self.rng
+        n = winners_out.shape[0]
+        p = self.player_count
+
+        # 角色分配：每行独立洗牌
+        roles = rng.permuted(np.tile(self._role_codes, (n, 1)), axis=1)
+        is_wolf = roles == WEREWOLF
+        wolf_seats = np.nonzero(is_wolf)[1].reshape(n, self.wolf_count)  # 按座位升序
+
+        has_witch = (roles == WITCH).any(axis=1)
+        witch_seat = (roles == WITCH).argmax(axis=1)
+        has_guard = (roles == GUARD).any(axis=1)
+        guard_seat = (roles == GUARD).argmax(axis=1)
+
+        alive = np.ones((n, p), dtype=bool)
+        has_save = has_witch.copy()
+        has_poison = has_witch.copy()
+        guard_last = np.full(n, -1, dtype=np.int64)
+        round_num = np.ones(n, dtype=np.int16)
+        game_ids = np.arange(n)
+
+        while game_ids.size:
+            m = game_ids.size
+            ar = np.arange(m)
+
+            # ---------- 夜间：狼人（按座位顺序提交） ----------
+            kills = np.full((m, self.wolf_count), -1, dtype=np.int64)
+            for k in range(self.wolf_count):
+                seat = wolf_seats[:, k]
+                target, has_target = _sample_others(rng, alive, seat)
+                acts = alive[ar, seat] & (rng.random(m) < 0.5) & has_target
+                kills[:, k] = np.where(acts, target, -1)
+            wolf_target = majority_targets(kills, p)
+
+            # ---------- 夜间：女巫 ----------
+            witch_alive = has_witch & alive[ar, witch_seat]
+            # 女巫看到的是座位在她之前的狼人已提交击杀的多数决
+            visible = np.where(wolf_seats < witch_seat[:, None], kills, -1)
+            seen_target = majority_targets(visible, p)
+            can_save = has_save & (seen_target >= 0)
+            n_options = 1 + can_save.astype(np.int64) + has_poison
+            pick = (rng.random(m) * n_options).astype(np.int64)
+            choose_save = witch_alive & (pick == 1) & can_save
+            choose_poison = witch_alive & (((pick == 1) & ~can_save) | (pick == 2))
+
+            saved = choose_save & (seen_target != witch_seat)   # 女巫不能自救
+            has_save &= ~saved
+
+            poison_target, has_poison_target = _sample_others(rng, alive, witch_seat)
+            poisoned = choose_poison & has_poison_target
+            has_poison &= ~poisoned
+
+            # ---------- 夜间：守卫 ----------
+            guard_alive = has_guard & alive[ar, guard_seat]
+            protect_target, has_protect_target = _sample_others(rng, alive, guard_seat)
+            choose_protect = guard_alive & (rng.random(m) < 0.5) & has_protect_target
+            protects = choose_protect & (protect_target != guard_last)
+            guard_skip = guard_alive & ~choose_protect
+            guard_last = np.where(protects, protect_target, guard_last)
+            guard_last = np.where(guard_skip, -1, guard_last)
+
+            # ---------- 夜间结算 ----------
+            protected = np.where(protects, protect_target, -1)
+            wolf_kills = (wolf_target >= 0) & (wolf_target != protected) & ~saved
+            alive[ar[wolf_kills], wolf_target[wolf_kills]] = False
+            alive[ar[poisoned], poison_target[poisoned]] = False
+
+            done, winner = self._check_winner(alive, is_wolf)
+
+            # ---------- 白天投票（按座位顺序，存活者各以 1/2 投票或弃权） ----------
+            voting = ~done
+            votes = np.full((m, p), -1, dtype=np.int64)
+            for seat in range(p):
+                seats = np.full(m, seat)
+                target, has_target = _sample_others(rng, alive, seats)
+                acts = voting & alive[:, seat] & (rng.random(m) < 0.5) & has_target
+                votes[:, seat] = np.where(acts, target, -1)
+            eliminated = tally_votes(votes, p)
+            out = eliminated >= 0
+            alive[ar[out], eliminated[out]] = False
+
+            day_done, day_winner = self._check_winner(alive, is_wolf)
+            winner = np.where(done, winner, day_winner)
+            done |= day_done
+
+            # 未结束的对局进入下一回合
+            round_num = np.where(done, round_num, round_num + 1)
+            overflow = round_num > self.max_rounds
+            finished = done | overflow
+
+            if finished.any():
+                ids = game_ids[finished]
+                winners_out[ids] = np.where(done[finished], winner[finished], NO_WINNER)
+                rounds_out[ids] = round_num[finished]
+
+                keep = ~finished
+                game_ids = game_ids[keep]
+                alive, is_wolf, wolf_seats = alive[keep], is_wolf[keep], wolf_seats[keep]
+                has_witch, witch_seat = has_witch[keep], witch_seat[keep]
+                has_guard, guard_seat = has_guard[keep], guard_seat[keep]
+                has_save, has_poison = has_save[keep], has_poison[keep]
+                guard_last, round_num = guard_last[keep], round_num[keep]
+
+    @staticmethod
+    def _check_winner(alive: np.ndarray, is_wolf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量胜负判定（与 engine.rules.check_winner 一致）
+
+        Returns:
+            (是否结束, 胜利阵营编码)
+        """
+        wolves = (alive & is_wolf).sum(axis=1)
+        villagers = alive.sum(axis=1) - wolves
+        villager_win = wolves == 0
+        wolf_win = ~villager_win & (wolves >= villagers)
+        winner = np.where(villager_win, VILLAGER_WIN, np.where(wolf_win, WEREWOLF_WIN, NO_WINNER))
+        return villager_win | wolf_win, winner.astype(np.int8)
@@ -0,0 +1,394 @@
+# ==================== 精确求解器 ====================
+"""
+ExactSolver：小人数配置在随机策略下的精确胜率
+
+随机策略（RandomAgent / RandomPolicy）下，一局游戏的后续走向只取决于
+存活集合、女巫药水、守卫上一晚的守护对象和当前回合数。求解器按
+FastGame 复刻的角色语义枚举每一晚所有行动组合的概率，白天投票按存活
+人数的对称性给出每名玩家被处决的概率，对状态做记忆化递归，
+得到各阵营的精确胜率与期望回合数（浮点误差内），可作为 FastGame /
+BatchSimulator 等模拟器的基准。
+
+状态在记忆化前按角色规范化：同阵营、无行动差异的玩家可互换，
+只保留提交顺序有影响的狼人 / 女巫相对座次，因此不同的角色分配共享
+大部分子问题。
+"""
+
+from __future__ import annotations
+import itertools
+import math
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from werewolf.core.enums import Faction
+from werewolf.config.presets import GameConfig
+from werewolf.engine.rules import check_winner, majority_target
+from werewolf.sim.fast_game import (
+    ROLE_CODES, WEREWOLF, WITCH, GUARD, DEFAULT_MAX_ROUNDS, check_phase_rules,
+)
+
+# 状态值：(村民胜率, 狼人胜率, 无胜者概率, 期望回合数)
+Value = Tuple[float, float, float, float]
+
+# 默认允许的不同角色排列数上限（9 人局为 10080，12 人局约 83 万，无法在合理时间内求解）
+DEFAULT_MAX_ASSIGNMENTS = 20_000
+
+# 规范化时视为等价的“无行动差异”角色（预言家、猎人、平民对随机策略下的局面没有影响）
+_PASSIVE = -1
+
+
+@dataclass
+class ExactResult:
+    """
+    精确求解结果
+
+    Attributes:
+        villager: 村民阵营胜率
+        werewolf: 狼人阵营胜率
+        no_winner: 超过回合上限无胜者的概率
+        expected_rounds: 期望回合数（与 GameResult.rounds 含义一致）
+        states: 记忆化的规范状态数
+    """
+    villager: float
+    werewolf: float
+    no_winner: float
+    expected_rounds: float
+    states: int = 0
+
+    def win_rate(self, faction: Faction) -> float:
+        """指定阵营的胜率"""
+        return self.villager if faction == Faction.VILLAGER else self.werewolf
+
+    def summary(self) -> Dict[str, object]:
+        """汇总统计（字段与 BenchmarkService 结果一致）"""
+        return {
+            "win_rates": {"villager": self.villager, "werewolf": self.werewolf},
+            "no_winner": self.no_winner,
+            "avg_rounds": self.expected_rounds,
+            "exact": True,
+        }
+
+
+class ExactSolver:
+    """
+    精确胜率求解器
+
+    支持任意狼人数量，女巫和守卫每局至多一名；状态数随人数快速增长，
+    适用于 6 人 / 9 人等小配置。
+
+    Example:
+        result = ExactSolver(PRESET_6P).solve()
+        print(result.werewolf, result.expected_rounds)
+    """
+
+    def __init__(
+        self, config: GameConfig, max_rounds: int = DEFAULT_MAX_ROUNDS,
+        max_assignments: Optional[int] = DEFAULT_MAX_ASSIGNMENTS,
+    ):
+        """
+        Args:
+            config: 游戏配置
+            max_rounds: 回合上限（与 FastGame 一致，超过后以无胜者结束）
+            max_assignments: 不同角色排列数上限，超过时直接拒绝（None 表示不限制）
+
+        Raises:
+            ValueError: 配置无效、不受支持或超出求解规模
+        """
+        valid, msg = config.validate()
+        if not valid:
+            raise ValueError(f"配置无效: {msg}")
+        check_phase_rules(config)
+        for role in ("witch", "guard"):
+            if config.roles.count(role) > 1:
+                raise ValueError(f"精确求解器不支持多个 {role}")
+        assignments = count_assignments(config.roles)
+        if max_assignments is not None and assignments > max_assignments:
+            raise ValueError(
+                f"{config.name} 有 {assignments} 种角色排列，超过精确求解上限 "
+                f"{max_assignments}，请改用蒙特卡洛模拟"
+            )
+
+        self.config = config
+        self.max_rounds = max_rounds
+        self._role_codes = [ROLE_CODES[r] for r in config.roles]
+        self._memo: Dict[tuple, Value] = {}
+
+    def solve(self) -> ExactResult:
+        """
+        求解随机角色分配下的整局结果
+
+        每种不同的角色排列等概率出现（与 Game.setup 的均匀洗牌一致）。
+        """
+        assignments = sorted(set(itertools.permutations(self._role_codes)))
+        weight = 1.0 / len(assignments)
+        total = [0.0, 0.0, 0.0, 0.0]
+        for roles in assignments:
+            value = self.solve_assignment(roles)
+            for i in range(4):
+                total[i] += weight * value[i]
+        return ExactResult(*total, states=len(self._memo))
+
+    def solve_assignment(self, roles: Sequence[int]) -> Value:
+        """求解指定座位角色（ROLE_CODES 编码）的对局"""
+        roles = tuple(roles)
+        alive = (1 << len(roles)) - 1
+        has_witch = WITCH in roles
+        return self._value(roles, alive, has_witch, has_witch, -1, 1)
+
+    # ==================== 递归 ====================
+
+    def _value(
+        self, roles: Tuple[int, ...], alive: int,
+        has_save: bool, has_poison: bool, guard_last: int, round_num: int,
+    ) -> Value:
+        """第 round_num 晚开始时的状态值"""
+        if round_num > self.max_rounds:
+            return 0.0, 0.0, 1.0, float(round_num)
+
+        key = self._canonical(roles, alive, has_save, has_poison, guard_last, round_num)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        villager = werewolf = none = rounds = 0.0
+        for (next_alive, save, poison, last), prob in self._night(
+            roles, alive, has_save, has_poison, guard_last
+        ).items():
+            winner = check_winner(*_alive_counts(roles, next_alive))
+            if winner == Faction.VILLAGER:
+                villager += prob
+                rounds += prob * round_num
+            elif winner == Faction.WEREWOLF:
+                werewolf += prob
+                rounds += prob * round_num
+            else:
+                # 白天投票：每名存活玩家被处决的概率相同，其余情况无人出局
+                ids = [pid for pid in range(len(roles)) if (next_alive >> pid) & 1]
+                q = vote_out_probability(len(ids))
+                days = [(next_alive, 1.0 - len(ids) * q)]
+                days += [(next_alive & ~(1 << pid), q) for pid in ids]
+                for day_alive, p_day in days:
+                    p = prob * p_day
+                    winner = check_winner(*_alive_counts(roles, day_alive))
+                    if winner == Faction.VILLAGER:
+                        villager += p
+                        rounds += p * round_num
+                    elif winner == Faction.WEREWOLF:
+                        werewolf += p
+                        rounds += p * round_num
+                    else:
+                        v = self._value(roles, day_alive, save, poison, last, round_num + 1)
+                        villager += p * v[0]
+                        werewolf += p * v[1]
+                        none += p * v[2]
+                        rounds += p * v[3]
+
+        value = (villager, werewolf, none, rounds)
+        self._memo[key] = value
+        return value
+
+    def _night(
+        self, roles: Tuple[int, ...], alive: int,
+        has_save: bool, has_poison: bool, guard_last: int,
+    ) -> Dict[Tuple[int, bool, bool, int], float]:
+        """
+        一晚所有行动组合的结果分布
+
+        Returns:
+            {(存活掩码, 解药, 毒药, 守卫记忆): 概率}
+        """
+        ids = [pid for pid in range(len(roles)) if (alive >> pid) & 1]
+        n_others = len(ids) - 1
+        witch = _find(roles, ids, WITCH)
+        guard = _find(roles, ids, GUARD)
+        wolves = [pid for pid in ids if roles[pid] == WEREWOLF]
+        # 女巫看到的狼刀 = 座位在她之前的狼人已提交击杀的多数决
+        seen_count = sum(1 for w in wolves if witch is not None and w < witch)
+
+        outcomes: Dict[Tuple[int, bool, bool, int], float] = {}
+
+        for (seen, final), p_wolf in _wolf_outcomes(wolves, ids, seen_count).items():
+            # (是否救人, 毒杀目标, 解药, 毒药, 概率)
+            witch_branches = [(False, None, has_save, has_poison, 1.0)]
+            if witch is not None:
+                witch_branches = []
+                can_save = has_save and seen is not None
+                n_options = 1 + can_save + has_poison
+                p_option = 1.0 / n_options
+                witch_branches.append((False, None, has_save, has_poison, p_option))
+                if can_save:
+                    if seen != witch:
+                        witch_branches.append((True, None, False, has_poison, p_option))
+                    else:
+                        # 不能自救：行动被拒绝，药水保留
+                        witch_branches.append((False, None, has_save, has_poison, p_option))
+                if has_poison:
+                    p_target = p_option / n_others
+                    for target in ids:
+                        if target != witch:
+                            witch_branches.append((False, target, has_save, False, p_target))
+
+            # (守护目标, 守卫记忆, 概率)
+            guard_branches = [(None, guard_last, 1.0)]
+            if guard is not None:
+                guard_branches = [(None, -1, 0.5)]
+                p_target = 0.5 / n_others
+                for target in ids:
+                    if target == guard:
+                        continue
+                    if target != guard_last:
+                        guard_branches.append((target, target, p_target))
+                    else:
+                        # 不能连续守护同一人：行动被拒绝，记忆不变
+                        guard_branches.append((None, guard_last, p_target))
+
+            for saved, poisoned, save, poison, p_witch in witch_branches:
+                for protected, last, p_guard in guard_branches:
+                    next_alive = alive
+                    if final is not None and final != protected and not saved:
+                        next_alive &= ~(1 << final)
+                    if poisoned is not None:
+                        next_alive &= ~(1 << poisoned)
+                    key = (next_alive, save, poison, last)
+                    outcomes[key] = outcomes.get(key, 0.0) + p_wolf * p_witch * p_guard
+
+        return outcomes
+
+    # ==================== 规范化 ====================
+
+    def _canonical(
+        self, roles: Tuple[int, ...], alive: int,
+        has_save: bool, has_poison: bool, guard_last: int, round_num: int,
+    ) -> tuple:
+        """
+        状态的规范形式
+
+        - 女巫或守卫死亡后，其状态不再影响局面
+        - 守卫记忆指向的玩家已死亡时等价于没有记忆
+        - 只有女巫持有解药时，狼人相对女巫的座次才影响她看到的狼刀
+        """
+        ids = [pid for pid in range(len(roles)) if (alive >> pid) & 1]
+        witch = _find(roles, ids, WITCH)
+        guard = _find(roles, ids, GUARD)
+        if witch is None:
+            has_save = has_poison = False
+        if guard is None or guard_last < 0 or not (alive >> guard_last) & 1:
+            guard_last = -1
+
+        ordered = WITCH if has_save else None
+        sequence: List[int] = []
+        others: Dict[int, int] = {}
+        last_token: Optional[tuple] = None
+        for pid in ids:
+            code = roles[pid]
+            if code == WEREWOLF or code == ordered:
+                if pid == guard_last:
+                    last_token = ("seq", len(sequence))
+                sequence.append(code)
+            else:
+                if code not in (WITCH, GUARD):
+                    code = _PASSIVE
+                if pid == guard_last:
+                    last_token = ("other", code)
+                others[code] = others.get(code, 0) + 1
+
+        return (
+            tuple(sequence), tuple(sorted(others.items())), last_token,
+            has_save, has_poison, round_num,
+        )
+
+
+# ==================== 辅助函数 ====================
+
+def count_assignments(roles: Sequence[str]) -> int:
+    """不同角色排列数（多重集排列数）"""
+    total = math.factorial(len(roles))
+    for count in Counter(roles).values():
+        total //= math.factorial(count)
+    return total
+
+
+def _find(roles: Tuple[int, ...], ids: List[int], code: int) -> Optional[int]:
+    """存活玩家中指定角色的座位"""
+    for pid in ids:
+        if roles[pid] == code:
+            return pid
+    return None
+
+
+def _alive_counts(roles: Tuple[int, ...], alive: int) -> Tuple[int, int]:
+    """(存活狼人数, 存活村民阵营数)"""
+    wolves = total = 0
+    for pid, code in enumerate(roles):
+        if (alive >> pid) & 1:
+            total += 1
+            wolves += code == WEREWOLF
+    return wolves, total - wolves
+
+
+@lru_cache(maxsize=None)
+def vote_out_probability(n: int) -> float:
+    """
+    n 名存活玩家随机投票时，指定玩家被处决的概率
+
+    每名玩家以 1/2 概率弃权，否则在除自己外的存活玩家中均匀投票；
+    票数唯一最高者出局（与 engine.rules.tally_votes 的 no_elimination 策略一致）。
+    按投票者逐个展开票数向量的分布，由对称性只统计座位 0。
+    """
+    if n < 2:
+        return 0.0
+    p_target = 0.5 / (n - 1)
+    counts: Dict[Tuple[int, ...], float] = {(0,) * n: 1.0}
+    for voter in range(n):
+        step: Dict[Tuple[int, ...], float] = {}
+        for vector, prob in counts.items():
+            step[vector] = step.get(vector, 0.0) + prob * 0.5
+            for target in range(n):
+                if target == voter:
+                    continue
+                key = vector[:target] + (vector[target] + 1,) + vector[target + 1:]
+                step[key] = step.get(key, 0.0) + prob * p_target
+        counts = step
+    return sum(
+        prob for vector, prob in counts.items()
+        if vector[0] > 0 and all(c < vector[0] for c in vector[1:])
+    )
+
+
+def _wolf_outcomes(
+    wolves: List[int], ids: List[int], seen_count: int,
+) -> Dict[Tuple[Optional[int], Optional[int]], float]:
+    """
+    狼人行动的结果分布
+
+    每名狼人以 1/2 概率空刀，否则在除自己外的存活玩家中均匀选择目标。
+
+    Returns:
+        {(女巫看到的狼刀, 最终狼刀): 概率}
+    """
+    outcomes: Dict[Tuple[Optional[int], Optional[int]], float] = {}
+    for choices, prob in _wolf_choices(wolves, ids):
+        seen = majority_target(choices[:seen_count])
+        final = majority_target(choices)
+        key = (seen, final)
+        outcomes[key] = outcomes.get(key, 0.0) + prob
+    return outcomes
+
+
+def _wolf_choices(
+    wolves: List[int], ids: List[int],
+) -> Iterator[Tuple[Tuple[Optional[int], ...], float]]:
+    """按座位顺序枚举每名狼人的击杀目标（None 表示空刀）及其概率"""
+    per_wolf = []
+    for wolf in wolves:
+        others = [pid for pid in ids if pid != wolf]
+        p_target = 0.5 / len(others)
+        per_wolf.append([(None, 0.5)] + [(target, p_target) for target in others])
+
+    for combo in itertools.product(*per_wolf):
+        prob = 1.0
+        for _, p in combo:
+            prob *= p
+        yield tuple(target for target, _ in combo), prob
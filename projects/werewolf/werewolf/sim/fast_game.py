@@ -0,0 +1,665 @@
+# ==================== 快速模拟引擎 ====================
+"""
+FastGame：无头、位掩码化的对局引擎
+
+与 Game 共用 engine.rules 中的结算规则，并逐条复刻各角色的
+validate_action / execute_action 语义，但把存活、阵营、角色状态压缩为
+位掩码和小整数数组，默认不创建任何事件对象，用于大批量平衡性模拟。
+"""
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from werewolf.core.enums import ActionType, DeathReason, Faction, GamePhase
+from werewolf.core.events import GameEvent
+from werewolf.config.presets import GameConfig
+from werewolf.engine.rules import check_winner, majority_target, tally_votes
+from werewolf.core.legal import TARGETED_ACTIONS
+from werewolf.core.phrases import RANDOM_PHRASES
+
+
+# ==================== 角色编码 ====================
+
+VILLAGER, WEREWOLF, SEER, WITCH, HUNTER, GUARD = range(6)
+
+ROLE_CODES: Dict[str, int] = {
+    "villager": VILLAGER,
+    "werewolf": WEREWOLF,
+    "seer": SEER,
+    "witch": WITCH,
+    "hunter": HUNTER,
+    "guard": GUARD,
+}
+
+# 夜间可以行动的角色（对应 Role.can_act_at_night）
+NIGHT_ACTORS = frozenset({WEREWOLF, SEER, WITCH, GUARD})
+
+# 女巫药水位
+SAVE_POTION = 1
+POISON_POTION = 2
+
+# 对局安全上限：随机策略理论上可能无限空刀
+DEFAULT_MAX_ROUNDS = 100
+
+# 热路径上用身份比较代替 Enum 属性查找
+_KILL = ActionType.KILL
+_CHECK = ActionType.CHECK
+_SAVE = ActionType.SAVE
+_POISON = ActionType.POISON
+_PROTECT = ActionType.PROTECT
+_SHOOT = ActionType.SHOOT
+_VOTE = ActionType.VOTE
+_SKIP = ActionType.SKIP
+_NIGHT = GamePhase.NIGHT
+_DAY_VOTE = GamePhase.DAY_VOTE
+
+# 预先构造的可用行动元组（顺序与各角色 get_available_actions 一致）
+_NIGHT_OPTIONS: Dict[int, Tuple[ActionType, ...]] = {
+    WEREWOLF: (ActionType.KILL, ActionType.SKIP),
+    SEER: (ActionType.CHECK, ActionType.SKIP),
+    GUARD: (ActionType.PROTECT, ActionType.SKIP),
+}
+_HUNTER_OPTIONS = (ActionType.SHOOT, ActionType.SKIP)
+_VOTE_OPTIONS = (ActionType.VOTE, ActionType.SKIP)
+_WITCH_OPTIONS = {
+    (False, False): (ActionType.SKIP,),
+    (True, False): (ActionType.SKIP, ActionType.SAVE),
+    (False, True): (ActionType.SKIP, ActionType.POISON),
+    (True, True): (ActionType.SKIP, ActionType.SAVE, ActionType.POISON),
+}
+
+
+@dataclass
+class FastGameResult:
+    """
+    快速对局结果
+
+    Attributes:
+        winner: 胜利阵营（超过回合上限时为None）
+        rounds: 总回合数（与 GameResult.rounds 含义一致）
+        alive_mask: 结束时的存活位掩码
+        deaths: 死亡记录 [(round, player_id, reason), ...]
+        history: 事件历史（仅 record_events=True 时填充）
+    """
+    winner: Optional[Faction] = None
+    rounds: int = 0
+    alive_mask: int = 0
+    deaths: List[Tuple[int, int, DeathReason]] = field(default_factory=list)
+    history: List[GameEvent] = field(default_factory=list)
+
+
+class RandomPolicy:
+    """
+    随机策略
+
+    与 RandomAgent 逐位等价：每个座位持有 seed + player_id 的独立随机数
+    生成器，行动/目标/发言的随机数消耗顺序完全一致，因此同一 seed 下
+    FastGame 与 Game + RandomAgent 的对局结果相同。
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed: 基础随机种子（座位 i 使用 seed + i）
+        """
+        self.seed = seed
+        self._rngs: List[random.Random] = []
+
+    def bind(self, game: FastGame) -> None:
+        """对局开始时为每个座位创建随机数生成器"""
+        seed = self.seed
+        self._rngs = [
+            random.Random(None if seed is None else seed + pid)
+            for pid in range(game.player_count)
+        ]
+
+    def decide(self, game: FastGame, pid: int) -> Tuple[ActionType, Optional[int]]:
+        """选择行动（夜间技能或投票）"""
+        options = game.available_actions(pid)
+        if not options:
+            return _SKIP, None
+
+        rng = self._rngs[pid]
+        action_type = rng.choice(options)
+
+        if action_type in TARGETED_ACTIONS:
+            others = game.other_alive_ids(pid)
+            if others:
+                return action_type, rng.choice(others)
+            return _SKIP, None
+
+        if action_type is _SAVE:
+            return action_type, game.wolf_target_tonight
+
+        return action_type, None
+
+    def speak(self, game: FastGame, pid: int) -> None:
+        """发言（只消耗随机数，保持与 RandomAgent 同步）"""
+        self._rngs[pid].choice(RANDOM_PHRASES)
+
+
+def check_phase_rules(config: GameConfig) -> None:
+    """
+    检查阶段规则是否受模拟引擎支持
+
+    FastGame / BatchSimulator 只实现 Moderator 的默认阶段表
+    （跳过空阶段、不插入猎人开枪阶段）。
+
+    Raises:
+        ValueError: 配置使用了不支持的阶段规则
+    """
+    rules = config.rules
+    if rules.get("hunter_shot_phase", False):
+        raise ValueError("模拟引擎不支持 hunter_shot_phase 规则")
+    if not rules.get("skip_idle_phases", True):
+        raise ValueError("模拟引擎不支持关闭 skip_idle_phases 规则")
+
+
+class FastGame:
+    """
+    快速对局引擎
+
+    状态表示：
+    - alive: 存活位掩码（第 i 位对应座位 i）
+    - wolf_mask: 狼人位掩码
+    - roles: 座位 -> 角色编码
+    - potions / guard_last / can_shoot: 每座位的小整数状态
+
+    与 Game 一样用 random.Random(seed) 洗牌分配角色，因此同一 seed
+    得到相同的角色分配。
+
+    Example:
+        game = FastGame(PRESET_9P)
+        for seed in range(10000):
+            game.reset(seed)
+            result = game.run(RandomPolicy(seed))
+    """
+
+    def __init__(
+        self,
+        config: GameConfig,
+        seed: Optional[int] = None,
+        record_events: bool = False,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+    ):
+        """
+        Args:
+            config: 游戏配置
+            seed: 随机种子（与 Game 相同的洗牌方式）
+            record_events: 是否生成与 Game.history 一致的事件对象
+            max_rounds: 回合上限，超过后以无胜者结束
+        """
+        valid, msg = config.validate()
+        if not valid:
+            raise ValueError(f"配置无效: {msg}")
+        check_phase_rules(config)
+
+        self.config = config
+        self.player_count = config.player_count
+        self.record_events = record_events
+        self.max_rounds = max_rounds
+        self._role_codes = [ROLE_CODES[r] for r in config.roles]
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """重置为新对局（复用实例，避免重复分配）"""
+        n = self.player_count
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        roles = list(self._role_codes)
+        self.rng.shuffle(roles)
+        self.roles: List[int] = roles
+
+        wolf_mask = 0
+        for pid, role in enumerate(roles):
+            if role == WEREWOLF:
+                wolf_mask |= 1 << pid
+        self.wolf_mask = wolf_mask
+        self.alive = (1 << n) - 1
+        self.alive_ids: List[int] = list(range(n))
+        self._others: Dict[int, List[int]] = {}
+
+        self.potions = bytearray(
+            SAVE_POTION | POISON_POTION if role == WITCH else 0 for role in roles
+        )
+        self.guard_last: List[int] = [-1] * n
+        self.can_shoot = bytearray(1 if role == HUNTER else 0 for role in roles)
+
+        self.phase = GamePhase.INIT
+        self.round = 0
+        # 本局事件负载的驻留表（record_events=True 时使用）
+        self._interned: Dict[Any, Any] = {}
+        # 待结算行动 [(actor, action_type, target), ...]
+        self.pending: List[Tuple[int, ActionType, Optional[int]]] = []
+        self._kill_targets: List[Optional[int]] = []
+        self._wolf_target: Optional[int] = None
+        self.result = FastGameResult()
+
+    def set_position(
+        self,
+        roles: Sequence[int],
+        alive: int,
+        phase: GamePhase,
+        round_num: int,
+        potions: Optional[Sequence[int]] = None,
+        guard_last: Optional[Sequence[int]] = None,
+        can_shoot: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        从任意局面开始（用于搜索中的确定化局面）
+
+        Args:
+            roles: 座位 -> 角色编码
+            alive: 存活位掩码
+            phase: 当前阶段
+            round_num: 当前回合
+            potions: 每座位的药水位（默认女巫满药）
+            guard_last: 每座位上次守护的目标（默认 -1）
+            can_shoot: 每座位能否开枪（默认猎人可开枪）
+        """
+        n = self.player_count
+        self.roles = list(roles)
+        wolf_mask = 0
+        for pid, role in enumerate(self.roles):
+            if role == WEREWOLF:
+                wolf_mask |= 1 << pid
+        self.wolf_mask = wolf_mask
+        self.alive = alive
+        self._refresh_alive_ids()
+
+        roles = self.roles
+        self.potions = bytearray(
+            potions if potions is not None
+            else (SAVE_POTION | POISON_POTION if role == WITCH else 0 for role in roles)
+        )
+        self.guard_last = list(guard_last) if guard_last is not None else [-1] * n
+        self.can_shoot = bytearray(
+            can_shoot if can_shoot is not None
+            else (1 if role == HUNTER else 0 for role in roles)
+        )
+
+        self.phase = phase
+        self.round = round_num
+        self.pending = []
+        self._kill_targets = []
+        self._wolf_target = None
+        self.result = FastGameResult()
+
+    # ==================== 查询接口 ====================
+
+    def is_alive(self, pid: int) -> bool:
+        """玩家是否存活"""
+        return (self.alive >> pid) & 1 == 1
+
+    def other_alive_ids(self, pid: int) -> List[int]:
+        """除自己外的存活座位（按存活集合缓存，调用方不应修改）"""
+        others = self._others.get(pid)
+        if others is None:
+            others = [i for i in self.alive_ids if i != pid]
+            self._others[pid] = others
+        return others
+
+    def alive_counts(self) -> Tuple[int, int]:
+        """(存活狼人数, 存活村民阵营数)"""
+        wolves = (self.alive & self.wolf_mask).bit_count()
+        return wolves, self.alive.bit_count() - wolves
+
+    @property
+    def wolf_target_tonight(self) -> Optional[int]:
+        """今晚狼刀目标（与 Moderator.get_wolf_target 一致：已提交击杀的多数决）"""
+        return self._wolf_target
+
+    def available_actions(self, pid: int) -> Tuple[ActionType, ...]:
+        """当前可用行动（与各角色 get_available_actions 一致）"""
+        role = self.roles[pid]
+        alive = (self.alive >> pid) & 1
+        if role == HUNTER and self.can_shoot[pid] and not alive:
+            return _HUNTER_OPTIONS
+        if not alive:
+            return ()
+        if self.phase is _DAY_VOTE:
+            return _VOTE_OPTIONS
+        if self.phase is not _NIGHT or role == HUNTER:
+            return ()
+
+        if role == WITCH:
+            potions = self.potions[pid]
+            can_save = bool(potions & SAVE_POTION) and self.wolf_target_tonight is not None
+            return _WITCH_OPTIONS[can_save, bool(potions & POISON_POTION)]
+
+        return _NIGHT_OPTIONS.get(role, ())
+
+    def legal_moves(self, pid: int) -> List[Tuple[ActionType, Optional[int]]]:
+        """
+        当前合法的 (行动, 目标) 组合（无需目标的行动目标为 None）
+
+        与 ActionMask 的语义一致，用于搜索中枚举分支。
+        """
+        moves: List[Tuple[ActionType, Optional[int]]] = []
+        for action_type in self.available_actions(pid):
+            if action_type in TARGETED_ACTIONS:
+                for target in self.alive_ids:
+                    if self._validate(pid, action_type, target):
+                        moves.append((action_type, target))
+            elif self._validate(pid, action_type, None):
+                moves.append((action_type, None))
+        return moves
+
+    # ==================== 对局驱动 ====================
+
+    def run(self, policy) -> FastGameResult:
+        """
+        运行完整对局
+
+        Args:
+            policy: 策略对象，需实现 bind(game) / decide(game, pid) / speak(game, pid)
+
+        Returns:
+            FastGameResult
+        """
+        policy.bind(self)
+        self.start()
+        return self.play(policy)
+
+    def play(self, policy) -> FastGameResult:
+        """
+        从当前阶段继续对局直到结束（策略需已 bind）
+
+        Args:
+            policy: 策略对象，需实现 decide(game, pid) / speak(game, pid)
+
+        Returns:
+            FastGameResult
+        """
+        decide, speak, submit = policy.decide, policy.speak, self.submit
+        roles = self.roles
+        while self.phase is not GamePhase.GAME_OVER:
+            if self.round > self.max_rounds:
+                break
+
+            phase = self.phase
+            if phase is _NIGHT:
+                for pid in self.alive_ids:
+                    if roles[pid] in NIGHT_ACTORS:
+                        submit(pid, *decide(self, pid))
+            elif phase is GamePhase.DAY_DISCUSSION:
+                for pid in self.alive_ids:
+                    speak(self, pid)
+            elif phase is _DAY_VOTE:
+                for pid in self.alive_ids:
+                    submit(pid, *decide(self, pid))
+
+            self.advance_phase()
+
+        self.result.rounds = self.round
+        self.result.alive_mask = self.alive
+        return self.result
+
+    def start(self) -> None:
+        """开始游戏（对应 Moderator.start_game）"""
+        if self.phase != GamePhase.INIT:
+            raise RuntimeError("游戏已经开始")
+        if self.record_events:
+            self._emit(GameEvent.GAME_START, 0, GamePhase.INIT,
+                       {"player_count": self.player_count})
+        self._transition_to(GamePhase.NIGHT)
+        self.round = 1
+
+    def submit(self, pid: int, action_type: ActionType, target: Optional[int] = None) -> bool:
+        """
+        提交行动（对应 Moderator.submit_action）
+
+        Returns:
+            是否提交成功
+        """
+        if not (0 <= pid < self.player_count and self._validate(pid, action_type, target)):
+            return False
+
+        self._execute(pid, action_type, target)
+        self.pending.append((pid, action_type, target))
+        if action_type is _KILL:
+            self._kill_targets.append(target)
+            self._wolf_target = majority_target(self._kill_targets)
+        if self.record_events:
+            self._emit(GameEvent.PLAYER_ACTION, self.round, self.phase,
+                       {"player_id": pid, "action": action_type.value}, [pid])
+        return True
+
+    def advance_phase(self) -> None:
+        """推进到下一阶段（对应 Moderator.advance_phase）"""
+        phase = self.phase
+        if phase == GamePhase.NIGHT:
+            self._resolve_night()
+        elif phase == GamePhase.DAY_DISCUSSION:
+            self._transition_to(GamePhase.DAY_VOTE)
+        elif phase == GamePhase.DAY_VOTE:
+            self._resolve_vote()
+        elif phase != GamePhase.GAME_OVER:
+            raise RuntimeError(f"无法从此阶段推进: {phase}")
+
+    # ==================== 行动校验与执行 ====================
+
+    def _validate(self, pid: int, action_type: ActionType, target: Optional[int]) -> bool:
+        """复刻各角色 validate_action 的判定"""
+        role = self.roles[pid]
+
+        if self.phase is _DAY_VOTE and (self.alive >> pid) & 1:
+            # Role.validate_action 的投票规则：投给除自己外的存活玩家，或弃权
+            if action_type is _SKIP:
+                return True
+            return (
+                action_type is _VOTE
+                and target is not None
+                and 0 <= target < self.player_count
+                and target != pid
+                and self.is_alive(target)
+            )
+
+        if role == HUNTER:
+            # Hunter.validate_action 不检查行动者存活
+            if action_type is _SHOOT:
+                return (
+                    bool(self.can_shoot[pid])
+                    and target is not None
+                    and 0 <= target < self.player_count
+                    and self.is_alive(target)
+                    and target != pid
+                )
+            return action_type is _SKIP
+
+        # Role.validate_action：行动者与目标必须存活
+        alive = self.alive
+        if not (alive >> pid) & 1:
+            return False
+        if target is not None:
+            if not 0 <= target < self.player_count or not (alive >> target) & 1:
+                return False
+
+        if role == VILLAGER:
+            return action_type is not _VOTE
+
+        if action_type is _SKIP:
+            return True
+
+        if role == WEREWOLF:
+            return action_type is _KILL and target is not None
+
+        if role == SEER:
+            return action_type is _CHECK and target is not None and target != pid
+
+        if role == WITCH:
+            potions = self.potions[pid]
+            if action_type is _SAVE:
+                wolf_target = self.wolf_target_tonight
+                return bool(potions & SAVE_POTION) and wolf_target is not None and wolf_target != pid
+            if action_type is _POISON:
+                return bool(potions & POISON_POTION) and target is not None and target != pid
+            return False
+
+        if role == GUARD:
+            if action_type is _PROTECT:
+                return target is not None and target != self.guard_last[pid]
+            return False
+
+        return False
+
+    def _execute(self, pid: int, action_type: ActionType, target: Optional[int]) -> None:
+        """复刻各角色 execute_action 的状态变化（投票不改变角色状态）"""
+        if self.phase is _DAY_VOTE and (self.alive >> pid) & 1:
+            return
+        role = self.roles[pid]
+        if role == GUARD:
+            if action_type is _SKIP:
+                self.guard_last[pid] = -1
+            elif action_type is _PROTECT:
+                self.guard_last[pid] = target
+        elif role == WITCH:
+            if action_type is _SAVE:
+                self.potions[pid] &= ~SAVE_POTION
+            elif action_type is _POISON:
+                self.potions[pid] &= ~POISON_POTION
+        elif role == HUNTER and action_type is _SHOOT:
+            self.can_shoot[pid] = 0
+
+    # ==================== 结算 ====================
+
+    def _resolve_night(self) -> None:
+        """夜间结算（对应 NightResolver.resolve + Moderator._resolve_night）"""
+        protected: Optional[int] = None
+        kills: List[Optional[int]] = []
+        saved = False
+        poisoned = 0
+
+        for _, action_type, target in self.pending:
+            if action_type is _KILL:
+                kills.append(target)
+            elif action_type is _PROTECT:
+                if protected is None and target is not None:
+                    protected = target
+            elif action_type is _SAVE:
+                saved = True
+            elif action_type is _POISON:
+                if target is not None:
+                    poisoned |= 1 << target
+        self.pending.clear()
+        self._kill_targets.clear()
+        self._wolf_target = None
+
+        wolf_target = majority_target(kills)
+        deaths: List[Tuple[int, DeathReason]] = []
+        if wolf_target is not None and wolf_target != protected and not saved:
+            deaths.append((wolf_target, DeathReason.WOLF_KILL))
+        for pid in self.alive_ids:
+            if (poisoned >> pid) & 1:
+                deaths.append((pid, DeathReason.WITCH_POISON))
+
+        for pid, reason in deaths:
+            self._kill(pid, reason, GamePhase.NIGHT)
+        if deaths:
+            self._refresh_alive_ids()
+
+        self._finish_phase(check_winner(*self.alive_counts()), GamePhase.DAY_DISCUSSION)
+
+    def _resolve_vote(self) -> None:
+        """投票结算（对应 VoteManager.resolve + Moderator._resolve_vote）"""
+        votes: Dict[int, Optional[int]] = {}
+        for actor, action_type, target in self.pending:
+            if action_type is _VOTE:
+                votes[actor] = target
+            elif action_type is _SKIP:
+                votes[actor] = None
+        self.pending.clear()
+
+        _, eliminated, _ = tally_votes(votes.values())
+
+        if self.record_events:
+            self._emit(GameEvent.VOTE_RESULT, self.round, GamePhase.DAY_VOTE, {
+                "votes": {str(k): v for k, v in votes.items()},
+                "eliminated": eliminated,
+            })
+
+        if eliminated is not None:
+            self.alive &= ~(1 << eliminated)
+            self.result.deaths.append((self.round, eliminated, DeathReason.VOTE_OUT))
+            self._refresh_alive_ids()
+
+        winner = check_winner(*self.alive_counts())
+        if winner is None:
+            self.round += 1
+        self._finish_phase(winner, GamePhase.NIGHT)
+
+    def _finish_phase(self, winner: Optional[Faction], next_phase: GamePhase) -> None:
+        """根据胜负结果切换阶段"""
+        if winner is not None:
+            self.result.winner = winner
+            self._transition_to(GamePhase.GAME_OVER)
+        else:
+            self._transition_to(next_phase)
+
+    def _kill(self, pid: int, reason: DeathReason, phase: GamePhase) -> None:
+        """玩家死亡（夜间死亡会记录 PLAYER_DEATH 事件）"""
+        self.alive &= ~(1 << pid)
+        self.result.deaths.append((self.round, pid, reason))
+        if self.record_events:
+            self._emit(GameEvent.PLAYER_DEATH, self.round, phase,
+                       {"player_id": pid, "reason": reason.value})
+
+    def _refresh_alive_ids(self) -> None:
+        """死亡后重建存活座位列表"""
+        alive = self.alive
+        self.alive_ids = [pid for pid in range(self.player_count) if (alive >> pid) & 1]
+        self._others.clear()
+
+    def _transition_to(self, phase: GamePhase) -> None:
+        """切换阶段"""
+        old_phase = self.phase
+        self.phase = phase
+        if self.record_events:
+            self._emit(GameEvent.PHASE_CHANGE, self.round, phase,
+                       {"from": old_phase.value, "to": phase.value})
+
+    def _emit(
+        self,
+        event_type: str,
+        round_num: int,
+        phase: GamePhase,
+        data: dict,
+        visible_to: Optional[List[int]] = None,
+    ) -> None:
+        """记录事件（仅 record_events=True 时调用）"""
+        event = GameEvent(
+            event_type=event_type,
+            round_num=round_num,
+            phase=phase,
+            data=data,
+            visible_to=visible_to,
+        )
+        event.intern_into(self._interned)
+        self.result.history.append(event)
+
+
+def run_games(
+    config: GameConfig,
+    seeds: Sequence[int],
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+) -> List[FastGameResult]:
+    """
+    批量运行随机策略对局
+
+    Args:
+        config: 游戏配置
+        seeds: 种子列表（对局种子与策略种子相同，与 BenchmarkService 一致）
+        max_rounds: 回合上限
+
+    Returns:
+        每局的 FastGameResult
+    """
+    game = FastGame(config, max_rounds=max_rounds)
+    results = []
+    for seed in seeds:
+        game.reset(seed)
+        results.append(game.run(RandomPolicy(seed)))
+    return results
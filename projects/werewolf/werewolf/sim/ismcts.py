@@ -0,0 +1,328 @@
+# ==================== 信息集蒙特卡洛树搜索 ====================
+"""
+单观察者信息集 MCTS（SO-ISMCTS）
+
+每次迭代从角色分配的后验样本中抽取一个确定化局面，在 FastGame 上
+模拟到对局结束：观察者自己的决策沿搜索树按 UCB 选择（按"在该确定化中
+是否合法"统计可用次数），离开树后其余决策交给廉价的随机规则策略。
+树节点只由观察者自己的行动序列决定，不同确定化共享同一棵树，
+最终按根节点各行动的访问次数选择。
+
+search() 只依赖可 pickle 的参数，可以直接提交到进程池做根并行，
+各进程的根统计用 merge_stats() 合并。
+"""
+
+from __future__ import annotations
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from werewolf.core.enums import ActionType, Faction, GamePhase
+from werewolf.config.presets import GameConfig
+from werewolf.sim.fast_game import (
+    FastGame,
+    GUARD,
+    HUNTER,
+    NIGHT_ACTORS,
+    POISON_POTION,
+    SAVE_POTION,
+    SEER,
+    WEREWOLF,
+    WITCH,
+)
+
+# (行动类型, 目标)；无需目标的行动目标为 None
+Move = Tuple[ActionType, Optional[int]]
+
+# 根节点统计：行动 -> (访问次数, 累计收益)
+RootStats = Dict[Move, Tuple[int, float]]
+
+DEFAULT_EXPLORATION = 0.7
+# 时间预算模式下每隔多少次迭代检查一次时钟
+_CLOCK_INTERVAL = 32
+
+# 随机规则策略的参数
+ROLLOUT_SAVE_PROB = 0.5     # 女巫有解药时救人的概率
+ROLLOUT_POISON_PROB = 0.1   # 女巫有毒药时每晚用毒的概率
+
+_KILL = ActionType.KILL
+_CHECK = ActionType.CHECK
+_SAVE = ActionType.SAVE
+_POISON = ActionType.POISON
+_PROTECT = ActionType.PROTECT
+_SHOOT = ActionType.SHOOT
+_VOTE = ActionType.VOTE
+_SKIP = ActionType.SKIP
+
+
+@dataclass
+class SearchPosition:
+    """
+    观察者视角下的搜索起点
+
+    只包含观察者可见的信息；其他座位的角色由确定化样本补全，
+    其他座位的角色状态取默认值（女巫满药、守卫无上次守护、猎人可开枪）。
+
+    Attributes:
+        config: 游戏配置
+        observer: 观察者座位
+        alive: 存活位掩码
+        phase: 当前阶段（NIGHT 或 DAY_VOTE）
+        round_num: 当前回合
+        potions: 观察者是女巫时的药水位
+        guard_last: 观察者是守卫时上次守护的目标
+        can_shoot: 观察者是猎人时能否开枪
+        wolf_target: 今晚狼刀目标（女巫可见，确定化时所有狼人刀该目标）
+    """
+    config: GameConfig
+    observer: int
+    alive: int
+    phase: GamePhase
+    round_num: int
+    potions: int = SAVE_POTION | POISON_POTION
+    guard_last: int = -1
+    can_shoot: bool = True
+    wolf_target: Optional[int] = None
+
+
+class RolloutPolicy:
+    """
+    模拟用的随机规则策略
+
+    比 RandomPolicy 略有常识（狼人统一刀非狼人、不空刀，守卫不空守，
+    女巫按概率用药），但每个决策仍是常数次随机数调用。
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self._wolf_choice: Tuple[int, Optional[int]] = (-1, None)
+
+    def bind(self, game: FastGame) -> None:
+        self._wolf_choice = (-1, None)
+
+    def decide(self, game: FastGame, pid: int) -> Tuple[ActionType, Optional[int]]:
+        rng = self.rng
+        options = game.available_actions(pid)
+        if not options:
+            return _SKIP, None
+        others = game.other_alive_ids(pid)
+        if not others:
+            return _SKIP, None
+
+        if _VOTE in options:
+            return _VOTE, rng.choice(others)
+
+        role = game.roles[pid]
+        if role == WEREWOLF:
+            round_num, target = self._wolf_choice
+            if round_num != game.round:
+                wolves = game.wolf_mask
+                prey = [t for t in others if not (wolves >> t) & 1]
+                target = rng.choice(prey) if prey else None
+                self._wolf_choice = (game.round, target)
+            return (_KILL, target) if target is not None else (_SKIP, None)
+        if role == SEER:
+            return _CHECK, rng.choice(others)
+        if role == GUARD:
+            target = rng.choice(others)
+            if target == game.guard_last[pid]:
+                return _SKIP, None
+            return _PROTECT, target
+        if role == WITCH:
+            if _SAVE in options and rng.random() < ROLLOUT_SAVE_PROB:
+                wolf_target = game.wolf_target_tonight
+                if wolf_target != pid:
+                    return _SAVE, wolf_target
+            if _POISON in options and rng.random() < ROLLOUT_POISON_PROB:
+                return _POISON, rng.choice(others)
+            return _SKIP, None
+        if role == HUNTER:
+            return _SHOOT, rng.choice(others)
+        return _SKIP, None
+
+    def speak(self, game: FastGame, pid: int) -> None:
+        pass
+
+
+class _Node:
+    """搜索树节点（边上的统计存放在子节点中）"""
+
+    __slots__ = ("children", "visits", "reward", "avail")
+
+    def __init__(self):
+        self.children: Dict[Move, _Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.avail = 0
+
+
+class _TreePolicy(RolloutPolicy):
+    """观察者的决策沿搜索树选择，其余座位使用随机规则策略"""
+
+    def __init__(self, rng: random.Random, observer: int, exploration: float):
+        super().__init__(rng)
+        self.observer = observer
+        self.exploration = exploration
+        self.node: Optional[_Node] = None
+        self.path: List[_Node] = []
+
+    def start(self, root: _Node) -> None:
+        self.node = root
+        self.path = []
+
+    def choose(self, moves: Sequence[Move]) -> Optional[Move]:
+        """在当前节点选择（未尝试的行动优先展开，展开后离开搜索树）"""
+        node = self.node
+        if node is None or not moves:
+            return None
+        children = node.children
+        untried = []
+        for move in moves:
+            child = children.get(move)
+            if child is None:
+                untried.append(move)
+            else:
+                child.avail += 1
+
+        if untried:
+            move = self.rng.choice(untried)
+            child = children[move] = _Node()
+            child.avail = 1
+            self.node = None
+        else:
+            c = self.exploration
+            best_score = -1.0
+            move = moves[0]
+            for m in moves:
+                ch = children[m]
+                score = ch.reward / ch.visits + c * math.sqrt(math.log(ch.avail) / ch.visits)
+                if score > best_score:
+                    move, best_score = m, score
+            child = children[move]
+            self.node = child
+        self.path.append(child)
+        return move
+
+    def decide(self, game: FastGame, pid: int) -> Tuple[ActionType, Optional[int]]:
+        if pid == self.observer and self.node is not None:
+            move = self.choose(game.legal_moves(pid))
+            if move is not None:
+                return move
+        return super().decide(game, pid)
+
+
+def _reward(winner: Optional[Faction], faction: Faction) -> float:
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == faction else 0.0
+
+
+def search(
+    position: SearchPosition,
+    samples: Sequence[Sequence[int]],
+    moves: Sequence[Move],
+    iterations: int = 1000,
+    time_limit: Optional[float] = None,
+    exploration: float = DEFAULT_EXPLORATION,
+    seed: Optional[int] = None,
+) -> RootStats:
+    """
+    运行搜索
+
+    Args:
+        position: 搜索起点
+        samples: 确定化样本（座位 -> 角色编码），按后验抽取，每次迭代均匀取一个
+        moves: 观察者在根节点的候选行动（来自真实对局的合法行动掩码）
+        iterations: 迭代次数上限
+        time_limit: 时间上限（秒），与 iterations 先到者为准
+        exploration: UCB 探索系数
+        seed: 随机种子
+
+    Returns:
+        根节点统计 {行动: (访问次数, 累计收益)}
+    """
+    if not samples or not moves:
+        return {}
+
+    rng = random.Random(seed)
+    observer = position.observer
+    game = FastGame(position.config)
+    policy = _TreePolicy(rng, observer, exploration)
+    root = _Node()
+    moves = list(moves)
+    faction = Faction.WEREWOLF if samples[0][observer] == WEREWOLF else Faction.VILLAGER
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    for it in range(iterations):
+        if deadline is not None and it % _CLOCK_INTERVAL == 0 and time.perf_counter() > deadline:
+            break
+
+        roles = rng.choice(samples)
+        _setup(game, position, roles)
+        policy.bind(game)
+        policy.start(root)
+
+        # 当前阶段：其他行动者先按随机规则策略行动，观察者最后从根节点选择
+        phase = game.phase
+        for pid in game.alive_ids:
+            if pid == observer:
+                continue
+            if phase is GamePhase.NIGHT:
+                if roles[pid] not in NIGHT_ACTORS:
+                    continue
+                if roles[pid] == WEREWOLF and position.wolf_target is not None:
+                    game.submit(pid, _KILL, position.wolf_target)
+                    continue
+            elif not game.available_actions(pid):
+                continue
+            game.submit(pid, *policy.decide(game, pid))
+        move = policy.choose(moves)
+        game.submit(observer, *move)
+        game.advance_phase()
+
+        result = game.play(policy)
+        reward = _reward(result.winner, faction)
+        root.visits += 1
+        for node in policy.path:
+            node.visits += 1
+            node.reward += reward
+
+    return {move: (child.visits, child.reward) for move, child in root.children.items()}
+
+
+def _setup(game: FastGame, position: SearchPosition, roles: Sequence[int]) -> None:
+    """按确定化样本设置局面（观察者自己的角色状态取真实值）"""
+    observer = position.observer
+    potions = [SAVE_POTION | POISON_POTION if role == WITCH else 0 for role in roles]
+    guard_last = [-1] * len(roles)
+    can_shoot = [1 if role == HUNTER else 0 for role in roles]
+    role = roles[observer]
+    if role == WITCH:
+        potions[observer] = position.potions
+    elif role == GUARD:
+        guard_last[observer] = position.guard_last
+    elif role == HUNTER:
+        can_shoot[observer] = int(position.can_shoot)
+    game.set_position(
+        roles, position.alive, position.phase, position.round_num,
+        potions=potions, guard_last=guard_last, can_shoot=can_shoot,
+    )
+
+
+def merge_stats(stats: Sequence[RootStats]) -> RootStats:
+    """合并多个独立搜索（根并行）的根节点统计"""
+    merged: Dict[Move, Tuple[int, float]] = {}
+    for part in stats:
+        for move, (visits, reward) in part.items():
+            v, r = merged.get(move, (0, 0.0))
+            merged[move] = (v + visits, r + reward)
+    return merged
+
+
+def best_move(stats: RootStats) -> Optional[Move]:
+    """访问次数最多的行动（平局时比较平均收益）"""
+    if not stats:
+        return None
+    return max(stats, key=lambda m: (stats[m][0], stats[m][1] / max(stats[m][0], 1)))